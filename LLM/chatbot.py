@@ -1,8 +1,11 @@
 import re
-import socket
+from collections.abc import Iterable, Iterator
 
+from brain import connectivity
 from LLM.offlineLLM import chat as offline_chat
+from LLM.offlineLLM import stream_chat as offline_stream_chat
 from LLM.onlineLLM import chat as online_chat
+from LLM.onlineLLM import stream_chat as online_stream_chat
 
 
 # =========================
@@ -29,18 +32,6 @@ SHORT_MODE_PROMPT = (
 )
 
 
-# =========================
-# INTERNET CHECK
-# =========================
-def _has_internet(host="8.8.8.8", port=53, timeout=2):
-    try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-        return True
-    except Exception:
-        return False
-
-
 def _word_count(text: str) -> int:
     return len(re.findall(r"[A-Za-z0-9]+", text))
 
@@ -55,7 +46,10 @@ def _build_prompt(user_prompt: str) -> str:
 def _strip_greeting(text: str) -> str:
     if not text:
         return text
+    return _remove_greeting(text) or text
+
 
+def _remove_greeting(text: str) -> str:
     # Remove common leading salutations and honorifics like "Good morning, Tony.", "Hello, Mr. Iron Man!"
     # This is intentionally conservative: only removes short leading salutations up to the first sentence boundary.
     import re
@@ -66,9 +60,7 @@ def _strip_greeting(text: str) -> str:
 
     # Also handle short honorifics like "Mr. Iron Man," or "Tony," at the start
     honorific_re = re.compile(r"^(\s*(mr|mrs|ms|sir|madam|dr)\.?\s+[^,\n]{1,40},\s*)", re.IGNORECASE)
-    stripped = honorific_re.sub("", stripped, count=1).strip()
-
-    return stripped or text
+    return honorific_re.sub("", stripped, count=1).strip()
 
 
 # =========================
@@ -82,11 +74,12 @@ def chat(prompt: str) -> str:
     final_prompt = _build_prompt(user_prompt)
 
     # ---------- ONLINE PATH ----------
-    if _has_internet():
+    if connectivity.is_online():
         reply = online_chat(final_prompt)
 
         # If online fails, fallback
         if reply in ("OPENROUTER_UNAVAILABLE", None, ""):
+            connectivity.get_monitor().refresh()
             offline_reply = offline_chat(final_prompt)
             return _strip_greeting(offline_reply)
 
@@ -96,6 +89,56 @@ def chat(prompt: str) -> str:
     return _strip_greeting(offline_chat(final_prompt))
 
 
+# =========================
+# STREAMING CHAT
+# =========================
+# A reply streams on once its first sentence is in and any leading salutation
+# has been cut off; text past _GREETING_HEAD_CHARS is never a salutation.
+_GREETING_HEAD_RE = re.compile(r"[.!?\n]")
+_GREETING_HEAD_CHARS = 120
+
+
+def _strip_greeting_stream(deltas: Iterable[str]) -> Iterator[str]:
+    head = ""
+    deltas = iter(deltas)
+    for delta in deltas:
+        head += delta
+        if len(head) >= _GREETING_HEAD_CHARS:
+            break
+        if _GREETING_HEAD_RE.search(head):
+            rest = _remove_greeting(head)
+            if rest:
+                # Keep trailing whitespace: the next delta continues the text.
+                yield rest + head[len(head.rstrip()):]
+                yield from deltas
+                return
+    if head:
+        yield _strip_greeting(head)
+    yield from deltas
+
+
+def stream_chat(prompt: str) -> Iterator[str]:
+    """Like ``chat``, but yields the reply in pieces as the model generates it."""
+    if not prompt or not prompt.strip():
+        yield "Please say something meaningful."
+        return
+
+    final_prompt = _build_prompt(prompt.strip())
+
+    # ---------- ONLINE PATH ----------
+    if connectivity.is_online():
+        produced = False
+        for delta in _strip_greeting_stream(online_stream_chat(final_prompt)):
+            produced = True
+            yield delta
+        if produced:
+            return
+        connectivity.get_monitor().refresh()
+
+    # ---------- OFFLINE PATH ----------
+    yield from _strip_greeting_stream(offline_stream_chat(final_prompt))
+
+
 # =========================
 # MANUAL TEST
 # =========================
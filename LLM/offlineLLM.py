@@ -4,8 +4,12 @@ offlineLLM.py
 Offline LLM chat using Ollama.
 """
 
+import codecs
 import subprocess
+import threading
+from collections.abc import Iterator
 
+_OLLAMA_EXE = "C:\\Users\\kalpe\\AppData\\Local\\Programs\\Ollama\\ollama.exe"
 _MODEL_NAME = "llama3.2:3b"
 _TIMEOUT = 60  # increased for model load time
 
@@ -19,7 +23,7 @@ def chat(prompt: str) -> str:
 
     try:
         result = subprocess.run(
-            ["C:\\Users\\kalpe\\AppData\\Local\\Programs\\Ollama\\ollama.exe", "run", _MODEL_NAME, prompt],
+            [_OLLAMA_EXE, "run", _MODEL_NAME, prompt],
             capture_output=True,
             text=True,
             encoding="utf-8",
@@ -44,6 +48,57 @@ def chat(prompt: str) -> str:
         return "Offline language model failed unexpectedly."
 
 
+def stream_chat(prompt: str) -> Iterator[str]:
+    """
+    Yield the offline model's reply as Ollama prints it.
+    """
+    if not prompt or not prompt.strip():
+        yield "Say something meaningful."
+        return
+
+    try:
+        process = subprocess.Popen(
+            [_OLLAMA_EXE, "run", _MODEL_NAME, prompt],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        yield "Offline model engine is not installed."
+        return
+    except Exception:
+        yield "Offline language model failed unexpectedly."
+        return
+
+    timed_out = threading.Event()
+
+    def _kill() -> None:
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(_TIMEOUT, _kill)
+    timer.daemon = True
+    timer.start()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    produced = False
+    try:
+        while True:
+            chunk = process.stdout.read1(1024)
+            text = decoder.decode(chunk, final=not chunk)
+            if text.strip() or (produced and text):
+                produced = True
+                yield text
+            if not chunk:
+                break
+    finally:
+        timer.cancel()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    if not produced:
+        yield "Thinking took too long. Try again." if timed_out.is_set() else "I thought about it, but got nothing."
+
+
 if __name__ == "__main__":
     while True:
        
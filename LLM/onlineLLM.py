@@ -9,10 +9,13 @@ import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 import os
+from collections.abc import Iterator
+
 from dotenv import load_dotenv
 import google.generativeai as genai
 
 from LLM.openrouterLLM import chat as openrouter_chat
+from LLM.openrouterLLM import stream_chat as openrouter_stream_chat
 
 load_dotenv()
 
@@ -40,6 +43,32 @@ def chat(prompt: str) -> str:
         # Explicit fallback
         return openrouter_chat(prompt)
 
+
+def stream_chat(prompt: str) -> Iterator[str]:
+    """Yield Gemini's reply as it is generated.
+
+    Falls back to OpenRouter when Gemini fails before producing any text;
+    yields nothing when neither is available.
+    """
+    if not chat_session:
+        yield from openrouter_stream_chat(prompt)
+        return
+
+    if not prompt or not prompt.strip():
+        yield "Say something meaningful."
+        return
+
+    produced = False
+    try:
+        for chunk in chat_session.send_message(prompt, stream=True):
+            text = chunk.text
+            if text:
+                produced = True
+                yield text
+    except Exception:
+        if not produced:
+            yield from openrouter_stream_chat(prompt)
+
 if __name__ == "__main__":
     while True:
         test_prompt = input("Test prompt: ")
@@ -6,6 +6,9 @@ Secondary online LLM.
 """
 
 import os
+import time
+from collections.abc import Iterator
+
 from dotenv import load_dotenv
 from openai import OpenAI
 
@@ -31,9 +34,14 @@ else:
     client = None
 
 
-def chat(prompt: str) -> str:
-    import time
+def _messages(prompt: str) -> list[dict]:
+    return [
+        {"role": "system", "content": "You are JARVIS. Be concise, calm, intelligent. Do not start replies with salutations."},
+        {"role": "user", "content": prompt}
+    ]
+
 
+def chat(prompt: str) -> str:
     global _last_failure
 
     # If we previously failed recently, skip attempting
@@ -50,10 +58,7 @@ def chat(prompt: str) -> str:
     try:
         response = client.chat.completions.create(
             model=OPENROUTER_MODEL,
-            messages=[
-                {"role": "system", "content": "You are JARVIS. Be concise, calm, intelligent. Do not start replies with salutations."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=_messages(prompt),
             temperature=0.6,
             max_tokens=300,
         )
@@ -63,6 +68,40 @@ def chat(prompt: str) -> str:
         _last_failure = time.time()
         return "OPENROUTER_UNAVAILABLE"
 
+
+def stream_chat(prompt: str) -> Iterator[str]:
+    """Yield the reply as it is generated; yields nothing when OpenRouter is unavailable."""
+    global _last_failure
+
+    if time.time() - _last_failure < _cooldown_s:
+        return
+
+    if not client:
+        _last_failure = time.time()
+        return
+
+    if not prompt or not prompt.strip():
+        yield "Say something meaningful."
+        return
+
+    try:
+        stream = client.chat.completions.create(
+            model=OPENROUTER_MODEL,
+            messages=_messages(prompt),
+            temperature=0.6,
+            max_tokens=300,
+            stream=True,
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    except Exception as e:
+        print("OPENROUTER_UNAVAILABLE", e)
+        _last_failure = time.time()
+
 if __name__ == "__main__":
     while True:
         test_prompt = input("Test prompt: ")
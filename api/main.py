@@ -1,10 +1,13 @@
 # for start server : uvicorn api.main:app --reload 
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
-from body.speak import speak, _internet_available
+from body.speak import speak
 from fastapi import FastAPI, BackgroundTasks
+from brain import connectivity
 from brain.brain import process_text
-from memory.sync_manager import start_sync
+from brain.intent_engine import NLU_CLASSIFIER
+from memory.sync_manager import start_sync, sync_metrics
+from system.laptop.app_launcher import preresolve_top_apps
 from fastapi.middleware.cors import CORSMiddleware
 import threading
 import time
@@ -45,6 +48,14 @@ def startup_sync():
     
     tts_thread = threading.Thread(target=init_tts_background, daemon=True)
     tts_thread.start()
+
+    # First connectivity probe runs in the background; sync, LLM and TTS read its result
+    connectivity.get_monitor()
+
+    # Sentence embedder loads on its own thread; keyword NLU serves until ready
+    NLU_CLASSIFIER.warm_up()
+    # Most used apps resolve to their executables while the server idles
+    preresolve_top_apps()
     
     logger.info("✓ Server startup complete")
     logger.info("=" * 50)
@@ -67,6 +78,11 @@ def shutdown_sync():
         logger.error(f"✗ TTS shutdown error: {e}")
     
     executor.shutdown(wait=False)
+
+    # Memory writes are buffered for a moment; persist the last ones now
+    from memory.local_cache import flush as flush_memory
+    flush_memory()
+
     logger.info("✓ Server shutdown complete")
 
 
@@ -81,7 +97,13 @@ app.add_middleware(
 
 @app.get("/")
 def home():
-    return {"status": "Jarvis API running"}
+    return {"status": "Jarvis API running", "nlu_embeddings_ready": NLU_CLASSIFIER.embedder_ready}
+
+
+@app.get("/metrics")
+def metrics():
+    """Sync outbox depth and upload latency."""
+    return sync_metrics()
 
 
 @app.get("/ask")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: difflib.get_close_matches vs. the trigram app-name index.
+
+Builds synthetic app catalogs (1k, 10k and 50k names by default), derives
+queries from them (typos, truncations, extra words and outright misses) and
+reports the per-lookup cost of:
+
+* ``difflib``   -- the old full scan with ``get_close_matches``;
+* ``compat``    -- ``TrigramIndex`` with the difflib scorer and cutoff;
+* ``trigram``   -- ``TrigramIndex`` ranking by trigram overlap only.
+
+``agree`` is the share of queries where ``compat`` returns what difflib does.
+Run with:
+
+    python benchmarks/bench_app_fuzzy.py [--sizes 1000 10000 50000] [--queries 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from system.laptop.fuzzy_index import TrigramIndex  # noqa: E402
+
+CUTOFF = 0.72
+_SYLLABLES = (
+    "ab", "ac", "al", "an", "ar", "ba", "bo", "ca", "co", "da", "de", "di", "do", "el", "en", "er",
+    "fi", "fo", "ga", "go", "ha", "in", "is", "ka", "la", "le", "li", "lo", "ma", "me", "mi", "mo",
+    "na", "ne", "no", "on", "or", "pa", "pe", "po", "ra", "re", "ri", "ro", "sa", "se", "so", "st",
+    "ta", "te", "ti", "to", "un", "ur", "va", "vi", "wa", "xe", "yo", "za",
+)
+_SUFFIXES = ("", "", "", " studio", " player", " editor", " launcher", " 2024", " pro", " helper")
+
+
+def synthetic_catalog(size: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    names: set[str] = set()
+    while len(names) < size:
+        words = [
+            "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+            for _ in range(rng.choice((1, 1, 2, 2, 3)))
+        ]
+        names.add(" ".join(words) + rng.choice(_SUFFIXES))
+    return sorted(names)
+
+
+def _typo(name: str, rng: random.Random) -> str:
+    chars = list(name)
+    position = rng.randrange(len(chars))
+    op = rng.choice(("drop", "swap", "replace"))
+    if op == "drop" and len(chars) > 3:
+        del chars[position]
+    elif op == "swap" and position < len(chars) - 1:
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    else:
+        chars[position] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def make_queries(names: list[str], count: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)
+    queries: list[str] = []
+    for index in range(count):
+        name = rng.choice(names)
+        kind = index % 4
+        if kind == 0:
+            queries.append(_typo(name, rng))
+        elif kind == 1:
+            queries.append(name[: max(3, len(name) * 2 // 3)])
+        elif kind == 2:
+            queries.append(f"{name} app")
+        else:
+            queries.append("".join(rng.choice("qwxz") for _ in range(6)))
+    return queries
+
+
+def _per_lookup(func, queries: list[str]) -> tuple[float, list[list[str]]]:
+    start = time.perf_counter()
+    results = [func(query) for query in queries]
+    return (time.perf_counter() - start) / max(1, len(queries)), results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy app-name lookup.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="Catalog sizes")
+    parser.add_argument("--queries", type=int, default=200, help="Lookups per catalog")
+    parser.add_argument(
+        "--difflib-queries", type=int, default=40, help="Lookups for the (slow) difflib baseline and agreement"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'apps':>7} {'build ms':>9} {'difflib µs':>11} {'compat µs':>10} {'trigram µs':>11} {'agree':>7}"
+    )
+    for size in args.sizes:
+        names = synthetic_catalog(size)
+        queries = make_queries(names, args.queries)
+
+        start = time.perf_counter()
+        index = TrigramIndex(names)
+        build = time.perf_counter() - start
+
+        sample = queries[: args.difflib_queries]
+        difflib_cost, expected = _per_lookup(lambda q: difflib.get_close_matches(q, names, n=1, cutoff=CUTOFF), sample)
+        _, compat_sample = _per_lookup(lambda q: index.close_matches(q, n=1, cutoff=CUTOFF), sample)
+        compat_cost, _ = _per_lookup(lambda q: index.close_matches(q, n=1, cutoff=CUTOFF), queries)
+        trigram_cost, _ = _per_lookup(lambda q: index.close_matches(q, n=1, cutoff=0.6, scorer="trigram"), queries)
+        agree = sum(a == b for a, b in zip(expected, compat_sample)) / max(1, len(sample))
+
+        print(
+            f"{size:>7} {build * 1e3:>9.0f} {difflib_cost * 1e6:>11.0f} {compat_cost * 1e6:>10.0f} "
+            f"{trigram_cost * 1e6:>11.0f} {agree:>7.0%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
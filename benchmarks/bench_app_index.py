@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark: app index build, cold vs. incremental, sequential vs. parallel.
+
+Generates a synthetic Linux install tree in a temporary directory --
+``.desktop`` entries in several vendor folders under an XDG data dir -- points
+the collectors at it and reports:
+
+* ``cold``        -- first ``build_app_index`` with an empty directory cache;
+* ``warm``        -- rebuild with nothing changed (one ``stat`` per directory);
+* ``touched``     -- rebuild after a few directories gained an entry;
+* ``sequential``  -- the same collectors called one after another, warm cache.
+
+``--collector-delay`` adds a sleep to every collector to stand in for the
+PowerShell round trips of the Windows collectors, which the thread pool
+overlaps.  ``--system`` walks this machine's real XDG dirs instead of the
+synthetic tree.  The real ``database/`` files are never touched.
+Run with:
+
+    python benchmarks/bench_app_index.py [--apps 2000] [--vendors 10] [--collector-delay 0.3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import system.laptop.app_launcher as app_launcher  # noqa: E402
+from system.laptop.incremental_walk import DirectoryCache  # noqa: E402
+
+COLLECTORS = (
+    "_collect_registry_apps",
+    "_collect_program_files_apps",
+    "_collect_uwp_apps",
+    "_collect_desktop_entry_apps",
+)
+
+
+def _write_entry(directory: Path, stem: str, name: str) -> None:
+    (directory / f"{stem}.desktop").write_text(
+        f"[Desktop Entry]\nType=Application\nName={name}\nExec={stem} %U\n", encoding="utf-8"
+    )
+
+
+def make_tree(root: Path, apps: int, vendors: int) -> tuple[Path, list[Path]]:
+    share = root / "share"
+    folders = [share / "applications" / f"vendor{index}" for index in range(max(1, vendors))]
+    for folder in folders:
+        folder.mkdir(parents=True)
+    for index in range(apps):
+        _write_entry(folders[index % len(folders)], f"app{index}", f"Synthetic App {index}")
+    return share, folders
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _delayed(func, delay: float):
+    def collector():
+        time.sleep(delay)
+        return func()
+
+    return collector
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the app index builder.")
+    parser.add_argument("--apps", type=int, default=2000, help="Synthetic .desktop entries")
+    parser.add_argument("--vendors", type=int, default=10, help="Folders the entries are spread over")
+    parser.add_argument("--touch", type=int, default=3, help="Directories changed before the 'touched' build")
+    parser.add_argument("--collector-delay", type=float, default=0.0, help="Seconds added to every collector")
+    parser.add_argument("--system", action="store_true", help="Walk the real XDG dirs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        touchable: list[Path] = []
+        if not args.system:
+            share, folders = make_tree(tmp_path / "tree", args.apps, args.vendors)
+            os.environ["XDG_DATA_HOME"] = str(share)
+            os.environ["XDG_DATA_DIRS"] = str(tmp_path / "none")
+            touchable = folders[: args.touch]
+
+        app_launcher.APP_INDEX_PATH = tmp_path / "app_names.json"
+        app_launcher.APP_CATALOG = app_launcher.AppCatalog(app_launcher.APP_INDEX_PATH)
+        cache_path = tmp_path / "walk.json"
+        if args.collector_delay:
+            for name in COLLECTORS:
+                setattr(app_launcher, name, _delayed(getattr(app_launcher, name), args.collector_delay))
+
+        def build(fresh_cache: bool) -> DirectoryCache:
+            cache = DirectoryCache(cache_path)
+            if fresh_cache and cache_path.exists():
+                cache_path.unlink()
+            app_launcher.APP_WALK_CACHE = cache
+            return cache
+
+        cache = build(fresh_cache=True)
+        cold = _timed(lambda: app_launcher.build_app_index(force_refresh=True))
+        apps = len(app_launcher.APP_CATALOG.payload().get("apps", []))
+        rows = [("cold", cold, cache)]
+
+        cache = build(fresh_cache=False)
+        rows.append(("warm", _timed(lambda: app_launcher.build_app_index(force_refresh=True)), cache))
+
+        for number, directory in enumerate(touchable):
+            _write_entry(directory, f"new_app{number}", f"New App {number}")
+        cache = build(fresh_cache=False)
+        rows.append(("touched", _timed(lambda: app_launcher.build_app_index(force_refresh=True)), cache))
+
+        cache = build(fresh_cache=False)
+        collectors = [getattr(app_launcher, name) for name in COLLECTORS]
+        rows.append(("sequential", _timed(lambda: [collector() for collector in collectors]), cache))
+
+    print(f"indexed apps: {apps}")
+    print(f"{'build':>10} {'ms':>9} {'listed':>7} {'reused':>7}")
+    for label, seconds, walked in rows:
+        print(f"{label:>10} {seconds * 1e3:>9.1f} {walked.listed:>7} {walked.reused:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Benchmark: Firestore sync throughput and convergence between two devices.
+
+Runs ``memory.firestore_sync`` and ``memory.sync_manager`` against the
+in-process ``FakeFirestore`` from ``benchmarks/firestore_fake.py``
+(``--latency`` seconds per round trip, ``--listener-latency`` seconds before a
+write reaches listeners, ``--failure-rate`` of round trips failing) and
+reports, for each of ``--sizes`` turns:
+
+* ``upload per-turn`` -- ``push_conversation_turn`` for each turn, one
+  ``set()`` round trip each (the old upload path);
+* ``upload batched``  -- ``push_conversation_turns``: write batches of up to
+  ``FIRESTORE_BATCH_LIMIT`` turns, one commit each;
+* ``outbox drain``    -- the same turns queued in the sync outbox and drained
+  by ``sync_manager`` (outbox rows read, uploaded in batches, removed);
+* ``download paged``  -- ``sync_manager.download_latest`` pulling every turn
+  another device uploaded, one cursor-paged query and one merge per page;
+* ``listener merge``  -- another device commits the turns in write batches
+  while the realtime listener merges each snapshot into the journal; timed
+  until the last turn is merged.
+
+Then two simulated devices exchange ``--rounds`` single turns each way and
+the time until the other side has each turn is reported (p50/p95):
+
+* ``phone -> laptop`` -- the phone commits a turn; the laptop (this process's
+  memory stack) merges it from its realtime listener;
+* ``laptop -> phone`` -- the laptop queues a turn with ``upload_turn``; the
+  outbox thread uploads it and the phone's listener sees it.
+
+Each run starts from an empty temporary directory.  Run with:
+
+    python benchmarks/bench_firestore_sync.py [--sizes 200 5000] [--latency 0.002]
+        [--listener-latency 0.01] [--failure-rate 0.0] [--rounds 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import memory.firestore_sync as firestore_sync  # noqa: E402
+import memory.local_cache as local_cache  # noqa: E402
+import memory.sync_manager as sync_manager  # noqa: E402
+from benchmarks.firestore_fake import FakeFirestore, fake_firestore_module  # noqa: E402
+
+MODES = ("upload per-turn", "upload batched", "outbox drain", "download paged", "listener merge")
+
+
+def _turns(count: int, device_id: str) -> list[dict]:
+    return [
+        {
+            "conversation_id": f"{device_id}-{index}",
+            "user_text": f"question {index}",
+            "assistant_text": "An answer of a sentence or two.",
+            "timestamp": f"2026-01-{1 + index // 86400:02d}T{index // 3600 % 24:02d}:{index // 60 % 60:02d}:{index % 60:02d}+00:00",
+            "device_id": device_id,
+            "metadata": {"user": {"intent": "chat"}, "assistant": {"intent": "chat", "status": "success"}},
+        }
+        for index in range(count)
+    ]
+
+
+def _use_temp_store(tmp: str) -> None:
+    local_cache.DB_FILE = str(Path(tmp) / "memory.db")
+    local_cache.CACHE_FILE = str(Path(tmp) / "cache.json")
+    local_cache.SYNC_FILE = str(Path(tmp) / "sync.json")
+    local_cache.JOURNAL_DIR = str(Path(tmp) / "journal")
+    local_cache.reset_store()
+    sync_manager._OUTBOX = None
+
+
+def _commit(client: FakeFirestore, turns: list[dict]) -> None:
+    # Another device's outbox: write batches, retried until they commit.
+    collection = firestore_sync._conversations_collection()
+    for start in range(0, len(turns), firestore_sync.FIRESTORE_BATCH_LIMIT):
+        while True:
+            batch = client.batch()
+            for turn in turns[start : start + firestore_sync.FIRESTORE_BATCH_LIMIT]:
+                batch.set(collection.document(turn["conversation_id"]), turn, merge=True)
+            try:
+                batch.commit()
+                break
+            except Exception:
+                continue
+
+
+def _listen(start_listener):
+    # Injected failures can refuse a listener; sync_manager would try again later.
+    while True:
+        try:
+            watch = start_listener()
+        except Exception:
+            continue
+        if watch is not None:
+            return watch
+
+
+def _listen_and_merge(total: int) -> tuple[threading.Event, object]:
+    merged = 0
+    done = threading.Event()
+
+    def on_turns(turns: list[dict]) -> None:
+        nonlocal merged
+        merged += sync_manager.merge_turns(turns)
+        if merged >= total:
+            done.set()
+
+    return done, _listen(lambda: firestore_sync.start_realtime_listener(on_turns, "bench", batch=True))
+
+
+def _run(mode: str, turns: list[dict], client: FakeFirestore) -> tuple[float, int, int]:
+    firestore_sync.install_client(client, fake_firestore_module)
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_temp_store(tmp)
+        if mode == "download paged":
+            _commit(client, turns)
+        elif mode == "outbox drain":
+            outbox = sync_manager.get_outbox()
+            store = local_cache.get_store()
+            for turn in turns:
+                store.outbox_put(turn["conversation_id"], turn, time.time())
+        elif mode == "listener merge":
+            merged, watch = _listen_and_merge(len(turns))
+        client.round_trips = 0
+
+        start = time.perf_counter()
+        if mode == "upload per-turn":
+            done = sum(1 for turn in turns if firestore_sync.push_conversation_turn(turn))
+        elif mode == "upload batched":
+            done = firestore_sync.push_conversation_turns(turns)
+        elif mode == "outbox drain":
+            done = 0
+            while done < len(turns):
+                done += outbox.drain(force=True)
+        elif mode == "listener merge":
+            _commit(client, turns)
+            done = len(turns) if merged.wait(600) else 0
+            watch.unsubscribe()
+        else:
+            done = sync_manager.download_latest()
+        local_cache.flush()
+        elapsed = time.perf_counter() - start
+        local_cache.reset_store()
+        sync_manager._OUTBOX = None
+    return elapsed, client.round_trips, done
+
+
+def _converge(client: FakeFirestore, rounds: int) -> dict[str, list[float]]:
+    firestore_sync.install_client(client, fake_firestore_module)
+    collection = firestore_sync._conversations_collection()
+    seen_by_phone: dict[str, threading.Event] = {}
+
+    def phone_listener(_snapshots, changes, _read_time) -> None:
+        for change in changes:
+            event = seen_by_phone.get(change.document.id)
+            if event is not None:
+                event.set()
+
+    timings: dict[str, list[float]] = {"phone -> laptop": [], "laptop -> phone": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_temp_store(tmp)
+        phone_watch = _listen(lambda: collection.on_snapshot(phone_listener))
+        laptop_watch = _listen(
+            lambda: firestore_sync.start_realtime_listener(sync_manager._on_remote_turns, "bench", batch=True)
+        )
+        for index in range(rounds):
+            turn = _turns(index + 1, "phone")[index]
+            start = time.perf_counter()
+            _commit(client, [turn])
+            while not local_cache.has_turn(turn["conversation_id"]):
+                time.sleep(0.0005)
+            timings["phone -> laptop"].append(time.perf_counter() - start)
+
+            turn = _turns(index + 1, "bench")[index]
+            seen = seen_by_phone[turn["conversation_id"]] = threading.Event()
+            start = time.perf_counter()
+            sync_manager.upload_turn(turn)
+            seen.wait(600)
+            timings["laptop -> phone"].append(time.perf_counter() - start)
+        phone_watch.unsubscribe()
+        laptop_watch.unsubscribe()
+        sync_manager.get_outbox().stop()
+        local_cache.reset_store()
+        sync_manager._OUTBOX = None
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Firestore sync throughput and two-device convergence.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 5000], help="Turns to sync")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds per fake Firestore round trip")
+    parser.add_argument("--listener-latency", type=float, default=0.01, help="Seconds before a write reaches listeners")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of round trips that fail")
+    parser.add_argument("--rounds", type=int, default=50, help="Turns sent each way in the convergence test")
+    args = parser.parse_args()
+
+    def client() -> FakeFirestore:
+        return FakeFirestore(
+            rpc_latency=args.latency, listener_latency=args.listener_latency, failure_rate=args.failure_rate
+        )
+
+    firestore_sync._is_online = lambda *args, **kwargs: True
+    sync_manager._DEVICE_ID = "bench"
+    print(f"{'turns':>6} {'mode':<16} {'total ms':>9} {'turns/s':>9} {'round trips':>12} {'synced':>7}")
+    for size in args.sizes:
+        for mode in MODES:
+            device = "other-device" if mode in ("download paged", "listener merge") else "bench"
+            elapsed, round_trips, done = _run(mode, _turns(size, device), client())
+            print(
+                f"{size:>6} {mode:<16} {elapsed * 1e3:>9.1f} {done / elapsed:>9.0f} {round_trips:>12} {done:>7}"
+            )
+
+    print()
+    print(f"{'convergence':<16} {'turns':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for direction, seconds in _converge(client(), max(1, args.rounds)).items():
+        ordered = sorted(seconds)
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        print(f"{direction:<16} {len(seconds):>6} {statistics.median(seconds) * 1e3:>8.1f} {p95 * 1e3:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark: time to first audio for LLM replies, whole vs. streamed.
+
+A fake LLM provider streams canned replies of 1, 3 and 8 sentences word by
+word (``--first-token-ms`` before the first word, ``--token-ms`` per word
+after it).  A fake blocking TTS backend takes ``--synth-ms`` plus
+``--synth-ms-per-char`` to synthesize a piece of text, then "plays" it for
+``--play-ms-per-char``.  Both paths go through ``body.speak``:
+
+* ``whole``    -- wait for the complete reply, then ``speak`` it (the old
+  router path);
+* ``streamed`` -- ``speak_stream``: the first sentence is synthesized and
+  played while the rest is still being generated.
+
+Reported: time until the first audio starts playing, and until the reply
+has been spoken in full (medians of ``--repeat`` runs).  Run with:
+
+    python benchmarks/bench_first_audio.py [--token-ms 25] [--synth-ms 150] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import body.speak as speak_module  # noqa: E402
+
+REPLIES = {
+    "1 sentence": "The capital of Australia is Canberra, not Sydney as many people assume.",
+    "3 sentences": (
+        "Black holes form when massive stars collapse at the end of their lives. "
+        "Their gravity is so strong that not even light can escape past the event horizon. "
+        "The nearest known one is about fifteen hundred light years away."
+    ),
+    "8 sentences": (
+        "A good morning routine starts the night before. "
+        "Go to bed at the same time so waking up is easier. "
+        "Drink a glass of water as soon as you are up. "
+        "Spend ten minutes moving, even if it is only a short walk. "
+        "Eat a breakfast with some protein in it. "
+        "Look at your calendar before you open any messages. "
+        "Pick the one task that matters most today. "
+        "Start on it before the day fills up with other things."
+    ),
+}
+
+
+class _FakeBackend:
+    """Blocking TTS: synthesizes, then plays, then returns (like the offline backend)."""
+
+    def __init__(self, synth_s: float, synth_per_char_s: float, play_per_char_s: float) -> None:
+        self._synth_s = synth_s
+        self._synth_per_char_s = synth_per_char_s
+        self._play_per_char_s = play_per_char_s
+        self.first_audio: float | None = None
+
+    def speak(self, text: str) -> None:
+        time.sleep(self._synth_s + self._synth_per_char_s * len(text))
+        if self.first_audio is None:
+            self.first_audio = time.perf_counter()
+        time.sleep(self._play_per_char_s * len(text))
+
+
+def _provider(reply: str, first_token_s: float, token_s: float) -> Iterator[str]:
+    time.sleep(first_token_s)
+    for index, word in enumerate(reply.split(" ")):
+        if index:
+            time.sleep(token_s)
+        yield word if index == 0 else " " + word
+
+
+def _run(mode: str, reply: str, args: argparse.Namespace) -> tuple[float, float]:
+    backend = _FakeBackend(args.synth_ms / 1e3, args.synth_ms_per_char / 1e3, args.play_ms_per_char / 1e3)
+    speak_module._get_backend = lambda: ("fake", backend)
+    deltas = _provider(reply, args.first_token_ms / 1e3, args.token_ms / 1e3)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "whole":
+            speak_module.speak("".join(deltas))
+        else:
+            speak_module.speak_stream(deltas)
+    done = time.perf_counter()
+    return (backend.first_audio or done) - start, done - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark time to first audio for LLM replies.")
+    parser.add_argument("--first-token-ms", type=float, default=400.0, help="Fake provider delay before the first word")
+    parser.add_argument("--token-ms", type=float, default=25.0, help="Fake provider delay per further word")
+    parser.add_argument("--synth-ms", type=float, default=150.0, help="Fake TTS synthesis cost per call")
+    parser.add_argument("--synth-ms-per-char", type=float, default=1.0, help="Fake TTS synthesis cost per character")
+    parser.add_argument("--play-ms-per-char", type=float, default=5.0, help="Fake playback time per character")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per reply and mode (median reported)")
+    args = parser.parse_args()
+
+    original = speak_module._get_backend
+    print(f"{'reply':<12} {'mode':<9} {'first audio ms':>15} {'spoken ms':>10}")
+    try:
+        for label, reply in REPLIES.items():
+            for mode in ("whole", "streamed"):
+                runs = [_run(mode, reply, args) for _ in range(max(1, args.repeat))]
+                first = statistics.median(first for first, _ in runs)
+                done = statistics.median(done for _, done in runs)
+                print(f"{label:<12} {mode:<9} {first * 1e3:>15.0f} {done * 1e3:>10.0f}")
+    finally:
+        speak_module._get_backend = original
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
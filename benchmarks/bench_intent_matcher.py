@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: legacy inline regex cascade vs. the compiled IntentMatcher.
+
+Replays every user utterance from ``tests/dialogue/*.json`` through both
+implementations and reports the mean per-utterance cost. Run with:
+
+    python benchmarks/bench_intent_matcher.py [--repeat 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.legacy_intent_cascade import legacy_regex_fallback_intent  # noqa: E402
+from brain.context import context  # noqa: E402
+from brain.intent_engine import INTENT_MATCHER, _normalize, _regex_fallback_intent  # noqa: E402
+
+SCENARIO_DIR = ROOT / "tests" / "dialogue"
+
+
+def load_utterances(scenario_dir: Path = SCENARIO_DIR) -> list[str]:
+    utterances: list[str] = []
+    for path in sorted(scenario_dir.glob("*.json")):
+        scenario = json.loads(path.read_text(encoding="utf-8"))
+        utterances.extend(turn["user"] for turn in scenario.get("turns", []))
+    return utterances
+
+
+def _time_per_call(func, utterance: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(utterance)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the compiled intent matcher.")
+    parser.add_argument("--repeat", type=int, default=2000, help="Calls per utterance and implementation")
+    args = parser.parse_args()
+
+    context.__init__()
+    utterances = load_utterances()
+    rule_count = len(INTENT_MATCHER.rules)
+
+    print(f"{'utterance':<32} {'legacy µs':>10} {'compiled µs':>12} {'rules run':>10}")
+    legacy_total = compiled_total = 0.0
+    for utterance in utterances:
+        legacy = _time_per_call(legacy_regex_fallback_intent, utterance, args.repeat)
+        compiled = _time_per_call(_regex_fallback_intent, utterance, args.repeat)
+        legacy_total += legacy
+        compiled_total += compiled
+        candidates = len(INTENT_MATCHER.candidates(_normalize(utterance)))
+        print(
+            f"{utterance[:32]:<32} {legacy * 1e6:>10.1f} {compiled * 1e6:>12.1f} "
+            f"{candidates:>4}/{rule_count:<5}"
+        )
+
+    count = max(1, len(utterances))
+    print(
+        f"\nmean per utterance: legacy {legacy_total / count * 1e6:.1f} µs, "
+        f"compiled {compiled_total / count * 1e6:.1f} µs "
+        f"({legacy_total / max(compiled_total, 1e-12):.2f}x)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Benchmark: memory I/O per command, JSON cache file vs. the SQLite store.
+
+Replays the memory calls one chat command makes in ``brain.process_text``:
+
+    set_working_memory -> get_nlu_context -> set_working_memory
+    -> add_turn (+ sync metadata update) -> clear_working_memory
+
+against two backends seeded with the same realistic cache (20 turns, 40
+history messages, a 3 KB summary, a profile):
+
+* ``json``    -- the previous ``cache.json`` code path, reproduced inline: every
+  call parses the whole file and rewrites it with ``indent=2``;
+* ``sqlite``  -- ``memory.conversation`` on the write-back cache over the
+  WAL-mode ``MemoryStore``; flushes run on the background debounce timer;
+* ``flushed`` -- the same, with an explicit ``flush()`` ending every command
+  (the cost if every command were written through to disk).
+
+Everything happens in a temporary directory; Firestore uploads are disabled.
+Run with:
+
+    python benchmarks/bench_memory_io.py [--commands 300]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from threading import Lock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import memory.conversation as conversation  # noqa: E402
+import memory.local_cache as local_cache  # noqa: E402
+import memory.sync_manager as sync_manager  # noqa: E402
+
+
+def seed_cache() -> dict:
+    turns = [
+        {
+            "user_text": f"tell me about topic {i}",
+            "assistant_text": "Here is a fairly typical two sentence answer. " * 3,
+            "time": f"2026-01-01T10:{i:02d}:00",
+            "timestamp": f"2026-01-01T10:{i:02d}:00",
+            "conversation_id": f"seed{i:04d}",
+            "device_id": "bench",
+            "metadata": {"user": {"intent": "chat", "confidence": 0.9}, "assistant": {"intent": "chat"}},
+        }
+        for i in range(20)
+    ]
+    history = []
+    for turn in turns:
+        history.append({"role": "user", "text": turn["user_text"], "time": turn["time"], "metadata": {"intent": "chat"}})
+        history.append({"role": "assistant", "text": turn["assistant_text"], "time": turn["time"]})
+    return {
+        "user_profile": {"name": "Tony", "updated_at": "2026-01-01T00:00:00"},
+        "working_memory": {},
+        "conversation_history": history,
+        "conversation_turns": turns,
+        "conversation_summary": "Older user requests included: something. " * 75,
+    }
+
+
+class JsonBackend:
+    """The pre-SQLite read-modify-write cycle over cache.json and sync.json."""
+
+    def __init__(self, directory: Path, seed: dict) -> None:
+        self.cache = directory / "cache.json"
+        self.sync = directory / "sync.json"
+        self.lock = Lock()
+        self._write(self.cache, seed)
+        self._write(self.sync, {"device_id": "bench"})
+
+    def _read(self, path: Path) -> dict:
+        with self.lock:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+    def _write(self, path: Path, data: dict) -> None:
+        with self.lock:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+
+    def set_working_memory(self, **kwargs) -> None:
+        data = self._read(self.cache)
+        working = data.get("working_memory", {})
+        working.update(kwargs)
+        working["updated_at"] = conversation._now()
+        data["working_memory"] = working
+        self._write(self.cache, data)
+
+    def get_nlu_context(self) -> dict:
+        data = self._read(self.cache)
+        recent = self._read(self.cache).get("conversation_turns", [])[-6:]
+        return {
+            "summary": data.get("conversation_summary", ""),
+            "recent_turns": recent,
+            "working_memory": data.get("working_memory", {}),
+            "preferences": data.get("user_profile", {}),
+        }
+
+    def add_turn(self, user_text: str, assistant_text: str) -> None:
+        data = self._read(self.cache)
+        timestamp = conversation._now()
+        turn = {"user_text": user_text, "assistant_text": assistant_text, "time": timestamp, "metadata": {}}
+        data["conversation_turns"] = (data.get("conversation_turns", []) + [turn])[-20:]
+        history = data.get("conversation_history", [])
+        history += [{"role": "user", "text": user_text, "time": timestamp}, {"role": "assistant", "text": assistant_text, "time": timestamp}]
+        data["conversation_history"] = history[-40:]
+        self._write(self.cache, data)
+        metadata = self._read(self.sync)
+        metadata["last_sync_time"] = timestamp
+        self._write(self.sync, metadata)
+
+    def clear_working_memory(self) -> None:
+        data = self._read(self.cache)
+        data["working_memory"] = {}
+        self._write(self.cache, data)
+
+
+class SqliteBackend:
+    def __init__(self, directory: Path, seed: dict) -> None:
+        (directory / "cache.json").write_text(json.dumps(seed), encoding="utf-8")
+        local_cache.DB_FILE = str(directory / "memory.db")
+        local_cache.CACHE_FILE = str(directory / "cache.json")
+        local_cache.SYNC_FILE = str(directory / "sync.json")
+        local_cache.JOURNAL_DIR = str(directory / "journal")
+        local_cache.reset_store()
+        # Uploads would need Firestore; keep only the local sync metadata update.
+        conversation.push_conversation_turn = self._record_upload
+        local_cache.get_store()
+
+    @staticmethod
+    def _record_upload(turn: dict) -> None:
+        metadata = local_cache.load_sync_metadata()
+        metadata["last_sync_time"] = turn["timestamp"]
+        local_cache.save_sync_metadata(metadata)
+
+    set_working_memory = staticmethod(conversation.set_working_memory)
+    get_nlu_context = staticmethod(conversation.get_nlu_context)
+    clear_working_memory = staticmethod(conversation.clear_working_memory)
+
+    @staticmethod
+    def add_turn(user_text: str, assistant_text: str) -> None:
+        conversation.add_turn(
+            user_text, assistant_text, user_metadata={"intent": "chat"}, assistant_metadata={"intent": "chat"}
+        )
+
+
+class FlushedBackend(SqliteBackend):
+    @staticmethod
+    def clear_working_memory() -> None:
+        conversation.clear_working_memory()
+        local_cache.flush()
+
+
+def run_command(backend, index: int) -> float:
+    start = time.perf_counter()
+    backend.set_working_memory(current_task={"mode": "text", "input": f"question {index}", "status": "nlu"})
+    backend.get_nlu_context()
+    backend.set_working_memory(current_task={"mode": "text", "input": f"question {index}", "status": "routing"})
+    backend.add_turn(f"question {index}", "An answer of a sentence or two. " * 3)
+    backend.clear_working_memory()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-command memory I/O.")
+    parser.add_argument("--commands", type=int, default=300, help="Commands replayed per backend")
+    args = parser.parse_args()
+
+    sync_manager._DEVICE_ID = "bench"
+    seed = seed_cache()
+    print(f"{'backend':>8} {'p50 ms':>8} {'p95 ms':>8} {'total s':>8}")
+    for name, factory in (("json", JsonBackend), ("sqlite", SqliteBackend), ("flushed", FlushedBackend)):
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = factory(Path(tmp), seed)
+            samples = sorted(run_command(backend, index) for index in range(args.commands))
+            local_cache.reset_store()
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{name:>8} {statistics.median(samples) * 1e3:>8.2f} {p95 * 1e3:>8.2f} {sum(samples):>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark: per-turn write cost as the conversation grows.
+
+Calls ``memory.conversation.add_turn`` for ``--turns`` turns (Firestore
+uploads disabled) in a temporary directory and reports the mean cost of each
+block of turns, plus what the background compactor folded into the summary.
+With the append-only journal the cost should stay flat however long the
+conversation has run.  Run with:
+
+    python benchmarks/bench_turn_journal.py [--turns 10000] [--block 1000] [--fsync]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import memory.conversation as conversation  # noqa: E402
+import memory.local_cache as local_cache  # noqa: E402
+import memory.sync_manager as sync_manager  # noqa: E402
+from memory.journal import TurnJournal  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark conversation turn writes.")
+    parser.add_argument("--turns", type=int, default=10000, help="Turns written in total")
+    parser.add_argument("--block", type=int, default=1000, help="Turns per reported block")
+    parser.add_argument("--fsync", action="store_true", help="fsync every journal line")
+    args = parser.parse_args()
+
+    sync_manager._DEVICE_ID = "bench"
+    conversation.push_conversation_turn = lambda turn: None
+    with tempfile.TemporaryDirectory() as tmp:
+        local_cache.DB_FILE = str(Path(tmp) / "memory.db")
+        local_cache.CACHE_FILE = str(Path(tmp) / "cache.json")
+        local_cache.SYNC_FILE = str(Path(tmp) / "sync.json")
+        local_cache.JOURNAL_DIR = str(Path(tmp) / "journal")
+        local_cache.reset_store()
+        if args.fsync:
+            local_cache._journal = TurnJournal(
+                local_cache.JOURNAL_DIR,
+                tail_size=local_cache.MAX_CONVERSATION_TURNS,
+                on_fold=local_cache._fold_into_summary,
+                fsync=True,
+            )
+
+        print(f"{'turns':>8} {'µs/turn':>9}")
+        written = 0
+        while written < args.turns:
+            block = min(args.block, args.turns - written)
+            start = time.perf_counter()
+            for index in range(written, written + block):
+                conversation.add_turn(
+                    f"question {index}", "An answer of a sentence or two.", user_metadata={"intent": "chat"}
+                )
+            elapsed = time.perf_counter() - start
+            written += block
+            print(f"{written:>8} {elapsed / block * 1e6:>9.0f}")
+
+        journal = local_cache.get_journal()
+        journal.compact()
+        segments = len(list(Path(local_cache.JOURNAL_DIR).glob("turns-*.jsonl")))
+        print(f"segments on disk: {segments}, summary chars: {len(conversation.get_summary())}")
+        local_cache.reset_store()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark: merging pulled remote turns, one by one vs. batched.
+
+Feeds ``--sizes`` turns from another device (already in timestamp order, as
+``pull_new_conversation_turns`` returns them, with a few duplicates mixed in)
+to ``memory.sync_manager`` in two ways:
+
+* ``per-turn`` -- ``merge_turn`` for each turn: a journal write and a sync
+  metadata update per turn (the old ``download_latest`` loop);
+* ``batched``  -- one ``merge_turns`` call: one journal write, one metadata
+  update.
+
+Each run starts from an empty temporary directory and ends with the store
+flushed to disk.  Run with:
+
+    python benchmarks/bench_turn_merge.py [--sizes 10 200 5000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import memory.local_cache as local_cache  # noqa: E402
+import memory.sync_manager as sync_manager  # noqa: E402
+
+
+def _remote_turns(count: int) -> list[dict]:
+    turns = [
+        {
+            "conversation_id": f"remote-{index}",
+            "user_text": f"question {index}",
+            "assistant_text": "An answer of a sentence or two.",
+            "timestamp": f"2026-01-01T{index // 3600 % 24:02d}:{index // 60 % 60:02d}:{index % 60:02d}+00:00",
+            "device_id": "other-device",
+            "metadata": {"user": {"intent": "chat"}, "assistant": {"intent": "chat", "status": "success"}},
+        }
+        for index in range(count)
+    ]
+    return turns + turns[: max(1, count // 20)]
+
+
+def _run(mode: str, turns: list[dict]) -> tuple[float, int]:
+    saves = 0
+    save = sync_manager.save_sync_metadata
+
+    def counting_save(metadata: dict) -> None:
+        nonlocal saves
+        saves += 1
+        save(metadata)
+
+    sync_manager.save_sync_metadata = counting_save
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            local_cache.DB_FILE = str(Path(tmp) / "memory.db")
+            local_cache.CACHE_FILE = str(Path(tmp) / "cache.json")
+            local_cache.SYNC_FILE = str(Path(tmp) / "sync.json")
+            local_cache.JOURNAL_DIR = str(Path(tmp) / "journal")
+            local_cache.reset_store()
+            local_cache.get_journal()
+
+            start = time.perf_counter()
+            if mode == "per-turn":
+                for turn in turns:
+                    sync_manager.merge_turn(turn)
+            else:
+                sync_manager.merge_turns(turns)
+            local_cache.flush()
+            elapsed = time.perf_counter() - start
+            local_cache.reset_store()
+    finally:
+        sync_manager.save_sync_metadata = save
+    return elapsed, saves
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark merging remote turns.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 200, 5000], help="Unique turns per merge")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size and mode (median reported)")
+    args = parser.parse_args()
+
+    sync_manager._DEVICE_ID = "bench"
+    print(f"{'turns':>6} {'mode':<9} {'total ms':>9} {'µs/turn':>8} {'metadata writes':>16}")
+    for size in args.sizes:
+        turns = _remote_turns(size)
+        for mode in ("per-turn", "batched"):
+            runs = [_run(mode, turns) for _ in range(max(1, args.repeat))]
+            elapsed = statistics.median(seconds for seconds, _ in runs)
+            saves = runs[0][1]
+            print(f"{size:>6} {mode:<9} {elapsed * 1e3:>9.2f} {elapsed / len(turns) * 1e6:>8.1f} {saves:>16}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
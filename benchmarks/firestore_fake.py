@@ -0,0 +1,388 @@
+"""In-process stand-in for the part of the Firestore client the sync layer uses.
+
+Documents live in a dict keyed by collection path.  Every round trip the real
+client would make (``DocumentReference.set``, ``WriteBatch.commit``,
+``Query.stream``) sleeps for ``rpc_latency`` seconds, so batching and paging
+show up in timings the way they would against the service.  Install it with
+``firestore_sync.install_client(FakeFirestore(), fake_firestore_module)``.
+
+``Query.on_snapshot`` works like the real listener: the callback first gets
+every matching document as ``ADDED``, then one call per committed write
+(a ``set`` or a whole batch) with the documents it changed, on a background
+thread and ``listener_latency`` seconds after the write.
+
+Failures are injected per round trip: ``failure_rate`` fails that fraction
+of them at random (seeded), ``fail_next(n, after=k)`` fails ``n`` of them
+once the next ``k`` have succeeded.  A failed round trip raises
+``ServiceUnavailable`` and writes nothing.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import time
+from collections.abc import Callable
+from copy import deepcopy
+from datetime import datetime, timezone
+from enum import Enum
+from threading import Condition, RLock, Thread
+from types import SimpleNamespace
+from typing import Any
+
+SERVER_TIMESTAMP = object()
+ASCENDING = "ASCENDING"
+DESCENDING = "DESCENDING"
+
+# Stands in for ``firebase_admin.firestore`` (the constants firestore_sync reads).
+fake_firestore_module = SimpleNamespace(
+    SERVER_TIMESTAMP=SERVER_TIMESTAMP,
+    Query=SimpleNamespace(ASCENDING=ASCENDING, DESCENDING=DESCENDING),
+)
+
+
+class ServiceUnavailable(Exception):
+    """Raised by an injected failure, like ``google.api_core.exceptions.ServiceUnavailable``."""
+
+
+class ChangeType(Enum):
+    ADDED = 1
+    REMOVED = 2
+    MODIFIED = 3
+
+
+class DocumentSnapshot:
+    def __init__(self, reference: DocumentReference, data: dict[str, Any] | None) -> None:
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> dict[str, Any] | None:
+        return deepcopy(self._data)
+
+    def get(self, field: str) -> Any:
+        return (self._data or {}).get(field)
+
+
+class DocumentReference:
+    def __init__(self, client: FakeFirestore, path: str) -> None:
+        self._client = client
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name: str) -> CollectionReference:
+        return CollectionReference(self._client, f"{self.path}/{name}")
+
+    def set(self, data: dict[str, Any], merge: bool = False) -> None:
+        self._client._round_trip()
+        self._client._write([(self, data, merge)])
+
+    def get(self) -> DocumentSnapshot:
+        self._client._round_trip()
+        return DocumentSnapshot(self, self._client._read(self.path))
+
+
+class Query:
+    def __init__(
+        self,
+        client: FakeFirestore,
+        path: str,
+        *,
+        filters: tuple[tuple[str, str, Any], ...] = (),
+        order: tuple[tuple[str, str], ...] = (),
+        limit: int | None = None,
+        cursor: DocumentSnapshot | None = None,
+    ) -> None:
+        self._client = client
+        self._path = path
+        self._filters = filters
+        self._order = order
+        self._limit = limit
+        self._cursor = cursor
+
+    def _copy(self, **changes: Any) -> Query:
+        values = {
+            "filters": self._filters,
+            "order": self._order,
+            "limit": self._limit,
+            "cursor": self._cursor,
+        }
+        values.update(changes)
+        return Query(self._client, self._path, **values)
+
+    def where(self, field: str, op: str, value: Any) -> Query:
+        if op not in _OPERATORS:
+            raise ValueError(f"unsupported operator: {op!r}")
+        return self._copy(filters=self._filters + ((field, op, value),))
+
+    def order_by(self, field: str, direction: str = ASCENDING) -> Query:
+        return self._copy(order=self._order + ((field, direction),))
+
+    def limit(self, count: int) -> Query:
+        return self._copy(limit=count)
+
+    def start_after(self, snapshot: DocumentSnapshot) -> Query:
+        return self._copy(cursor=snapshot)
+
+    def _sort_key(self, doc_id: str, data: dict[str, Any]) -> tuple:
+        # Ties are broken by document id, as Firestore does.
+        return tuple(_Ordered(data.get(field), direction) for field, direction in self._order) + (doc_id,)
+
+    def _matches(self, data: dict[str, Any]) -> bool:
+        for field, op, value in self._filters:
+            if field not in data or not _OPERATORS[op](data[field], value):
+                return False
+        return True
+
+    def _run(self) -> list[DocumentSnapshot]:
+        documents = [
+            (doc_id, data) for doc_id, data in self._client._documents(self._path) if self._matches(data)
+        ]
+        documents.sort(key=lambda item: self._sort_key(*item))
+        if self._cursor is not None:
+            after = self._sort_key(self._cursor.id, self._cursor._data or {})
+            documents = [item for item in documents if self._sort_key(*item) > after]
+        if self._limit is not None:
+            documents = documents[: self._limit]
+        return [
+            DocumentSnapshot(DocumentReference(self._client, f"{self._path}/{doc_id}"), deepcopy(data))
+            for doc_id, data in documents
+        ]
+
+    def stream(self):
+        self._client._round_trip()
+        return iter(self._run())
+
+    def get(self) -> list[DocumentSnapshot]:
+        return list(self.stream())
+
+    def on_snapshot(self, callback: SnapshotCallback) -> Watch:
+        """Call ``callback(snapshots, changes, read_time)`` now and after every matching write."""
+        self._client._round_trip()
+        watch = Watch(self, callback)
+        self._client._watch(watch)
+        return watch
+
+
+class DocumentChange:
+    def __init__(self, change_type: ChangeType, document: DocumentSnapshot) -> None:
+        self.type = change_type
+        self.document = document
+
+
+SnapshotCallback = Callable[[list[DocumentSnapshot], list[DocumentChange], datetime], None]
+
+
+class Watch:
+    def __init__(self, query: Query, callback: SnapshotCallback) -> None:
+        self._query = query
+        self._callback = callback
+        self.active = True
+
+    def unsubscribe(self) -> None:
+        self.active = False
+        self._query._client._unwatch(self)
+
+    def _changes(self, written: list[tuple[str, str, bool]]) -> list[DocumentChange]:
+        changes = []
+        for collection, doc_id, existed in written:
+            if collection != self._query._path:
+                continue
+            data = self._query._client._read(f"{collection}/{doc_id}")
+            if data is None or not self._query._matches(data):
+                continue
+            reference = DocumentReference(self._query._client, f"{collection}/{doc_id}")
+            change_type = ChangeType.MODIFIED if existed else ChangeType.ADDED
+            changes.append(DocumentChange(change_type, DocumentSnapshot(reference, data)))
+        return changes
+
+    def _deliver(self, changes: list[DocumentChange]) -> None:
+        if not self.active:
+            return
+        try:
+            self._callback(self._query._run(), changes, datetime.now(timezone.utc))
+        except Exception as exc:
+            print("[FAKE FIRESTORE LISTENER ERROR]", exc)
+
+
+class CollectionReference(Query):
+    def __init__(self, client: FakeFirestore, path: str) -> None:
+        super().__init__(client, path)
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, document_id: str) -> DocumentReference:
+        return DocumentReference(self._client, f"{self._path}/{document_id}")
+
+
+class WriteBatch:
+    def __init__(self, client: FakeFirestore) -> None:
+        self._client = client
+        self._writes: list[tuple[DocumentReference, dict[str, Any], bool]] = []
+
+    def set(self, reference: DocumentReference, data: dict[str, Any], merge: bool = False) -> None:
+        self._writes.append((reference, data, merge))
+
+    def commit(self) -> None:
+        if len(self._writes) > FakeFirestore.MAX_BATCH_WRITES:
+            raise ValueError(f"a batch holds at most {FakeFirestore.MAX_BATCH_WRITES} writes")
+        self._client._round_trip()
+        self._client._write(self._writes)
+        self._writes = []
+
+
+class FakeFirestore:
+    MAX_BATCH_WRITES = 500
+
+    def __init__(
+        self,
+        *,
+        rpc_latency: float = 0.0,
+        listener_latency: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.rpc_latency = rpc_latency
+        self.listener_latency = listener_latency
+        self.failure_rate = failure_rate
+        self.round_trips = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._fail_next = 0
+        self._fail_after = 0
+        self._lock = RLock()
+        # collection path -> {document id: data}
+        self._collections: dict[str, dict[str, dict[str, Any]]] = {}
+        self._watches: list[Watch] = []
+        # (due time, sequence, watch, changes), delivered in order by one thread
+        self._deliveries: list[tuple[float, int, Watch, list[DocumentChange]]] = []
+        self._delivery_seq = itertools.count()
+        self._delivery_ready = Condition(self._lock)
+        self._dispatcher: Thread | None = None
+
+    def collection(self, name: str) -> CollectionReference:
+        return CollectionReference(self, name)
+
+    def batch(self) -> WriteBatch:
+        return WriteBatch(self)
+
+    def fail_next(self, count: int = 1, *, after: int = 0) -> None:
+        """Fail ``count`` round trips, once ``after`` more have succeeded."""
+        with self._lock:
+            self._fail_after = after
+            self._fail_next += count
+
+    def _round_trip(self) -> None:
+        with self._lock:
+            self.round_trips += 1
+            if self._fail_next > 0 and self._fail_after > 0:
+                self._fail_after -= 1
+                fail = False
+            else:
+                fail = self._fail_next > 0 or (self.failure_rate > 0 and self._random.random() < self.failure_rate)
+            if fail:
+                self._fail_next = max(0, self._fail_next - 1)
+                self.failures += 1
+        if self.rpc_latency > 0:
+            time.sleep(self.rpc_latency)
+        if fail:
+            raise ServiceUnavailable("injected failure")
+
+    def _write(self, writes: list[tuple[DocumentReference, dict[str, Any], bool]]) -> None:
+        now = datetime.now(timezone.utc)
+        written: list[tuple[str, str, bool]] = []
+        with self._lock:
+            for reference, data, merge in writes:
+                collection, doc_id = reference.path.rsplit("/", 1)
+                values = {key: now if value is SERVER_TIMESTAMP else deepcopy(value) for key, value in data.items()}
+                documents = self._collections.setdefault(collection, {})
+                existed = doc_id in documents
+                if merge and existed:
+                    documents[doc_id].update(values)
+                else:
+                    documents[doc_id] = values
+                written.append((collection, doc_id, existed))
+            for watch in self._watches:
+                changes = watch._changes(written)
+                if changes:
+                    self._schedule(watch, changes)
+
+    def _read(self, path: str) -> dict[str, Any] | None:
+        collection, doc_id = path.rsplit("/", 1)
+        with self._lock:
+            data = self._collections.get(collection, {}).get(doc_id)
+            return deepcopy(data)
+
+    def _documents(self, collection: str) -> list[tuple[str, dict[str, Any]]]:
+        with self._lock:
+            return list(self._collections.get(collection, {}).items())
+
+    # =========================
+    # LISTENERS
+    # =========================
+    def _watch(self, watch: Watch) -> None:
+        with self._lock:
+            self._watches.append(watch)
+            initial = [DocumentChange(ChangeType.ADDED, snapshot) for snapshot in watch._query._run()]
+            self._schedule(watch, initial)
+
+    def _unwatch(self, watch: Watch) -> None:
+        with self._lock:
+            if watch in self._watches:
+                self._watches.remove(watch)
+
+    def _schedule(self, watch: Watch, changes: list[DocumentChange]) -> None:
+        # Called with the lock held.
+        due = time.monotonic() + self.listener_latency
+        heapq.heappush(self._deliveries, (due, next(self._delivery_seq), watch, changes))
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = Thread(target=self._dispatch, name="fake-firestore-listeners", daemon=True)
+            self._dispatcher.start()
+        self._delivery_ready.notify()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._lock:
+                while not self._deliveries or self._deliveries[0][0] > time.monotonic():
+                    timeout = self._deliveries[0][0] - time.monotonic() if self._deliveries else None
+                    self._delivery_ready.wait(timeout)
+                _, _, watch, changes = heapq.heappop(self._deliveries)
+            watch._deliver(changes)
+
+
+class _Ordered:
+    """Sort key for one order_by field; missing values sort first, as in Firestore."""
+
+    __slots__ = ("value", "descending")
+
+    def __init__(self, value: Any, direction: str) -> None:
+        self.value = value
+        self.descending = direction == DESCENDING
+
+    def _key(self) -> tuple[bool, Any]:
+        return (self.value is not None, self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Ordered) and self._key() == other._key()
+
+    def __lt__(self, other: _Ordered) -> bool:
+        if self.descending:
+            return other._key() < self._key()
+        return self._key() < other._key()
+
+    def __gt__(self, other: _Ordered) -> bool:
+        return other < self
+
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
@@ -0,0 +1,453 @@
+"""Frozen copy of the inline regex cascade that preceded ``IntentMatcher``.
+
+Kept only as the "before" side of ``bench_intent_matcher.py`` and as the parity
+reference for ``tests/test_intent_matcher.py``.  Do not extend it; new rules go
+into the rule table in ``brain/intent_engine.py``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from brain.context import context
+from brain.intent_engine import (
+    _BRIGHTNESS_LEVEL_QUERY,
+    _MOODS,
+    _VOLUME_LEVEL_QUERY,
+    _clamp_level,
+    _extract_app_name,
+    _first_crypto_coin_mention,
+    _intent,
+    _is_explanatory_chat,
+    _normalize,
+    _resolve_active_domain_followup,
+    _resolve_temporal_slots,
+    _try_dictionary_intent,
+    _unknown_intent,
+)
+
+
+def legacy_regex_fallback_intent(text: str) -> dict[str, Any] | None:
+
+    if not text or not text.strip():
+        return _unknown_intent()
+
+    raw_text = text.strip()
+    normalized = _normalize(raw_text)
+
+    follow = _resolve_active_domain_followup(raw_text, normalized)
+    if follow is not None:
+        return follow
+
+    # =========================
+    # EXIT
+    # =========================
+    if re.fullmatch(r"(?:exit|quit|shutdown|bye|goodbye|close jarvis)", normalized):
+        return _intent("exit", raw_text, normalized, 1.0)
+
+    # =========================
+    # GREETING
+    # =========================
+    if re.fullmatch(r"(?:hey|hi|hello|hey jarvis|hi jarvis|hello jarvis)", normalized):
+        return _intent("greeting", raw_text, normalized, 0.98)
+
+    # =========================
+    # TIME QUERY
+    # =========================
+    if re.search(
+        r"\b("
+        r"what\s+time\s+is\s+it|what\s+is\s+the\s+time|what\s+s\s+the\s+time|"
+        r"tell\s+me\s+the\s+time|current\s+time|time\s+now"
+        r")\b",
+        normalized,
+    ):
+        return _intent("get_time", raw_text, normalized, 0.96, **_resolve_temporal_slots(raw_text))
+
+    # =========================
+    # DATE QUERY
+    # =========================
+    if re.search(
+        r"\b("
+        r"what\s+date\s+is\s+it|what\s+is\s+the\s+date|what\s+is\s+today\s+s\s+date|"
+        r"today\s+s\s+date|today'?s\s+date|current\s+date|date\s+today|"
+        r"what\s+day\s+is\s+it|what\s+is\s+today\s+day|today\s+day|"
+        r"date\s+tomorrow|what\s+is\s+tomorrow|tomorrow\s+date|tomorrow\s+day|"
+        r"day\s+after\s+tomorrow|next\s+week|next\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)|"
+        r"tommorow|tomarow|tomarrows|tomorrows|todays\s+day"
+        r")\b",
+        normalized,
+    ) and not re.search(r"\b(weather|temperature|forecast|humidity|climate)\b", normalized):
+        return _intent("get_date", raw_text, normalized, 0.96, **_resolve_temporal_slots(raw_text))
+
+    # =========================
+    # ADVICE TIME
+    # =========================
+    if re.search(r"\b(best time|good time|ideal time|when should i)\b", normalized):
+        return _intent("advice_time", raw_text, normalized, 0.84, topic=raw_text)
+
+    # =========================
+    # TIMEZONE CONVERSION
+    # e.g. "convert 5pm IST to UTC"
+    # =========================
+    if re.search(r"\b(convert|change)\b.*(time|timezone|zone)\b", normalized) or \
+       re.search(r"\b(ist|utc|gmt|pst|est|cst)\b.*\bto\b.*\b(ist|utc|gmt|pst|est|cst)\b", normalized):
+        return _intent("convert_timezone", raw_text, normalized, 0.85, query=raw_text)
+    
+    # =========================
+    # WEATHER
+    # =========================
+
+    if re.search(
+        r"\b(weather|temperature|forecast|humidity|climate)\b",
+        normalized
+    ):
+        # Remove filler words
+        cleaned = re.sub(
+            r"\b(today|todays|tomorrow|current|now|please|tell me|what is|whats|show)\b",
+            "",
+            normalized
+        ).strip()
+
+        city = None
+
+        # weather in pune
+        match = re.search(r"\b(?:in|for|at)\s+([a-z ]+)", cleaned)
+        if match:
+            city = match.group(1).strip()
+
+        # remove extra weather-related words accidentally captured
+        if city:
+            city = re.sub(
+                r"\b(weather|temperature|forecast|humidity|climate)\b",
+                "",
+                city
+            ).strip()
+
+        return _intent(
+            "get_weather",
+            raw_text,
+            normalized,
+            0.95,
+            city=city
+        )
+    # =========================
+    # NEWS
+    # e.g. "latest news", "show me tech news"
+    # =========================
+    if re.search(r"\b(news|headlines|top stories|latest updates)\b", normalized):
+        category = "general"
+        for cat in ["business", "entertainment", "health", "science", "sports", "technology"]:
+            if cat in normalized:
+                category = cat
+                break
+        return _intent("get_news", raw_text, normalized, 0.91, category=category)
+
+    # =========================
+    # CRYPTO PRICE
+    # e.g. "bitcoin price", "ethereum in inr"
+    # Short tickers (eth, btc, doge) must be word-boundary — avoid "eth" in "something".
+    # =========================
+    coin_match = _first_crypto_coin_mention(normalized)
+    if coin_match is None and re.search(r"\b(crypto|coin)\b", normalized):
+        coin_match = "bitcoin"
+    if coin_match:
+        currency = "inr"
+        for cur in ["usd", "eur", "inr"]:
+            if cur in normalized:
+                currency = cur
+                break
+        return _intent("get_crypto_price", raw_text, normalized, 0.92,
+                       symbol=coin_match, currency=currency)
+
+    # =========================
+    # CRYPTO PRICE ALERT
+    # e.g. "alert me when bitcoin goes above 5000000"
+    # =========================
+    if re.search(r"\b(alert|notify|tell me)\b.*(price|bitcoin|ethereum|crypto)\b", normalized) or \
+       re.search(r"\b(price alert|when .+ (above|below|reaches))\b", normalized):
+        direction = "below" if "below" in normalized else "above"
+        price_match = re.search(r"(\d+)", normalized)
+        target = int(price_match.group(1)) if price_match else None
+        return _intent("check_price_alert", raw_text, normalized, 0.87,
+                       direction=direction, target_price=target)
+
+    # =========================
+    # SCHEDULE TASK / REMINDER
+    # e.g. "remind me in 10 seconds", "schedule after 5 minutes"
+    # =========================
+    if re.search(r"\b(remind|reminder|schedule|set timer|after|in)\b.*(second|minute|hour)\b", normalized):
+        delay = 0
+        num_match = re.search(r"(\d+)\s*(second|minute|hour)", normalized)
+        if num_match:
+            val = int(num_match.group(1))
+            unit = num_match.group(2)
+            delay = val * (60 if unit == "minute" else 3600 if unit == "hour" else 1)
+        return _intent("schedule_task", raw_text, normalized, 0.88, delay_seconds=delay, query=raw_text)
+
+    # =========================
+    # YOUTUBE PLAY
+    # e.g. "play despacito on youtube"
+    # =========================
+    if re.search(r"\b(play|open|watch)\b.*(youtube|yt)\b", normalized) or \
+       re.search(r"\byoutube\b.*\b(play|open|watch)\b", normalized):
+        query_match = re.sub(r"\b(play|open|watch|youtube|yt|video|on)\b", "", normalized).strip()
+        return _intent("play_youtube", raw_text, normalized, 0.92, video=query_match)
+
+    # =========================
+    # YOUTUBE SEARCH
+    # e.g. "search youtube for lofi music"
+    # =========================
+    if re.search(r"\b(search|find|look up)\b.*(youtube|yt)\b", normalized) or \
+       re.search(r"\byoutube\b.*\b(search|find)\b", normalized):
+        query_match = re.sub(r"\b(search|find|look up|youtube|yt|for)\b", "", normalized).strip()
+        return _intent("search_youtube", raw_text, normalized, 0.92, query=query_match)
+
+    # =========================
+    # DICTIONARY (single-token only; after YouTube so "look up … on youtube" is not a word lookup)
+    # =========================
+    dict_hit = _try_dictionary_intent(raw_text, normalized)
+    if dict_hit:
+        return dict_hit
+
+    # =========================
+    # PLAY MUSIC
+    # =========================
+
+    # PLAY MUSIC
+    if re.search(r"\b(play|start|resume)\b.*\b(music|song|songs|playlist|audio)\b", normalized):
+        return _intent("play_music", raw_text, normalized, 0.91)
+
+    # STOP MUSIC
+    if re.search(r"\b(stop|pause)\b.*\b(music|song|songs|playlist|audio)\b", normalized):
+        return _intent("stop_music", raw_text, normalized, 0.91)
+
+    # RESUME MUSIC
+    if re.search(r"\b(resume|continue|unpause)\b.*\b(music|song|play)\b", normalized):
+        return _intent("resume_music", raw_text, normalized, 0.92)
+
+    # NEXT TRACK
+    if re.search(r"\b(next|skip|next song|next track)\b", normalized):
+        return _intent("next_track", raw_text, normalized, 0.92)
+
+    # PREVIOUS TRACK
+    if re.search(r"\b(previous|prev|last song|go back|previous track)\b", normalized):
+        return _intent("previous_track", raw_text, normalized, 0.92)
+
+    # PLAY BY MOOD
+    if any(mood in normalized for mood in _MOODS):
+        mood_match = next((m for m in _MOODS if m in normalized), None)
+        return _intent("play_by_mood", raw_text, normalized, 0.91, mood=mood_match)
+
+    # STOP MUSIC
+    
+    if re.search(r"\b(stop|pause)\b.*\b(music|song|songs|playlist|audio)\b", normalized):
+        return _intent("stop_music", raw_text, normalized, 0.91)
+    
+    # PLAY ARTIST
+    
+    if re.search(r"\b(play|put on)\b.*\b(by|songs by|music by)\b", normalized):
+        artist_match = re.sub(r"\b(play|put on|songs|music|by)\b", "", normalized).strip()
+        return _intent("play_artist", raw_text, normalized, 0.90, artist=artist_match)
+
+    # PLAY PLAYLIST OR GENRE
+
+    if re.search(r"\bplaylist\b", normalized):
+        genre = re.sub(r"\b(play|playlist|music|songs|jarvis)\b", "", normalized).strip()
+        return _intent("play_playlist", raw_text, normalized, 0.90, genre=genre)
+
+    # =========================
+    # OPEN APP
+    # =========================
+    app_name = _extract_app_name(normalized)
+    if app_name:
+        post_actions: list[str] = []
+        if "maximize" in normalized:
+            post_actions.append("maximize")
+        if "minimize" in normalized:
+            post_actions.append("minimize")
+        return _intent("open_app", raw_text, normalized, 0.90, app=app_name, post_actions=post_actions)
+
+    # =========================
+    # GET VOLUME / GET BRIGHTNESS (current level)
+    # =========================
+    if _VOLUME_LEVEL_QUERY.search(normalized):
+        return _intent("get_volume", raw_text, normalized, 0.94)
+    if _BRIGHTNESS_LEVEL_QUERY.search(normalized):
+        return _intent("get_brightness", raw_text, normalized, 0.94)
+
+    # =========================
+    # VOLUME STEP
+    # =========================
+    if re.search(
+        r"\b(volume\s+up|increase\s+volume|turn\s+up\s+(the\s+)?volume|louder|more\s+volume)\b",
+        normalized,
+    ):
+        return _intent("volume_up", raw_text, normalized, 0.93)
+    if re.search(
+        r"\b(volume\s+down|decrease\s+volume|turn\s+down\s+(the\s+)?volume|quieter|less\s+volume)\b",
+        normalized,
+    ):
+        return _intent("volume_down", raw_text, normalized, 0.93)
+
+    # =========================
+    # BRIGHTNESS STEP
+    # =========================
+    if re.search(
+        r"\b(brightness\s+up|increase\s+brightness|brighter|more\s+brightness)\b",
+        normalized,
+    ):
+        return _intent("brightness_up", raw_text, normalized, 0.93)
+    if re.search(
+        r"\b(brightness\s+down|decrease\s+brightness|dimmer|less\s+brightness)\b",
+        normalized,
+    ):
+        return _intent("brightness_down", raw_text, normalized, 0.93)
+
+    # =========================
+    # SET BRIGHTNESS / SET VOLUME (same names as system/router.py)
+    # =========================
+    bright_explicit = "brightness" in normalized and not _is_explanatory_chat(normalized)
+    bright_session = (
+        context.active_domain == "brightness"
+        and not _is_explanatory_chat(normalized)
+        and "brightness" not in normalized
+        and (
+            re.search(r"\b(set|put|make)\b", normalized)
+            or re.search(r"\b(max|full|min|zero)\b", normalized)
+            or re.match(r"^(\d{1,3})(?:\s*(?:%|percent))?$", normalized.strip())
+        )
+    )
+    if bright_explicit or bright_session:
+        if "max" in normalized or "full" in normalized:
+            return _intent("set_brightness", raw_text, normalized, 0.95, level=100)
+        if "min" in normalized or "zero" in normalized:
+            return _intent("set_brightness", raw_text, normalized, 0.95, level=0)
+        match = re.search(r"(\d+)", normalized)
+        if match:
+            return _intent(
+                "set_brightness",
+                raw_text,
+                normalized,
+                0.9,
+                level=_clamp_level(int(match.group(1))),
+            )
+        return _intent("set_brightness", raw_text, normalized, 0.7)
+
+    vol_explicit = "volume" in normalized and not _is_explanatory_chat(normalized)
+    vol_session = (
+        context.active_domain == "volume"
+        and not _is_explanatory_chat(normalized)
+        and "volume" not in normalized
+        and (
+            re.search(r"\b(set|put|make)\b", normalized)
+            or re.search(r"\b(max|full|min|mute|zero)\b", normalized)
+            or re.match(r"^(\d{1,3})(?:\s*(?:%|percent))?$", normalized.strip())
+        )
+    )
+    if vol_explicit or vol_session:
+        if "max" in normalized or "full" in normalized:
+            return _intent("set_volume", raw_text, normalized, 0.95, level=100)
+        if "min" in normalized or "mute" in normalized:
+            return _intent("set_volume", raw_text, normalized, 0.95, level=0)
+        match = re.search(r"(\d+)", normalized)
+        if match:
+            return _intent(
+                "set_volume",
+                raw_text,
+                normalized,
+                0.9,
+                level=_clamp_level(int(match.group(1))),
+            )
+        return _intent("set_volume", raw_text, normalized, 0.7)
+
+    # =========================
+    # FILE MANAGEMENT
+    # =========================
+    if "create folder" in normalized:
+        name = normalized.replace("create folder", "").strip()
+        return _intent("file_manager", raw_text, normalized, 0.9, action="create_folder", name=name)
+
+    if re.search(r"\bdelete\b", normalized):
+        name = re.sub(r"\bdelete\b", "", normalized).strip()
+        return _intent("file_manager", raw_text, normalized, 0.85, action="delete", name=name)
+
+    if re.search(r"\b(rename|move|copy)\b", normalized):
+        action_match = re.search(r"\b(rename|move|copy)\b", normalized)
+        action = action_match.group(1) if action_match else "unknown"
+        name = re.sub(r"\b(rename|move|copy)\b", "", normalized).strip()
+        return _intent("file_manager", raw_text, normalized, 0.85, action=action, name=name)
+
+    # =========================
+    # PROCESS MANAGER
+    # =========================
+    if re.search(r"\b(kill|terminate|end)\b.*\b(process|task|app)\b", normalized):
+        name = re.sub(r"\b(kill|terminate|end|process|task|app)\b", "", normalized).strip()
+        return _intent("process_manager", raw_text, normalized, 0.88, action="kill", name=name)
+
+    if re.search(r"\b(list|show)\b.*\b(process|processes|tasks)\b", normalized):
+        return _intent("process_manager", raw_text, normalized, 0.88, action="list")
+
+    # =========================
+    # WINDOW (aligned with system/router.py)
+    # =========================
+    if "minimize" in normalized:
+        return _intent("minimize", raw_text, normalized, 0.9)
+
+    if "maximize" in normalized:
+        return _intent("maximize", raw_text, normalized, 0.9)
+
+    if re.search(r"\bclose\s+window\b", normalized):
+        return _intent("close", raw_text, normalized, 0.9)
+
+    if re.search(r"\brestore\s+window\b", normalized) or normalized.strip() == "restore":
+        return _intent("restore", raw_text, normalized, 0.88)
+
+    focus_match = re.search(r"\bfocus\s+(?:on\s+)?(.+)$", normalized)
+    if focus_match:
+        fname = re.sub(r"\b(please|window|the)\b", "", focus_match.group(1)).strip()
+        if fname:
+            return _intent("focus", raw_text, normalized, 0.88, name=fname)
+
+    if re.search(r"\bmove\s+window\b", normalized):
+        return _intent("move_window", raw_text, normalized, 0.85)
+
+    if re.search(r"\bresize\s+window\b", normalized):
+        return _intent("resize_window", raw_text, normalized, 0.85)
+
+    # =========================
+    # SCREENSHOT
+    # =========================
+    if "screenshot" in normalized or "take a snap" in normalized:
+        return _intent("take_screenshot", raw_text, normalized, 0.9)
+
+    # =========================
+    # RUN CODE
+    # =========================
+    if re.search(r"\brun\s+python\b", normalized):
+        file = re.sub(r"\brun\s+python\b", "", normalized).strip()
+        return _intent("run_code", raw_text, normalized, 0.9, file=file)
+
+    # =========================
+    # EVALUATE TRIGGER (IF-THEN)
+    # e.g. "if battery low then notify me"
+    # =========================
+    if re.search(r"\bif\b.+\bthen\b", normalized):
+        return _intent("evaluate_trigger", raw_text, normalized, 0.80, query=raw_text)
+
+    # =========================
+    # APPLY RULES
+    # =========================
+    if re.search(r"\b(apply rules|run rules|check rules|automation rules)\b", normalized):
+        return _intent("apply_rules", raw_text, normalized, 0.80, query=raw_text)
+
+    # =========================
+    # CHAT — clear Q&A / explanation (everything above failed; do not guess a tool intent)
+    # =========================
+    if _is_explanatory_chat(normalized):
+        return _intent("chat", raw_text, normalized, 0.9)
+
+    # =========================
+    # LOCAL CLASSIFIER FALLBACK (commands / ambiguous phrasing not matched above)
+    # =========================
+    return None
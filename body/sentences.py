@@ -0,0 +1,102 @@
+"""
+Split streamed LLM text into sentences for speech.
+
+``SentenceChunker.feed`` takes text deltas as they arrive and returns the
+sentences they complete, so the first one can be synthesized while the rest
+is still being generated.  A sentence ends at ``.``, ``!``, ``?`` or ``…``
+followed by whitespace (abbreviations such as "Mr.", "e.g." and "U.S." do not
+count), or at a line break.  A lone letter ("Plan B.") or "no." ends a
+sentence unless the next word shows otherwise ("J. R. R. Tolkien", "No. 5"),
+so those wait for that word.  Text that runs past ``max_chars`` without an end
+is cut at the last comma, semicolon, colon or space, so a long first sentence
+does not hold back the audio.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+
+MAX_SENTENCE_CHARS = 220
+
+_ABBREVIATIONS = frozenset(
+    {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "approx", "fig"}
+)
+# Terminator (plus closing quotes/brackets) followed by whitespace, or a line break.
+_BOUNDARY_RE = re.compile(r"[.!?…]+[\"')\]]*(?=\s)|\n")
+_CLAUSE_BREAK_RE = re.compile(r"[,;:]\s")
+_WORD_BREAK_RE = re.compile(r"\s")
+
+
+def _is_initial(word: str) -> bool:
+    return len(word) == 2 and word[0].isalpha() and word[1] == "."
+
+
+def _ends_with_abbreviation(text: str, following: str) -> bool | None:
+    """Whether the ``.`` ending ``text`` closes an abbreviation; None until ``following`` can tell."""
+    words = text.split()
+    if not words or not text.endswith("."):
+        return False
+    word = words[-1].lower().rstrip(".")
+    letters = word.split(".")
+    if word in _ABBREVIATIONS or (len(letters) > 1 and all(len(part) == 1 and part.isalpha() for part in letters)):
+        return True
+    if word != "no" and not (len(word) == 1 and word.isalpha()):
+        return False
+    if word != "no" and len(words) > 1 and _is_initial(words[-2]):
+        return True  # the second of "J. R." or "U. S."
+    nxt = following.lstrip()
+    if word == "no":
+        return nxt[0].isdigit() if nxt else None
+    return _is_initial(nxt[:2]) if len(nxt) > 1 else None
+
+
+def _last_break(pattern: re.Pattern[str], text: str) -> int:
+    return max((match.end() for match in pattern.finditer(text)), default=0)
+
+
+class SentenceChunker:
+    def __init__(self, *, max_chars: int = MAX_SENTENCE_CHARS) -> None:
+        self._max_chars = max(1, max_chars)
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        """Add ``delta``; return the sentences it completed."""
+        self._buffer += delta or ""
+        sentences: list[str] = []
+        start = 0
+        for match in _BOUNDARY_RE.finditer(self._buffer):
+            end = match.end()
+            if match.group() != "\n":
+                abbreviation = _ends_with_abbreviation(self._buffer[start : match.start() + 1], self._buffer[end:])
+                if abbreviation is None:
+                    break  # the next word decides
+                if abbreviation:
+                    continue
+            sentence = self._buffer[start:end].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = end
+        self._buffer = self._buffer[start:]
+
+        while len(self._buffer) > self._max_chars:
+            head = self._buffer[: self._max_chars]
+            cut = _last_break(_CLAUSE_BREAK_RE, head) or _last_break(_WORD_BREAK_RE, head) or len(head)
+            sentence = self._buffer[:cut].strip()
+            if sentence:
+                sentences.append(sentence)
+            self._buffer = self._buffer[cut:]
+        return sentences
+
+    def flush(self) -> list[str]:
+        """Return whatever is left once the stream has ended."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+def iter_sentences(deltas: Iterable[str], *, max_chars: int = MAX_SENTENCE_CHARS) -> Iterator[str]:
+    """Sentences of the text streamed as ``deltas``, each as soon as it is complete."""
+    chunker = SentenceChunker(max_chars=max_chars)
+    for delta in deltas:
+        yield from chunker.feed(delta)
+    yield from chunker.flush()
@@ -3,14 +3,17 @@ Hybrid TTS router for Jarvis.
 
 - Online: use ``body.speak_edgetts`` (edge-tts backend)
 - Offline: use ``body.speak_TTS`` (simple pyttsx3 backend)
+
+``speak_stream`` speaks text that is still being generated (LLM replies) one
+sentence at a time, so the first sentence plays while the rest is written.
 """
 
 from __future__ import annotations
 import importlib
-import socket
+import queue
 import sys
 import threading
-import time
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 from types import ModuleType
 from typing import Optional
@@ -28,39 +31,14 @@ _ROOT = Path(__file__).resolve().parent.parent
 if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
+from body.sentences import iter_sentences  # noqa: E402
+from brain import connectivity  # noqa: E402
+
 _state_lock = threading.Lock()
 _backend_name: Optional[str] = None
 _backend_module: Optional[ModuleType] = None
 _warmup_done = {"edge": False, "offline": False}
 
-_connectivity_cache_ttl_s = 5.0
-_last_connectivity_check = 0.0
-_last_connectivity_result = False
-
-
-def _internet_available(timeout_s: float = 1.0) -> bool:
-    """Quick internet check with short-lived cache."""
-    global _last_connectivity_check, _last_connectivity_result
-    now = time.monotonic()
-    if now - _last_connectivity_check < _connectivity_cache_ttl_s:
-        return _last_connectivity_result
-
-    ok = False
-    try:
-        for dns in ["8.8.8.8", "1.1.1.1", "9.9.9.9"]:
-            try:
-                with socket.create_connection((dns, 53), timeout=timeout_s):
-                    ok = True
-                    break
-            except OSError:
-                continue
-    except Exception:
-        ok = False
-
-    _last_connectivity_check = now
-    _last_connectivity_result = ok
-    return ok
-
 
 def _import_backend(name: str) -> ModuleType:
     """Import backend module with suppressed output."""
@@ -75,7 +53,7 @@ def _get_backend() -> tuple[str, ModuleType]:
     """Choose backend dynamically."""
     global _backend_name, _backend_module
 
-    preferred = "edge" if _internet_available() else "offline"
+    preferred = "edge" if connectivity.is_online() else "offline"
 
     with _state_lock:
         if _backend_name == preferred and _backend_module is not None:
@@ -208,15 +186,22 @@ def speak(text: str) -> None:
         return
 
     print(f"Jarvis: {text}")
+    _say(text)
 
-    _, backend = _get_backend()
+
+def _say(text: str) -> None:
+    """Hand already cleaned text to the backend without printing it."""
+    name, backend = _get_backend()
     
     try:
         fn = getattr(backend, "speak")
         
-        if _backend_name == "offline":
+        if name == "offline":
             # Simple synchronous speak
             fn(text)
+        elif name == "edge":
+            # The edge backend prints from its synthesis threads, after any redirect.
+            fn(text, echo=False)
         else:
             with contextlib.redirect_stdout(io.StringIO()):
                 fn(text)
@@ -224,6 +209,46 @@ def speak(text: str) -> None:
         print(f"[TTS] Speak error: {exc}")
 
 
+
+def _recorded(deltas: Iterable[str], parts: list[str]) -> Iterator[str]:
+    for delta in deltas:
+        parts.append(delta)
+        yield delta
+
+
+def speak_stream(deltas: Iterable[str], *, on_first_sentence: Callable[[], None] | None = None) -> str:
+    """Speak streamed text one sentence at a time; returns the whole text.
+
+    Sentences are handed to the backend from a helper thread, so a backend
+    that blocks while it talks does not hold up the generator.  The reply is
+    printed once, in full, when the stream ends.  Returns once every sentence
+    has been passed to the backend.
+    """
+    sentences: queue.Queue[str | None] = queue.Queue()
+
+    def _speak_sentences() -> None:
+        while (sentence := sentences.get()) is not None:
+            sentence = clean_for_speech(sentence)
+            if sentence:
+                _say(sentence)
+
+    speaker = threading.Thread(target=_speak_sentences, name="jarvis-speak-stream", daemon=True)
+    speaker.start()
+    parts: list[str] = []
+    try:
+        for index, sentence in enumerate(iter_sentences(_recorded(deltas, parts))):
+            if index == 0 and on_first_sentence is not None:
+                on_first_sentence()
+            sentences.put(sentence)
+    finally:
+        sentences.put(None)
+        text = "".join(parts).strip()
+        shown = clean_for_speech(text)
+        if shown:
+            print(f"Jarvis: {shown}")
+        speaker.join()
+    return text
+
 if __name__ == "__main__":
     from body.speak_TTS import initialize
     initialize()
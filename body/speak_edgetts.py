@@ -23,7 +23,22 @@ warnings.filterwarnings("ignore")
 # Male English neural voice (change via env JARVIS_EDGE_VOICE if you prefer another).
 DEFAULT_VOICE = os.environ.get("JARVIS_EDGE_VOICE", "en-GB-RyanNeural")
 
-_audio_queue: queue.Queue[str | None] = queue.Queue()
+
+class _Clip:
+    """One ``speak`` call: queued for playback at once, filled in when synthesized.
+
+    Sentences are synthesized in parallel but play in the order they were
+    spoken, even when a later one finishes synthesizing first.
+    """
+
+    __slots__ = ("path", "ready")
+
+    def __init__(self) -> None:
+        self.path: str | None = None
+        self.ready = threading.Event()
+
+
+_audio_queue: queue.Queue[_Clip | None] = queue.Queue()
 _audio_loop_started = False
 _audio_loop_lock = threading.Lock()
 _audio_loop_thread: threading.Thread | None = None
@@ -53,17 +68,15 @@ def _play_mp3(path: str) -> None:
     playsound(path, block=True)
 
 
-def _tts_worker(text: str, voice: str) -> None:
-    if not text or not text.strip():
-        return
-
-    print(f"Jarvis: {text}")
+def _tts_worker(text: str, voice: str, clip: _Clip, echo: bool) -> None:
+    if echo:
+        print(f"Jarvis: {text}")
     tmp_path: str | None = None
     try:
         fd, tmp_path = tempfile.mkstemp(suffix=".mp3")
         os.close(fd)
         _synthesize_to_mp3(text, tmp_path, voice)
-        _audio_queue.put(tmp_path)
+        clip.path = tmp_path
     except Exception as exc:
         print(f"[edge-tts ERROR] Failed to synthesize speech: {exc}")
         if tmp_path and os.path.isfile(tmp_path):
@@ -71,18 +84,27 @@ def _tts_worker(text: str, voice: str) -> None:
                 os.unlink(tmp_path)
             except OSError:
                 pass
-        _mark_job_done()
+    finally:
+        clip.ready.set()
 
 
-def speak(text: str, voice: str | None = None) -> None:
-    print("EDGE TTS SPEAKING:", text)
-    """Queue speech synthesis and playback without blocking the caller (e.g. Qt UI thread)."""
-    ensure_audio_loop_started()
+def speak(text: str, voice: str | None = None, *, echo: bool = True) -> None:
+    """Queue speech synthesis and playback without blocking the caller (e.g. Qt UI thread).
+
+    ``echo=False`` skips printing the text, for callers that print it themselves.
+    """
+    if echo:
+        print("EDGE TTS SPEAKING:", text)
     text = text.replace("*", "")
+    if not text or not text.strip():
+        return
+    ensure_audio_loop_started()
     _mark_job_started()
+    clip = _Clip()
+    _audio_queue.put(clip)
     threading.Thread(
         target=_tts_worker,
-        args=(text, voice or DEFAULT_VOICE),
+        args=(text, voice or DEFAULT_VOICE, clip, echo),
         daemon=True,
     ).start()
 
@@ -96,16 +118,19 @@ def _audio_playback_loop() -> None:
     """Internal worker: drains synthesized audio files and plays them sequentially."""
     global _audio_loop_started, _audio_loop_thread
     while True:
-        path = _audio_queue.get()
-        if path is None:
+        clip = _audio_queue.get()
+        if clip is None:
             break
+        clip.ready.wait()
+        path = clip.path
         try:
-            _play_mp3(path)
+            if path:
+                _play_mp3(path)
         except Exception as exc:
             print(f"[edge-tts ERROR] Failed during audio playback: {exc}")
         finally:
             try:
-                if os.path.isfile(path):
+                if path and os.path.isfile(path):
                     os.unlink(path)
             except OSError:
                 pass
@@ -8,6 +8,7 @@ from body.speak import speak
 from body.wake_word import listen_for_wake_word
 
 from brain.intent_engine import detect_intent
+from brain.nlu.utterance import Utterance
 from brain.router import route
 from brain.dialogue_manager import dialogue_manager
 from brain.performance import log_stage
@@ -38,7 +39,7 @@ def _detect_intent_timed(command: str, memory_context: dict) -> dict:
 # =========================
 # INTENT HANDLER
 # =========================
-def _handle_intent(intent_data: dict, voice_mode: bool = False) -> str | None:
+def _handle_intent(intent_data: dict, voice_mode: bool = False, utterance: Utterance | None = None) -> str | None:
 
     intent = intent_data.get("intent", "unknown")
     confidence = intent_data.get("confidence", 0)
@@ -57,7 +58,7 @@ def _handle_intent(intent_data: dict, voice_mode: bool = False) -> str | None:
         intent_data["intent"] = "chat"
 
     # ---------- DIALOGUE MANAGEMENT ----------
-    dialogue = dialogue_manager.handle(intent_data, context)
+    dialogue = dialogue_manager.handle(intent_data, context, utterance)
 
     if dialogue.action in {"follow_up", "cancelled"}:
         response = dialogue.response or "Please clarify."
@@ -66,7 +67,7 @@ def _handle_intent(intent_data: dict, voice_mode: bool = False) -> str | None:
         return response
 
     # ---------- EXECUTION ----------
-    return route(dialogue.command, return_response=not voice_mode)
+    return route(dialogue.command, return_response=not voice_mode, utterance=dialogue.utterance)
 
 
 def _remember_exchange(
@@ -117,11 +118,12 @@ def process_text(command: str) -> str:
 
         
         memory_context = get_nlu_context()
+        utterance = Utterance.parse(cleaned)
         
-        intent_data = detect_intent(cleaned, memory_context=memory_context)
+        intent_data = detect_intent(utterance, memory_context=memory_context)
         set_working_memory(current_task={"mode": "text", "input": cleaned, "status": "routing", "intent": intent_data.get("intent")})
         
-        response = _handle_intent(intent_data, voice_mode=False) or "No response generated."
+        response = _handle_intent(intent_data, voice_mode=False, utterance=utterance) or "No response generated."
         
         _remember_exchange(cleaned, response, intent_data=intent_data, status="success")
         clear_working_memory()
@@ -159,11 +161,12 @@ def _execute(command: str):
         set_working_memory(current_task={"mode": "voice", "input": cleaned, "status": "nlu"})
 
         memory_context = get_nlu_context()
-        intent_data = detect_intent(cleaned, memory_context=memory_context)
+        utterance = Utterance.parse(cleaned)
+        intent_data = detect_intent(utterance, memory_context=memory_context)
         set_working_memory(current_task={"mode": "voice", "input": cleaned, "status": "routing", "intent": intent_data.get("intent")})
 
         # 🔥 NO ASYNC (prevents duplicate execution bugs)
-        response = _handle_intent(intent_data, voice_mode=True) or "No response generated."
+        response = _handle_intent(intent_data, voice_mode=True, utterance=utterance) or "No response generated."
         _remember_exchange(cleaned, response, intent_data=intent_data, status="success")
         clear_working_memory()
 
@@ -0,0 +1,154 @@
+"""Shared view of whether Jarvis can reach the internet.
+
+Firestore sync, the chatbot and the TTS router each used to open their own
+probe sockets on the request path.  ``ConnectivityMonitor`` probes on a daemon
+thread instead (every ``ONLINE_INTERVAL_SECONDS`` while online, every
+``OFFLINE_INTERVAL_SECONDS`` while offline, so a reconnect is noticed
+quickly) and keeps the answer in an attribute: ``is_online()`` never does I/O.
+
+Every change of state is published through ``brain.events`` as
+``CONNECTIVITY_EVENT`` with ``{"online": bool}``.  Until the first probe
+finishes the monitor reports ``assume_online``; callers already fall back when
+an online request fails.
+
+Tests build a monitor around their own probe and either call ``check()``
+directly or swap it in with ``install_monitor``.
+"""
+
+from __future__ import annotations
+
+import socket
+import time
+from collections.abc import Callable, Iterable
+from threading import Event, Lock, Thread
+from typing import Any
+
+from brain.events import trigger_event
+
+CONNECTIVITY_EVENT = "connectivity_changed"
+PROBE_HOSTS = (("8.8.8.8", 53), ("1.1.1.1", 53), ("9.9.9.9", 53))
+PROBE_TIMEOUT_SECONDS = 1.0
+ONLINE_INTERVAL_SECONDS = 30.0
+OFFLINE_INTERVAL_SECONDS = 5.0
+
+Probe = Callable[[], bool]
+
+
+def dns_probe(hosts: Iterable[tuple[str, int]] = PROBE_HOSTS, timeout_s: float = PROBE_TIMEOUT_SECONDS) -> bool:
+    """True if a TCP connection to any of the public DNS ``hosts`` succeeds."""
+    for host, port in hosts:
+        try:
+            with socket.create_connection((host, port), timeout=timeout_s):
+                return True
+        except OSError:
+            continue
+    return False
+
+
+class ConnectivityMonitor:
+    def __init__(
+        self,
+        probe: Probe = dns_probe,
+        *,
+        online_interval: float = ONLINE_INTERVAL_SECONDS,
+        offline_interval: float = OFFLINE_INTERVAL_SECONDS,
+        assume_online: bool = True,
+        publish: Callable[[str, Any], None] = trigger_event,
+    ) -> None:
+        self._probe = probe
+        self._online_interval = online_interval
+        self._offline_interval = offline_interval
+        self._publish = publish
+        self._lock = Lock()
+        self._wake = Event()
+        self._probed = Event()
+        self._worker: Thread | None = None
+        self._stopped = False
+        self.online = assume_online
+        self.checked_at: float | None = None
+
+    # =========================
+    # READERS
+    # =========================
+    def is_online(self) -> bool:
+        """The last probe result; never blocks."""
+        return self.online
+
+    def wait_until_checked(self, timeout: float | None = None) -> bool:
+        """Block until the first probe has finished (for startup paths)."""
+        return self._probed.wait(timeout)
+
+    # =========================
+    # PROBING
+    # =========================
+    def check(self) -> bool:
+        """Probe now, record the result and publish it if it changed."""
+        try:
+            online = bool(self._probe())
+        except Exception as exc:
+            print("[CONNECTIVITY ERROR]", exc)
+            online = False
+        with self._lock:
+            changed = online != self.online
+            self.online = online
+            self.checked_at = time.time()
+        self._probed.set()
+        if changed:
+            self._publish(CONNECTIVITY_EVENT, {"online": online})
+        return online
+
+    def refresh(self) -> None:
+        """Ask the probe thread to check again now, e.g. after a request failed."""
+        self.start()
+
+    def start(self) -> None:
+        with self._lock:
+            self._stopped = False
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = Thread(target=self._run, name="jarvis-connectivity", daemon=True)
+                self._worker.start()
+                return
+        self._wake.set()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            online = self.check()
+            self._wake.wait(self._online_interval if online else self._offline_interval)
+            self._wake.clear()
+
+
+# =========================
+# SHARED MONITOR
+# =========================
+_monitor: ConnectivityMonitor | None = None
+_monitor_lock = Lock()
+
+
+def get_monitor() -> ConnectivityMonitor:
+    """The process-wide monitor; its probe thread starts on first use."""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = ConnectivityMonitor()
+                _monitor.start()
+    return _monitor
+
+
+def install_monitor(monitor: ConnectivityMonitor | None) -> ConnectivityMonitor | None:
+    """Replace the shared monitor (``None`` resets it); returns the previous one."""
+    global _monitor
+    with _monitor_lock:
+        previous, _monitor = _monitor, monitor
+    if previous is not None and previous is not monitor:
+        previous.stop()
+    return previous
+
+
+def is_online() -> bool:
+    return get_monitor().is_online()
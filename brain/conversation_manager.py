@@ -5,7 +5,7 @@ import threading
 import time
 from typing import Any
 
-from memory.conversation import get_recent_turns
+from memory.conversation import get_memory_snapshot
 
 
 class ConversationManager:
@@ -72,7 +72,7 @@ class ConversationManager:
         if short_mode:
             prompt_parts.append(self.SHORT_MODE_PROMPT)
 
-        history = get_recent_turns(self.CONVERSATION_TURNS)
+        history = get_memory_snapshot().turns[-self.CONVERSATION_TURNS:]
         if history:
             prompt_parts.append("Conversation history:")
             for turn in history:
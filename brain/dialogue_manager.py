@@ -12,6 +12,7 @@ from dataclasses import dataclass
 from typing import Any, Literal
 
 from brain.nlu.schema import REQUIRED_SLOTS
+from brain.nlu.utterance import Utterance
 from system.laptop.app_launcher import canonicalize_app_name
 
 DialogueAction = Literal["execute", "follow_up", "cancelled"]
@@ -23,6 +24,9 @@ class DialogueResult:
     response: str | None = None
     command: dict[str, Any] | None = None
     follow_up: dict[str, Any] | None = None
+    # Set when ``command`` was built from the utterance being handled, so the
+    # router can reuse its parse; None for commands replayed from context.
+    utterance: Utterance | None = None
 
 
 _SLOT_QUESTIONS: dict[str, str] = {
@@ -48,6 +52,9 @@ _RISKY_ACTIONS = {
 }
 _CONFIRM_YES = re.compile(r"^(yes|yep|yeah|confirm|confirmed|do it|proceed|go ahead|sure|ok|okay)$")
 _CONFIRM_NO = re.compile(r"^(no|nope|cancel|stop|abort|don'?t|do not|never mind)$")
+_LEVEL_MAX = frozenset({"max", "full", "maximum"})
+_LEVEL_MIN = frozenset({"min", "mute", "zero", "silent"})
+_APP_FILLER = re.compile(r"\b(open|launch|start|run|app|application|please)\b")
 _GENERIC_STOPWORDS = {
     "the",
     "a",
@@ -66,16 +73,17 @@ _GENERIC_STOPWORDS = {
 class DialogueManager:
     """Validates commands and maintains pending dialogue state in context."""
 
-    def handle(self, intent_data: dict[str, Any], context: Any) -> DialogueResult:
-        raw_text = (intent_data.get("text") or "").strip()
-        normalized = (intent_data.get("normalized_text") or self._normalize(raw_text)).strip()
+    def handle(self, intent_data: dict[str, Any], context: Any, utterance: Utterance | None = None) -> DialogueResult:
+        if utterance is None:
+            utterance = Utterance.parse(intent_data.get("text") or "")
+        normalized = utterance.normalized.strip()
 
         confirmation_result = self._handle_pending_confirmation(normalized, context)
         if confirmation_result is not None:
             return confirmation_result
 
         if context.pending_intent:
-            merged = self._merge_pending_intent(intent_data, raw_text, normalized, context)
+            merged = self._merge_pending_intent(intent_data, utterance, context)
             if merged is not None:
                 intent_data = merged
 
@@ -101,7 +109,7 @@ class DialogueManager:
             )
 
         context.clear_pending_intent()
-        return DialogueResult(action="execute", command=command)
+        return DialogueResult(action="execute", command=command, utterance=utterance)
 
     def _handle_pending_confirmation(self, normalized: str, context: Any) -> DialogueResult | None:
         pending = context.pending_confirmation
@@ -131,8 +139,7 @@ class DialogueManager:
     def _merge_pending_intent(
         self,
         intent_data: dict[str, Any],
-        raw_text: str,
-        normalized: str,
+        utterance: Utterance,
         context: Any,
     ) -> dict[str, Any] | None:
         pending_intent = context.pending_intent
@@ -141,7 +148,7 @@ class DialogueManager:
         if not pending_intent or not missing_slots:
             return None
 
-        filled = self._infer_slots_from_followup(pending_intent, missing_slots, raw_text, normalized)
+        filled = self._infer_slots_from_followup(pending_intent, missing_slots, utterance)
         if not filled:
             return None
 
@@ -150,8 +157,8 @@ class DialogueManager:
             **context.pending_intent_data,
             **intent_data,
             "intent": pending_intent,
-            "text": raw_text or context.pending_intent_data.get("text", ""),
-            "normalized_text": normalized or context.pending_intent_data.get("normalized_text", ""),
+            "text": utterance.raw or context.pending_intent_data.get("text", ""),
+            "normalized_text": utterance.normalized.strip() or context.pending_intent_data.get("normalized_text", ""),
             "confidence": max(float(context.pending_intent_data.get("confidence", 0.0)), 0.9),
         }
         merged.update(pending_slots)
@@ -257,38 +264,34 @@ class DialogueManager:
         self,
         intent: str,
         missing_slots: list[str],
-        raw_text: str,
-        normalized: str,
+        utterance: Utterance,
     ) -> dict[str, Any]:
         filled: dict[str, Any] = {}
         for slot in missing_slots:
-            value = self._infer_slot_value(intent, slot, raw_text, normalized)
+            value = self._infer_slot_value(intent, slot, utterance)
             if not self._is_missing(value):
                 filled[slot] = value
         return filled
 
-    def _infer_slot_value(self, intent: str, slot: str, raw_text: str, normalized: str) -> Any:
+    def _infer_slot_value(self, intent: str, slot: str, utterance: Utterance) -> Any:
         if slot == "app":
-            cleaned = re.sub(r"\b(open|launch|start|run|app|application|please)\b", "", normalized).strip()
-            return canonicalize_app_name(cleaned or raw_text)
+            cleaned = _APP_FILLER.sub("", utterance.uncorrected).strip()
+            return canonicalize_app_name(cleaned or utterance.raw)
         if slot == "level":
-            if re.search(r"\b(max|full|maximum)\b", normalized):
+            if not _LEVEL_MAX.isdisjoint(utterance.token_set):
                 return 100
-            if re.search(r"\b(min|mute|zero|silent)\b", normalized):
+            if not _LEVEL_MIN.isdisjoint(utterance.token_set):
                 return 0
-            m = re.search(r"(\d{1,3})", normalized)
-            if m:
-                return max(0, min(100, int(m.group(1))))
+            if utterance.numbers:
+                return max(0, min(100, int(utterance.numbers[0][:3])))
             return None
         if slot == "pid":
-            m = re.search(r"\d+", normalized)
-            return int(m.group(0)) if m else None
+            return int(utterance.numbers[0]) if utterance.numbers else None
         if slot == "target_price":
-            m = re.search(r"\d+(?:\.\d+)?", normalized)
-            return float(m.group(0)) if m else None
+            return float(utterance.numbers[0]) if utterance.numbers else None
         if slot in {"name", "file", "word", "city", "query", "video", "command", "destination"}:
-            return self._clean_free_text(normalized if normalized else raw_text)
-        return self._clean_free_text(raw_text)
+            return self._clean_free_text(utterance.uncorrected or utterance.raw)
+        return self._clean_free_text(utterance.raw)
 
     @staticmethod
     def _clean_free_text(text: str) -> str:
@@ -299,11 +302,5 @@ class DialogueManager:
     def _is_missing(value: Any) -> bool:
         return value is None or value == "" or value == [] or value == {}
 
-    @staticmethod
-    def _normalize(text: str) -> str:
-        text = text.lower().strip()
-        text = re.sub(r"[^a-z0-9\s]", " ", text)
-        return re.sub(r"\s+", " ", text)
-
 
 dialogue_manager = DialogueManager()
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Mapping
 from typing import Any
 
 from brain.context import context
+from brain.nlu.utterance import Utterance
+from memory.snapshot import memory_frames
 from services.time_date.temporal_reasoner import TEMPORAL_REASONER
 
 _ANAPHORA_RE = re.compile(r"\b(it|that|same|there)\b")
+_ANAPHORA_WORDS = frozenset({"it", "that", "same", "there"})
 
 
 class FollowupResolver:
@@ -19,7 +23,8 @@ class FollowupResolver:
         intent: str,
         slots: dict[str, Any],
         required_slots: tuple[str, ...],
-        memory_context: dict[str, Any] | None = None,
+        memory_context: Mapping[str, Any] | None = None,
+        utterance: Utterance | None = None,
     ) -> tuple[dict[str, Any], dict[str, Any]]:
         meta: dict[str, Any] = {"resolved": False, "ambiguity": None}
         if not required_slots:
@@ -29,7 +34,11 @@ class FollowupResolver:
         if not missing:
             return slots, meta
 
-        needs_context = bool(_ANAPHORA_RE.search(normalized)) or self._looks_elliptical(normalized)
+        if utterance is not None:
+            has_anaphora = not _ANAPHORA_WORDS.isdisjoint(utterance.token_set)
+        else:
+            has_anaphora = bool(_ANAPHORA_RE.search(normalized))
+        needs_context = has_anaphora or self._looks_elliptical(normalized)
         if not needs_context:
             return slots, meta
 
@@ -68,7 +77,7 @@ class FollowupResolver:
         )
 
     @staticmethod
-    def _candidate_labels(candidates: list[dict[str, Any]]) -> list[str]:
+    def _candidate_labels(candidates: list[Mapping[str, Any]]) -> list[str]:
         labels: list[str] = []
         for frame in candidates[:2]:
             if frame.get("app"):
@@ -82,11 +91,11 @@ class FollowupResolver:
         return labels
 
     @staticmethod
-    def _candidate_frames(intent: str, missing: list[str], memory_context: dict[str, Any]) -> list[dict[str, Any]]:
+    def _candidate_frames(intent: str, missing: list[str], memory_context: Mapping[str, Any]) -> list[Mapping[str, Any]]:
         frames = []
         seen: set[tuple[str, str]] = set()
 
-        def add_frame(frame: dict[str, Any]):
+        def add_frame(frame: Mapping[str, Any]):
             key = (str(frame.get("intent", "")), str(frame.get("text", "")))
 
             if key in seen:
@@ -101,25 +110,10 @@ class FollowupResolver:
             if len(frames) == 3:
                 return frames
 
-        for turn in reversed(memory_context.get("recent_turns", []) or []):
-            if not isinstance(turn, dict):
-                continue
-
-            # New memory turns are stored as {user_text, assistant_text, time, metadata}
-            # with user metadata nested under metadata.user. Accept the legacy
-            # {user, assistant} shape as a compatibility fallback.
-            turn_metadata = turn.get("metadata") if isinstance(turn.get("metadata"), dict) else {}
-            metadata = turn_metadata.get("user") if isinstance(turn_metadata.get("user"), dict) else None
-            user_text = turn.get("user_text", "")
-            if metadata is None:
-                user_msg = turn.get("user") or {}
-                metadata = user_msg.get("metadata") if isinstance(user_msg, dict) else {}
-                user_text = user_msg.get("text", "") if isinstance(user_msg, dict) else ""
-
-            if isinstance(metadata, dict):
-                frame = dict(metadata)
-                frame.setdefault("text", user_text)
-                add_frame(frame)
+        # A memory snapshot carries these frames prebuilt; a plain context
+        # dict has them derived from its recent turns here.
+        for frame in memory_frames(memory_context):
+            add_frame(frame)
             if len(frames) == 3:
                 break
         return frames
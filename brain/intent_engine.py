@@ -1,21 +1,30 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Mapping
 from typing import Any
 
 from brain.context import context
 from brain.followup_resolver import FOLLOWUP_RESOLVER
+from memory.snapshot import last_intent
 from services.time_date.temporal_reasoner import TEMPORAL_REASONER
 from system.laptop.app_launcher import canonicalize_app_name
 
 
 from brain.nlu.classifier import IntentClassifier
+from brain.nlu.embedding_cache import PrototypeEmbeddingCache
+from brain.nlu.intent_matcher import IntentMatcher, IntentRule
+from brain.nlu.intent_memo import IntentMemo
 from brain.nlu.slot_filler import SlotFiller
+from brain.nlu.gazetteer import CRYPTO_NAMES, CRYPTO_TICKERS, MOODS, best, default_gazetteer
+from brain.nlu.utterance import Utterance, app_candidates, coin_mentions, normalize_text
 from brain.nlu.schema import REQUIRED_SLOTS
+from brain.nlu.spelling import pattern_words, register_vocabulary
 
 
-NLU_CLASSIFIER = IntentClassifier()
+NLU_CLASSIFIER = IntentClassifier(embedding_cache=PrototypeEmbeddingCache())
 SLOT_FILLER = SlotFiller()
+INTENT_MEMO = IntentMemo(maxsize=256)
 LOCAL_INTENT_THRESHOLD = 0.62
 
 # Chat: conversational Q&A, trivia, explanations (not device commands or tool intents).
@@ -51,21 +60,13 @@ _BRIGHTNESS_LEVEL_QUERY = re.compile(
     r"screen\s+brightness\s+(level|now|percentage)|what\s+is\s+my\s+brightness|get\s+brightness"
     r")\b"
 )
+_WHAT_IS_START = re.compile(r"^what\s+(is|are|was|were)\s+")
 
 # =========================
-# APP STOPWORDS
+# MOODS (matched through the gazetteer)
 # =========================
-_APP_STOPWORDS = {"the", "a", "an", "please", "for", "me", "my", "app", "application"}
 
-_MOODS = [
-    "sleeping", "sleep", "relax", "relaxing", "calm", "chill", "peaceful",
-    "meditation", "focus", "study", "studying", "concentration", "work",
-    "coding", "productive", "workout", "gym", "energy", "morning", "running",
-    "dance", "party", "happy", "sad", "romantic", "love", "angry", "nostalgic",
-    "lonely", "motivated", "lofi", "jazz", "classical", "pop", "rock", "rap",
-    "bollywood", "punjabi", "devotional", "instrumental", "acoustic", "edm",
-    "night", "evening", "afternoon"
-]
+_MOODS = list(MOODS)
 
 
 def _is_explanatory_chat(norm: str) -> bool:
@@ -74,7 +75,7 @@ def _is_explanatory_chat(norm: str) -> bool:
         return False
     if _CHAT_START.match(norm) or _CHAT_PHRASE.search(norm):
         return True
-    if re.match(r"^what\s+(is|are|was|were)\s+", norm):
+    if _WHAT_IS_START.match(norm):
         return True
     return False
 
@@ -105,19 +106,10 @@ def _clamp_level(value: int) -> int:
     return max(0, min(100, value))
 
 
-_CRYPTO_LONG = ("bitcoin", "ethereum", "dogecoin", "litecoin", "ripple")
-_CRYPTO_SHORT = ("btc", "eth", "doge")
-
-
 def _first_crypto_coin_mention(norm: str) -> str | None:
     """Match coin names; short tickers use word boundaries (avoid 'eth' inside 'something')."""
-    for c in _CRYPTO_LONG:
-        if c in norm:
-            return c
-    for c in _CRYPTO_SHORT:
-        if re.search(rf"\b{re.escape(c)}\b", norm):
-            return c
-    return None
+    coins = coin_mentions(norm)
+    return coins[0] if coins else None
 
 
 def _resolve_active_domain_followup(raw: str, norm: str) -> dict[str, Any] | None:
@@ -277,465 +269,624 @@ def _resolve_temporal_slots(raw: str) -> dict[str, Any]:
 
 
 # =========================
-# MAIN DETECTOR
+# RULE TABLE
+# Each rule keeps the slot extraction of the old inline cascade; the order of
+# _RULES is the priority order. Triggers only gate whether a rule is tried.
 # =========================
-def _regex_fallback_intent(text: str) -> dict[str, Any] | None:
+_EXIT_RE = re.compile(r"(?:exit|quit|shutdown|bye|goodbye|close jarvis)")
+_GREETING_RE = re.compile(r"(?:hey|hi|hello|hey jarvis|hi jarvis|hello jarvis)")
+_TIME_QUERY = re.compile(
+    r"\b("
+    r"what\s+time\s+is\s+it|what\s+is\s+the\s+time|what\s+s\s+the\s+time|"
+    r"tell\s+me\s+the\s+time|current\s+time|time\s+now"
+    r")\b"
+)
+_DATE_QUERY = re.compile(
+    r"\b("
+    r"what\s+date\s+is\s+it|what\s+is\s+the\s+date|what\s+is\s+today\s+s\s+date|"
+    r"today\s+s\s+date|today'?s\s+date|current\s+date|date\s+today|"
+    r"what\s+day\s+is\s+it|what\s+is\s+today\s+day|today\s+day|"
+    r"date\s+tomorrow|what\s+is\s+tomorrow|tomorrow\s+date|tomorrow\s+day|"
+    r"day\s+after\s+tomorrow|next\s+week|next\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)|"
+    r"tomorrows|todays\s+day"
+    r")\b"
+)
+_WEATHER_WORDS = re.compile(r"\b(weather|temperature|forecast|humidity|climate)\b")
+_WEATHER_FILLER = re.compile(r"\b(today|todays|tomorrow|current|now|please|tell me|what is|whats|show)\b")
+_WEATHER_CITY = re.compile(r"\b(?:in|for|at)\s+([a-z ]+)")
+_ADVICE_TIME = re.compile(r"\b(best time|good time|ideal time|when should i)\b")
+_TZ_CONVERT = re.compile(r"\b(convert|change)\b.*(time|timezone|zone)\b")
+_TZ_PAIR = re.compile(r"\b(ist|utc|gmt|pst|est|cst)\b.*\bto\b.*\b(ist|utc|gmt|pst|est|cst)\b")
+_NEWS = re.compile(r"\b(news|headlines|top stories|latest updates)\b")
+_CRYPTO_GENERIC = re.compile(r"\b(crypto|coin)\b")
+_CURRENCIES = ("usd", "eur", "inr")
+_ALERT = re.compile(r"\b(alert|notify|tell me)\b.*(price|bitcoin|ethereum|crypto)\b")
+_ALERT_THRESHOLD = re.compile(r"\b(price alert|when .+ (above|below|reaches))\b")
+_FIRST_NUMBER = re.compile(r"(\d+)")
+_SCHEDULE = re.compile(r"\b(remind|reminder|schedule|set timer|after|in)\b.*(second|minute|hour)\b")
+_DELAY = re.compile(r"(\d+)\s*(second|minute|hour)")
+_YT_PLAY = re.compile(r"\b(play|open|watch)\b.*(youtube|yt)\b")
+_YT_PLAY_REV = re.compile(r"\byoutube\b.*\b(play|open|watch)\b")
+_YT_PLAY_STRIP = re.compile(r"\b(play|open|watch|youtube|yt|video|on)\b")
+_YT_SEARCH = re.compile(r"\b(search|find|look up)\b.*(youtube|yt)\b")
+_YT_SEARCH_REV = re.compile(r"\byoutube\b.*\b(search|find)\b")
+_YT_SEARCH_STRIP = re.compile(r"\b(search|find|look up|youtube|yt|for)\b")
+_PLAY_MUSIC = re.compile(r"\b(play|start|resume)\b.*\b(music|song|songs|playlist|audio)\b")
+_STOP_MUSIC = re.compile(r"\b(stop|pause)\b.*\b(music|song|songs|playlist|audio)\b")
+_RESUME_MUSIC = re.compile(r"\b(resume|continue|unpause)\b.*\b(music|song|play)\b")
+_NEXT_TRACK = re.compile(r"\b(next|skip|next song|next track)\b")
+_PREVIOUS_TRACK = re.compile(r"\b(previous|prev|last song|go back|previous track)\b")
+_PLAY_ARTIST = re.compile(r"\b(play|put on)\b.*\b(by|songs by|music by)\b")
+_ARTIST_STRIP = re.compile(r"\b(play|put on|songs|music|by)\b")
+_PLAYLIST = re.compile(r"\bplaylist\b")
+_PLAYLIST_STRIP = re.compile(r"\b(play|playlist|music|songs|jarvis)\b")
+_VOLUME_UP = re.compile(r"\b(volume\s+up|increase\s+volume|turn\s+up\s+(the\s+)?volume|louder|more\s+volume)\b")
+_VOLUME_DOWN = re.compile(r"\b(volume\s+down|decrease\s+volume|turn\s+down\s+(the\s+)?volume|quieter|less\s+volume)\b")
+_BRIGHTNESS_UP = re.compile(r"\b(brightness\s+up|increase\s+brightness|brighter|more\s+brightness)\b")
+_BRIGHTNESS_DOWN = re.compile(r"\b(brightness\s+down|decrease\s+brightness|dimmer|less\s+brightness)\b")
+_SET_VERB = re.compile(r"\b(set|put|make)\b")
+_BRIGHTNESS_EXTREME = re.compile(r"\b(max|full|min|zero)\b")
+_VOLUME_EXTREME = re.compile(r"\b(max|full|min|mute|zero)\b")
+_BARE_LEVEL = re.compile(r"^(\d{1,3})(?:\s*(?:%|percent))?$")
+_DELETE = re.compile(r"\bdelete\b")
+_FILE_ACTION = re.compile(r"\b(rename|move|copy)\b")
+_KILL_PROCESS = re.compile(r"\b(kill|terminate|end)\b.*\b(process|task|app)\b")
+_KILL_STRIP = re.compile(r"\b(kill|terminate|end|process|task|app)\b")
+_LIST_PROCESSES = re.compile(r"\b(list|show)\b.*\b(process|processes|tasks)\b")
+_CLOSE_WINDOW = re.compile(r"\bclose\s+window\b")
+_RESTORE_WINDOW = re.compile(r"\brestore\s+window\b")
+_FOCUS = re.compile(r"\bfocus\s+(?:on\s+)?(.+)$")
+_FOCUS_STRIP = re.compile(r"\b(please|window|the)\b")
+_MOVE_WINDOW = re.compile(r"\bmove\s+window\b")
+_RESIZE_WINDOW = re.compile(r"\bresize\s+window\b")
+_RUN_PYTHON = re.compile(r"\brun\s+python\b")
+_IF_THEN = re.compile(r"\bif\b.+\bthen\b")
+_APPLY_RULES = re.compile(r"\b(apply rules|run rules|check rules|automation rules)\b")
+
+
+def _rule_exit(raw: str, norm: str) -> dict[str, Any] | None:
+    if _EXIT_RE.fullmatch(norm):
+        return _intent("exit", raw, norm, 1.0)
+    return None
 
-    if not text or not text.strip():
-        return _unknown_intent()
 
-    raw_text = text.strip()
-    normalized = _normalize(raw_text)
+def _rule_greeting(raw: str, norm: str) -> dict[str, Any] | None:
+    if _GREETING_RE.fullmatch(norm):
+        return _intent("greeting", raw, norm, 0.98)
+    return None
 
-    follow = _resolve_active_domain_followup(raw_text, normalized)
-    if follow is not None:
-        return follow
 
-    # =========================
-    # EXIT
-    # =========================
-    if re.fullmatch(r"(?:exit|quit|shutdown|bye|goodbye|close jarvis)", normalized):
-        return _intent("exit", raw_text, normalized, 1.0)
-
-    # =========================
-    # GREETING
-    # =========================
-    if re.fullmatch(r"(?:hey|hi|hello|hey jarvis|hi jarvis|hello jarvis)", normalized):
-        return _intent("greeting", raw_text, normalized, 0.98)
-
-    # =========================
-    # TIME QUERY
-    # =========================
-    if re.search(
-        r"\b("
-        r"what\s+time\s+is\s+it|what\s+is\s+the\s+time|what\s+s\s+the\s+time|"
-        r"tell\s+me\s+the\s+time|current\s+time|time\s+now"
-        r")\b",
-        normalized,
-    ):
-        return _intent("get_time", raw_text, normalized, 0.96, **_resolve_temporal_slots(raw_text))
-
-    # =========================
-    # DATE QUERY
-    # =========================
-    if re.search(
-        r"\b("
-        r"what\s+date\s+is\s+it|what\s+is\s+the\s+date|what\s+is\s+today\s+s\s+date|"
-        r"today\s+s\s+date|today'?s\s+date|current\s+date|date\s+today|"
-        r"what\s+day\s+is\s+it|what\s+is\s+today\s+day|today\s+day|"
-        r"date\s+tomorrow|what\s+is\s+tomorrow|tomorrow\s+date|tomorrow\s+day|"
-        r"day\s+after\s+tomorrow|next\s+week|next\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)|"
-        r"tommorow|tomarow|tomarrows|tomorrows|todays\s+day"
-        r")\b",
-        normalized,
-    ) and not re.search(r"\b(weather|temperature|forecast|humidity|climate)\b", normalized):
-        return _intent("get_date", raw_text, normalized, 0.96, **_resolve_temporal_slots(raw_text))
+def _rule_time(raw: str, norm: str) -> dict[str, Any] | None:
+    if _TIME_QUERY.search(norm):
+        return _intent("get_time", raw, norm, 0.96, **_resolve_temporal_slots(raw))
+    return None
+
+
+def _rule_date(raw: str, norm: str) -> dict[str, Any] | None:
+    if _DATE_QUERY.search(norm) and not _WEATHER_WORDS.search(norm):
+        return _intent("get_date", raw, norm, 0.96, **_resolve_temporal_slots(raw))
+    return None
+
+
+def _rule_advice_time(raw: str, norm: str) -> dict[str, Any] | None:
+    if _ADVICE_TIME.search(norm):
+        return _intent("advice_time", raw, norm, 0.84, topic=raw)
+    return None
 
-    # =========================
-    # ADVICE TIME
-    # =========================
-    if re.search(r"\b(best time|good time|ideal time|when should i)\b", normalized):
-        return _intent("advice_time", raw_text, normalized, 0.84, topic=raw_text)
 
-    # =========================
-    # TIMEZONE CONVERSION
+def _rule_timezone(raw: str, norm: str) -> dict[str, Any] | None:
     # e.g. "convert 5pm IST to UTC"
-    # =========================
-    if re.search(r"\b(convert|change)\b.*(time|timezone|zone)\b", normalized) or \
-       re.search(r"\b(ist|utc|gmt|pst|est|cst)\b.*\bto\b.*\b(ist|utc|gmt|pst|est|cst)\b", normalized):
-        return _intent("convert_timezone", raw_text, normalized, 0.85, query=raw_text)
-    
-    # =========================
-    # WEATHER
-    # =========================
-
-    if re.search(
-        r"\b(weather|temperature|forecast|humidity|climate)\b",
-        normalized
-    ):
-        # Remove filler words
-        cleaned = re.sub(
-            r"\b(today|todays|tomorrow|current|now|please|tell me|what is|whats|show)\b",
-            "",
-            normalized
-        ).strip()
-
-        city = None
-
-        # weather in pune
-        match = re.search(r"\b(?:in|for|at)\s+([a-z ]+)", cleaned)
-        if match:
-            city = match.group(1).strip()
-
-        # remove extra weather-related words accidentally captured
-        if city:
-            city = re.sub(
-                r"\b(weather|temperature|forecast|humidity|climate)\b",
-                "",
-                city
-            ).strip()
+    if _TZ_CONVERT.search(norm) or _TZ_PAIR.search(norm):
+        return _intent("convert_timezone", raw, norm, 0.85, query=raw)
+    return None
 
-        return _intent(
-            "get_weather",
-            raw_text,
-            normalized,
-            0.95,
-            city=city
-        )
-    # =========================
-    # NEWS
+
+def _rule_weather(raw: str, norm: str) -> dict[str, Any] | None:
+    if not _WEATHER_WORDS.search(norm):
+        return None
+    # Remove filler words, then "weather in pune" → pune
+    cleaned = _WEATHER_FILLER.sub("", norm).strip()
+    city = None
+    match = _WEATHER_CITY.search(cleaned)
+    if match:
+        city = match.group(1).strip()
+    # remove extra weather-related words accidentally captured
+    if city:
+        city = _WEATHER_WORDS.sub("", city).strip()
+    return _intent("get_weather", raw, norm, 0.95, city=city)
+
+
+def _rule_news(raw: str, norm: str) -> dict[str, Any] | None:
     # e.g. "latest news", "show me tech news"
-    # =========================
-    if re.search(r"\b(news|headlines|top stories|latest updates)\b", normalized):
-        category = "general"
-        for cat in ["business", "entertainment", "health", "science", "sports", "technology"]:
-            if cat in normalized:
-                category = cat
-                break
-        return _intent("get_news", raw_text, normalized, 0.91, category=category)
-
-    # =========================
-    # CRYPTO PRICE
+    if not _NEWS.search(norm):
+        return None
+    category = best(default_gazetteer().find(norm), "news_category") or "general"
+    return _intent("get_news", raw, norm, 0.91, category=category)
+
+
+def _rule_crypto_price(raw: str, norm: str) -> dict[str, Any] | None:
     # e.g. "bitcoin price", "ethereum in inr"
     # Short tickers (eth, btc, doge) must be word-boundary — avoid "eth" in "something".
-    # =========================
-    coin_match = _first_crypto_coin_mention(normalized)
-    if coin_match is None and re.search(r"\b(crypto|coin)\b", normalized):
+    coin_match = _first_crypto_coin_mention(norm)
+    if coin_match is None and _CRYPTO_GENERIC.search(norm):
         coin_match = "bitcoin"
-    if coin_match:
-        currency = "inr"
-        for cur in ["usd", "eur", "inr"]:
-            if cur in normalized:
-                currency = cur
-                break
-        return _intent("get_crypto_price", raw_text, normalized, 0.92,
-                       symbol=coin_match, currency=currency)
-
-    # =========================
-    # CRYPTO PRICE ALERT
+    if not coin_match:
+        return None
+    currency = next((cur for cur in _CURRENCIES if cur in norm), "inr")
+    return _intent("get_crypto_price", raw, norm, 0.92, symbol=coin_match, currency=currency)
+
+
+def _rule_price_alert(raw: str, norm: str) -> dict[str, Any] | None:
     # e.g. "alert me when bitcoin goes above 5000000"
-    # =========================
-    if re.search(r"\b(alert|notify|tell me)\b.*(price|bitcoin|ethereum|crypto)\b", normalized) or \
-       re.search(r"\b(price alert|when .+ (above|below|reaches))\b", normalized):
-        direction = "below" if "below" in normalized else "above"
-        price_match = re.search(r"(\d+)", normalized)
-        target = int(price_match.group(1)) if price_match else None
-        return _intent("check_price_alert", raw_text, normalized, 0.87,
-                       direction=direction, target_price=target)
-
-    # =========================
-    # SCHEDULE TASK / REMINDER
+    if not (_ALERT.search(norm) or _ALERT_THRESHOLD.search(norm)):
+        return None
+    direction = "below" if "below" in norm else "above"
+    price_match = _FIRST_NUMBER.search(norm)
+    target = int(price_match.group(1)) if price_match else None
+    return _intent("check_price_alert", raw, norm, 0.87, direction=direction, target_price=target)
+
+
+def _rule_schedule(raw: str, norm: str) -> dict[str, Any] | None:
     # e.g. "remind me in 10 seconds", "schedule after 5 minutes"
-    # =========================
-    if re.search(r"\b(remind|reminder|schedule|set timer|after|in)\b.*(second|minute|hour)\b", normalized):
-        delay = 0
-        num_match = re.search(r"(\d+)\s*(second|minute|hour)", normalized)
-        if num_match:
-            val = int(num_match.group(1))
-            unit = num_match.group(2)
-            delay = val * (60 if unit == "minute" else 3600 if unit == "hour" else 1)
-        return _intent("schedule_task", raw_text, normalized, 0.88, delay_seconds=delay, query=raw_text)
-
-    # =========================
-    # YOUTUBE PLAY
+    if not _SCHEDULE.search(norm):
+        return None
+    delay = 0
+    num_match = _DELAY.search(norm)
+    if num_match:
+        val = int(num_match.group(1))
+        unit = num_match.group(2)
+        delay = val * (60 if unit == "minute" else 3600 if unit == "hour" else 1)
+    return _intent("schedule_task", raw, norm, 0.88, delay_seconds=delay, query=raw)
+
+
+def _rule_play_youtube(raw: str, norm: str) -> dict[str, Any] | None:
     # e.g. "play despacito on youtube"
-    # =========================
-    if re.search(r"\b(play|open|watch)\b.*(youtube|yt)\b", normalized) or \
-       re.search(r"\byoutube\b.*\b(play|open|watch)\b", normalized):
-        query_match = re.sub(r"\b(play|open|watch|youtube|yt|video|on)\b", "", normalized).strip()
-        return _intent("play_youtube", raw_text, normalized, 0.92, video=query_match)
-
-    # =========================
-    # YOUTUBE SEARCH
+    if not (_YT_PLAY.search(norm) or _YT_PLAY_REV.search(norm)):
+        return None
+    return _intent("play_youtube", raw, norm, 0.92, video=_YT_PLAY_STRIP.sub("", norm).strip())
+
+
+def _rule_search_youtube(raw: str, norm: str) -> dict[str, Any] | None:
     # e.g. "search youtube for lofi music"
-    # =========================
-    if re.search(r"\b(search|find|look up)\b.*(youtube|yt)\b", normalized) or \
-       re.search(r"\byoutube\b.*\b(search|find)\b", normalized):
-        query_match = re.sub(r"\b(search|find|look up|youtube|yt|for)\b", "", normalized).strip()
-        return _intent("search_youtube", raw_text, normalized, 0.92, query=query_match)
-
-    # =========================
-    # DICTIONARY (single-token only; after YouTube so "look up … on youtube" is not a word lookup)
-    # =========================
-    dict_hit = _try_dictionary_intent(raw_text, normalized)
-    if dict_hit:
-        return dict_hit
-
-    # =========================
-    # PLAY MUSIC
-    # =========================
-
-    # PLAY MUSIC
-    if re.search(r"\b(play|start|resume)\b.*\b(music|song|songs|playlist|audio)\b", normalized):
-        return _intent("play_music", raw_text, normalized, 0.91)
-
-    # STOP MUSIC
-    if re.search(r"\b(stop|pause)\b.*\b(music|song|songs|playlist|audio)\b", normalized):
-        return _intent("stop_music", raw_text, normalized, 0.91)
-
-    # RESUME MUSIC
-    if re.search(r"\b(resume|continue|unpause)\b.*\b(music|song|play)\b", normalized):
-        return _intent("resume_music", raw_text, normalized, 0.92)
-
-    # NEXT TRACK
-    if re.search(r"\b(next|skip|next song|next track)\b", normalized):
-        return _intent("next_track", raw_text, normalized, 0.92)
-
-    # PREVIOUS TRACK
-    if re.search(r"\b(previous|prev|last song|go back|previous track)\b", normalized):
-        return _intent("previous_track", raw_text, normalized, 0.92)
-
-    # PLAY BY MOOD
-    if any(mood in normalized for mood in _MOODS):
-        mood_match = next((m for m in _MOODS if m in normalized), None)
-        return _intent("play_by_mood", raw_text, normalized, 0.91, mood=mood_match)
-
-    # STOP MUSIC
-    
-    if re.search(r"\b(stop|pause)\b.*\b(music|song|songs|playlist|audio)\b", normalized):
-        return _intent("stop_music", raw_text, normalized, 0.91)
-    
-    # PLAY ARTIST
-    
-    if re.search(r"\b(play|put on)\b.*\b(by|songs by|music by)\b", normalized):
-        artist_match = re.sub(r"\b(play|put on|songs|music|by)\b", "", normalized).strip()
-        return _intent("play_artist", raw_text, normalized, 0.90, artist=artist_match)
-
-    # PLAY PLAYLIST OR GENRE
-
-    if re.search(r"\bplaylist\b", normalized):
-        genre = re.sub(r"\b(play|playlist|music|songs|jarvis)\b", "", normalized).strip()
-        return _intent("play_playlist", raw_text, normalized, 0.90, genre=genre)
-
-    # =========================
-    # OPEN APP
-    # =========================
-    app_name = _extract_app_name(normalized)
-    if app_name:
-        post_actions: list[str] = []
-        if "maximize" in normalized:
-            post_actions.append("maximize")
-        if "minimize" in normalized:
-            post_actions.append("minimize")
-        return _intent("open_app", raw_text, normalized, 0.90, app=app_name, post_actions=post_actions)
-
-    # =========================
-    # GET VOLUME / GET BRIGHTNESS (current level)
-    # =========================
-    if _VOLUME_LEVEL_QUERY.search(normalized):
-        return _intent("get_volume", raw_text, normalized, 0.94)
-    if _BRIGHTNESS_LEVEL_QUERY.search(normalized):
-        return _intent("get_brightness", raw_text, normalized, 0.94)
-
-    # =========================
-    # VOLUME STEP
-    # =========================
-    if re.search(
-        r"\b(volume\s+up|increase\s+volume|turn\s+up\s+(the\s+)?volume|louder|more\s+volume)\b",
-        normalized,
-    ):
-        return _intent("volume_up", raw_text, normalized, 0.93)
-    if re.search(
-        r"\b(volume\s+down|decrease\s+volume|turn\s+down\s+(the\s+)?volume|quieter|less\s+volume)\b",
-        normalized,
-    ):
-        return _intent("volume_down", raw_text, normalized, 0.93)
+    if not (_YT_SEARCH.search(norm) or _YT_SEARCH_REV.search(norm)):
+        return None
+    return _intent("search_youtube", raw, norm, 0.92, query=_YT_SEARCH_STRIP.sub("", norm).strip())
 
-    # =========================
-    # BRIGHTNESS STEP
-    # =========================
-    if re.search(
-        r"\b(brightness\s+up|increase\s+brightness|brighter|more\s+brightness)\b",
-        normalized,
-    ):
-        return _intent("brightness_up", raw_text, normalized, 0.93)
-    if re.search(
-        r"\b(brightness\s+down|decrease\s+brightness|dimmer|less\s+brightness)\b",
-        normalized,
-    ):
-        return _intent("brightness_down", raw_text, normalized, 0.93)
 
-    # =========================
-    # SET BRIGHTNESS / SET VOLUME (same names as system/router.py)
-    # =========================
-    bright_explicit = "brightness" in normalized and not _is_explanatory_chat(normalized)
+def _rule_play_music(raw: str, norm: str) -> dict[str, Any] | None:
+    if _PLAY_MUSIC.search(norm):
+        return _intent("play_music", raw, norm, 0.91)
+    return None
+
+
+def _rule_stop_music(raw: str, norm: str) -> dict[str, Any] | None:
+    if _STOP_MUSIC.search(norm):
+        return _intent("stop_music", raw, norm, 0.91)
+    return None
+
+
+def _rule_resume_music(raw: str, norm: str) -> dict[str, Any] | None:
+    if _RESUME_MUSIC.search(norm):
+        return _intent("resume_music", raw, norm, 0.92)
+    return None
+
+
+def _rule_next_track(raw: str, norm: str) -> dict[str, Any] | None:
+    if _NEXT_TRACK.search(norm):
+        return _intent("next_track", raw, norm, 0.92)
+    return None
+
+
+def _rule_previous_track(raw: str, norm: str) -> dict[str, Any] | None:
+    if _PREVIOUS_TRACK.search(norm):
+        return _intent("previous_track", raw, norm, 0.92)
+    return None
+
+
+def _rule_play_by_mood(raw: str, norm: str) -> dict[str, Any] | None:
+    mood_match = best(default_gazetteer().find(norm), "mood")
+    if mood_match is None:
+        return None
+    return _intent("play_by_mood", raw, norm, 0.91, mood=mood_match)
+
+
+def _rule_play_artist(raw: str, norm: str) -> dict[str, Any] | None:
+    if not _PLAY_ARTIST.search(norm):
+        return None
+    return _intent("play_artist", raw, norm, 0.90, artist=_ARTIST_STRIP.sub("", norm).strip())
+
+
+def _rule_play_playlist(raw: str, norm: str) -> dict[str, Any] | None:
+    if not _PLAYLIST.search(norm):
+        return None
+    return _intent("play_playlist", raw, norm, 0.90, genre=_PLAYLIST_STRIP.sub("", norm).strip())
+
+
+def _rule_open_app(raw: str, norm: str) -> dict[str, Any] | None:
+    app_name = _extract_app_name(norm)
+    if not app_name:
+        return None
+    post_actions: list[str] = []
+    if "maximize" in norm:
+        post_actions.append("maximize")
+    if "minimize" in norm:
+        post_actions.append("minimize")
+    return _intent("open_app", raw, norm, 0.90, app=app_name, post_actions=post_actions)
+
+
+def _rule_get_volume(raw: str, norm: str) -> dict[str, Any] | None:
+    if _VOLUME_LEVEL_QUERY.search(norm):
+        return _intent("get_volume", raw, norm, 0.94)
+    return None
+
+
+def _rule_get_brightness(raw: str, norm: str) -> dict[str, Any] | None:
+    if _BRIGHTNESS_LEVEL_QUERY.search(norm):
+        return _intent("get_brightness", raw, norm, 0.94)
+    return None
+
+
+def _rule_volume_up(raw: str, norm: str) -> dict[str, Any] | None:
+    if _VOLUME_UP.search(norm):
+        return _intent("volume_up", raw, norm, 0.93)
+    return None
+
+
+def _rule_volume_down(raw: str, norm: str) -> dict[str, Any] | None:
+    if _VOLUME_DOWN.search(norm):
+        return _intent("volume_down", raw, norm, 0.93)
+    return None
+
+
+def _rule_brightness_up(raw: str, norm: str) -> dict[str, Any] | None:
+    if _BRIGHTNESS_UP.search(norm):
+        return _intent("brightness_up", raw, norm, 0.93)
+    return None
+
+
+def _rule_brightness_down(raw: str, norm: str) -> dict[str, Any] | None:
+    if _BRIGHTNESS_DOWN.search(norm):
+        return _intent("brightness_down", raw, norm, 0.93)
+    return None
+
+
+def _rule_set_brightness(raw: str, norm: str) -> dict[str, Any] | None:
+    # Same names as system/router.py. Runs untriggered: the session branch
+    # depends on context.active_domain rather than on words in the utterance.
+    bright_explicit = "brightness" in norm and not _is_explanatory_chat(norm)
     bright_session = (
         context.active_domain == "brightness"
-        and not _is_explanatory_chat(normalized)
-        and "brightness" not in normalized
+        and not _is_explanatory_chat(norm)
+        and "brightness" not in norm
         and (
-            re.search(r"\b(set|put|make)\b", normalized)
-            or re.search(r"\b(max|full|min|zero)\b", normalized)
-            or re.match(r"^(\d{1,3})(?:\s*(?:%|percent))?$", normalized.strip())
+            _SET_VERB.search(norm)
+            or _BRIGHTNESS_EXTREME.search(norm)
+            or _BARE_LEVEL.match(norm.strip())
         )
     )
-    if bright_explicit or bright_session:
-        if "max" in normalized or "full" in normalized:
-            return _intent("set_brightness", raw_text, normalized, 0.95, level=100)
-        if "min" in normalized or "zero" in normalized:
-            return _intent("set_brightness", raw_text, normalized, 0.95, level=0)
-        match = re.search(r"(\d+)", normalized)
-        if match:
-            return _intent(
-                "set_brightness",
-                raw_text,
-                normalized,
-                0.9,
-                level=_clamp_level(int(match.group(1))),
-            )
-        return _intent("set_brightness", raw_text, normalized, 0.7)
-
-    vol_explicit = "volume" in normalized and not _is_explanatory_chat(normalized)
+    if not (bright_explicit or bright_session):
+        return None
+    if "max" in norm or "full" in norm:
+        return _intent("set_brightness", raw, norm, 0.95, level=100)
+    if "min" in norm or "zero" in norm:
+        return _intent("set_brightness", raw, norm, 0.95, level=0)
+    match = _FIRST_NUMBER.search(norm)
+    if match:
+        return _intent("set_brightness", raw, norm, 0.9, level=_clamp_level(int(match.group(1))))
+    return _intent("set_brightness", raw, norm, 0.7)
+
+
+def _rule_set_volume(raw: str, norm: str) -> dict[str, Any] | None:
+    vol_explicit = "volume" in norm and not _is_explanatory_chat(norm)
     vol_session = (
         context.active_domain == "volume"
-        and not _is_explanatory_chat(normalized)
-        and "volume" not in normalized
+        and not _is_explanatory_chat(norm)
+        and "volume" not in norm
         and (
-            re.search(r"\b(set|put|make)\b", normalized)
-            or re.search(r"\b(max|full|min|mute|zero)\b", normalized)
-            or re.match(r"^(\d{1,3})(?:\s*(?:%|percent))?$", normalized.strip())
+            _SET_VERB.search(norm)
+            or _VOLUME_EXTREME.search(norm)
+            or _BARE_LEVEL.match(norm.strip())
         )
     )
-    if vol_explicit or vol_session:
-        if "max" in normalized or "full" in normalized:
-            return _intent("set_volume", raw_text, normalized, 0.95, level=100)
-        if "min" in normalized or "mute" in normalized:
-            return _intent("set_volume", raw_text, normalized, 0.95, level=0)
-        match = re.search(r"(\d+)", normalized)
-        if match:
-            return _intent(
-                "set_volume",
-                raw_text,
-                normalized,
-                0.9,
-                level=_clamp_level(int(match.group(1))),
-            )
-        return _intent("set_volume", raw_text, normalized, 0.7)
-
-    # =========================
-    # FILE MANAGEMENT
-    # =========================
-    if "create folder" in normalized:
-        name = normalized.replace("create folder", "").strip()
-        return _intent("file_manager", raw_text, normalized, 0.9, action="create_folder", name=name)
-
-    if re.search(r"\bdelete\b", normalized):
-        name = re.sub(r"\bdelete\b", "", normalized).strip()
-        return _intent("file_manager", raw_text, normalized, 0.85, action="delete", name=name)
-
-    if re.search(r"\b(rename|move|copy)\b", normalized):
-        action_match = re.search(r"\b(rename|move|copy)\b", normalized)
-        action = action_match.group(1) if action_match else "unknown"
-        name = re.sub(r"\b(rename|move|copy)\b", "", normalized).strip()
-        return _intent("file_manager", raw_text, normalized, 0.85, action=action, name=name)
-
-    # =========================
-    # PROCESS MANAGER
-    # =========================
-    if re.search(r"\b(kill|terminate|end)\b.*\b(process|task|app)\b", normalized):
-        name = re.sub(r"\b(kill|terminate|end|process|task|app)\b", "", normalized).strip()
-        return _intent("process_manager", raw_text, normalized, 0.88, action="kill", name=name)
-
-    if re.search(r"\b(list|show)\b.*\b(process|processes|tasks)\b", normalized):
-        return _intent("process_manager", raw_text, normalized, 0.88, action="list")
-
-    # =========================
-    # WINDOW (aligned with system/router.py)
-    # =========================
-    if "minimize" in normalized:
-        return _intent("minimize", raw_text, normalized, 0.9)
-
-    if "maximize" in normalized:
-        return _intent("maximize", raw_text, normalized, 0.9)
-
-    if re.search(r"\bclose\s+window\b", normalized):
-        return _intent("close", raw_text, normalized, 0.9)
-
-    if re.search(r"\brestore\s+window\b", normalized) or normalized.strip() == "restore":
-        return _intent("restore", raw_text, normalized, 0.88)
-
-    focus_match = re.search(r"\bfocus\s+(?:on\s+)?(.+)$", normalized)
-    if focus_match:
-        fname = re.sub(r"\b(please|window|the)\b", "", focus_match.group(1)).strip()
-        if fname:
-            return _intent("focus", raw_text, normalized, 0.88, name=fname)
-
-    if re.search(r"\bmove\s+window\b", normalized):
-        return _intent("move_window", raw_text, normalized, 0.85)
-
-    if re.search(r"\bresize\s+window\b", normalized):
-        return _intent("resize_window", raw_text, normalized, 0.85)
-
-    # =========================
-    # SCREENSHOT
-    # =========================
-    if "screenshot" in normalized or "take a snap" in normalized:
-        return _intent("take_screenshot", raw_text, normalized, 0.9)
-
-    # =========================
-    # RUN CODE
-    # =========================
-    if re.search(r"\brun\s+python\b", normalized):
-        file = re.sub(r"\brun\s+python\b", "", normalized).strip()
-        return _intent("run_code", raw_text, normalized, 0.9, file=file)
-
-    # =========================
-    # EVALUATE TRIGGER (IF-THEN)
+    if not (vol_explicit or vol_session):
+        return None
+    if "max" in norm or "full" in norm:
+        return _intent("set_volume", raw, norm, 0.95, level=100)
+    if "min" in norm or "mute" in norm:
+        return _intent("set_volume", raw, norm, 0.95, level=0)
+    match = _FIRST_NUMBER.search(norm)
+    if match:
+        return _intent("set_volume", raw, norm, 0.9, level=_clamp_level(int(match.group(1))))
+    return _intent("set_volume", raw, norm, 0.7)
+
+
+def _rule_create_folder(raw: str, norm: str) -> dict[str, Any] | None:
+    if "create folder" not in norm:
+        return None
+    name = norm.replace("create folder", "").strip()
+    return _intent("file_manager", raw, norm, 0.9, action="create_folder", name=name)
+
+
+def _rule_delete(raw: str, norm: str) -> dict[str, Any] | None:
+    if not _DELETE.search(norm):
+        return None
+    return _intent("file_manager", raw, norm, 0.85, action="delete", name=_DELETE.sub("", norm).strip())
+
+
+def _rule_file_action(raw: str, norm: str) -> dict[str, Any] | None:
+    action_match = _FILE_ACTION.search(norm)
+    if not action_match:
+        return None
+    name = _FILE_ACTION.sub("", norm).strip()
+    return _intent("file_manager", raw, norm, 0.85, action=action_match.group(1), name=name)
+
+
+def _rule_kill_process(raw: str, norm: str) -> dict[str, Any] | None:
+    if not _KILL_PROCESS.search(norm):
+        return None
+    name = _KILL_STRIP.sub("", norm).strip()
+    return _intent("process_manager", raw, norm, 0.88, action="kill", name=name)
+
+
+def _rule_list_processes(raw: str, norm: str) -> dict[str, Any] | None:
+    if _LIST_PROCESSES.search(norm):
+        return _intent("process_manager", raw, norm, 0.88, action="list")
+    return None
+
+
+def _rule_minimize(raw: str, norm: str) -> dict[str, Any] | None:
+    if "minimize" in norm:
+        return _intent("minimize", raw, norm, 0.9)
+    return None
+
+
+def _rule_maximize(raw: str, norm: str) -> dict[str, Any] | None:
+    if "maximize" in norm:
+        return _intent("maximize", raw, norm, 0.9)
+    return None
+
+
+def _rule_close_window(raw: str, norm: str) -> dict[str, Any] | None:
+    if _CLOSE_WINDOW.search(norm):
+        return _intent("close", raw, norm, 0.9)
+    return None
+
+
+def _rule_restore_window(raw: str, norm: str) -> dict[str, Any] | None:
+    if _RESTORE_WINDOW.search(norm) or norm.strip() == "restore":
+        return _intent("restore", raw, norm, 0.88)
+    return None
+
+
+def _rule_focus(raw: str, norm: str) -> dict[str, Any] | None:
+    focus_match = _FOCUS.search(norm)
+    if not focus_match:
+        return None
+    fname = _FOCUS_STRIP.sub("", focus_match.group(1)).strip()
+    if not fname:
+        return None
+    return _intent("focus", raw, norm, 0.88, name=fname)
+
+
+def _rule_move_window(raw: str, norm: str) -> dict[str, Any] | None:
+    if _MOVE_WINDOW.search(norm):
+        return _intent("move_window", raw, norm, 0.85)
+    return None
+
+
+def _rule_resize_window(raw: str, norm: str) -> dict[str, Any] | None:
+    if _RESIZE_WINDOW.search(norm):
+        return _intent("resize_window", raw, norm, 0.85)
+    return None
+
+
+def _rule_screenshot(raw: str, norm: str) -> dict[str, Any] | None:
+    if "screenshot" in norm or "take a snap" in norm:
+        return _intent("take_screenshot", raw, norm, 0.9)
+    return None
+
+
+def _rule_run_code(raw: str, norm: str) -> dict[str, Any] | None:
+    if not _RUN_PYTHON.search(norm):
+        return None
+    return _intent("run_code", raw, norm, 0.9, file=_RUN_PYTHON.sub("", norm).strip())
+
+
+def _rule_evaluate_trigger(raw: str, norm: str) -> dict[str, Any] | None:
     # e.g. "if battery low then notify me"
-    # =========================
-    if re.search(r"\bif\b.+\bthen\b", normalized):
-        return _intent("evaluate_trigger", raw_text, normalized, 0.80, query=raw_text)
-
-    # =========================
-    # APPLY RULES
-    # =========================
-    if re.search(r"\b(apply rules|run rules|check rules|automation rules)\b", normalized):
-        return _intent("apply_rules", raw_text, normalized, 0.80, query=raw_text)
-
-    # =========================
-    # CHAT — clear Q&A / explanation (everything above failed; do not guess a tool intent)
-    # =========================
-    if _is_explanatory_chat(normalized):
-        return _intent("chat", raw_text, normalized, 0.9)
-
-    # =========================
-    # LOCAL CLASSIFIER FALLBACK (commands / ambiguous phrasing not matched above)
-    # =========================
+    if _IF_THEN.search(norm):
+        return _intent("evaluate_trigger", raw, norm, 0.80, query=raw)
+    return None
+
+
+def _rule_apply_rules(raw: str, norm: str) -> dict[str, Any] | None:
+    if _APPLY_RULES.search(norm):
+        return _intent("apply_rules", raw, norm, 0.80, query=raw)
     return None
 
 
+def _rule_chat(raw: str, norm: str) -> dict[str, Any] | None:
+    # Clear Q&A / explanation once every tool rule failed; do not guess a tool intent.
+    if _is_explanatory_chat(norm):
+        return _intent("chat", raw, norm, 0.9)
+    return None
+
+
+def _words(*words: str) -> frozenset[str]:
+    return frozenset(words)
+
+
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_MUSIC_NOUNS = ("music", "song", "playlist", "audio")
+
+_RULES: tuple[IntentRule, ...] = (
+    IntentRule("exit", _rule_exit, _words("exit", "quit", "shutdown", "bye", "goodbye", "close")),
+    IntentRule("greeting", _rule_greeting, _words("hey", "hi", "hello")),
+    IntentRule("get_time", _rule_time, _words("time")),
+    IntentRule(
+        "get_date",
+        _rule_date,
+        _words("date", "day", "tomorrow", "week", "tomorrows", *_WEEKDAYS),
+    ),
+    IntentRule("advice_time", _rule_advice_time, _words("time", "when")),
+    IntentRule(
+        "convert_timezone",
+        _rule_timezone,
+        _words("convert", "change", "ist", "utc", "gmt", "pst", "est", "cst"),
+    ),
+    IntentRule(
+        "get_weather",
+        _rule_weather,
+        _words("weather", "temperature", "forecast", "humidity", "climate"),
+    ),
+    IntentRule("get_news", _rule_news, _words("news", "headlines", "stories", "updates")),
+    IntentRule(
+        "get_crypto_price",
+        _rule_crypto_price,
+        substrings=(*CRYPTO_NAMES, *CRYPTO_TICKERS, "crypto", "coin"),
+    ),
+    IntentRule("check_price_alert", _rule_price_alert, _words("alert", "notify", "tell", "when")),
+    IntentRule(
+        "schedule_task",
+        _rule_schedule,
+        _words("remind", "reminder", "schedule", "set", "after", "in"),
+        ("second", "minute", "hour"),
+    ),
+    IntentRule("play_youtube", _rule_play_youtube, _words("play", "open", "watch"), ("youtube", "yt")),
+    IntentRule("search_youtube", _rule_search_youtube, _words("search", "find", "look"), ("youtube", "yt")),
+    # Dictionary is single-token only and sits after YouTube so
+    # "look up … on youtube" is not a word lookup.
+    IntentRule(
+        "lookup_word",
+        _try_dictionary_intent,
+        _words("define", "meaning", "definition", "does", "look"),
+    ),
+    IntentRule("play_music", _rule_play_music, _words("play", "start", "resume"), _MUSIC_NOUNS),
+    IntentRule("stop_music", _rule_stop_music, _words("stop", "pause"), _MUSIC_NOUNS),
+    IntentRule(
+        "resume_music",
+        _rule_resume_music,
+        _words("resume", "continue", "unpause"),
+        ("music", "song", "play"),
+    ),
+    IntentRule("next_track", _rule_next_track, _words("next", "skip")),
+    IntentRule("previous_track", _rule_previous_track, _words("previous", "prev", "last", "go")),
+    IntentRule("play_by_mood", _rule_play_by_mood, frozenset(MOODS)),
+    IntentRule("play_artist", _rule_play_artist, _words("play", "put"), ("by",)),
+    IntentRule("play_playlist", _rule_play_playlist, _words("playlist")),
+    IntentRule("open_app", _rule_open_app, _words("open", "launch", "start", "run")),
+    IntentRule("get_volume", _rule_get_volume, _words("volume", "loud")),
+    IntentRule("get_brightness", _rule_get_brightness, _words("brightness")),
+    IntentRule("volume_up", _rule_volume_up, _words("volume", "louder")),
+    IntentRule("volume_down", _rule_volume_down, _words("volume", "quieter")),
+    IntentRule("brightness_up", _rule_brightness_up, _words("brightness", "brighter")),
+    IntentRule("brightness_down", _rule_brightness_down, _words("brightness", "dimmer")),
+    IntentRule("set_brightness", _rule_set_brightness),
+    IntentRule("set_volume", _rule_set_volume),
+    IntentRule("create_folder", _rule_create_folder, substrings=("create folder",)),
+    IntentRule("delete", _rule_delete, _words("delete")),
+    IntentRule("file_action", _rule_file_action, _words("rename", "move", "copy")),
+    IntentRule("kill_process", _rule_kill_process, _words("kill", "terminate", "end"), ("process", "task", "app")),
+    IntentRule("list_processes", _rule_list_processes, _words("list", "show"), ("process", "tasks")),
+    IntentRule("minimize", _rule_minimize, substrings=("minimize",)),
+    IntentRule("maximize", _rule_maximize, substrings=("maximize",)),
+    IntentRule("close", _rule_close_window, _words("close")),
+    IntentRule("restore", _rule_restore_window, _words("restore")),
+    IntentRule("focus", _rule_focus, _words("focus")),
+    IntentRule("move_window", _rule_move_window, _words("move")),
+    IntentRule("resize_window", _rule_resize_window, _words("resize")),
+    IntentRule("take_screenshot", _rule_screenshot, substrings=("screenshot", "take a snap")),
+    IntentRule("run_code", _rule_run_code, _words("python")),
+    IntentRule("evaluate_trigger", _rule_evaluate_trigger, _words("if"), ("then",)),
+    IntentRule("apply_rules", _rule_apply_rules, _words("rules")),
+    IntentRule("chat", _rule_chat),
+)
+
+INTENT_MATCHER = IntentMatcher(_RULES)
+
+# Misspelled words are corrected towards what the rules and the classifier react to.
+register_vocabulary(INTENT_MATCHER.vocabulary() | NLU_CLASSIFIER.vocabulary())
+register_vocabulary(pattern_words(value for value in list(globals().values()) if isinstance(value, re.Pattern)))
+
+
 # =========================
-# ORCHESTRATED DETECTOR
+# MAIN DETECTOR
 # =========================
-def detect_intent(text: str, memory_context: dict[str, Any] | None = None) -> dict[str, Any]:
+def _regex_fallback_intent(text: str) -> dict[str, Any] | None:
 
     if not text or not text.strip():
         return _unknown_intent()
 
     raw_text = text.strip()
     normalized = _normalize(raw_text)
+
+    follow = _resolve_active_domain_followup(raw_text, normalized)
+    if follow is not None:
+        return follow
+
+    # LOCAL CLASSIFIER FALLBACK when no rule matched (commands / ambiguous phrasing).
+    return INTENT_MATCHER.match(raw_text, normalized)
+
+
+# =========================
+# ORCHESTRATED DETECTOR
+# =========================
+def detect_intent(text: str | Utterance, memory_context: Mapping[str, Any] | None = None) -> dict[str, Any]:
+    """Resolve ``text`` to an intent dict.
+
+    Callers that go on to the dialogue manager and router should pass an
+    ``Utterance`` so the parse done here is the one they reuse.
+    """
+    utterance = text if isinstance(text, Utterance) else None
+    raw_text = utterance.raw if utterance is not None else (text or "").strip()
+    if not raw_text:
+        return _unknown_intent()
+
+    # Keyed on what was typed: slots keep the typed words, so two spellings
+    # that correct to the same text do not share a result.
+    normalized = utterance.uncorrected if utterance is not None else _normalize(raw_text)
     memory_context = memory_context or {}
 
-    # deterministic quick checks (exit/safety)
-    if re.fullmatch(r"(?:exit|quit|shutdown|bye|goodbye|close jarvis)", normalized):
-        return _intent("exit", raw_text, normalized, 1.0, source="deterministic", model_confidence=1.0)
+    fingerprint = _memo_fingerprint(memory_context)
+    cached = INTENT_MEMO.get(normalized, fingerprint)
+    if cached is not None:
+        return _refresh_cached_intent(cached, raw_text)
+
+    result, cacheable = _detect_intent_uncached(utterance or Utterance.parse(raw_text), memory_context)
+    result["text"] = raw_text
+    if cacheable:
+        INTENT_MEMO.put(normalized, fingerprint, result)
+    return result
 
-    if re.search(r"\b(emergency stop|panic stop|abort all)\b", normalized):
-        return _intent("exit", raw_text, normalized, 0.98, source="deterministic", model_confidence=0.98)
+
+def _detect_intent_uncached(utterance: Utterance, memory_context: Mapping[str, Any]) -> tuple[dict[str, Any], bool]:
+    """Full NLU pipeline; the flag says whether the result may be memoized.
+
+    Rules and follow-ups read the spell-corrected text, unless what was typed
+    already matches a rule for another intent; free-text slots always keep the
+    typed words, and ``detect_intent`` puts what the user actually typed back
+    into ``text``.
+    """
+    if utterance.corrected != utterance.raw and _typed_rule_wins(utterance):
+        utterance = utterance.as_typed()
+    raw_text, normalized = utterance.corrected, utterance.normalized
+    quick = _deterministic_intent(raw_text, normalized)
+    if quick is not None:
+        return quick, True
 
     follow = _resolve_active_domain_followup(raw_text, normalized)
     if follow is not None:
         follow.setdefault("source", "context_followup")
         follow.setdefault("model_confidence", follow.get("confidence", 0.0))
         follow.setdefault("disambiguation_needed", False)
-        return follow
+        return follow, True
 
     date_follow = _resolve_relative_date_followup(raw_text, normalized)
     if date_follow is not None:
         date_follow.setdefault("source", "context_followup")
         date_follow.setdefault("model_confidence", date_follow.get("confidence", 0.0))
         date_follow.setdefault("disambiguation_needed", False)
-        return date_follow
+        return date_follow, True
     temporal_follow = FOLLOWUP_RESOLVER.resolve_temporal_followup(
         raw_text, normalized, _last_intent_from_memory(memory_context) or context.get_last_intent()
     )
@@ -749,22 +900,28 @@ def detect_intent(text: str, memory_context: dict[str, Any] | None = None) -> di
             model_confidence=0.9,
             disambiguation_needed=False,
             **{k: v for k, v in temporal_follow.items() if k != "intent"},
-        )
+        ), True
 
-    regex_hit = _regex_fallback_intent(raw_text)
+    # The active-domain follow-up already ran above, so go straight to the rules.
+    regex_hit = INTENT_MATCHER.match(raw_text, normalized)
     if regex_hit is not None:
+        _restore_typed_slots(regex_hit, utterance)
         regex_hit["source"] = "regex"
         regex_hit["model_confidence"] = regex_hit.get("confidence", 0.0)
         regex_hit["disambiguation_needed"] = False
-        return regex_hit
+        return regex_hit, True
 
-    cls = NLU_CLASSIFIER.classify(raw_text, normalized)
-    slots = SLOT_FILLER.fill(intent=cls.intent, raw_text=raw_text, normalized=normalized)
+    cls = NLU_CLASSIFIER.classify(raw_text, normalized, tokens=utterance.tokens)
+    slots = SLOT_FILLER.fill(intent=cls.intent, utterance=utterance)
 
     required = REQUIRED_SLOTS.get(cls.intent, ())
+    # Filling missing slots from earlier turns depends on history the memo
+    # fingerprint does not capture, so only complete frames are memoized.
+    history_free = all(slots.get(key) for key in required)
     slots, follow_meta = FOLLOWUP_RESOLVER.resolve_slots(
         raw_text=raw_text,
         normalized=normalized,
+        utterance=utterance,
         intent=cls.intent,
         slots=slots,
         required_slots=required,
@@ -780,7 +937,7 @@ def detect_intent(text: str, memory_context: dict[str, Any] | None = None) -> di
             model_confidence=0.95,
             disambiguation_needed=True,
             response=follow_meta["ambiguity"],
-        )
+        ), False
     disambiguation_needed = any(not slots.get(key) for key in required)
 
     if cls.confidence >= LOCAL_INTENT_THRESHOLD:
@@ -793,7 +950,7 @@ def detect_intent(text: str, memory_context: dict[str, Any] | None = None) -> di
             model_confidence=cls.confidence,
             disambiguation_needed=disambiguation_needed,
             **slots,
-        )
+        ), history_free
 
     return _intent(
         "chat",
@@ -803,51 +960,92 @@ def detect_intent(text: str, memory_context: dict[str, Any] | None = None) -> di
         source="local_classifier_fallback",
         model_confidence=cls.confidence,
         disambiguation_needed=False,
-    )
+    ), history_free
 
 
 # =========================
 # HELPERS
 # =========================
 
-def _last_intent_from_memory(memory_context: dict[str, Any]) -> str | None:
-    for turn in reversed(memory_context.get("recent_turns", []) or []):
-        user_msg = turn.get("user") if isinstance(turn, dict) else {}
-        metadata = user_msg.get("metadata") if isinstance(user_msg, dict) else {}
-        intent = metadata.get("intent") if isinstance(metadata, dict) else None
-        if intent:
-            return str(intent)
+def _deterministic_intent(raw_text: str, normalized: str) -> dict[str, Any] | None:
+    """Quick exit/safety checks that run before any other stage."""
+    if re.fullmatch(r"(?:exit|quit|shutdown|bye|goodbye|close jarvis)", normalized):
+        return _intent("exit", raw_text, normalized, 1.0, source="deterministic", model_confidence=1.0)
+
+    if re.search(r"\b(emergency stop|panic stop|abort all)\b", normalized):
+        return _intent("exit", raw_text, normalized, 0.98, source="deterministic", model_confidence=0.98)
     return None
 
 
+_TEMPORAL_INTENTS = frozenset({"get_date", "get_time"})
+
+
+def _memo_fingerprint(memory_context: Mapping[str, Any]) -> tuple:
+    """Dialogue state a memoized result was resolved under.
+
+    Last intents only matter to the temporal follow-ups, which ignore anything
+    that is not a date/time turn, so they are reduced to a flag to keep the hit
+    rate up across ordinary turns.
+    """
+    return (
+        context.active_domain,
+        context.get_last_date_ref(),
+        context.pending_intent,
+        context.get_last_intent() in _TEMPORAL_INTENTS,
+        _last_intent_from_memory(memory_context) in _TEMPORAL_INTENTS,
+        NLU_CLASSIFIER.embedder_ready,
+    )
+
+
+def _refresh_cached_intent(result: dict[str, Any], raw_text: str) -> dict[str, Any]:
+    """Re-anchor a memo hit to this utterance and to the current clock."""
+    result["text"] = raw_text
+    if result.get("date_ref") and "resolved_date" in result:
+        # date_ref is the canonical expression ("tomorrow", "next friday"), so
+        # re-resolving it moves the dates without redoing follow-up handling.
+        slots = TEMPORAL_REASONER.resolve(date_ref=result["date_ref"]).as_slots()
+        slots["temporal_followup"] = result.get("temporal_followup", False)
+        result.update(slots)
+    return result
+
+
+def _typed_rule_wins(utterance: Utterance) -> bool:
+    """Whether a rule matches the text as typed and the correction would change its intent."""
+    typed = INTENT_MATCHER.match(utterance.raw, utterance.uncorrected)
+    if typed is None:
+        return False
+    corrected = INTENT_MATCHER.match(utterance.corrected, utterance.normalized)
+    return corrected is None or corrected["intent"] != typed["intent"]
+
+
+_TYPED_SLOTS = ("video", "query", "topic", "word", "name", "file", "artist", "genre")
+
+
+def _restore_typed_slots(result: dict[str, Any], utterance: Utterance) -> None:
+    """Put the words a correction changed back into the user's own slot text."""
+    if utterance.corrected == utterance.raw:
+        return
+    for key in _TYPED_SLOTS:
+        value = result.get(key)
+        if value == utterance.corrected:
+            result[key] = utterance.raw
+        elif isinstance(value, str):
+            result[key] = utterance.typed(value)
+    if result.get("app") and utterance.app_candidates:
+        result["app"] = canonicalize_app_name(utterance.app_candidates[0])
+
+
+def _last_intent_from_memory(memory_context: Mapping[str, Any]) -> str | None:
+    return last_intent(memory_context)
+
+
 def _normalize(text: str) -> str:
-    text = text.lower().strip()
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text
+    return normalize_text(text)
 
 
 def _extract_app_name(text: str) -> str | None:
-    patterns = [
-        r"\bopen\s+(.+)$",
-        r"\blaunch\s+(.+)$",
-        r"\bstart\s+(.+)$",
-        r"\brun\s+(.+)$",
-    ]
-    best: tuple[int, str] | None = None
-    for p in patterns:
-        for m in re.finditer(p, text):
-            start, candidate = m.start(), m.group(1).strip()
-            if best is None or start >= best[0]:
-                best = (start, candidate)
-    if not best:
-        return None
-    candidate = re.split(r"\b(and|then)\b", best[1], maxsplit=1)[0].strip()
-    tokens = [t for t in candidate.split() if t not in _APP_STOPWORDS and t != "it"]
-    if not tokens:
-        return None
-    raw_name = " ".join(tokens[:5])
-    return canonicalize_app_name(raw_name)
+    names = app_candidates(text)
+    return canonicalize_app_name(names[0]) if names else None
 
 
 def _intent(intent: str, raw: str, norm: str, confidence: float, **extra: Any) -> dict:
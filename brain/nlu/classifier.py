@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterable
+import threading
+from collections.abc import Collection, Sequence
 from dataclasses import dataclass
-from math import sqrt
 
+from brain.nlu.embedding_cache import PrototypeEmbeddingCache
+from brain.nlu.intent_index import INDEX_STOPWORDS, IntentIndex, bigrams, index_tokens
+from brain.nlu.spelling import pattern_words
 from brain.nlu.schema import AVAILABLE_INTENTS
 
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
 
 @dataclass(slots=True)
 class ClassificationResult:
@@ -18,7 +23,15 @@ class ClassificationResult:
 class IntentClassifier:
     """Hybrid classifier: optional sentence embeddings + lightweight keyword scoring."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        load_on_demand: bool = True,
+        embedding_cache: PrototypeEmbeddingCache | None = None,
+    ) -> None:
+        self._model_name = model_name
+        self._embedding_cache = embedding_cache
+        self._load_on_demand = load_on_demand
         self._embedder = None
         self._prototypes: dict[str, list[str]] = {
             "open_app": ["open chrome", "launch vscode", "start spotify"],
@@ -51,7 +64,7 @@ class IntentClassifier:
             (re.compile(r"\b(youtube|yt)\b.*\b(play|watch)\b|\b(play|watch)\b.*\b(youtube|yt)\b"), "play_youtube", 0.82),
             (re.compile(r"\b(search|find|look up)\b.*\b(youtube|yt)\b"), "search_youtube", 0.82),
             (re.compile(r"\b(what\s+time|current\s+time|time\s+now)\b"), "get_time", 0.9),
-            (re.compile(r"\b(what\s+date|today\'?s\s+date|current\s+date|what\s+day|tomorrow\s+date|tomorrow\s+day|what\s+is\s+tomorrow|todays\s+day|tommorow|tomarow|tomarrows|tomorrows)\b"), "get_date", 0.9),
+            (re.compile(r"\b(what\s+date|today\'?s\s+date|current\s+date|what\s+day|tomorrow\s+date|tomorrow\s+day|what\s+is\s+tomorrow|todays\s+day|tomorrows)\b"), "get_date", 0.9),
             (re.compile(r"\b(play|start)\b.*\b(music|song|playlist)\b"), "play_music", 0.82),
             (re.compile(r"\b(stop|pause)\b.*\b(music|song|playlist)\b"), "stop_music", 0.82),
             (re.compile(r"\b(volume)\b.*\b(set|to|percent|%)\b"), "set_volume", 0.8),
@@ -60,40 +73,176 @@ class IntentClassifier:
             (re.compile(r"\b(remind|schedule|timer|after|in)\b.*\b(second|minute|hour)\b"), "schedule_task", 0.81),
             (re.compile(r"\b(screenshot|screen shot|take a snap)\b"), "take_screenshot", 0.86),
         ]
+        # Words without which each hint above cannot match; they feed the index.
+        self._hint_keys: dict[str, tuple[str, ...]] = {
+            "get_weather": ("weather", "temperature", "forecast"),
+            "get_news": ("news", "headlines", "top stories"),
+            "open_app": ("open", "launch", "start"),
+            "play_youtube": ("youtube", "yt"),
+            "search_youtube": ("youtube", "yt"),
+            "get_time": ("time",),
+            "get_date": ("date", "day", "tomorrow", "todays", "tomorrows"),
+            "play_music": ("music", "song", "playlist"),
+            "stop_music": ("music", "song", "playlist"),
+            "set_volume": ("volume",),
+            "set_brightness": ("brightness",),
+            "get_crypto_price": ("crypto", "bitcoin", "ethereum", "btc", "eth", "doge"),
+            "schedule_task": ("second", "minute", "hour"),
+            "take_screenshot": ("screenshot", "screen shot", "take a snap"),
+        }
+        self._prototype_tokens: dict[str, list[set[str]]] = {
+            name: [self._tokenize(sample) for sample in samples] for name, samples in self._prototypes.items()
+        }
+        self._intent_rank = {name: rank for rank, name in enumerate(self._prototypes)}
+        self._hints_by_intent: dict[str, list[tuple[int, re.Pattern[str], str, float]]] = {}
+        for position, (pattern, intent, conf) in enumerate(self._pattern_hints):
+            self._hints_by_intent.setdefault(intent, []).append((position, pattern, intent, conf))
+        self._index = self._build_index()
+
+        # Embedding state: one L2-normalised row per prototype sample, grouped
+        # by intent so a single reduceat gives the per-intent max similarity.
+        self._prototype_matrix = None
+        self._prototype_offsets = None
+        self._prototype_intent_ids = None
+        self._matrix_intents: list[str] = []
+
+        # The sentence model takes seconds to import and load, so it is never
+        # loaded here: warm_up() (or, with load_on_demand, the first classify
+        # call) loads it on a daemon thread and the keyword classifier serves
+        # until it is ready.
+        self._warmup_lock = threading.Lock()
+        self._warmup_thread: threading.Thread | None = None
+        self._embedder_done = threading.Event()
+        self._embedder_error: Exception | None = None
+
+    # =========================
+    # EMBEDDER LIFECYCLE
+    # =========================
+    @property
+    def embedder_ready(self) -> bool:
+        """True once the sentence embedder and prototype matrix are usable."""
+        return self._embedder is not None and self._prototype_matrix is not None
+
+    @property
+    def embedder_failed(self) -> bool:
+        return self._embedder_error is not None
+
+    def warm_up(self, background: bool = True) -> bool:
+        """Start loading the sentence embedder; returns ``embedder_ready``.
 
+        Only the first call starts a loader thread.  With ``background=False``
+        the call blocks until loading has finished (or failed).
+        """
+        with self._warmup_lock:
+            if self._warmup_thread is None and not self.embedder_ready:
+                self._warmup_thread = threading.Thread(
+                    target=self._load_embedder,
+                    name="nlu-embedder-warmup",
+                    daemon=True,
+                )
+                self._warmup_thread.start()
+        if not background:
+            self.wait_until_ready()
+        return self.embedder_ready
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        if self._warmup_thread is not None:
+            self._embedder_done.wait(timeout)
+        return self.embedder_ready
+
+    def _load_embedder(self) -> None:
         try:
             from sentence_transformers import SentenceTransformer  # type: ignore
 
-            self._embedder = SentenceTransformer("all-MiniLM-L6-v2")
-            self._prototype_vectors = {
-                name: self._embedder.encode(samples) for name, samples in self._prototypes.items()
-            }
-        except Exception:
+            embedder = SentenceTransformer(self._model_name)
+            self._build_prototype_matrix(embedder)
+            # Publish last: classify() keys off _embedder, so the matrix must
+            # already be in place when another thread sees it.
+            self._embedder = embedder
+        except Exception as exc:
+            self._embedder_error = exc
             self._embedder = None
-            self._prototype_vectors = {}
+            self._prototype_matrix = None
+        finally:
+            self._embedder_done.set()
 
-    def classify(self, text: str, normalized: str) -> ClassificationResult:
-        if self._embedder:
-            emb = self._embedder.encode([text])[0]
-            best_intent = "chat"
-            best_sim = -1.0
-            for intent, vectors in self._prototype_vectors.items():
-                sim = max(self._cosine(emb, v) for v in vectors)
-                if sim > best_sim:
-                    best_sim = sim
-                    best_intent = intent
-            confidence = max(0.0, min(0.97, 0.55 + (best_sim * 0.4)))
-            return ClassificationResult(best_intent, confidence, "embedding_classifier")
-
-        for pattern, intent, conf in self._pattern_hints:
+    def _build_prototype_matrix(self, embedder=None) -> None:
+        import numpy as np
+
+        embedder = embedder if embedder is not None else self._embedder
+        names = [name for name, samples in self._prototypes.items() if samples]
+        texts = [sample for name in names for sample in self._prototypes[name]]
+        counts = [len(self._prototypes[name]) for name in names]
+
+        def encode(batch: list[str]):
+            return self._l2_normalize(np.asarray(embedder.encode(batch), dtype=np.float32))
+
+        if self._embedding_cache is not None:
+            self._prototype_matrix = self._embedding_cache.load(self._model_name, texts, encode)
+        else:
+            self._prototype_matrix = encode(texts)
+        self._prototype_offsets = np.cumsum([0, *counts[:-1]])
+        self._prototype_intent_ids = np.repeat(np.arange(len(names)), counts)
+        self._matrix_intents = names
+
+    def _build_index(self) -> IntentIndex:
+        index = IntentIndex()
+        index.add_always("chat")
+        for name, samples in self._prototypes.items():
+            for sample in samples:
+                words = [w for w in index_tokens(sample) if w not in INDEX_STOPWORDS]
+                index.add_keys(name, words)
+                index.add_keys(name, bigrams(words))
+        for name, keys in self._hint_keys.items():
+            index.add_keys(name, keys)
+        return index
+
+    def vocabulary(self) -> set[str]:
+        """Words of the prototypes, hint keys and hint patterns."""
+        words = {word for samples in self._prototypes.values() for sample in samples for word in index_tokens(sample)}
+        words.update(key for keys in self._hint_keys.values() for key in keys)
+        words.update(pattern_words(pattern for pattern, _, _ in self._pattern_hints))
+        return words
+
+    def candidate_intents(self, normalized: str, tokens: Sequence[str] | None = None) -> set[str]:
+        """Intents whose prototypes or hints share a word or bigram with the utterance."""
+        return self._index.lookup(normalized, tokens)  # type: ignore[return-value]
+
+    def classify(
+        self,
+        text: str,
+        normalized: str,
+        candidates: Collection[str] | None = None,
+        tokens: Sequence[str] | None = None,
+    ) -> ClassificationResult:
+        """``tokens`` are the whitespace tokens of ``normalized`` when the caller has them."""
+        if tokens is None:
+            tokens = normalized.split()
+        if candidates is None:
+            candidates = self.candidate_intents(normalized, tokens)
+
+        if self.embedder_ready:
+            scores = self._intent_scores(self._encode([text]))[0]
+            return self._embedding_result(scores, candidates)
+        if self._load_on_demand and self._warmup_thread is None:
+            self.warm_up()
+
+        hints = sorted(
+            hint for name in candidates for hint in self._hints_by_intent.get(name, ())
+        )
+        for _, pattern, intent, conf in hints:
             if pattern.search(normalized):
                 return ClassificationResult(intent, conf, "keyword_classifier")
 
-        tokens = set(normalized.split())
+        token_set = set(tokens)
         best_intent = "chat"
         best_score = 0.0
-        for intent, samples in self._prototypes.items():
-            score = max(self._token_overlap(tokens, self._tokenize(sample)) for sample in samples)
+        ranked = sorted(
+            (name for name in candidates if name in self._intent_rank),
+            key=self._intent_rank.__getitem__,
+        )
+        for intent in ranked:
+            score = max(self._token_overlap(token_set, sample) for sample in self._prototype_tokens[intent])
             if score > best_score:
                 best_score = score
                 best_intent = intent
@@ -114,13 +263,51 @@ class IntentClassifier:
             return 0.0
         return len(left & right) / len(left | right)
 
+    def classify_batch(
+        self,
+        texts: Sequence[str],
+        normalized: Sequence[str] | None = None,
+    ) -> list[ClassificationResult]:
+        """Classify many utterances with one encode call and one matrix product."""
+        texts = list(texts)
+        if normalized is None:
+            normalized = [" ".join(index_tokens(text)) for text in texts]
+        if not self.embedder_ready or not texts:
+            return [self.classify(text, norm) for text, norm in zip(texts, normalized)]
+        scores = self._intent_scores(self._encode(texts))
+        return [
+            self._embedding_result(row, self.candidate_intents(norm))
+            for row, norm in zip(scores, normalized)
+        ]
+
+    def _encode(self, texts: list[str]):
+        import numpy as np
+
+        return self._l2_normalize(np.asarray(self._embedder.encode(texts), dtype=np.float32))
+
+    def _intent_scores(self, embeddings):
+        """(batch, dim) normalised embeddings -> (batch, intents) best cosine per intent."""
+        import numpy as np
+
+        similarities = embeddings @ self._prototype_matrix.T
+        return np.maximum.reduceat(similarities, self._prototype_offsets, axis=1)
+
+    def _embedding_result(self, scores, candidates: Collection[str]) -> ClassificationResult:
+        import numpy as np
+
+        # Without any lexical evidence the embedding is the only signal for
+        # paraphrases, so only prune when the index found something.
+        if any(name != "chat" for name in candidates):
+            mask = np.fromiter((name in candidates for name in self._matrix_intents), dtype=bool)
+            scores = np.where(mask, scores, -np.inf)
+        best = int(np.argmax(scores))
+        best_sim = float(scores[best])
+        confidence = max(0.0, min(0.97, 0.55 + (best_sim * 0.4)))
+        return ClassificationResult(self._matrix_intents[best], confidence, "embedding_classifier")
+
     @staticmethod
-    def _cosine(v1: Iterable[float], v2: Iterable[float]) -> float:
-        a = list(v1)
-        b = list(v2)
-        dot = sum(x * y for x, y in zip(a, b))
-        n1 = sqrt(sum(x * x for x in a))
-        n2 = sqrt(sum(y * y for y in b))
-        if not n1 or not n2:
-            return 0.0
-        return dot / (n1 * n2)
+    def _l2_normalize(vectors):
+        import numpy as np
+
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
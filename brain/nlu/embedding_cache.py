@@ -0,0 +1,120 @@
+"""On-disk cache of prototype sentence embeddings.
+
+Encoding every prototype on each start is the slowest part of the embedder
+warm-up.  The cache keeps the normalised prototype matrix as an ``.npy`` file
+next to a small JSON manifest (model name, prototype texts and their digest).
+When the manifest matches, the matrix is memory-mapped as-is; when prototypes
+were added or edited, only the texts the cache has never seen are encoded and
+the file is rewritten.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+PROTOTYPE_CACHE_DIR = Path("database") / "nlu"
+PROTOTYPE_CACHE_NAME = "prototype_embeddings"
+
+
+def texts_digest(texts: Sequence[str]) -> str:
+    sha = hashlib.sha256()
+    for text in texts:
+        sha.update(text.encode("utf-8"))
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+class PrototypeEmbeddingCache:
+    """Best-effort ``.npy`` + manifest store for one prototype matrix."""
+
+    def __init__(self, directory: str | Path = PROTOTYPE_CACHE_DIR, name: str = PROTOTYPE_CACHE_NAME) -> None:
+        self.directory = Path(directory)
+        self.matrix_path = self.directory / f"{name}.npy"
+        self.manifest_path = self.directory / f"{name}.json"
+        self.last_encoded = 0
+
+    def load(self, model_name: str, texts: Sequence[str], encode: Callable[[list[str]], object]):
+        """Return one row per text, encoding (and persisting) only unseen texts.
+
+        ``encode`` receives a list of texts and must return a 2-D float array of
+        rows in the form the caller wants cached (e.g. already L2-normalised).
+        """
+        import numpy as np
+
+        texts = list(texts)
+        digest = texts_digest(texts)
+        manifest = self._read_manifest()
+        cached = self._open_matrix(manifest, model_name)
+
+        if cached is not None and manifest.get("digest") == digest and cached.shape[0] == len(texts):
+            self.last_encoded = 0
+            return cached
+
+        known: dict[str, int] = {}
+        if cached is not None:
+            for row, text in enumerate(manifest.get("texts", [])):
+                known.setdefault(text, row)
+
+        missing = list(dict.fromkeys(text for text in texts if text not in known))
+        fresh = np.asarray(encode(missing), dtype=np.float32) if missing else None
+        self.last_encoded = len(missing)
+
+        dim = fresh.shape[1] if fresh is not None else cached.shape[1]
+        matrix = np.empty((len(texts), dim), dtype=np.float32)
+        fresh_rows = {text: row for row, text in enumerate(missing)}
+        for row, text in enumerate(texts):
+            if text in fresh_rows:
+                matrix[row] = fresh[fresh_rows[text]]
+            else:
+                matrix[row] = cached[known[text]]
+        # Drop the memory map before replacing the file underneath it.
+        del cached
+
+        self._save(model_name, texts, digest, matrix)
+        return matrix
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _open_matrix(self, manifest: dict, model_name: str):
+        import numpy as np
+
+        if manifest.get("model") != model_name:
+            return None
+        try:
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if matrix.ndim != 2 or matrix.shape[0] != len(manifest.get("texts", [])):
+            return None
+        return matrix
+
+    def _save(self, model_name: str, texts: list[str], digest: str, matrix) -> None:
+        import numpy as np
+
+        manifest = {"model": model_name, "digest": digest, "dim": int(matrix.shape[1]), "texts": texts}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Invalidate first so a crash between the two renames can never
+            # pair the new matrix with the old manifest's row order.
+            if self.manifest_path.exists():
+                os.remove(self.manifest_path)
+            tmp_matrix = self.matrix_path.with_suffix(".npy.tmp")
+            with open(tmp_matrix, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp_matrix, self.matrix_path)
+            tmp_manifest = self.manifest_path.with_suffix(".json.tmp")
+            with open(tmp_manifest, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_manifest, self.manifest_path)
+        except OSError:
+            pass
@@ -0,0 +1,218 @@
+"""Gazetteer: every entity list the NLU knows, matched in one pass.
+
+Coins, moods, cities, news categories and app names are compiled into a single
+Aho-Corasick automaton over the normalized utterance.  ``Gazetteer.find``
+walks the text once and reports every mention with its kind, canonical value
+and span, instead of each slot extractor scanning its own list with ``in`` or
+a regex per entry.
+
+Entries are whole-word by default.  ``prefix`` entries only need a word start,
+so "bitcoins" still mentions bitcoin while "eth" never fires inside
+"something".
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+CRYPTO_NAMES = ("bitcoin", "ethereum", "dogecoin", "litecoin", "ripple")
+CRYPTO_TICKERS = ("btc", "eth", "doge")
+
+MOODS = (
+    "sleeping", "sleep", "relax", "relaxing", "calm", "chill", "peaceful",
+    "meditation", "focus", "study", "studying", "concentration", "work",
+    "coding", "productive", "workout", "gym", "energy", "morning", "running",
+    "dance", "party", "happy", "sad", "romantic", "love", "angry", "nostalgic",
+    "lonely", "motivated", "lofi", "jazz", "classical", "pop", "rock", "rap",
+    "bollywood", "punjabi", "devotional", "instrumental", "acoustic", "edm",
+    "night", "evening", "afternoon",
+)
+
+KNOWN_CITIES = (
+    "pune", "mumbai", "delhi", "new delhi", "bangalore", "bengaluru", "hyderabad",
+    "chennai", "kolkata", "ahmedabad", "jaipur", "lucknow", "nagpur", "nashik",
+    "surat", "indore", "bhopal", "goa", "kochi", "chandigarh", "patna", "thane",
+    "london", "paris", "berlin", "madrid", "rome", "amsterdam", "dubai",
+    "singapore", "tokyo", "beijing", "shanghai", "hong kong", "seoul", "sydney",
+    "melbourne", "toronto", "vancouver", "new york", "los angeles",
+    "san francisco", "san jose", "chicago", "boston", "seattle", "washington",
+    "moscow", "istanbul", "cairo", "nairobi", "bangkok", "kathmandu", "dhaka",
+    "karachi", "lahore", "colombo",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Mention:
+    kind: str
+    value: str
+    text: str
+    start: int
+    end: int
+    # Registration order inside the kind; lower wins when a caller wants "the" coin.
+    rank: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    kind: str
+    value: str
+    rank: int
+    prefix: bool
+
+
+class AhoCorasick:
+    """Character-level multi-pattern matcher with outputs merged along fail links."""
+
+    def __init__(self) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, Any]]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, payload: Any) -> None:
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), payload))
+        self._built = False
+
+    def build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+
+    def iter(self, text: str) -> Iterator[tuple[int, int, Any]]:
+        """Yield ``(start, end, payload)`` for every occurrence, overlaps included."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, payload in out[node]:
+                yield index + 1 - length, index + 1, payload
+
+
+_FIND_CACHE_LIMIT = 1024
+
+
+class Gazetteer:
+    def __init__(self) -> None:
+        self._automaton = AhoCorasick()
+        self._ranks: dict[str, int] = {}
+        self._seen: set[tuple[str, str]] = set()
+        # Utterance parsing and the rule table ask about the same text, so the
+        # last few results are kept and the automaton walks each text once.
+        self._found: dict[str, tuple[Mention, ...]] = {}
+
+    def add(self, kind: str, phrase: str, value: str | None = None, *, prefix: bool = False) -> None:
+        phrase = " ".join(phrase.lower().split())
+        if not phrase or (kind, phrase) in self._seen:
+            return
+        self._seen.add((kind, phrase))
+        rank = self._ranks.get(kind, 0)
+        self._ranks[kind] = rank + 1
+        self._automaton.add(phrase, _Entry(kind, value or phrase, rank, prefix))
+        self._found.clear()
+
+    def add_all(self, kind: str, phrases: Iterable[str], *, prefix: bool = False) -> None:
+        for phrase in phrases:
+            self.add(kind, phrase, prefix=prefix)
+
+    def phrases(self) -> list[str]:
+        """Every registered phrase, sorted."""
+        return sorted({phrase for _, phrase in self._seen})
+
+    def find(self, normalized: str) -> tuple[Mention, ...]:
+        """All word-bounded mentions, ordered by position then longest first."""
+        cached = self._found.get(normalized)
+        if cached is not None:
+            return cached
+        mentions: list[Mention] = []
+        size = len(normalized)
+        for start, end, entry in self._automaton.iter(normalized):
+            if start > 0 and normalized[start - 1].isalnum():
+                continue
+            if not entry.prefix and end < size and normalized[end].isalnum():
+                continue
+            mentions.append(Mention(entry.kind, entry.value, normalized[start:end], start, end, entry.rank))
+        mentions.sort(key=lambda m: (m.start, m.start - m.end))
+        found = tuple(mentions)
+        if len(self._found) >= _FIND_CACHE_LIMIT:
+            self._found.clear()
+        self._found[normalized] = found
+        return found
+
+
+def of_kind(mentions: Iterable[Mention], kind: str) -> tuple[Mention, ...]:
+    return tuple(m for m in mentions if m.kind == kind)
+
+
+def best(mentions: Iterable[Mention], kind: str) -> str | None:
+    """Value of the highest-priority mention of ``kind`` (list order, not text order)."""
+    found = of_kind(mentions, kind)
+    return min(found, key=lambda m: m.rank).value if found else None
+
+
+def build_default_gazetteer() -> Gazetteer:
+    from brain.nlu.utterance import normalize_text
+    from services.music.music_services import MOOD_MAP
+    from services.news.categories import CATEGORIES
+    from system.laptop.app_launcher import APP_ALIASES, APP_CATALOG, APP_PATHS
+
+    gazetteer = Gazetteer()
+    gazetteer.add_all("coin", CRYPTO_NAMES, prefix=True)
+    gazetteer.add_all("coin", CRYPTO_TICKERS)
+    gazetteer.add_all("mood", (*MOODS, *MOOD_MAP))
+    gazetteer.add_all("city", KNOWN_CITIES)
+    gazetteer.add_all("news_category", (name for name in CATEGORIES if name != "general"), prefix=True)
+
+    for alias, canonical in APP_ALIASES.items():
+        gazetteer.add("app", alias, canonical)
+    gazetteer.add_all("app", APP_PATHS)
+    for name, _ in APP_CATALOG.entries():
+        # Fold index names the way utterances are folded so they line up.
+        gazetteer.add("app", normalize_text(name))
+    APP_CATALOG.add_listener(reset_default_gazetteer)
+    return gazetteer
+
+
+_default: Gazetteer | None = None
+_default_lock = Lock()
+
+
+def default_gazetteer() -> Gazetteer:
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = build_default_gazetteer()
+    return _default
+
+
+def reset_default_gazetteer() -> None:
+    """Drop the shared automaton so the next lookup rebuilds it (e.g. after an app index rebuild)."""
+    global _default
+    with _default_lock:
+        _default = None
@@ -0,0 +1,94 @@
+"""Inverted index from utterance words to the intents (or rules) they can trigger.
+
+NLU components register the words each intent needs: whole tokens, two-word
+bigrams ("look up", "top stories") or fragments that may sit inside a token
+("bitcoin" in "bitcoins"). ``lookup`` then answers "which intents could this
+utterance possibly be?" with a few dict probes per token, so the cost tracks
+the length of the utterance instead of the number of registered intents.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from collections.abc import Hashable, Iterable, Sequence
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_FRAGMENT_CACHE_LIMIT = 4096
+
+# Function words that appear in almost every prototype; indexing them would make
+# every intent a candidate for every utterance.
+INDEX_STOPWORDS = frozenset(
+    {
+        "a", "an", "the", "it", "is", "to", "in", "of", "on", "at", "for", "me", "my",
+        "i", "you", "what", "some", "and", "be", "by", "s", "when", "please", "jarvis",
+    }
+)
+
+
+def index_tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def bigrams(tokens: Sequence[str]) -> list[str]:
+    return [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+
+
+class IntentIndex:
+    """Token / bigram / fragment postings with a set of never-pruned entries."""
+
+    def __init__(self) -> None:
+        self._postings: dict[str, set[Hashable]] = defaultdict(set)
+        self._fragments: dict[str, set[Hashable]] = defaultdict(set)
+        self._phrases: dict[str, set[Hashable]] = defaultdict(set)
+        self._always: set[Hashable] = set()
+        self._fragment_cache: dict[str, frozenset[Hashable]] = {}
+
+    def add_keys(self, value: Hashable, keys: Iterable[str]) -> None:
+        """Post ``value`` under whole words; phrases are posted under their first bigram."""
+        for key in keys:
+            words = index_tokens(key)
+            if not words:
+                continue
+            self._postings[" ".join(words[:2])].add(value)
+
+    def add_fragments(self, value: Hashable, fragments: Iterable[str]) -> None:
+        """Post ``value`` under raw fragments matched anywhere in the normalized text."""
+        for fragment in fragments:
+            if " " in fragment.strip():
+                self._phrases[fragment].add(value)
+            elif fragment:
+                self._fragments[fragment].add(value)
+        self._fragment_cache.clear()
+
+    def add_always(self, value: Hashable) -> None:
+        self._always.add(value)
+
+    def lookup(self, normalized: str, tokens: Sequence[str] | None = None) -> set[Hashable]:
+        words = tokens if tokens is not None else normalized.split()
+        found: set[Hashable] = set(self._always)
+        postings = self._postings
+        for key in (*words, *bigrams(words)):
+            hits = postings.get(key)
+            if hits:
+                found |= hits
+        if self._fragments:
+            for word in words:
+                found |= self._fragment_hits(word)
+        for phrase, values in self._phrases.items():
+            if phrase in normalized:
+                found |= values
+        return found
+
+    def _fragment_hits(self, word: str) -> frozenset[Hashable]:
+        hits = self._fragment_cache.get(word)
+        if hits is None:
+            matched: set[Hashable] = set()
+            for fragment, values in self._fragments.items():
+                if fragment in word:
+                    matched |= values
+            hits = frozenset(matched)
+            if len(self._fragment_cache) >= _FRAGMENT_CACHE_LIMIT:
+                self._fragment_cache.clear()
+            self._fragment_cache[word] = hits
+        return hits
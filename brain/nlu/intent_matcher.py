@@ -0,0 +1,87 @@
+"""Precompiled, prefiltered intent rule table.
+
+Rules are evaluated in priority order exactly like the old inline ``re.search``
+cascade, but each rule declares the trigger words it cannot match without.  The
+triggers are posted into an ``IntentIndex``, so an utterance only looks at the
+rules its own words point to and a typical command executes a handful of
+regexes instead of walking the whole table.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from brain.nlu.intent_index import IntentIndex
+
+RuleHandler = Callable[[str, str], "dict[str, Any] | None"]
+
+
+@dataclass(frozen=True, slots=True)
+class IntentRule:
+    """One entry of the rule table.
+
+    ``tokens`` are whole words and ``substrings`` are raw fragments of the
+    normalized text.  Each non-empty group must have at least one hit for the
+    handler to run; a rule with neither group always runs (context-dependent
+    rules and catch-alls).
+    """
+
+    name: str
+    handler: RuleHandler
+    tokens: frozenset[str] = frozenset()
+    substrings: tuple[str, ...] = ()
+
+    def could_match(self, normalized: str, token_set: frozenset[str]) -> bool:
+        if self.tokens and self.tokens.isdisjoint(token_set):
+            return False
+        if self.substrings and not any(part in normalized for part in self.substrings):
+            return False
+        return True
+
+
+class IntentMatcher:
+    """Runs an ordered rule table with a keyword prefilter in front of every rule."""
+
+    def __init__(self, rules: Iterable[IntentRule]) -> None:
+        self._rules: tuple[IntentRule, ...] = tuple(rules)
+        self._index = IntentIndex()
+        for position, rule in enumerate(self._rules):
+            # Either trigger group is a necessary condition, so one of them is
+            # enough to post the rule; could_match() re-checks both.
+            if rule.tokens:
+                self._index.add_keys(position, rule.tokens)
+            elif rule.substrings:
+                self._index.add_fragments(position, rule.substrings)
+            else:
+                self._index.add_always(position)
+
+    @property
+    def rules(self) -> tuple[IntentRule, ...]:
+        return self._rules
+
+    def vocabulary(self) -> set[str]:
+        """Every trigger word and fragment the rules react to."""
+        words: set[str] = set()
+        for rule in self._rules:
+            words.update(rule.tokens)
+            words.update(rule.substrings)
+        return words
+
+    def candidates(self, normalized: str) -> list[IntentRule]:
+        """Rules that survive the prefilter, in priority order."""
+        tokens = normalized.split()
+        token_set = frozenset(tokens)
+        return [
+            self._rules[position]
+            for position in sorted(self._index.lookup(normalized, tokens))
+            if self._rules[position].could_match(normalized, token_set)
+        ]
+
+    def match(self, raw_text: str, normalized: str) -> dict[str, Any] | None:
+        for rule in self.candidates(normalized):
+            hit = rule.handler(raw_text, normalized)
+            if hit is not None:
+                return hit
+        return None
@@ -0,0 +1,56 @@
+"""Bounded LRU memo for ``detect_intent`` results.
+
+Voice assistants hear the same handful of commands over and over ("volume
+up", "next song", "what time is it").  The memo maps a normalized utterance
+plus a fingerprint of the dialogue state it was resolved under to the intent
+dict, so a repeat skips the follow-up resolvers, rule table and classifier.
+Entries are copied on the way in and out because callers enrich the dict.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+from collections.abc import Hashable
+from threading import Lock
+from typing import Any
+
+
+class IntentMemo:
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, Hashable], dict[str, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, normalized: str, fingerprint: Hashable) -> dict[str, Any] | None:
+        key = (normalized, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(entry)
+
+    def put(self, normalized: str, fingerprint: Hashable, result: dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        entry = copy.deepcopy(result)
+        with self._lock:
+            self._entries[(normalized, fingerprint)] = entry
+            self._entries.move_to_end((normalized, fingerprint))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
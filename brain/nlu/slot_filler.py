@@ -1,131 +1,176 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 from typing import Any
 
+from brain.nlu.utterance import Utterance
 from system.laptop.app_launcher import canonicalize_app_name
 from services.time_date.temporal_reasoner import TEMPORAL_REASONER
 
+SlotExtractor = Callable[[Utterance], "dict[str, Any]"]
+
+_CURRENCIES = ("usd", "eur", "inr")
+_LEVEL_MAX = frozenset({"max", "full", "maximum"})
+_LEVEL_MIN = frozenset({"min", "mute", "zero", "silent"})
+_DELAY = re.compile(r"(\d+)\s*(second|minute|hour)")
+_YOUTUBE_WORDS = re.compile(r"\b(play|open|watch|search|find|look up|youtube|yt|video|for|on)\b")
+_WORD_LOOKUPS = (
+    re.compile(r"\bdefine\s+([a-z]{2,})\b"),
+    re.compile(r"\b(?:meaning of|definition of)\s+([a-z]{2,})\b"),
+    re.compile(r"\bwhat\s+does\s+([a-z]{2,})\s+mean\b"),
+)
+
 
 class SlotFiller:
-    def fill(self, *, intent: str, raw_text: str, normalized: str) -> dict[str, Any]:
+    """Per-intent slot extraction.
+
+    Extractors are looked up by intent in a dispatch table, so filling slots
+    costs the same no matter how many intents ``INTENT_SCHEMA`` grows to.
+    """
+
+    def __init__(self) -> None:
+        self._extractors: dict[str, SlotExtractor] = {
+            "open_app": self._fill_open_app,
+            "set_volume": self._fill_level,
+            "set_brightness": self._fill_level,
+            "get_date": self._fill_temporal,
+            "get_time": self._fill_temporal,
+            "get_weather": self._fill_weather,
+            "get_news": self._fill_news,
+            "play_youtube": self._fill_youtube_video,
+            "search_youtube": self._fill_youtube_query,
+            "lookup_word": self._fill_word,
+            "get_crypto_price": self._fill_crypto_price,
+            "check_price_alert": self._fill_price_alert,
+            "schedule_task": self._fill_schedule,
+            "advice_time": self._fill_topic,
+            "convert_timezone": self._fill_query,
+            "evaluate_trigger": self._fill_query,
+            "apply_rules": self._fill_query,
+        }
+
+    def fill(
+        self,
+        *,
+        intent: str,
+        utterance: Utterance | None = None,
+        raw_text: str | None = None,
+        normalized: str | None = None,
+    ) -> dict[str, Any]:
+        extractor = self._extractors.get(intent)
+        if extractor is None:
+            return {}
+        if utterance is None:
+            utterance = Utterance.parse(raw_text if raw_text is not None else normalized or "")
+        return extractor(utterance)
+
+    def _fill_open_app(self, u: Utterance) -> dict[str, Any]:
         slots: dict[str, Any] = {}
+        app = self._extract_app(u)
+        if app:
+            slots["app"] = app
+        actions: list[str] = []
+        if "maximize" in u.token_set:
+            actions.append("maximize")
+        if "minimize" in u.token_set:
+            actions.append("minimize")
+        if actions:
+            slots["post_actions"] = actions
+        return slots
+
+    def _fill_level(self, u: Utterance) -> dict[str, Any]:
+        level = self._extract_level(u)
+        return {"level": level} if level is not None else {}
+
+    @staticmethod
+    def _fill_temporal(u: Utterance) -> dict[str, Any]:
+        return TEMPORAL_REASONER.resolve(u.corrected).as_slots()
+
+    @staticmethod
+    def _fill_weather(u: Utterance) -> dict[str, Any]:
+        return {"city": u.cities[0]} if u.cities else {}
+
+    @staticmethod
+    def _fill_news(u: Utterance) -> dict[str, Any]:
+        return {"category": u.best_entity("news_category") or "general"}
+
+    @staticmethod
+    def _strip_youtube_words(normalized: str) -> str:
+        return _YOUTUBE_WORDS.sub("", normalized).strip()
+
+    # Titles, queries and looked-up words are the user's own text: read them
+    # from the uncorrected form so a spelling correction never rewrites them.
+    def _fill_youtube_video(self, u: Utterance) -> dict[str, Any]:
+        return {"video": self._strip_youtube_words(u.uncorrected)}
+
+    def _fill_youtube_query(self, u: Utterance) -> dict[str, Any]:
+        return {"query": self._strip_youtube_words(u.uncorrected)}
 
-        if intent == "open_app":
-            app = self._extract_app(normalized)
-            if app:
-                slots["app"] = app
-            actions: list[str] = []
-            if re.search(r"\bmaximize\b", normalized):
-                actions.append("maximize")
-            if re.search(r"\bminimize\b", normalized):
-                actions.append("minimize")
-            if actions:
-                slots["post_actions"] = actions
-
-        elif intent in {"set_volume", "set_brightness"}:
-            level = self._extract_level(normalized)
-            if level is not None:
-                slots["level"] = level
-
-        elif intent == "get_date":
-            slots.update(TEMPORAL_REASONER.resolve(raw_text).as_slots())
-
-        elif intent == "get_time":
-            slots.update(TEMPORAL_REASONER.resolve(raw_text).as_slots())
-
-        elif intent == "get_weather":
-            city_match = re.search(r"\b(?:in|for|at)\s+([a-z]+(?:\s+[a-z]+)?)", normalized)
-            if city_match:
-                slots["city"] = city_match.group(1).strip()
-
-        elif intent == "get_news":
-            slots["category"] = "general"
-            for cat in ["business", "entertainment", "health", "science", "sports", "technology"]:
-                if cat in normalized:
-                    slots["category"] = cat
-                    break
-
-        elif intent in {"play_youtube", "search_youtube"}:
-            strip_words = r"\b(play|open|watch|search|find|look up|youtube|yt|video|for|on)\b"
-            field = "video" if intent == "play_youtube" else "query"
-            slots[field] = re.sub(strip_words, "", normalized).strip()
-
-        elif intent == "lookup_word":
-            m = re.search(r"\bdefine\s+([a-z]{2,})\b", normalized)
-            if not m:
-                m = re.search(r"\b(?:meaning of|definition of)\s+([a-z]{2,})\b", normalized)
-            if not m:
-                m = re.search(r"\bwhat\s+does\s+([a-z]{2,})\s+mean\b", normalized)
+    @staticmethod
+    def _fill_word(u: Utterance) -> dict[str, Any]:
+        for pattern in _WORD_LOOKUPS:
+            m = pattern.search(u.normalized)
             if m:
-                slots["word"] = m.group(1)
-
-        elif intent == "get_crypto_price":
-            for cur in ["usd", "eur", "inr"]:
-                if cur in normalized:
-                    slots["currency"] = cur
-                    break
-            slots.setdefault("currency", "inr")
-            symbol = self._extract_coin(normalized)
-            if symbol:
-                slots["symbol"] = symbol
-
-        elif intent == "check_price_alert":
-            slots["direction"] = "below" if "below" in normalized else "above"
-            num = re.search(r"(\d+)", normalized)
-            if num:
-                slots["target_price"] = int(num.group(1))
-            symbol = self._extract_coin(normalized)
-            if symbol:
-                slots["symbol"] = symbol
-            for cur in ["usd", "eur", "inr"]:
-                if cur in normalized:
-                    slots["currency"] = cur
-                    break
-            slots.setdefault("currency", "inr")
-
-        elif intent == "schedule_task":
-            num_match = re.search(r"(\d+)\s*(second|minute|hour)", normalized)
-            if num_match:
-                val = int(num_match.group(1))
-                unit = num_match.group(2)
-                slots["delay_seconds"] = val * (60 if unit == "minute" else 3600 if unit == "hour" else 1)
-            slots.setdefault("query", raw_text)
-
-        elif intent in {"advice_time", "convert_timezone", "evaluate_trigger", "apply_rules"}:
-            key = "topic" if intent == "advice_time" else "query"
-            slots[key] = raw_text
+                return {"word": u.typed(m.group(1))}
+        return {}
 
+    def _fill_crypto_price(self, u: Utterance) -> dict[str, Any]:
+        slots: dict[str, Any] = {"currency": self._extract_currency(u.normalized)}
+        if u.coins:
+            slots["symbol"] = u.coins[0]
         return slots
 
-    def _extract_app(self, normalized: str) -> str | None:
-        patterns = [r"\bopen\s+(.+)$", r"\blaunch\s+(.+)$", r"\bstart\s+(.+)$", r"\brun\s+(.+)$"]
-        for pat in patterns:
-            m = re.search(pat, normalized)
-            if m:
-                candidate = re.split(r"\b(and|then)\b", m.group(1), maxsplit=1)[0]
-                app = re.sub(r"\b(the|a|an|please|for|me|my|app|application|it)\b", "", candidate).strip()
-                if app:
-                    return canonicalize_app_name(" ".join(app.split()[:5]))
+    def _fill_price_alert(self, u: Utterance) -> dict[str, Any]:
+        slots: dict[str, Any] = {"direction": "below" if "below" in u.normalized else "above"}
+        if u.numbers:
+            slots["target_price"] = int(u.numbers[0])
+        if u.coins:
+            slots["symbol"] = u.coins[0]
+        slots["currency"] = self._extract_currency(u.normalized)
+        return slots
+
+    @staticmethod
+    def _fill_schedule(u: Utterance) -> dict[str, Any]:
+        slots: dict[str, Any] = {}
+        num_match = _DELAY.search(u.normalized) if u.numbers else None
+        if num_match:
+            val = int(num_match.group(1))
+            unit = num_match.group(2)
+            slots["delay_seconds"] = val * (60 if unit == "minute" else 3600 if unit == "hour" else 1)
+        slots["query"] = u.raw
+        return slots
+
+    @staticmethod
+    def _fill_topic(u: Utterance) -> dict[str, Any]:
+        return {"topic": u.raw}
+
+    @staticmethod
+    def _fill_query(u: Utterance) -> dict[str, Any]:
+        return {"query": u.raw}
+
+    @staticmethod
+    def _extract_app(u: Utterance) -> str | None:
+        if u.app_candidates:
+            return canonicalize_app_name(u.app_candidates[0])
+        # No open/launch verb ("chrome please"): fall back to a known app name,
+        # preferring the longest mention ("google chrome" over "chrome").
+        apps = u.entities("app")
+        if apps:
+            return canonicalize_app_name(max(apps, key=lambda m: m.end - m.start).value)
         return None
 
     @staticmethod
-    def _extract_level(normalized: str) -> int | None:
-        if re.search(r"\b(max|full|maximum)\b", normalized):
+    def _extract_level(u: Utterance) -> int | None:
+        if not _LEVEL_MAX.isdisjoint(u.token_set):
             return 100
-        if re.search(r"\b(min|mute|zero|silent)\b", normalized):
+        if not _LEVEL_MIN.isdisjoint(u.token_set):
             return 0
-        m = re.search(r"(\d{1,3})", normalized)
-        if not m:
+        if not u.numbers:
             return None
-        return max(0, min(100, int(m.group(1))))
+        # Same as searching for \d{1,3}: the first three digits of the first run.
+        return max(0, min(100, int(u.numbers[0][:3])))
 
     @staticmethod
-    def _extract_coin(normalized: str) -> str | None:
-        for coin in ["bitcoin", "ethereum", "dogecoin", "litecoin", "ripple"]:
-            if coin in normalized:
-                return coin
-        for ticker in ["btc", "eth", "doge"]:
-            if re.search(rf"\b{ticker}\b", normalized):
-                return ticker
-        return None
+    def _extract_currency(normalized: str) -> str:
+        return next((cur for cur in _CURRENCIES if cur in normalized), "inr")
@@ -0,0 +1,271 @@
+"""Spelling correction against the NLU vocabulary (SymSpell symmetric delete).
+
+Every word the rules, the classifier and the gazetteer react to is indexed
+together with all the strings reachable from it by deleting up to
+``max_distance`` characters.  A misspelled token is looked up the same way:
+its own deletes are probed in the index and the few words that share one are
+verified with a Damerau-Levenshtein distance.  That replaces per-component typo
+lists ("tommorow", "chorme", ...) with one correction step in front of the NLU.
+
+Only tokens that neither the vocabulary nor the English word list in
+``data/english_words.txt`` knows are touched ("raining" is a word, not a typo
+of "running"), and short words are left alone: at four letters one edit
+already turns too many ordinary words into a command word.  For the same
+reason a correction may not change the first letter, and inflected forms of
+known words are left as they are.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections.abc import Iterable
+from itertools import combinations
+from pathlib import Path
+from threading import Lock
+
+_WORD = re.compile(r"\b[A-Za-z]+\b")
+_CORRECTION_CACHE_LIMIT = 4096
+
+ENGLISH_WORDS_FILE = Path(__file__).resolve().parents[2] / "data" / "english_words.txt"
+
+# Shortest token that is corrected at all, and the length from which two edits
+# (instead of one) are allowed.
+MIN_CORRECTABLE_LENGTH = 5
+TWO_EDIT_LENGTH = 7
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    """Optimal-string-alignment distance, or ``limit + 1`` once it is exceeded."""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous2: list[int] = []
+    previous = list(range(len(right) + 1))
+    for i, lchar in enumerate(left, start=1):
+        current = [i] + [0] * len(right)
+        for j, rchar in enumerate(right, start=1):
+            cost = 0 if lchar == rchar else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and lchar == right[j - 2] and left[i - 2] == rchar:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word: str, distance: int) -> set[str]:
+    found: set[str] = set()
+    for removed in range(1, min(distance, len(word)) + 1):
+        for positions in combinations(range(len(word)), removed):
+            found.add("".join(char for index, char in enumerate(word) if index not in positions))
+    return found
+
+
+_REGEX_ESCAPE = re.compile(r"\\[A-Za-z]")
+_PATTERN_WORD = re.compile(r"[a-z]{3,}")
+_INFLECTIONS = frozenset({"s", "es", "d", "ed", "r", "er", "ing"})
+_WORD_LIST_SUFFIXES = ("s", "es", "ies", "d", "ed", "ied", "er", "ers", "ing", "ly")
+
+# Everyday words within an edit or two of a command word ("whether" / "weather",
+# "thing" / "think"); knowing them keeps chat phrasing from being rewritten.
+COMMON_WORDS = (
+    "about", "after", "again", "always", "another", "answer", "around", "because",
+    "before", "believe", "better", "between", "could", "doing", "during", "every",
+    "family", "friend", "going", "great", "having", "house", "little", "maybe",
+    "money", "never", "often", "other", "people", "place", "point", "really",
+    "right", "should", "since", "something", "start", "still", "story", "thank",
+    "thanks", "their", "there", "these", "thing", "things", "think", "those",
+    "three", "through", "today", "under", "until", "water", "where", "whether",
+    "which", "while", "world", "would", "write", "wrong", "years",
+)
+
+
+def pattern_words(patterns: Iterable[re.Pattern[str]]) -> set[str]:
+    """Literal words spelled out in regex sources (``\\bopen`` gives "open")."""
+    return {
+        word
+        for pattern in patterns
+        for word in _PATTERN_WORD.findall(_REGEX_ESCAPE.sub(" ", pattern.pattern))
+    }
+
+
+def english_words(path: Path = ENGLISH_WORDS_FILE) -> set[str]:
+    """Base forms from a word list file (one per line, ``#`` starts a comment)."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        print("[SPELLING ERROR]", exc)
+        return set()
+    return {line.strip().lower() for line in lines if line.strip() and not line.startswith("#")}
+
+
+def _base_forms(word: str) -> set[str]:
+    """``word`` and what it may be an inflection of ("raining" -> "rain", "coming" -> "come")."""
+    forms = {word}
+    for suffix in _WORD_LIST_SUFFIXES:
+        stem = word[: -len(suffix)]
+        if not word.endswith(suffix) or len(stem) < 2:
+            continue
+        forms.add(stem)
+        if suffix in ("ies", "ied"):
+            forms.add(stem + "y")
+        elif suffix in ("ed", "er", "ers", "ing"):
+            forms.add(stem + "e")
+            if stem[-1] == stem[-2]:
+                forms.add(stem[:-1])  # "running" -> "run"
+    return forms
+
+
+def _inflected(word: str, candidate: str) -> bool:
+    shorter, longer = sorted((word, candidate), key=len)
+    return longer.startswith(shorter) and longer[len(shorter):] in _INFLECTIONS
+
+
+class SymSpell:
+    """Symmetric-delete index over a word list with occurrence counts."""
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7) -> None:
+        self.max_distance = max_distance
+        # Only a word's first letters are indexed; the full word is verified.
+        self.prefix_length = prefix_length
+        self._counts: Counter[str] = Counter()
+        self._deletes: dict[str, set[str]] = {}
+        self._dictionary: set[str] = set()
+        self._corrections: dict[str, str | None] = {}
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add_word(self, word: str, count: int = 1) -> None:
+        word = word.lower()
+        if not word.isalpha():
+            return
+        known = word in self._counts
+        self._counts[word] += count
+        self._corrections.clear()
+        if known or len(word) < MIN_CORRECTABLE_LENGTH - self.max_distance:
+            return
+        prefix = word[: self.prefix_length]
+        for variant in {prefix} | _deletes(prefix, self.max_distance):
+            self._deletes.setdefault(variant, set()).add(word)
+
+    def add_words(self, words: Iterable[str]) -> None:
+        for word in words:
+            for part in _WORD.findall(word):
+                self.add_word(part)
+
+    def add_dictionary(self, words: Iterable[str]) -> None:
+        """Words (and their inflections) that are never corrected, nor suggested."""
+        self._dictionary.update(word.lower() for word in words)
+        self._corrections.clear()
+
+    def lookup(self, word: str) -> str | None:
+        """Closest vocabulary word to an unknown ``word``, or None.
+
+        Known words, dictionary words, short words and ambiguous corrections
+        (a tie on both distance and count) return None so the caller keeps
+        what was typed.
+        """
+        word = word.lower()
+        if word in self._counts or len(word) < MIN_CORRECTABLE_LENGTH:
+            return None
+        if word in self._corrections:
+            return self._corrections[word]
+        if not self._dictionary.isdisjoint(_base_forms(word)):
+            self._remember(word, None)
+            return None
+
+        limit = min(self.max_distance, 2 if len(word) >= TWO_EDIT_LENGTH else 1)
+        prefix = word[: self.prefix_length]
+        candidates: set[str] = set()
+        for variant in {prefix} | _deletes(prefix, limit):
+            candidates.update(self._deletes.get(variant, ()))
+
+        ranked = sorted(
+            (distance, -self._counts[candidate], candidate)
+            for candidate in candidates
+            if (distance := edit_distance(word, candidate, limit)) <= limit
+        )
+        best: str | None = None
+        # An inflection of a vocabulary word ("timer", "processes") is a word
+        # of its own, and typing rarely gets the first letter wrong, so a
+        # changed first letter means another word ("reports" is not "sports").
+        if not any(_inflected(word, candidate) for _, _, candidate in ranked):
+            ranked = [entry for entry in ranked if entry[2][0] == word[0]]
+            if ranked and (len(ranked) == 1 or ranked[0][:2] != ranked[1][:2]):
+                best = ranked[0][2]
+
+        self._remember(word, best)
+        return best
+
+    def _remember(self, word: str, correction: str | None) -> None:
+        if len(self._corrections) >= _CORRECTION_CACHE_LIMIT:
+            self._corrections.clear()
+        self._corrections[word] = correction
+
+    def correct(self, text: str) -> str:
+        """``text`` with every correctable word replaced, everything else untouched."""
+
+        def replace(match: re.Match[str]) -> str:
+            return self.lookup(match.group(0)) or match.group(0)
+
+        return _WORD.sub(replace, text)
+
+
+# =========================
+# SHARED SPELLER
+# NLU components register the words they react to; the index is (re)built on
+# the next correction after the vocabulary grew.
+# =========================
+_registered: set[str] = set()
+_default: SymSpell | None = None
+_default_lock = Lock()
+
+
+def register_vocabulary(words: Iterable[str]) -> None:
+    global _default
+    with _default_lock:
+        before = len(_registered)
+        _registered.update(word.lower() for word in words)
+        if len(_registered) != before:
+            _default = None
+
+
+def build_default_speller() -> SymSpell:
+    from brain.nlu.gazetteer import default_gazetteer
+    from brain.nlu.intent_index import INDEX_STOPWORDS
+    from services.time_date.temporal_reasoner import TEMPORAL_WORDS
+    from system.laptop.app_launcher import APP_CATALOG
+
+    speller = SymSpell()
+    speller.add_words(INDEX_STOPWORDS)
+    speller.add_words(COMMON_WORDS)
+    speller.add_words(TEMPORAL_WORDS)
+    speller.add_words(default_gazetteer().phrases())
+    speller.add_words(sorted(_registered))
+    speller.add_dictionary(english_words())
+    APP_CATALOG.add_listener(reset_default_speller)
+    return speller
+
+
+def default_speller() -> SymSpell:
+    global _default
+    speller = _default
+    if speller is None:
+        with _default_lock:
+            if _default is None:
+                _default = build_default_speller()
+            speller = _default
+    return speller
+
+
+def reset_default_speller() -> None:
+    """Drop the shared index so the next correction rebuilds it (e.g. after an app index rebuild)."""
+    global _default
+    with _default_lock:
+        _default = None
@@ -0,0 +1,136 @@
+"""One parsed view of a user utterance, shared by NLU, dialogue and routing.
+
+``Utterance.parse`` spell-corrects, normalizes and tokenizes the text once and pre-extracts the
+cheap, commonly needed entities (numbers, gazetteer mentions such as coins and
+cities, app name candidates).  Components that receive an ``Utterance`` read these fields
+instead of re-running ``lower()`` / ``re.sub`` / ``split()`` on the raw text.
+
+``raw`` is what the user typed; ``corrected`` and everything derived from it is
+what the NLU reads to pick an intent.  ``uncorrected`` is ``raw`` normalized the
+same way but never spell-corrected: names, words and queries the user dictates
+are taken from it (``typed`` maps a span of ``normalized`` back onto it), so a
+correction can choose the command but never rewrite its content.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from brain.nlu.gazetteer import Mention, best, default_gazetteer, of_kind
+from brain.nlu.spelling import default_speller
+
+_NON_ALNUM = re.compile(r"[^a-z0-9\s]")
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+_CITY_PHRASE = re.compile(r"\b(?:in|for|at)\s+([a-z]+(?:\s+[a-z]+)?)")
+_APP_VERBS = (
+    re.compile(r"\bopen\s+(.+)$"),
+    re.compile(r"\blaunch\s+(.+)$"),
+    re.compile(r"\bstart\s+(.+)$"),
+    re.compile(r"\brun\s+(.+)$"),
+)
+_APP_CLAUSE_SPLIT = re.compile(r"\b(and|then)\b")
+_APP_STOPWORDS = frozenset({"the", "a", "an", "please", "for", "me", "my", "app", "application", "it"})
+
+
+def normalize_text(text: str) -> str:
+    text = text.lower().strip()
+    text = _NON_ALNUM.sub(" ", text)
+    return _WHITESPACE.sub(" ", text)
+
+
+def coin_mentions(normalized: str) -> tuple[str, ...]:
+    """Coins in priority order: full names first, then tickers."""
+    found = sorted(of_kind(default_gazetteer().find(normalized), "coin"), key=lambda m: m.rank)
+    return tuple(dict.fromkeys(m.value for m in found))
+
+
+def app_candidates(normalized: str) -> tuple[str, ...]:
+    """Uncanonicalized app names after open/launch/start/run, latest verb first."""
+    found: list[tuple[int, int, str]] = []
+    for order, pattern in enumerate(_APP_VERBS):
+        for match in pattern.finditer(normalized):
+            found.append((match.start(), order, match.group(1).strip()))
+    names: list[str] = []
+    for _, _, candidate in sorted(found, reverse=True):
+        candidate = _APP_CLAUSE_SPLIT.split(candidate, maxsplit=1)[0].strip()
+        tokens = [token for token in candidate.split() if token not in _APP_STOPWORDS]
+        if tokens:
+            names.append(" ".join(tokens[:5]))
+    return tuple(names)
+
+
+def _typed_span(text: str, tokens: tuple[str, ...], typed_tokens: tuple[str, ...]) -> str:
+    words = text.split()
+    if not words or len(tokens) != len(typed_tokens) or tokens == typed_tokens:
+        return text
+    for start in range(len(tokens) - len(words) + 1):
+        if tokens[start : start + len(words)] == tuple(words):
+            return " ".join(typed_tokens[start : start + len(words)])
+    return text
+
+
+@dataclass(frozen=True, slots=True)
+class Utterance:
+    raw: str
+    corrected: str
+    normalized: str
+    tokens: tuple[str, ...]
+    token_set: frozenset[str]
+    numbers: tuple[str, ...]
+    coins: tuple[str, ...]
+    cities: tuple[str, ...]
+    app_candidates: tuple[str, ...]
+    mentions: tuple[Mention, ...] = ()
+    uncorrected: str = ""
+
+    @classmethod
+    def parse(cls, text: str, *, correct: bool = True) -> Utterance:
+        raw = text.strip()
+        corrected = default_speller().correct(raw) if correct else raw
+        normalized = normalize_text(corrected)
+        uncorrected = normalize_text(raw) if corrected != raw else normalized
+        tokens = tuple(normalized.split())
+        typed_tokens = tuple(uncorrected.split())
+        token_set = frozenset(tokens)
+        mentions = default_gazetteer().find(normalized)
+        coins = sorted(of_kind(mentions, "coin"), key=lambda m: m.rank)
+        # Known cities first, then whatever follows "in/for/at" for places the
+        # gazetteer has never heard of.
+        cities = [m.value for m in of_kind(mentions, "city")]
+        cities += [m.group(1).strip() for m in _CITY_PHRASE.finditer(normalized)]
+        return cls(
+            raw=raw,
+            corrected=corrected,
+            normalized=normalized,
+            tokens=tokens,
+            token_set=token_set,
+            # Digit runs as written; "12.5" normalizes to "12 5".
+            numbers=tuple(_DIGITS.findall(normalized)),
+            coins=tuple(dict.fromkeys(m.value for m in coins)),
+            cities=tuple(dict.fromkeys(cities)),
+            app_candidates=tuple(_typed_span(name, tokens, typed_tokens) for name in app_candidates(normalized)),
+            mentions=mentions,
+            uncorrected=uncorrected,
+        )
+
+    def as_typed(self) -> Utterance:
+        """The same utterance parsed without spelling correction."""
+        return self if self.corrected == self.raw else Utterance.parse(self.raw, correct=False)
+
+    def typed(self, text: str) -> str:
+        """``text``, a span of ``normalized``, with corrected words put back as typed."""
+        return _typed_span(text, self.tokens, tuple(self.uncorrected.split()))
+
+    @property
+    def first_number(self) -> str | None:
+        return self.numbers[0] if self.numbers else None
+
+    def entities(self, kind: str) -> tuple[Mention, ...]:
+        """Gazetteer mentions of ``kind`` in text order."""
+        return of_kind(self.mentions, kind)
+
+    def best_entity(self, kind: str) -> str | None:
+        """Canonical value of the highest-priority mention of ``kind``."""
+        return best(self.mentions, kind)
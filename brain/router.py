@@ -14,11 +14,13 @@ import time
 
 from brain.response_picker import get_response
 from brain.nlu.schema import AVAILABLE_INTENTS
+from brain.nlu.utterance import Utterance
 from brain.context import context
 from brain.performance import log_stage
 
 # ── LLM Chat ─────────────────────────────────
 from LLM.chatbot import chat as llm_chat
+from LLM.chatbot import stream_chat as llm_stream_chat
 
 # ── Time & Date ───────────────────────────────
 from services.time_date.temporal_reasoner import TEMPORAL_REASONER
@@ -196,13 +198,15 @@ from services.automation.scheduler import schedule_task
 # =========================
 # ROUTER
 # =========================
-def route(command: dict, return_response: bool = False) -> str:
+def route(command: dict, return_response: bool = False, utterance: Utterance | None = None) -> str:
     """
     Route a fully structured command object to the correct service.
 
     Command shape: {"type": "command", "intent": str, "slots": dict, "metadata": dict}.
     If return_response=True → returns text (UI/API mode).
-    Otherwise → speaks the response (voice mode).
+    Otherwise → speaks the response (voice mode); LLM replies are spoken
+    sentence by sentence while they are still being generated.
+    `utterance` is the parsed user turn the command came from, when there is one.
     """
 
     if not isinstance(command, dict) or command.get("type") != "command" or not isinstance(command.get("slots"), dict):
@@ -221,10 +225,36 @@ def route(command: dict, return_response: bool = False) -> str:
             llm_elapsed += elapsed
             log_stage("LLM", elapsed)
 
+    spoken = False
+
+    def _ask_llm(prompt: str) -> str:
+        """The LLM reply; in voice mode it is also spoken as it streams in."""
+        nonlocal llm_elapsed, spoken
+        if return_response:
+            return _call_llm(prompt)
+
+        from body.speak import speak_stream
+
+        llm_start = time.perf_counter()
+        try:
+            reply = speak_stream(
+                llm_stream_chat(prompt),
+                on_first_sentence=lambda: log_stage("LLM FIRST SENTENCE", time.perf_counter() - llm_start),
+            )
+            spoken = bool(reply)
+            return reply
+        finally:
+            elapsed = time.perf_counter() - llm_start
+            llm_elapsed += elapsed
+            log_stage("LLM", elapsed)
+
     metadata = command.get("metadata") if isinstance(command.get("metadata"), dict) else {}
     intent_data = {**metadata, **command["slots"]}
     intent_data["intent"] = command.get("intent", "unknown")
-    intent_data["text"] = command.get("text", metadata.get("text", ""))
+    if utterance is not None:
+        intent_data["text"] = utterance.raw
+    else:
+        intent_data["text"] = command.get("text", metadata.get("text", ""))
 
     intent = intent_data.get("intent", "unknown")
     reply = ""
@@ -247,7 +277,7 @@ def route(command: dict, return_response: bool = False) -> str:
     elif intent == "chat":
         reply = intent_data.get("response")
         if reply is None:
-            reply = _call_llm(intent_data.get("text", ""))
+            reply = _ask_llm(intent_data.get("text", ""))
 
     # ─────────────────────────────────────────
     # TIME & DATE                                  ← FIXED: were missing
@@ -272,11 +302,11 @@ def route(command: dict, return_response: bool = False) -> str:
             reply = f"{resolution.label.capitalize()} is {rendered_date} ({resolution.timezone})."
 
     elif intent == "advice_time":
-        reply = _call_llm(intent_data.get("topic", intent_data.get("text", "")))
+        reply = _ask_llm(intent_data.get("topic", intent_data.get("text", "")))
 
     elif intent == "convert_timezone":
         # Pass raw query to LLM — timezone parsing needs NLP
-        reply = _call_llm(intent_data.get("query", intent_data.get("text", "")))
+        reply = _ask_llm(intent_data.get("query", intent_data.get("text", "")))
 
     # ─────────────────────────────────────────
     # WEATHER
@@ -372,7 +402,9 @@ def route(command: dict, return_response: bool = False) -> str:
     # MUSIC                                        ← FIXED: were missing
     # ─────────────────────────────────────────
     elif intent == "play_music":
-        reply = play_music_response(intent_data.get("text", ""))
+        # The gazetteer has already scanned this turn for moods; "" means none.
+        mood = (utterance.best_entity("mood") or "") if utterance is not None else None
+        reply = play_music_response(intent_data.get("text", ""), mood=mood)
 
     elif intent == "stop_music":
         reply = stop_music_response()
@@ -745,17 +777,17 @@ def route(command: dict, return_response: bool = False) -> str:
     # AUTOMATION                                   ← FIXED: were missing
     # ─────────────────────────────────────────
     elif intent == "evaluate_trigger":
-        reply = _call_llm(intent_data.get("query", intent_data.get("text", "")))
+        reply = _ask_llm(intent_data.get("query", intent_data.get("text", "")))
 
     elif intent == "apply_rules":
-        reply = _call_llm(intent_data.get("query", intent_data.get("text", "")))
+        reply = _ask_llm(intent_data.get("query", intent_data.get("text", "")))
 
     # ─────────────────────────────────────────
     # UNKNOWN FALLBACK
     # ─────────────────────────────────────────
     else:
         text = intent_data.get("text", "")
-        reply = _call_llm(text) if text else get_response("fallback")
+        reply = _ask_llm(text) if text else get_response("fallback")
 
     # ─────────────────────────────────────────
     # RESPOND
@@ -768,8 +800,9 @@ def route(command: dict, return_response: bool = False) -> str:
     if return_response:
         return reply
 
-    from body.speak import speak
-    speak(reply)
+    if not spoken:
+        from body.speak import speak
+        speak(reply)
 
     if intent == "exit":
         raise SystemExit
@@ -2,8 +2,11 @@
 import threading
 
 from body.speak import audio_loop, warm_up
+from brain import connectivity
 from brain.brain import brain_loop
+from brain.intent_engine import NLU_CLASSIFIER
 from memory.firestore_sync import overwrite_local_conversation_from_cloud
+from system.laptop.app_launcher import preresolve_top_apps
 
 
 def init_memory():
@@ -14,9 +17,12 @@ def init_memory():
 
 
 if __name__ == "__main__":
+    connectivity.get_monitor().wait_until_checked(timeout=3)
     init_memory()
 
     warm_up()
+    NLU_CLASSIFIER.warm_up()
+    preresolve_top_apps()
 
     threading.Thread(target=brain_loop, daemon=True).start()
     audio_loop()
@@ -1,14 +1,26 @@
 # memory/conversation.py
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping
 from datetime import datetime
+from heapq import merge
+from threading import Lock
 from typing import Any
 
 from memory.sync_manager import ensure_turn_identity, upload_turn
 
 # Backward-compatible alias for older imports/tests; synchronization is delegated to SyncManager.
 push_conversation_turn = upload_turn
-from memory.local_cache import read_cache, write_cache
+from memory.local_cache import (
+    WriteBackStore,
+    clear_section,
+    get_journal,
+    get_store,
+    iter_turn_messages,
+    memory_version,
+    update_section,
+)
+from memory.snapshot import MemorySnapshot
 
 # Keep enough verbatim context for follow-ups while compacting older sessions.
 MAX_RECENT_MESSAGES = 40
@@ -31,6 +43,10 @@ CONVERSATIONAL_INTENTS = {
 CONVERSATION_KIND = "conversation"
 COMMAND_KINDS = {"action", "command"}
 
+_snapshot: MemorySnapshot | None = None
+_snapshot_turns_version: tuple[Any, int] | None = None
+_snapshot_lock = Lock()
+
 
 def _now() -> str:
     return datetime.now().isoformat()
@@ -142,19 +158,12 @@ def _stored_turn_is_conversation(turn: dict[str, Any]) -> bool:
     return _is_conversation_turn(user_metadata, assistant_metadata)
 
 
-def _get_conversation_turns(data: dict[str, Any]) -> list[dict[str, Any]]:
-    turns = data.get(CONVERSATION_TURNS_KEY)
-    if isinstance(turns, list):
-        return [
-            turn
-            for turn in turns
-            if isinstance(turn, dict) and _stored_turn_is_conversation(turn)
-        ]
-
-    history = data.get(KEY, [])
-    if isinstance(history, list):
-        return _conversation_turns_from_history(history)
-    return []
+def _get_conversation_turns() -> list[dict[str, Any]]:
+    journal = get_journal()
+    if journal.tail_count():
+        return [turn for turn in journal.tail() if _stored_turn_is_conversation(turn)]
+    # Caches from before conversation turns existed only have the message stream.
+    return _conversation_turns_from_history(get_store().history())
 
 
 def _safe_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
@@ -207,12 +216,10 @@ def _is_conversation_turn(
 
 def add_message(role: str, text: str, metadata: dict[str, Any] | None = None):
     """Append one message and compact old history when needed."""
-    data = read_cache()
-    history = data.get(KEY, [])
-    history.append(_message(role, text, metadata))
-    data[KEY] = history
-    _compact_history(data)
-    write_cache(data)
+    store = get_store()
+    with store.transaction():
+        store.append_history([_message(role, text, metadata)])
+        _compact_history(store)
 
 
 def add_turn(
@@ -222,19 +229,15 @@ def add_turn(
     user_metadata: dict[str, Any] | None = None,
     assistant_metadata: dict[str, Any] | None = None,
 ):
-    """Persist a complete user/assistant exchange with one cache write.
+    """Journal a complete user/assistant exchange and update the derived memory.
 
-    Only conversational turns are written to local memory. Because ``write_cache``
-    also schedules the remote Firebase/Firestore-style sync, returning before the
-    write prevents action commands from being persisted locally or pushed to
-    Firebase/Firestore.
+    Only conversational turns are written to local memory. Returning before the
+    write also keeps action commands from being pushed to Firebase/Firestore.
     """
     if not _is_conversation_turn(user_metadata, assistant_metadata):
         return
 
-    data = read_cache()
     timestamp = _now()
-
     turn = _turn(
         user_text,
         assistant_text,
@@ -242,77 +245,114 @@ def add_turn(
         timestamp=timestamp,
     )
     turn = ensure_turn_identity(turn)
-    turns = _get_conversation_turns(data)
-    turns.append(turn)
-    data[CONVERSATION_TURNS_KEY] = _trim_conversation_turns(turns)
-
-    # Keep the legacy raw message stream for callers that still depend on it.
-    history = data.get(KEY, [])
-    if not isinstance(history, list):
-        history = []
-    user_message = _message("user", user_text, user_metadata, timestamp=timestamp)
-    assistant_message = _message("assistant", assistant_text, assistant_metadata, timestamp=timestamp)
-    history.append(user_message)
-    history.append(assistant_message)
-    data[KEY] = history
-
-    _capture_preferences(data, user_text)
-    _compact_history(data)
-    write_cache(data)
+    get_journal().append(turn)
+
+    store = get_store()
+    with store.transaction():
+        _capture_preferences(store, user_text)
     push_conversation_turn(turn)
 
 
+def _message_time(message: dict[str, Any]) -> str:
+    return str(message.get("time") or "")
+
+
+def iter_history(*, newest_first: bool = False) -> Iterator[dict[str, Any]]:
+    """The raw message stream, derived from the journaled turns as it is consumed.
+
+    Each turn is stored once; its user and assistant messages are only built
+    here.  Messages stored on their own (``add_message``, caches from before
+    the journal) are merged in by time.
+    """
+    derived = iter_turn_messages(get_journal().iter_tail(newest_first=newest_first), newest_first=newest_first)
+    stored = get_store().history()
+    if not stored:
+        yield from derived
+        return
+    if newest_first:
+        stored.reverse()
+    yield from merge(stored, derived, key=_message_time, reverse=newest_first)
+
+
 def get_history() -> list:
-    data = read_cache()
-    return data.get(KEY, [])
+    return list(iter_history())
 
 
 def get_summary() -> str:
-    data = read_cache()
-    return data.get(SUMMARY_KEY, "")
+    return get_store().summary()
 
 
 def get_recent_turns(n: int = DEFAULT_CONTEXT_TURNS) -> list[dict[str, Any]]:
     """Return the last N conversation-only turns for NLU and follow-up resolution."""
-    turns = _get_conversation_turns(read_cache())
+    turns = _get_conversation_turns()
     return turns[-max(0, n):]
 
 
-def get_nlu_context(n: int = DEFAULT_CONTEXT_TURNS) -> dict[str, Any]:
-    data = read_cache()
+def get_memory_snapshot() -> MemorySnapshot:
+    """The current memory, frozen; the same object until the next memory write.
+
+    Only the store sections are re-read when a write left the turns alone
+    (working memory changes several times per command).
+    """
+    global _snapshot, _snapshot_turns_version
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == memory_version():
+        return snapshot
+    with _snapshot_lock:
+        # Read the version first: a write landing mid-build leaves the
+        # snapshot one version behind, so the next call rebuilds it.
+        version = memory_version()
+        snapshot = _snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        store = get_store()
+        journal = get_journal()
+        turns_version = (journal, journal.version)
+        state = {
+            "summary": store.summary(),
+            "working_memory": store.section(WORKING_MEMORY_KEY),
+            "preferences": store.section(LONG_TERM_PREFERENCES_KEY),
+        }
+        if snapshot is not None and turns_version == _snapshot_turns_version:
+            snapshot = snapshot.with_state(version, **state)
+        else:
+            snapshot = MemorySnapshot.build(
+                version,
+                turns=_get_conversation_turns(),
+                recent_count=DEFAULT_CONTEXT_TURNS,
+                **state,
+            )
+        _snapshot, _snapshot_turns_version = snapshot, turns_version
+        return snapshot
+
+
+def get_nlu_context(n: int = DEFAULT_CONTEXT_TURNS) -> Mapping[str, Any]:
+    """Memory context for intent detection: the shared snapshot for the default ``n``."""
+    if n == DEFAULT_CONTEXT_TURNS:
+        return get_memory_snapshot()
+    store = get_store()
     return {
-        "summary": data.get(SUMMARY_KEY, ""),
+        "summary": store.summary(),
         "recent_turns": get_recent_turns(n),
-        "working_memory": data.get(WORKING_MEMORY_KEY, {}),
-        "preferences": data.get(LONG_TERM_PREFERENCES_KEY, {}),
+        "working_memory": store.section(WORKING_MEMORY_KEY),
+        "preferences": store.section(LONG_TERM_PREFERENCES_KEY),
     }
 
 
 def set_working_memory(**kwargs):
-    data = read_cache()
-    working = data.get(WORKING_MEMORY_KEY, {})
-    working.update(kwargs)
-    working["updated_at"] = _now()
-    data[WORKING_MEMORY_KEY] = working
-    write_cache(data)
+    update_section(WORKING_MEMORY_KEY, {**kwargs, "updated_at": _now()})
 
 
 def clear_working_memory():
-    data = read_cache()
-    data[WORKING_MEMORY_KEY] = {}
-    write_cache(data)
-
+    clear_section(WORKING_MEMORY_KEY)
 
-def _compact_history(data: dict[str, Any]):
-    history = data.get(KEY, [])
-    if len(history) <= COMPACT_AFTER_MESSAGES:
-        return
 
-    old = history[:-MAX_RECENT_MESSAGES]
-    recent = history[-MAX_RECENT_MESSAGES:]
-    previous_summary = data.get(SUMMARY_KEY, "").strip()
-    data[SUMMARY_KEY] = _summarize_messages(previous_summary, old)
-    data[KEY] = recent
+def _compact_history(store: WriteBackStore):
+    # Only trims the message stream: the journal compactor folds the turns
+    # these messages came from into the summary.
+    count = store.history_count()
+    if count > COMPACT_AFTER_MESSAGES:
+        store.take_oldest_history(count - MAX_RECENT_MESSAGES)
 
 
 def _summarize_messages(previous_summary: str, messages: list[dict[str, Any]]) -> str:
@@ -345,7 +385,7 @@ def _summarize_messages(previous_summary: str, messages: list[dict[str, Any]]) -
     return "\n".join(parts)[-4000:]
 
 
-def _capture_preferences(data: dict[str, Any], user_text: str):
+def _capture_preferences(store: WriteBackStore, user_text: str):
     """Store simple durable preferences separately from short-term dialogue state."""
     text = user_text.strip()
     lowered = text.lower()
@@ -353,12 +393,9 @@ def _capture_preferences(data: dict[str, Any], user_text: str):
     if not any(marker in lowered for marker in markers):
         return
 
-    profile = data.get(LONG_TERM_PREFERENCES_KEY, {})
-    preferences = profile.get("preferences", [])
+    preferences = store.section_value(LONG_TERM_PREFERENCES_KEY, "preferences", [])
     if not isinstance(preferences, list):
         preferences = []
     if text not in preferences:
         preferences.append(text)
-    profile["preferences"] = preferences[-50:]
-    profile["updated_at"] = _now()
-    data[LONG_TERM_PREFERENCES_KEY] = profile
+    store.update_section(LONG_TERM_PREFERENCES_KEY, {"preferences": preferences[-50:], "updated_at": _now()})
@@ -11,27 +11,25 @@ from __future__ import annotations
 
 import os
 import re
-import socket
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
+from brain import connectivity
+
 
 DEFAULT_PULL_LIMIT = 20
+# Firestore accepts at most 500 writes per batch.
+FIRESTORE_BATCH_LIMIT = 500
+PULL_PAGE_SIZE = 200
 USER_ENV_VAR = "JARVIS_USER_ID"
-NETWORK_CHECK_HOSTS = [("8.8.8.8", 53), ("1.1.1.1", 53), ("9.9.9.9", 53)]
-NETWORK_CHECK_TIMEOUT = 1.0
 
 
-def _is_online(timeout_s: float = NETWORK_CHECK_TIMEOUT) -> bool:
-    """Quick connectivity check before attempting Firestore operations."""
-    for host, port in NETWORK_CHECK_HOSTS:
-        try:
-            with socket.create_connection((host, port), timeout=timeout_s):
-                return True
-        except OSError:
-            continue
-    return False
+def _is_online() -> bool:
+    """Last known connectivity (``brain.connectivity``); no probe on the call path."""
+    return connectivity.is_online()
+
 
 _initialized = False
 _firestore_client: Any | None = None
@@ -61,6 +59,17 @@ def init_firebase() -> Any:
     return _firestore_client
 
 
+def install_client(client: Any, firestore_module: Any) -> None:
+    """Use ``client`` (and ``firestore_module`` for constants) instead of Firebase Admin.
+
+    For running the sync layer against an in-process stand-in.
+    """
+    global _initialized, _firestore_client, _firestore_module
+    _firestore_client = client
+    _firestore_module = firestore_module
+    _initialized = client is not None
+
+
 def _firestore() -> Any:
     """Return the lazily imported firebase_admin.firestore module."""
     if _firestore_module is None:
@@ -78,9 +87,9 @@ def _safe_user_id(raw_user_id: str | None = None) -> str:
 def _local_profile_user_id() -> str | None:
     """Best-effort local fallback without making local_cache import this module."""
     try:
-        from memory.local_cache import read_cache
+        from memory.local_cache import read_section
 
-        profile = read_cache().get("user_profile", {})
+        profile = read_section("user_profile")
         if not isinstance(profile, dict):
             return None
         return profile.get("user_id") or profile.get("id") or profile.get("name")
@@ -109,27 +118,6 @@ def _turn_time(turn: dict[str, Any]) -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _message_from_turn(turn: dict[str, Any], role: str) -> dict[str, Any] | None:
-    legacy_message = turn.get(role)
-    if isinstance(legacy_message, dict):
-        return legacy_message
-
-    text_key = "user_text" if role == "user" else "assistant_text"
-    text = turn.get(text_key)
-    if text is None:
-        return None
-
-    message: dict[str, Any] = {
-        "role": role,
-        "text": str(text),
-        "time": _turn_time(turn),
-    }
-    metadata = turn.get("metadata")
-    if isinstance(metadata, dict) and isinstance(metadata.get(role), dict):
-        message["metadata"] = metadata[role]
-    return message
-
-
 def _conversation_turn_from_cloud(turn: dict[str, Any]) -> dict[str, Any] | None:
     if not isinstance(turn, dict):
         return None
@@ -179,12 +167,7 @@ def push_conversation_turn(turn: dict):
         return False
 
     try:
-        payload = dict(turn)
-        payload["time"] = _turn_time(payload)
-        payload["timestamp"] = str(payload.get("timestamp") or payload["time"])
-        payload.setdefault("conversation_id", _turn_document_id(payload))
-        payload["synced_at"] = _firestore().SERVER_TIMESTAMP
-
+        payload = _upload_payload(turn)
         ref = _conversations_collection().document(str(payload["conversation_id"]))
         ref.set(payload, merge=True)
         return True
@@ -194,6 +177,46 @@ def push_conversation_turn(turn: dict):
         return False
 
 
+def _upload_payload(turn: dict[str, Any]) -> dict[str, Any]:
+    payload = dict(turn)
+    payload["time"] = _turn_time(payload)
+    payload["timestamp"] = str(payload.get("timestamp") or payload["time"])
+    payload.setdefault("conversation_id", _turn_document_id(payload))
+    payload["synced_at"] = _firestore().SERVER_TIMESTAMP
+    return payload
+
+
+def push_conversation_turns(turns: list[dict[str, Any]]) -> int:
+    """Push turns in write batches of up to ``FIRESTORE_BATCH_LIMIT``.
+
+    Each batch commits atomically; returns how many turns, from the first,
+    were committed before a batch failed.
+    """
+    turns = [turn for turn in turns or [] if isinstance(turn, dict) and turn]
+    if not turns:
+        return 0
+
+    if not _is_online():
+        print("[FIRESTORE PUSH SKIPPED] Offline or no network.")
+        return 0
+
+    committed = 0
+    try:
+        client = init_firebase()
+        collection = _conversations_collection()
+        for start in range(0, len(turns), FIRESTORE_BATCH_LIMIT):
+            chunk = turns[start : start + FIRESTORE_BATCH_LIMIT]
+            batch = client.batch()
+            for turn in chunk:
+                payload = _upload_payload(turn)
+                batch.set(collection.document(str(payload["conversation_id"])), payload, merge=True)
+            batch.commit()
+            committed += len(chunk)
+    except Exception as exc:
+        print("[FIRESTORE BATCH PUSH ERROR]", exc)
+    return committed
+
+
 def pull_last_conversation_turns(limit: int = DEFAULT_PULL_LIMIT) -> list[dict[str, Any]]:
     """Return the latest conversation turns from Firestore in chronological order."""
     if not _is_online():
@@ -226,32 +249,18 @@ def overwrite_local_conversation_from_cloud(limit: int = DEFAULT_PULL_LIMIT) ->
         return False
 
     turns: list[dict[str, Any]] = []
-    history: list[dict[str, Any]] = []
     for cloud_turn in cloud_turns:
         turn = _conversation_turn_from_cloud(cloud_turn)
         if turn is not None:
             turns.append(turn)
 
-        user_message = _message_from_turn(cloud_turn, "user")
-        if user_message is not None:
-            history.append(user_message)
-
-        assistant_message = _message_from_turn(cloud_turn, "assistant")
-        if assistant_message is not None:
-            history.append(assistant_message)
-
     if not turns:
         return False
 
     try:
-        from memory.conversation import CONVERSATION_TURNS_KEY, KEY, MAX_CONVERSATION_TURNS
-        from memory.local_cache import read_cache, write_cache
-
-        data = read_cache()
-        data[CONVERSATION_TURNS_KEY] = turns[-MAX_CONVERSATION_TURNS:]
-        if history:
-            data[KEY] = history
-        write_cache(data)
+        from memory.local_cache import replace_conversation
+
+        replace_conversation(turns)
         return True
 
     except Exception as exc:
@@ -260,7 +269,8 @@ def overwrite_local_conversation_from_cloud(limit: int = DEFAULT_PULL_LIMIT) ->
 
 
 def _normalize_cloud_turn(turn: dict[str, Any], document_id: str | None = None) -> dict[str, Any]:
-    payload = dict(turn or {})
+    # Server timestamps (``synced_at``) come back as datetimes; the journal stores JSON.
+    payload = {key: value.isoformat() if isinstance(value, datetime) else value for key, value in (turn or {}).items()}
     if document_id:
         payload.setdefault("conversation_id", document_id)
         payload.setdefault("id", document_id)
@@ -271,57 +281,77 @@ def _normalize_cloud_turn(turn: dict[str, Any], document_id: str | None = None)
     return payload
 
 
-def pull_new_conversation_turns(since_timestamp: str | None = None, limit: int = 200) -> list[dict[str, Any]]:
-    """Return cloud turns newer than ``since_timestamp`` in chronological order."""
+def iter_new_conversation_turns(
+    since_timestamp: str | None = None, page_size: int = PULL_PAGE_SIZE
+) -> Iterator[list[dict[str, Any]]]:
+    """Cloud turns newer than ``since_timestamp``, oldest first, one page at a time.
+
+    Each page resumes after the last document of the previous one, so a long
+    offline period is caught up in full without re-reading earlier pages.
+    """
     if not _is_online():
         print("[FIRESTORE INCREMENTAL PULL SKIPPED] Offline or no network.")
-        return []
+        return
 
     try:
-        safe_limit = max(1, int(limit or 200))
+        safe_size = max(1, int(page_size or PULL_PAGE_SIZE))
         query = _conversations_collection().order_by("timestamp", direction=_firestore().Query.ASCENDING)
         if since_timestamp:
             query = query.where("timestamp", ">", str(since_timestamp))
-        query = query.limit(safe_limit)
-        turns: list[dict[str, Any]] = []
-        for snapshot in query.stream():
-            turns.append(_normalize_cloud_turn(snapshot.to_dict() or {}, snapshot.id))
-        return turns
+        cursor = None
+        while True:
+            page_query = query.start_after(cursor) if cursor is not None else query
+            snapshots = list(page_query.limit(safe_size).stream())
+            if not snapshots:
+                return
+            yield [_normalize_cloud_turn(snapshot.to_dict() or {}, snapshot.id) for snapshot in snapshots]
+            if len(snapshots) < safe_size:
+                return
+            cursor = snapshots[-1]
     except Exception as exc:
         print("[FIRESTORE INCREMENTAL PULL ERROR]", exc)
-        return []
+
+
+def pull_new_conversation_turns(since_timestamp: str | None = None, limit: int = PULL_PAGE_SIZE) -> list[dict[str, Any]]:
+    """Return the first ``limit`` cloud turns newer than ``since_timestamp`` in chronological order."""
+    return next(iter_new_conversation_turns(since_timestamp, page_size=limit), [])
+
+
+def _local_turn_from_cloud(cloud_turn: dict[str, Any]) -> dict[str, Any] | None:
+    turn = _conversation_turn_from_cloud(_normalize_cloud_turn(cloud_turn))
+    if turn is None:
+        return None
+    turn.update({
+        "conversation_id": cloud_turn.get("conversation_id") or cloud_turn.get("id") or cloud_turn.get("turn_id"),
+        "device_id": cloud_turn.get("device_id"),
+        "timestamp": cloud_turn.get("timestamp") or cloud_turn.get("time"),
+    })
+    return turn
 
 
 def append_cloud_conversation_to_local(cloud_turn: dict[str, Any]) -> bool:
     """Incrementally append one cloud turn to local cache without overwriting history."""
+    return bool(merge_cloud_conversations([cloud_turn]))
+
+
+def merge_cloud_conversations(cloud_turns: list[dict[str, Any]]) -> int:
+    """Incrementally merge cloud turns into local cache with a single journal write."""
     try:
-        from memory.local_cache import append_turn
-
-        turn = _conversation_turn_from_cloud(_normalize_cloud_turn(cloud_turn))
-        if turn is None:
-            return False
-        turn.update({
-            "conversation_id": cloud_turn.get("conversation_id") or cloud_turn.get("id") or cloud_turn.get("turn_id"),
-            "device_id": cloud_turn.get("device_id"),
-            "timestamp": cloud_turn.get("timestamp") or cloud_turn.get("time"),
-        })
-        return append_turn(turn)
+        from memory.local_cache import merge_turns
+
+        turns = [turn for cloud_turn in cloud_turns or [] if (turn := _local_turn_from_cloud(cloud_turn)) is not None]
+        return merge_turns(turns)
     except Exception as exc:
         print("[FIRESTORE LOCAL APPEND ERROR]", exc)
-        return False
+        return 0
 
 
-def merge_cloud_conversations(cloud_turns: list[dict[str, Any]]) -> int:
-    """Incrementally merge cloud turns into local cache."""
-    merged = 0
-    for cloud_turn in cloud_turns or []:
-        if append_cloud_conversation_to_local(cloud_turn):
-            merged += 1
-    return merged
-
+def start_realtime_listener(callback, device_id: str | None = None, *, batch: bool = False) -> Any | None:
+    """Start a Firestore snapshot listener and call back for new remote turns.
 
-def start_realtime_listener(callback, device_id: str | None = None) -> Any | None:
-    """Start a Firestore snapshot listener and call back for new remote turns."""
+    With ``batch`` the callback gets each snapshot's turns as one list (the
+    first snapshot holds every existing turn) instead of one call per turn.
+    """
     if not _is_online():
         print("[FIRESTORE LISTENER SKIPPED] Offline or no network.")
         return None
@@ -330,6 +360,7 @@ def start_realtime_listener(callback, device_id: str | None = None) -> Any | Non
         query = _conversations_collection().order_by("timestamp", direction=_firestore().Query.ASCENDING)
 
         def _on_snapshot(_snapshots, changes, _read_time):
+            turns: list[dict[str, Any]] = []
             for change in changes:
                 if getattr(change, "type", None).name not in {"ADDED", "MODIFIED"}:
                     continue
@@ -337,7 +368,12 @@ def start_realtime_listener(callback, device_id: str | None = None) -> Any | Non
                 turn = _normalize_cloud_turn(snapshot.to_dict() or {}, snapshot.id)
                 if device_id and turn.get("device_id") == device_id:
                     continue
-                callback(turn)
+                if batch:
+                    turns.append(turn)
+                else:
+                    callback(turn)
+            if batch and turns:
+                callback(turns)
 
         return query.on_snapshot(_on_snapshot)
     except Exception as exc:
@@ -0,0 +1,398 @@
+"""Append-only JSONL journal of conversation turns.
+
+Each turn is one JSON line appended to the active segment file
+(``turns-000001.jsonl``, ``turns-000002.jsonl``, ...), so recording a turn
+costs the same however long the conversation has run.  The newest turns are
+kept in memory as the tail index that NLU context and follow-ups read from.
+
+Once the active segment holds ``segment_turns`` lines it is sealed and a new
+one started.  A background compactor then folds the sealed turns that are no
+longer in the tail into the conversation summary (through ``on_fold``) and
+rewrites what remains of them as a single segment, so the journal on disk
+stays a few segments long.
+
+The ids of folded turns are kept in ``folded-ids.txt`` so that a turn pulled
+again later is still a duplicate.  The file is rewritten before each fold and
+holds only the newest ``folded_ids`` of them: pulls start from the cloud
+cursor, so only recent turns come back.  A crash between that rewrite and the
+summary write leaves those turns out of the summary rather than folding them
+into it twice.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from bisect import insort
+from collections.abc import Callable, Iterable, Iterator
+from copy import deepcopy
+from heapq import merge
+from threading import Event, Lock, Thread
+from typing import Any, TextIO
+
+from memory.sqlite_store import turn_id as _turn_id
+
+SEGMENT_TURNS = 20
+FOLDED_IDS = 5000
+FOLDED_IDS_FILE = "folded-ids.txt"
+_SEGMENT_NAME = re.compile(r"^turns-(\d{6})\.jsonl$")
+
+FoldHandler = Callable[[list[dict[str, Any]]], None]
+
+
+def _timestamp(turn: dict[str, Any]) -> str:
+    return str(turn.get("timestamp") or turn.get("time") or "")
+
+
+class TurnJournal:
+    def __init__(
+        self,
+        directory: str,
+        *,
+        tail_size: int,
+        segment_turns: int = SEGMENT_TURNS,
+        folded_ids: int = FOLDED_IDS,
+        on_fold: FoldHandler | None = None,
+        on_write: Callable[[], None] | None = None,
+        fsync: bool = False,
+    ) -> None:
+        self.directory = directory
+        self._tail_size = tail_size
+        self._segment_turns = max(1, segment_turns)
+        self._folded_limit = max(0, folded_ids)
+        self._on_fold = on_fold
+        self._on_write = on_write
+        self._fsync = fsync
+        self._lock = Lock()
+        self._compact_lock = Lock()
+        self._loaded = False
+        # Tail index: (timestamp, seq, identity, turn), oldest first.
+        self._tail: list[tuple[str, int, str, dict[str, Any]]] = []
+        self._ids: set[str] = set()
+        # Folded turns: identity -> timestamp, as in folded-ids.txt.
+        self._folded: dict[str, str] = {}
+        self._seq = 0
+        self._segments: list[int] = []
+        self._active_lines = 0
+        self._handle: TextIO | None = None
+        self._wake = Event()
+        self._compactor: Thread | None = None
+        self._closed = False
+        # Bumped whenever the tail index changes.
+        self.version = 0
+
+    # =========================
+    # FILES
+    # =========================
+    def _path(self, number: int) -> str:
+        return os.path.join(self.directory, f"turns-{number:06d}.jsonl")
+
+    def _read_segment(self, number: int) -> list[dict[str, Any]]:
+        turns: list[dict[str, Any]] = []
+        try:
+            with open(self._path(number), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        turn = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    if isinstance(turn, dict):
+                        turns.append(turn)
+        except OSError:
+            pass
+        return turns
+
+    def _write_segment(self, number: int, turns: Iterable[dict[str, Any]]) -> None:
+        path = self._path(number)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for turn in turns:
+                f.write(json.dumps(turn, ensure_ascii=False) + "\n")
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _read_folded_ids(self) -> dict[str, str]:
+        folded: dict[str, str] = {}
+        try:
+            with open(os.path.join(self.directory, FOLDED_IDS_FILE), "r", encoding="utf-8") as f:
+                for line in f:
+                    # "timestamp<TAB>id"; files from before the timestamps hold bare ids.
+                    timestamp, _, identity = line.rstrip("\n").rpartition("\t")
+                    if identity:
+                        folded[identity] = timestamp
+        except OSError:
+            pass
+        return folded
+
+    def _write_folded_ids(self, folded: dict[str, str]) -> None:
+        path = os.path.join(self.directory, FOLDED_IDS_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(
+                "".join(
+                    f"{timestamp}\t{identity}\n"
+                    for identity, timestamp in folded.items()
+                    if "\n" not in identity and "\t" not in timestamp + identity
+                )
+            )
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _bounded(self, folded: dict[str, str]) -> dict[str, str]:
+        """The newest ``folded_ids`` of ``folded``, oldest first."""
+        newest = sorted(folded.items(), key=lambda item: item[1])[-self._folded_limit:] if self._folded_limit else []
+        return dict(newest)
+
+    def _open_active(self) -> TextIO:
+        if self._handle is None:
+            os.makedirs(self.directory, exist_ok=True)
+            if not self._segments:
+                self._segments.append(1)
+                self._active_lines = 0
+            self._handle = open(self._path(self._segments[-1]), "a", encoding="utf-8")
+        return self._handle
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+        self._segments = sorted(int(m.group(1)) for name in names if (m := _SEGMENT_NAME.match(name)))
+        self._folded = self._read_folded_ids()
+        self._tail, self._ids, self._seq = [], set(self._folded), 0
+        lines = 0
+        for number in self._segments:
+            turns = self._read_segment(number)
+            lines = len(turns)
+            for turn in turns:
+                self._index(turn)
+        self._active_lines = lines
+        self._loaded = True
+        if len(self._segments) > 1:
+            self._start_compactor()
+
+    def _identity(self, turn: dict[str, Any]) -> str:
+        return _turn_id(turn) or json.dumps(turn, sort_keys=True)
+
+    def _entry(self, turn: dict[str, Any]) -> tuple[str, int, str, dict[str, Any]] | None:
+        """Claim ``turn``'s id; None if the journal already has it."""
+        identity = self._identity(turn)
+        if identity in self._ids:
+            return None
+        self._ids.add(identity)
+        self._seq += 1
+        return (_timestamp(turn), self._seq, identity, turn)
+
+    def _index(self, turn: dict[str, Any]) -> bool:
+        entry = self._entry(turn)
+        if entry is None:
+            return False
+        if len(self._tail) < self._tail_size or entry > self._tail[0]:
+            insort(self._tail, entry)
+            del self._tail[: max(0, len(self._tail) - self._tail_size)]
+        return True
+
+    # =========================
+    # READ
+    # =========================
+    def tail(self, n: int | None = None) -> list[dict[str, Any]]:
+        """The newest turns (all of the tail index, or the last ``n``), oldest first."""
+        with self._lock:
+            self._load()
+            entries = self._tail if n is None else self._tail[-n:] if n > 0 else []
+            return [deepcopy(turn) for *_, turn in entries]
+
+    def iter_tail(self, *, newest_first: bool = False) -> Iterator[dict[str, Any]]:
+        """The tail turns one at a time, each copied only when it is reached."""
+        with self._lock:
+            self._load()
+            # Indexed turns are never changed in place, so a shallow copy of
+            # the index is a consistent view to walk after the lock is released.
+            entries = list(self._tail)
+        if newest_first:
+            entries.reverse()
+        for *_, turn in entries:
+            yield deepcopy(turn)
+
+    def tail_count(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._tail)
+
+    def has_turn(self, conversation_id: str) -> bool:
+        """True for turns in the journal, including those already folded."""
+        with self._lock:
+            self._load()
+            return conversation_id in self._ids
+
+    # =========================
+    # WRITE
+    # =========================
+    def append(self, turn: dict[str, Any]) -> bool:
+        """Journal one turn; False if its id is already there."""
+        return bool(self.append_many([turn]))
+
+    def append_many(self, turns: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Journal the turns whose ids are new, with one write; returns those turns.
+
+        Duplicates are dropped against the id set, within the batch too.  The
+        new turns are sorted (a single pass when they arrive in order, as pulls
+        do) and only their newest ``tail_size`` are merged into the tail index.
+        """
+        with self._lock:
+            self._load()
+            added: list[dict[str, Any]] = []
+            entries: list[tuple[str, int, str, dict[str, Any]]] = []
+            for turn in turns:
+                entry = self._entry(deepcopy(turn))
+                if entry is not None:
+                    added.append(turn)
+                    entries.append(entry)
+            if not added:
+                return []
+
+            entries.sort()
+            newest = entries[-self._tail_size:] if self._tail_size > 0 else []
+            self._tail = list(merge(self._tail, newest))
+            del self._tail[: max(0, len(self._tail) - self._tail_size)]
+
+            handle = self._open_active()
+            handle.write("".join(json.dumps(turn, ensure_ascii=False) + "\n" for turn in added))
+            handle.flush()
+            if self._fsync:
+                os.fsync(handle.fileno())
+            self._active_lines += len(added)
+            if self._active_lines >= self._segment_turns:
+                self._rotate()
+            self._written()
+            return added
+
+    def _rotate(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._segments.append(self._segments[-1] + 1)
+        self._active_lines = 0
+        self._start_compactor()
+
+    def replace(self, turns: Iterable[dict[str, Any]]) -> None:
+        """Make ``turns`` the whole journal."""
+        with self._compact_lock, self._lock:
+            self._load()
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            old, number = self._segments, (self._segments[-1] + 1 if self._segments else 1)
+            turns = [deepcopy(turn) for turn in turns if isinstance(turn, dict)]
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_segment(number, turns)
+            for stale in old:
+                self._unlink(stale)
+            try:
+                os.remove(os.path.join(self.directory, FOLDED_IDS_FILE))
+            except OSError:
+                pass
+            self._segments = [number]
+            self._tail, self._ids, self._folded, self._seq = [], set(), {}, 0
+            for turn in turns:
+                self._index(turn)
+            self._active_lines = len(turns)
+            if self._active_lines >= self._segment_turns:
+                self._rotate()
+            self._written()
+
+    def _written(self) -> None:
+        self.version += 1
+        if self._on_write is not None:
+            self._on_write()
+
+    def close(self) -> None:
+        """Close the active segment; waits for a running compaction and stops the compactor."""
+        with self._compact_lock, self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self._closed = True
+        self._wake.set()
+
+    def _unlink(self, number: int) -> None:
+        try:
+            os.remove(self._path(number))
+        except OSError:
+            pass
+
+    # =========================
+    # COMPACTION
+    # =========================
+    def _start_compactor(self) -> None:
+        self._wake.set()
+        if self._compactor is None or not self._compactor.is_alive():
+            self._compactor = Thread(target=self._compact_loop, name="memory-journal-compactor", daemon=True)
+            self._compactor.start()
+
+    def _compact_loop(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed:
+                return
+            try:
+                self.compact()
+            except Exception as exc:
+                print("[MEMORY JOURNAL COMPACTION ERROR]", exc)
+
+    def compact(self) -> int:
+        """Fold sealed turns that left the tail; returns how many were folded."""
+        with self._compact_lock:
+            with self._lock:
+                self._load()
+                sealed = self._segments[:-1]
+                in_tail = {identity for _, _, identity, _ in self._tail}
+                recorded = dict(self._folded)
+            if not sealed or self._closed:
+                return 0
+
+            # Sealed segments never change again, so they are read unlocked.
+            # Turns already recorded as folded are left over from a compaction
+            # cut short after its ids were written; they are dropped, not folded again.
+            kept: list[dict[str, Any]] = []
+            folded: list[dict[str, Any]] = []
+            seen: set[str] = set(recorded)
+            for number in sealed:
+                for turn in self._read_segment(number):
+                    identity = self._identity(turn)
+                    if identity in seen:
+                        continue
+                    seen.add(identity)
+                    (kept if identity in in_tail else folded).append(turn)
+
+            folded.sort(key=_timestamp)
+            everything = {**recorded, **{self._identity(turn): _timestamp(turn) for turn in folded}}
+            record = self._bounded(everything)
+            if folded:
+                # Recorded before the summary and the segment rewrite, so a
+                # restart never folds these turns again or takes them for new.
+                self._write_folded_ids(record)
+                if self._on_fold is not None:
+                    try:
+                        self._on_fold(folded)
+                    except Exception:
+                        self._write_folded_ids(recorded)  # still in the journal, fold them next time
+                        raise
+            self._write_segment(sealed[-1], kept)
+            for number in sealed[:-1]:
+                self._unlink(number)
+
+            with self._lock:
+                self._segments = [number for number in self._segments if number not in sealed[:-1]]
+                if folded:
+                    self._ids.difference_update(everything.keys() - record.keys())
+                    self._folded = record
+            return len(folded)
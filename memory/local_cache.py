@@ -1,55 +1,435 @@
-import json
+import atexit
 import os
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from copy import deepcopy
 from datetime import datetime, timezone
-from threading import Lock
+from threading import Lock, RLock, Timer
 from typing import Any
 
+from memory.journal import TurnJournal
+from memory.sqlite_store import SYNC_SECTION, MemoryStore
+from memory.sqlite_store import turn_id as _turn_id
+
 DATA_DIR = "database"
+DB_FILE = os.path.join(DATA_DIR, "memory.db")
+# Legacy JSON stores, imported into DB_FILE once on first open.
 CACHE_FILE = os.path.join(DATA_DIR, "cache.json")
 SYNC_FILE = os.path.join(DATA_DIR, "sync.json")
+# Conversation turns: append-only JSONL segments, see memory.journal.
+JOURNAL_DIR = os.path.join(DATA_DIR, "journal")
 CONVERSATION_TURNS_KEY = "conversation_turns"
 CONVERSATION_HISTORY_KEY = "conversation_history"
 MAX_CONVERSATION_TURNS = 20
-MAX_HISTORY_MESSAGES = 40
+# Writes made within this window reach the database together.
+FLUSH_DELAY_SECONDS = 0.5
+# Longest wait between retries of a flush that keeps failing.
+FLUSH_RETRY_MAX_SECONDS = 30.0
 
 _lock = Lock()
+_store: "WriteBackStore | None" = None
+_journal: TurnJournal | None = None
+# Memory version: bumped by every write to the store or the journal.
+_version = 0
+_version_lock = Lock()
 
 
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _ensure_file():
-    os.makedirs(DATA_DIR, exist_ok=True)
-    if not os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump({}, f)
-
-
-def _ensure_sync_file():
-    os.makedirs(DATA_DIR, exist_ok=True)
-    if not os.path.exists(SYNC_FILE):
-        with open(SYNC_FILE, "w", encoding="utf-8") as f:
-            json.dump({}, f)
+# =========================
+# WRITE-BACK CACHE
+# Reads are served from an in-process copy of the store; writes update the
+# copy, mark what changed and reach SQLite in one transaction after
+# FLUSH_DELAY_SECONDS, on flush() or at interpreter exit.  Per-command state
+# such as working memory ("nlu" -> "routing" -> cleared) usually never hits
+# the disk in its intermediate forms.  A failed flush keeps its writes pending
+# and retries with a growing delay.  This process is assumed to be the only
+# writer while it runs (see memory.sqlite_store).
+# =========================
+class WriteBackStore:
+    def __init__(
+        self,
+        store: MemoryStore,
+        *,
+        delay: float = FLUSH_DELAY_SECONDS,
+        on_write: Callable[[], None] | None = None,
+    ) -> None:
+        self._store = store
+        self._delay = delay
+        self._on_write = on_write
+        self._lock = RLock()
+        self._flush_lock = Lock()
+        self._timer: Timer | None = None
+        self._failed_flushes = 0
+        self._loaded = False
+        self._history: list[dict[str, Any]] = []
+        self._summary = ""
+        self._sections: dict[str, dict[str, Any]] = {}
+        # Pending writes: ordered history operations, the summary, and
+        # per-section (replaced, values) coalesced across calls.
+        self._ops: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+        self._summary_dirty = False
+        self._dirty_sections: dict[str, tuple[bool, dict[str, Any]]] = {}
+
+    @property
+    def path(self) -> str:
+        return self._store.path
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        store = self._store
+        self._history = store.history()
+        self._summary = store.summary()
+        self._sections = {name: store.section(name) for name in store.section_names()}
+        self._loaded = True
+
+    @contextmanager
+    def transaction(self) -> Iterator["WriteBackStore"]:
+        """Group writes so that no flush lands between them."""
+        with self._lock:
+            self._load()
+            yield self
+
+    def _pending(self, name: str, *args: Any, **kwargs: Any) -> None:
+        self._ops.append((name, args, kwargs))
+        self._schedule()
+
+    def _schedule(self) -> None:
+        # Every write schedules a flush, so this is also where it is counted.
+        if self._on_write is not None:
+            self._on_write()
+        self._start_timer(self._delay)
+
+    def _start_timer(self, delay: float) -> None:
+        if self._timer is None:
+            self._timer = Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """Write everything pending to the database in one transaction.
+
+        Returns False when the write failed; the writes then stay pending and
+        a retry is scheduled.
+        """
+        with self._flush_lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> bool:
+        # Lock order is always _flush_lock, then _lock; the disk write itself
+        # runs without _lock so readers and writers are never blocked on it.
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            ops, self._ops = self._ops, []
+            sections, self._dirty_sections = self._dirty_sections, {}
+            summary = self._summary if self._summary_dirty else None
+            self._summary_dirty = False
+        if not (ops or sections or summary is not None):
+            return True
+        store = self._store
+        try:
+            with store.transaction():
+                for name, args, kwargs in ops:
+                    getattr(store, name)(*args, **kwargs)
+                if summary is not None:
+                    store.set_summary(summary)
+                for name, (replaced, values) in sections.items():
+                    if replaced:
+                        store.replace_section(name, values)
+                    else:
+                        store.update_section(name, values)
+        except Exception as exc:
+            with self._lock:
+                self._restore_pending(ops, sections, summary is not None)
+                self._failed_flushes += 1
+                retry = min(FLUSH_RETRY_MAX_SECONDS, self._delay * 2 ** self._failed_flushes)
+                self._start_timer(retry)
+            print(
+                f"[MEMORY FLUSH ERROR] {exc} -- {len(ops) + len(sections)} pending writes kept, "
+                f"retry {self._failed_flushes} in {retry:.1f}s"
+            )
+            return False
+        self._failed_flushes = 0
+        return True
+
+    def _restore_pending(
+        self,
+        ops: list[tuple[str, tuple[Any, ...], dict[str, Any]]],
+        sections: dict[str, tuple[bool, dict[str, Any]]],
+        summary: bool,
+    ) -> None:
+        # Put a failed flush back in front of whatever was written meanwhile.
+        self._ops = ops + self._ops
+        for name, (replaced, values) in sections.items():
+            newer = self._dirty_sections.get(name)
+            if newer is None:
+                self._dirty_sections[name] = (replaced, values)
+            elif not newer[0]:
+                self._dirty_sections[name] = (replaced, {**values, **newer[1]})
+        # self._summary already holds the newest text.
+        self._summary_dirty = self._summary_dirty or summary
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            # A failed last flush was already reported; nothing retries after close.
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._store.close()
+
+    def take_legacy_turns(self) -> list[dict[str, Any]]:
+        """Remove and return turns stored in the database before the journal existed."""
+        with self._flush_lock:
+            self._flush_locked()
+            turns = self._store.turns()
+            if turns:
+                self._store.replace_turns([])
+            return turns
+
+    # =========================
+    # HISTORY
+    # =========================
+    def history(self) -> list[dict[str, Any]]:
+        with self._lock:
+            self._load()
+            return deepcopy(self._history)
+
+    def history_count(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._history)
+
+    def append_history(self, messages: Iterable[dict[str, Any]], *, keep: int | None = None) -> None:
+        with self._lock:
+            self._load()
+            messages = [deepcopy(message) for message in messages]
+            self._history.extend(messages)
+            if keep is not None:
+                self._history = self._history[-keep:] if keep > 0 else []
+            self._pending("append_history", messages, keep=keep)
+
+    def replace_history(self, messages: Iterable[dict[str, Any]]) -> None:
+        with self._lock:
+            self._load()
+            self._history = [deepcopy(message) for message in messages if isinstance(message, dict)]
+            self._pending("replace_history", list(self._history))
+
+    def take_oldest_history(self, count: int) -> list[dict[str, Any]]:
+        with self._lock:
+            self._load()
+            taken = self._history[: max(0, count)]
+            self._history = self._history[len(taken):]
+            if taken:
+                self._pending("take_oldest_history", len(taken))
+            return deepcopy(taken)
+
+    # =========================
+    # SUMMARY
+    # =========================
+    def summary(self) -> str:
+        with self._lock:
+            self._load()
+            return self._summary
+
+    def set_summary(self, text: str) -> None:
+        with self._lock:
+            self._load()
+            self._summary = text
+            self._summary_dirty = True
+            self._schedule()
+
+    # =========================
+    # SECTIONS
+    # =========================
+    def section(self, name: str) -> dict[str, Any]:
+        with self._lock:
+            self._load()
+            return deepcopy(self._sections.get(name, {}))
+
+    def section_value(self, name: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            self._load()
+            return deepcopy(self._sections.get(name, {}).get(key, default))
+
+    def update_section(self, name: str, values: dict[str, Any]) -> None:
+        with self._lock:
+            self._load()
+            values = {str(key): deepcopy(value) for key, value in values.items()}
+            self._sections.setdefault(name, {}).update(values)
+            replaced, dirty = self._dirty_sections.get(name, (False, {}))
+            dirty.update(values)
+            self._dirty_sections[name] = (replaced, dirty)
+            self._schedule()
+
+    def replace_section(self, name: str, values: dict[str, Any]) -> None:
+        with self._lock:
+            self._load()
+            values = {str(key): deepcopy(value) for key, value in values.items()}
+            self._sections[name] = values
+            self._dirty_sections[name] = (True, dict(values))
+            self._schedule()
+
+    # =========================
+    # OUTBOX
+    # Written through, not buffered: a queued upload must survive a crash
+    # right after the reply.
+    # =========================
+    def outbox_put(self, key: str, payload: dict[str, Any], enqueued_at: float) -> None:
+        self._store.outbox_put(key, payload, enqueued_at)
+
+    def outbox_items(self, limit: int | None = None) -> list[tuple[str, dict[str, Any], float]]:
+        return self._store.outbox_items(limit)
+
+    def outbox_remove(self, keys: Iterable[str]) -> None:
+        self._store.outbox_remove(keys)
+
+    def outbox_count(self) -> int:
+        return self._store.outbox_count()
+
+    # =========================
+    # WHOLE-CACHE VIEW
+    # =========================
+    def snapshot(self) -> dict[str, Any]:
+        self.flush()
+        return self._store.snapshot()
+
+    def replace_all(self, data: dict[str, Any]) -> None:
+        with self._flush_lock:
+            self._flush_locked()
+            with self._lock:
+                self._store.replace_all(data)
+                self._loaded = False
+                if self._on_write is not None:
+                    self._on_write()
+
+
+def get_store() -> WriteBackStore:
+    """The process-wide memory store, opened (and migrated) on first use."""
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                _store = WriteBackStore(
+                    MemoryStore(DB_FILE, legacy_cache=CACHE_FILE, legacy_sync=SYNC_FILE),
+                    on_write=_written,
+                )
+    return _store
+
+
+def _written() -> None:
+    global _version
+    with _version_lock:
+        _version += 1
+
+
+def memory_version() -> int:
+    """A counter that grows with every memory write (and store reset)."""
+    return _version
+
+
+def _fold_into_summary(turns: list[dict[str, Any]]) -> None:
+    # Imported here: memory.conversation imports this module.
+    from memory.conversation import _summarize_messages
+
+    messages = list(iter_turn_messages(turns))
+    store = get_store()
+    with store.transaction():
+        store.set_summary(_summarize_messages(store.summary().strip(), messages))
+    # The journal drops these turns as soon as this returns, so the summary
+    # that now holds them has to be on disk first, not in the write-back buffer.
+    if not store.flush():
+        raise RuntimeError("summary not written; the folded turns stay in the journal")
+
+
+def get_journal() -> TurnJournal:
+    """The process-wide turn journal; turns still in the database move into it once."""
+    global _journal
+    if _journal is None:
+        store = get_store()
+        with _lock:
+            if _journal is None:
+                journal = TurnJournal(
+                    JOURNAL_DIR,
+                    tail_size=MAX_CONVERSATION_TURNS,
+                    on_fold=_fold_into_summary,
+                    on_write=_written,
+                )
+                if not journal.tail_count():
+                    legacy = store.take_legacy_turns()
+                    if legacy:
+                        journal.replace(legacy)
+                _journal = journal
+    return _journal
+
+
+def flush() -> None:
+    """Write pending memory changes to disk now."""
+    if _store is not None:
+        _store.flush()
+
+
+atexit.register(flush)
+
+
+def reset_store() -> None:
+    """Flush and close the store and journal; the next calls reopen them from the current paths."""
+    global _store, _journal
+    with _lock:
+        if _journal is not None:
+            _journal.close()
+        if _store is not None:
+            _store.close()
+        _store = None
+        _journal = None
+    _written()
 
 
 def read_cache() -> dict:
-    _ensure_file()
-    with _lock:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                return {}
-            return data if isinstance(data, dict) else {}
+    """Every memory section in the old ``cache.json`` shape.
+
+    Reads all tables; prefer the per-section accessors on the hot path.
+    """
+    data = get_store().snapshot()
+    turns = get_journal().tail()
+    if turns:
+        data[CONVERSATION_TURNS_KEY] = turns
+    return data
 
 
 def write_cache(data: dict):
-    _ensure_file()
+    """Replace all memory sections with ``data`` (the old ``cache.json`` shape)."""
+    data = dict(data) if isinstance(data, dict) else {}
+    turns = data.pop(CONVERSATION_TURNS_KEY, [])
+    get_store().replace_all(data)
+    get_journal().replace(turns if isinstance(turns, list) else [])
 
-    with _lock:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+
+def read_section(name: str) -> dict[str, Any]:
+    return get_store().section(name)
+
+
+def update_section(name: str, values: dict[str, Any]):
+    get_store().update_section(name, values)
+
+
+def clear_section(name: str):
+    get_store().replace_section(name, {})
+
+
+def replace_conversation(turns: list[dict[str, Any]]):
+    """Swap in ``turns`` as the whole conversation, leaving the other sections alone.
+
+    Stored standalone messages are dropped too: the message stream of the new
+    conversation is derived from its turns.
+    """
+    get_journal().replace(turns[-MAX_CONVERSATION_TURNS:])
+    get_store().replace_history([])
 
 
 def _turn_timestamp(turn: dict[str, Any]) -> str:
@@ -57,18 +437,11 @@ def _turn_timestamp(turn: dict[str, Any]) -> str:
     return str(value) if value else _now()
 
 
-def _turn_id(turn: dict[str, Any]) -> str | None:
-    value = turn.get("conversation_id") or turn.get("id") or turn.get("turn_id")
-    return str(value) if value else None
-
-
 def has_turn(turn_or_id: dict[str, Any] | str) -> bool:
     conversation_id = _turn_id(turn_or_id) if isinstance(turn_or_id, dict) else str(turn_or_id)
     if not conversation_id:
         return False
-    data = read_cache()
-    turns = data.get(CONVERSATION_TURNS_KEY, [])
-    return any(isinstance(turn, dict) and _turn_id(turn) == conversation_id for turn in turns)
+    return get_journal().has_turn(conversation_id)
 
 
 def _messages_from_turn(turn: dict[str, Any]) -> list[dict[str, Any]]:
@@ -88,57 +461,46 @@ def _messages_from_turn(turn: dict[str, Any]) -> list[dict[str, Any]]:
     return messages
 
 
-def append_turn(turn: dict[str, Any], *, update_history: bool = True) -> bool:
-    if not isinstance(turn, dict) or not turn:
-        return False
-    data = read_cache()
-    turns = data.get(CONVERSATION_TURNS_KEY, [])
-    if not isinstance(turns, list):
-        turns = []
+def iter_turn_messages(turns: Iterable[dict[str, Any]], *, newest_first: bool = False) -> Iterator[dict[str, Any]]:
+    """The user/assistant message stream of ``turns``, built as it is consumed.
+
+    With ``newest_first`` the turns are expected newest first too, and each
+    turn's assistant message comes before its user message.
+    """
+    for turn in turns:
+        messages = _messages_from_turn(turn)
+        if newest_first:
+            messages.reverse()
+        yield from messages
 
-    conversation_id = _turn_id(turn)
-    if conversation_id and any(isinstance(existing, dict) and _turn_id(existing) == conversation_id for existing in turns):
-        return False
 
+def _normalized_turn(turn: dict[str, Any]) -> dict[str, Any]:
     normalized = dict(turn)
     normalized["timestamp"] = _turn_timestamp(normalized)
     normalized.setdefault("time", normalized["timestamp"])
-    turns.append(normalized)
-    turns.sort(key=_turn_timestamp)
-    data[CONVERSATION_TURNS_KEY] = turns[-MAX_CONVERSATION_TURNS:]
+    return normalized
+
 
-    if update_history:
-        history = data.get(CONVERSATION_HISTORY_KEY, [])
-        if not isinstance(history, list):
-            history = []
-        history.extend(_messages_from_turn(normalized))
-        data[CONVERSATION_HISTORY_KEY] = history[-MAX_HISTORY_MESSAGES:]
+def append_turn(turn: dict[str, Any]) -> bool:
+    """Journal ``turn`` unless its id is there already; its messages are derived on read."""
+    return bool(append_turns([turn]))
 
-    write_cache(data)
-    return True
+
+def append_turns(turns: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Journal every turn whose id is new in one write; returns the turns added."""
+    normalized = [_normalized_turn(turn) for turn in turns or [] if isinstance(turn, dict) and turn]
+    if not normalized:
+        return []
+    return get_journal().append_many(normalized)
 
 
 def merge_turns(turns: list[dict[str, Any]]) -> int:
-    merged = 0
-    for turn in turns or []:
-        if append_turn(turn):
-            merged += 1
-    return merged
+    return len(append_turns(turns))
 
 
 def load_sync_metadata() -> dict[str, Any]:
-    _ensure_sync_file()
-    with _lock:
-        with open(SYNC_FILE, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                return {}
-            return data if isinstance(data, dict) else {}
+    return get_store().section(SYNC_SECTION)
 
 
 def save_sync_metadata(metadata: dict[str, Any]):
-    _ensure_sync_file()
-    with _lock:
-        with open(SYNC_FILE, "w", encoding="utf-8") as f:
-            json.dump(metadata or {}, f, indent=2)
+    get_store().replace_section(SYNC_SECTION, metadata or {})
@@ -1,14 +1,17 @@
 # memory/memory_retriever.py
-from memory.conversation import get_history
+from itertools import islice
+
+from memory.conversation import iter_history
 
 
 def recall_last_user_message():
-    history = get_history()
-    for msg in reversed(history):
+    for msg in iter_history(newest_first=True):
         if msg["role"] == "user":
             return msg["text"]
     return None
 
 
 def recall_recent(n=5):
-    return get_history()[-n:]
+    recent = list(islice(iter_history(newest_first=True), max(0, n)))
+    recent.reverse()
+    return recent
@@ -0,0 +1,211 @@
+"""Durable queue of conversation turns waiting to be uploaded.
+
+``add_turn`` used to push each turn to Firestore inline, behind a
+connectivity probe and a blocking ``set()``, while the command lock was held.
+Now the request path only calls ``SyncOutbox.enqueue``: one row in the
+``outbox`` table of the memory database.  A daemon thread drains the queue in
+order, handing the uploader up to ``batch_size`` items per call (one
+Firestore write batch).  Items whose upload fails are retried with
+exponential backoff (``BASE_RETRY_SECONDS`` doubling up to
+``MAX_RETRY_SECONDS``), and the pass stops there, since the next upload would
+most likely fail the same way.  Nothing queued after them is uploaded before
+they are, so turns reach Firestore in the order they were recorded.  Rows left over when the process exits are
+uploaded by the next one.
+
+``metrics()`` reports queue depth and upload latency: how long the upload call
+took, and how long items waited in the queue in total.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from itertools import takewhile
+from threading import Event, Lock, Thread
+from typing import Any, Protocol
+
+BASE_RETRY_SECONDS = 2.0
+MAX_RETRY_SECONDS = 300.0
+# Latency samples kept for the percentiles in metrics().
+LATENCY_SAMPLES = 200
+UPLOAD_BATCH_SIZE = 500
+
+# Uploads a list of payloads; returns how many of them, from the first, were stored.
+Uploader = Callable[[list[dict[str, Any]]], int]
+
+
+class OutboxStore(Protocol):
+    def outbox_put(self, key: str, payload: dict[str, Any], enqueued_at: float) -> None: ...
+
+    def outbox_items(self, limit: int | None = None) -> list[tuple[str, dict[str, Any], float]]: ...
+
+    def outbox_remove(self, keys: Iterable[str]) -> None: ...
+
+    def outbox_count(self) -> int: ...
+
+
+def _percentile(samples: deque[float], fraction: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+class SyncOutbox:
+    def __init__(
+        self,
+        store: Callable[[], OutboxStore],
+        upload: Uploader,
+        *,
+        base_delay: float = BASE_RETRY_SECONDS,
+        max_delay: float = MAX_RETRY_SECONDS,
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        on_uploaded: Callable[[int], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._store = store
+        self._upload = upload
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._batch_size = max(1, batch_size)
+        self._on_uploaded = on_uploaded
+        self._clock = clock
+        self._lock = Lock()
+        self._pass_lock = Lock()
+        self._wake = Event()
+        self._worker: Thread | None = None
+        self._stopped = False
+        # key -> (failed attempts, clock time of the next attempt)
+        self._retry: dict[str, tuple[int, float]] = {}
+        self._depth: int | None = None
+        self._upload_ms: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._queued_ms: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.uploaded = 0
+        self.failed_attempts = 0
+
+    # =========================
+    # REQUEST PATH
+    # =========================
+    def enqueue(self, key: str, payload: dict[str, Any]) -> None:
+        """Queue ``payload`` for upload and return at once."""
+        self._store().outbox_put(key, payload, time.time())
+        with self._lock:
+            self._depth = None
+        self.start()
+
+    def depth(self) -> int:
+        with self._lock:
+            if self._depth is None:
+                self._depth = self._store().outbox_count()
+            return self._depth
+
+    # =========================
+    # UPLOADER
+    # =========================
+    def start(self) -> None:
+        """Wake the uploader, starting its thread on first use."""
+        with self._lock:
+            self._stopped = False
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = Thread(target=self._run, name="memory-sync-outbox", daemon=True)
+                self._worker.start()
+        self._wake.set()
+
+    def retry_now(self) -> None:
+        """Make items that are backing off due at once (e.g. the network came back)."""
+        with self._lock:
+            self._retry = {key: (attempts, 0.0) for key, (attempts, _) in self._retry.items()}
+        self.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self._seconds_to_next_retry())
+            self._wake.clear()
+            if self._stopped:
+                return
+            try:
+                self.drain()
+            except Exception as exc:
+                print("[SYNC OUTBOX ERROR]", exc)
+
+    def _seconds_to_next_retry(self) -> float | None:
+        with self._lock:
+            if not self._retry:
+                return None
+            return max(0.0, min(next_at for _, next_at in self._retry.values()) - self._clock())
+
+    def _retry_at(self, key: str) -> float:
+        return self._retry.get(key, (0, 0.0))[1]
+
+    def drain(self, *, force: bool = False) -> int:
+        """Upload queued items in order, a batch per call, until an upload fails.
+
+        Returns how many items were uploaded.  The pass stops at the first
+        item still backing off, unless ``force``, so newer items never go up
+        ahead of an older one that failed.
+        """
+        uploaded = 0
+        with self._pass_lock:
+            store = self._store()
+            items = store.outbox_items()
+            now = self._clock()
+            with self._lock:
+                queued = {key for key, _, _ in items}
+                self._retry = {key: retry for key, retry in self._retry.items() if key in queued}
+                due = items if force else list(takewhile(lambda item: self._retry_at(item[0]) <= now, items))
+            for start in range(0, len(due), self._batch_size):
+                batch = due[start : start + self._batch_size]
+                began = time.perf_counter()
+                try:
+                    stored = max(0, min(len(batch), int(self._upload([payload for _, payload, _ in batch]))))
+                except Exception as exc:
+                    print("[SYNC OUTBOX UPLOAD ERROR]", exc)
+                    stored = 0
+                elapsed_ms = (time.perf_counter() - began) * 1000
+                done, failed = batch[:stored], batch[stored:]
+                if done:
+                    store.outbox_remove(key for key, _, _ in done)
+                    uploaded += len(done)
+                    finished = time.time()
+                    with self._lock:
+                        for key, _, enqueued_at in done:
+                            self._retry.pop(key, None)
+                            self._queued_ms.append(max(0.0, finished - enqueued_at) * 1000)
+                        self._depth = None
+                        self.uploaded += len(done)
+                        self._upload_ms.append(elapsed_ms)
+                if failed:
+                    with self._lock:
+                        retry_at = self._clock()
+                        for key, _, _ in failed:
+                            attempts = self._retry.get(key, (0, 0.0))[0]
+                            delay = min(self._max_delay, self._base_delay * 2**attempts)
+                            self._retry[key] = (attempts + 1, retry_at + delay)
+                        self.failed_attempts += 1
+                    break
+        if uploaded and self._on_uploaded is not None:
+            self._on_uploaded(uploaded)
+        return uploaded
+
+    # =========================
+    # METRICS
+    # =========================
+    def metrics(self) -> dict[str, Any]:
+        depth = self.depth()
+        with self._lock:
+            return {
+                "queue_depth": depth,
+                "retrying": len(self._retry),
+                "uploaded": self.uploaded,
+                "failed_attempts": self.failed_attempts,
+                "upload_ms_p50": _percentile(self._upload_ms, 0.5),
+                "upload_ms_p95": _percentile(self._upload_ms, 0.95),
+                "queued_ms_p50": _percentile(self._queued_ms, 0.5),
+                "queued_ms_p95": _percentile(self._queued_ms, 0.95),
+            }
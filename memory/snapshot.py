@@ -0,0 +1,166 @@
+"""Immutable view of the memory the NLU reads on every command.
+
+``memory.conversation.get_memory_snapshot`` builds a ``MemorySnapshot`` once
+per memory version (the write counter in ``memory.local_cache``) and hands
+the same object to every reader until something is written.  Nothing in it can
+be changed: dicts are frozen into ``MappingProxyType`` and lists into tuples,
+so sharing it by reference is safe across threads.
+
+A snapshot is also a read-only ``Mapping`` with the keys ``get_nlu_context``
+has always returned (``summary``, ``recent_turns``, ``working_memory``,
+``preferences``), so it can be passed wherever a memory context dict was.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from types import MappingProxyType
+from typing import Any, ClassVar
+
+
+def freeze(value: Any) -> Any:
+    """``value`` with every dict made a read-only mapping and every list a tuple."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def frame_from_turn(turn: Any) -> dict[str, Any] | None:
+    """The user-side intent frame of a remembered turn, with its text.
+
+    Memory turns are stored as ``{user_text, assistant_text, time, metadata}``
+    with user metadata nested under ``metadata.user``; the legacy
+    ``{user, assistant}`` shape is accepted as a compatibility fallback.
+    """
+    if not isinstance(turn, Mapping):
+        return None
+    turn_metadata = turn.get("metadata") if isinstance(turn.get("metadata"), Mapping) else {}
+    metadata = turn_metadata.get("user") if isinstance(turn_metadata.get("user"), Mapping) else None
+    user_text = turn.get("user_text", "")
+    if metadata is None:
+        user_msg = turn.get("user") or {}
+        metadata = user_msg.get("metadata") if isinstance(user_msg, Mapping) else {}
+        user_text = user_msg.get("text", "") if isinstance(user_msg, Mapping) else ""
+    if not isinstance(metadata, Mapping):
+        return None
+    frame = dict(metadata)
+    frame.setdefault("text", user_text)
+    return frame
+
+
+def memory_frames(memory_context: Mapping[str, Any]) -> Sequence[Mapping[str, Any]]:
+    """Intent frames of the recent turns, newest first."""
+    if isinstance(memory_context, MemorySnapshot):
+        return memory_context.frames
+    turns = memory_context.get("recent_turns", []) or []
+    return [frame for turn in reversed(turns) if (frame := frame_from_turn(turn)) is not None]
+
+
+def last_intent(memory_context: Mapping[str, Any]) -> str | None:
+    if isinstance(memory_context, MemorySnapshot):
+        return memory_context.last_intent
+    for frame in memory_frames(memory_context):
+        if frame.get("intent"):
+            return str(frame["intent"])
+    return None
+
+
+class MemorySnapshot(Mapping[str, Any]):
+    __slots__ = (
+        "version",
+        "summary",
+        "turns",
+        "recent_turns",
+        "working_memory",
+        "preferences",
+        "frames",
+        "last_intent",
+    )
+    _KEYS: ClassVar[tuple[str, ...]] = ("summary", "recent_turns", "working_memory", "preferences")
+
+    def __init__(
+        self,
+        version: int,
+        *,
+        summary: str,
+        turns: tuple[Mapping[str, Any], ...],
+        recent_turns: tuple[Mapping[str, Any], ...],
+        frames: tuple[Mapping[str, Any], ...],
+        working_memory: Mapping[str, Any],
+        preferences: Mapping[str, Any],
+    ) -> None:
+        # Use build() or with_state(); the arguments here must already be frozen.
+        values = {
+            "version": version,
+            "summary": summary,
+            "turns": turns,
+            "recent_turns": recent_turns,
+            "working_memory": working_memory,
+            "preferences": preferences,
+            "frames": frames,
+            "last_intent": next((str(frame["intent"]) for frame in frames if frame.get("intent")), None),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        *,
+        summary: str,
+        turns: Sequence[Mapping[str, Any]],
+        recent_count: int,
+        working_memory: Mapping[str, Any],
+        preferences: Mapping[str, Any],
+    ) -> MemorySnapshot:
+        frozen = freeze(list(turns))
+        recent = frozen[-recent_count:] if recent_count > 0 else ()
+        frames = [frame for turn in reversed(recent) if (frame := frame_from_turn(turn)) is not None]
+        return cls(
+            version,
+            summary=summary,
+            turns=frozen,
+            recent_turns=recent,
+            frames=freeze(frames),
+            working_memory=freeze(working_memory),
+            preferences=freeze(preferences),
+        )
+
+    def with_state(
+        self,
+        version: int,
+        *,
+        summary: str,
+        working_memory: Mapping[str, Any],
+        preferences: Mapping[str, Any],
+    ) -> MemorySnapshot:
+        """A newer snapshot sharing this one's turns, for writes that left the turns alone."""
+        return type(self)(
+            version,
+            summary=summary,
+            turns=self.turns,
+            recent_turns=self.recent_turns,
+            frames=self.frames,
+            working_memory=freeze(working_memory),
+            preferences=freeze(preferences),
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("MemorySnapshot is immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"MemorySnapshot(version={self.version}, turns={len(self.turns)})"
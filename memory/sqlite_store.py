@@ -0,0 +1,345 @@
+"""SQLite (WAL) storage behind ``memory.local_cache``.
+
+``database/cache.json`` used to be parsed and rewritten in full for every
+memory operation.  Here each kind of memory lives in its own table, so setting
+working memory touches only ``working_memory`` rows and a new turn is a single
+``INSERT``:
+
+* ``turns``          -- conversation turns (``conversation_id`` is unique);
+* ``history``        -- the legacy raw message stream;
+* ``summary``        -- one row with the compacted older history;
+* ``sections``       -- key/value rows of ``working_memory``, ``user_profile``,
+                        ``sync`` metadata and any other top-level cache key;
+* ``outbox``         -- turns waiting to be uploaded, see ``memory.outbox``.
+
+WAL mode lets readers in other processes (an API server, the desktop UI) see
+the database while it is written.  Writing is single-process, though:
+``memory.local_cache`` serves reads from an in-process copy and buffers writes
+for a moment, so it assumes its process is the only writer while it runs.
+Another process may only start writing after this one has called
+``local_cache.flush()`` and stopped writing; otherwise each overwrites the
+other's rows with its own stale copy.  On first open the legacy JSON files
+are imported once; they are left on disk untouched.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from threading import RLock
+from typing import Any
+
+SCHEMA_VERSION = 1
+TURNS_KEY = "conversation_turns"
+HISTORY_KEY = "conversation_history"
+SUMMARY_KEY = "conversation_summary"
+SYNC_SECTION = "sync"
+# Section key holding a top-level cache value that is not a dict.
+_SCALAR_KEY = ""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id TEXT UNIQUE,
+    timestamp TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_by_time ON turns (timestamp, seq);
+CREATE TABLE IF NOT EXISTS history (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summary (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (section, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT UNIQUE NOT NULL,
+    enqueued_at REAL NOT NULL,
+    body TEXT NOT NULL
+);
+"""
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _read_json(path: str | None) -> dict[str, Any]:
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def turn_id(turn: dict[str, Any]) -> str | None:
+    value = turn.get("conversation_id") or turn.get("id") or turn.get("turn_id")
+    return str(value) if value else None
+
+
+class MemoryStore:
+    def __init__(self, path: str, *, legacy_cache: str | None = None, legacy_sync: str | None = None) -> None:
+        self.path = path
+        self._legacy_cache = legacy_cache
+        self._legacy_sync = legacy_sync
+        self._lock = RLock()
+        self._depth = 0
+        self._db: sqlite3.Connection | None = None
+
+    # =========================
+    # CONNECTION
+    # =========================
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+            if db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                with self.transaction():
+                    self._migrate_legacy_json()
+                    db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return self._db
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """One write transaction; nested uses join the outermost one."""
+        with self._lock:
+            db = self._connect()
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield db
+                finally:
+                    self._depth -= 1
+                return
+            db.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            else:
+                db.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._connect().execute(sql, tuple(params)).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _migrate_legacy_json(self) -> None:
+        cache = _read_json(self._legacy_cache)
+        if cache:
+            self.replace_all(cache)
+        sync = _read_json(self._legacy_sync)
+        if sync:
+            self.replace_section(SYNC_SECTION, sync)
+
+    # =========================
+    # TURNS
+    # =========================
+    def turns(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Stored turns, oldest first; only the newest ``limit`` when given."""
+        if limit is None:
+            rows = self._query("SELECT body FROM turns ORDER BY timestamp, seq")
+        else:
+            rows = self._query(
+                "SELECT body FROM (SELECT body, timestamp, seq FROM turns ORDER BY timestamp DESC, seq DESC LIMIT ?) "
+                "ORDER BY timestamp, seq",
+                (max(0, limit),),
+            )
+        return [json.loads(body) for (body,) in rows]
+
+    def turn_count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM turns")[0][0]
+
+    def has_turn(self, conversation_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM turns WHERE conversation_id = ?", (conversation_id,)))
+
+    def add_turn(self, turn: dict[str, Any], timestamp: str, *, keep: int) -> bool:
+        """Insert ``turn`` unless its id is stored already, then keep the newest ``keep``."""
+        with self.transaction() as db:
+            inserted = db.execute(
+                "INSERT OR IGNORE INTO turns (conversation_id, timestamp, body) VALUES (?, ?, ?)",
+                (turn_id(turn), timestamp, _dumps(turn)),
+            ).rowcount
+            if inserted:
+                db.execute(
+                    "DELETE FROM turns WHERE seq NOT IN "
+                    "(SELECT seq FROM turns ORDER BY timestamp DESC, seq DESC LIMIT ?)",
+                    (keep,),
+                )
+        return bool(inserted)
+
+    def replace_turns(self, turns: Iterable[dict[str, Any]]) -> None:
+        with self.transaction() as db:
+            db.execute("DELETE FROM turns")
+            db.executemany(
+                "INSERT OR IGNORE INTO turns (conversation_id, timestamp, body) VALUES (?, ?, ?)",
+                [
+                    (turn_id(turn), str(turn.get("timestamp") or turn.get("time") or ""), _dumps(turn))
+                    for turn in turns
+                    if isinstance(turn, dict)
+                ],
+            )
+
+    # =========================
+    # HISTORY
+    # =========================
+    def history(self) -> list[dict[str, Any]]:
+        return [json.loads(body) for (body,) in self._query("SELECT body FROM history ORDER BY seq")]
+
+    def history_count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM history")[0][0]
+
+    def append_history(self, messages: Iterable[dict[str, Any]], *, keep: int | None = None) -> None:
+        with self.transaction() as db:
+            db.executemany("INSERT INTO history (body) VALUES (?)", [(_dumps(m),) for m in messages])
+            if keep is not None:
+                db.execute(
+                    "DELETE FROM history WHERE seq NOT IN (SELECT seq FROM history ORDER BY seq DESC LIMIT ?)",
+                    (keep,),
+                )
+
+    def replace_history(self, messages: Iterable[dict[str, Any]]) -> None:
+        with self.transaction() as db:
+            db.execute("DELETE FROM history")
+            self.append_history(message for message in messages if isinstance(message, dict))
+
+    def take_oldest_history(self, count: int) -> list[dict[str, Any]]:
+        """Remove and return the ``count`` oldest messages."""
+        with self.transaction() as db:
+            rows = db.execute("SELECT seq, body FROM history ORDER BY seq LIMIT ?", (max(0, count),)).fetchall()
+            if rows:
+                db.execute("DELETE FROM history WHERE seq <= ?", (rows[-1][0],))
+        return [json.loads(body) for _, body in rows]
+
+    # =========================
+    # SUMMARY
+    # =========================
+    def summary(self) -> str:
+        rows = self._query("SELECT text FROM summary WHERE id = 0")
+        return rows[0][0] if rows else ""
+
+    def set_summary(self, text: str) -> None:
+        with self.transaction() as db:
+            db.execute("INSERT OR REPLACE INTO summary (id, text) VALUES (0, ?)", (text,))
+
+    # =========================
+    # SECTIONS
+    # =========================
+    def section_names(self) -> list[str]:
+        return [name for (name,) in self._query("SELECT DISTINCT section FROM sections")]
+
+    def section(self, name: str) -> dict[str, Any]:
+        rows = self._query("SELECT key, value FROM sections WHERE section = ?", (name,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def section_value(self, name: str, key: str, default: Any = None) -> Any:
+        rows = self._query("SELECT value FROM sections WHERE section = ? AND key = ?", (name, key))
+        return json.loads(rows[0][0]) if rows else default
+
+    def update_section(self, name: str, values: dict[str, Any]) -> None:
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO sections (section, key, value) VALUES (?, ?, ?)",
+                [(name, str(key), _dumps(value)) for key, value in values.items()],
+            )
+
+    def replace_section(self, name: str, values: dict[str, Any]) -> None:
+        with self.transaction() as db:
+            db.execute("DELETE FROM sections WHERE section = ?", (name,))
+            self.update_section(name, values)
+
+    # =========================
+    # OUTBOX
+    # Not part of the cache view: replace_all and snapshot leave it alone.
+    # =========================
+    def outbox_put(self, key: str, payload: dict[str, Any], enqueued_at: float) -> None:
+        """Queue ``payload`` under ``key``; a key already queued keeps its place."""
+        with self.transaction() as db:
+            db.execute(
+                "INSERT INTO outbox (key, enqueued_at, body) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET body = excluded.body",
+                (key, enqueued_at, _dumps(payload)),
+            )
+
+    def outbox_items(self, limit: int | None = None) -> list[tuple[str, dict[str, Any], float]]:
+        """``(key, payload, enqueued_at)`` of queued items, oldest first."""
+        rows = self._query("SELECT key, body, enqueued_at FROM outbox ORDER BY seq LIMIT ?", (-1 if limit is None else limit,))
+        return [(key, json.loads(body), enqueued_at) for key, body, enqueued_at in rows]
+
+    def outbox_remove(self, keys: Iterable[str]) -> None:
+        with self.transaction() as db:
+            db.executemany("DELETE FROM outbox WHERE key = ?", [(key,) for key in keys])
+
+    def outbox_count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM outbox")[0][0]
+
+    # =========================
+    # WHOLE-CACHE VIEW
+    # The old cache.json shape, for callers that still read or replace it all.
+    # =========================
+    def snapshot(self) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        for name in self.section_names():
+            if name == SYNC_SECTION:
+                continue
+            section = self.section(name)
+            data[name] = section[_SCALAR_KEY] if list(section) == [_SCALAR_KEY] else section
+        history = self.history()
+        if history:
+            data[HISTORY_KEY] = history
+        turns = self.turns()
+        if turns:
+            data[TURNS_KEY] = turns
+        summary = self.summary()
+        if summary:
+            data[SUMMARY_KEY] = summary
+        return data
+
+    def replace_all(self, data: dict[str, Any]) -> None:
+        """Replace every table but the sync metadata with the cache-shaped ``data``."""
+        with self.transaction() as db:
+            db.execute("DELETE FROM summary")
+            db.execute("DELETE FROM sections WHERE section != ?", (SYNC_SECTION,))
+            turns = data.get(TURNS_KEY)
+            self.replace_turns(turns if isinstance(turns, list) else [])
+            history = data.get(HISTORY_KEY)
+            self.replace_history(history if isinstance(history, list) else [])
+            summary = data.get(SUMMARY_KEY)
+            if summary:
+                self.set_summary(str(summary))
+            for name, value in data.items():
+                if name in (TURNS_KEY, HISTORY_KEY, SUMMARY_KEY):
+                    continue
+                if isinstance(value, dict):
+                    self.update_section(name, value)
+                else:
+                    self.update_section(name, {_SCALAR_KEY: value})
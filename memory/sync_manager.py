@@ -8,8 +8,11 @@ from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid4
 
+from brain.connectivity import CONNECTIVITY_EVENT
+from brain.events import register_event
 from memory import firestore_sync
-from memory.local_cache import append_turn, load_sync_metadata, read_cache, save_sync_metadata
+from memory.local_cache import append_turns, get_journal, get_store, load_sync_metadata, save_sync_metadata
+from memory.outbox import SyncOutbox
 
 _DEVICE_ENV = "JARVIS_DEVICE_ID"
 _SYNC_LOCK = threading.RLock()
@@ -17,6 +20,8 @@ _STARTED = False
 _LISTENER: Any | None = None
 _LISTENER_THREAD: threading.Thread | None = None
 _DEVICE_ID: str | None = None
+_OUTBOX: SyncOutbox | None = None
+_OUTBOX_LOCK = threading.Lock()
 
 
 def _now() -> str:
@@ -49,73 +54,100 @@ def ensure_turn_identity(turn: dict[str, Any]) -> dict[str, Any]:
 
 
 def merge_turn(turn: dict[str, Any]) -> bool:
-    if not isinstance(turn, dict) or not turn:
-        return False
-    payload = ensure_turn_identity(turn)
-    added = append_turn(payload)
-    if added:
-        metadata = load_sync_metadata()
-        metadata["device_id"] = get_device_id()
-        metadata["last_sync_time"] = _now()
-        metadata["last_received_timestamp"] = payload.get("timestamp")
-        metadata["last_processed_document"] = payload.get("conversation_id")
-        save_sync_metadata(metadata)
-    return added
+    return bool(merge_turns([turn]))
 
 
-def upload_turn(turn: dict[str, Any]) -> dict[str, Any] | None:
-    if not isinstance(turn, dict) or not turn:
-        return None
-    payload = ensure_turn_identity(turn)
-    uploaded = firestore_sync.push_conversation_turn(payload)
+def merge_turns(turns: list[dict[str, Any]], *, received_through: str | None = None) -> int:
+    """Merge remote turns with one journal write and one sync metadata update.
+
+    ``received_through`` is the newest timestamp the caller has seen, merged
+    or not (turns from this device are skipped but still advance the cursor).
+    """
+    payloads = [ensure_turn_identity(turn) for turn in turns or [] if isinstance(turn, dict) and turn]
+    added = append_turns(payloads)
+    newest = max(added, key=lambda turn: str(turn.get("timestamp") or ""), default=None)
+    if newest is None and not received_through:
+        return 0
+
     metadata = load_sync_metadata()
     metadata["device_id"] = get_device_id()
     metadata["last_sync_time"] = _now()
-    pending = set(metadata.get("pending_conversation_ids", []))
-    conversation_id = str(payload.get("conversation_id"))
-    if uploaded:
-        pending.discard(conversation_id)
-    else:
-        pending.add(conversation_id)
-    metadata["pending_conversation_ids"] = sorted(pending)
+    received = [str(metadata.get("last_received_timestamp") or "")]
+    if newest is not None:
+        received.append(str(newest.get("timestamp")))
+        metadata["last_processed_document"] = newest.get("conversation_id")
+    if received_through:
+        received.append(str(received_through))
+    metadata["last_received_timestamp"] = max(received)
     save_sync_metadata(metadata)
+    return len(added)
+
+
+def _push(payloads: list[dict[str, Any]]) -> int:
+    return firestore_sync.push_conversation_turns(payloads)
+
+
+def _uploaded(count: int) -> None:
+    metadata = load_sync_metadata()
+    metadata["device_id"] = get_device_id()
+    metadata["last_sync_time"] = _now()
+    save_sync_metadata(metadata)
+
+
+def get_outbox() -> SyncOutbox:
+    """The upload queue; its thread starts with the first queued turn."""
+    global _OUTBOX
+    if _OUTBOX is None:
+        with _OUTBOX_LOCK:
+            if _OUTBOX is None:
+                _OUTBOX = SyncOutbox(
+                    get_store,
+                    _push,
+                    batch_size=firestore_sync.FIRESTORE_BATCH_LIMIT,
+                    on_uploaded=_uploaded,
+                )
+    return _OUTBOX
+
+
+def upload_turn(turn: dict[str, Any]) -> dict[str, Any] | None:
+    """Queue ``turn`` for upload; the network is only touched by the outbox thread."""
+    if not isinstance(turn, dict) or not turn:
+        return None
+    payload = ensure_turn_identity(turn)
+    get_outbox().enqueue(str(payload["conversation_id"]), payload)
     return payload
 
 
+def sync_metrics() -> dict[str, Any]:
+    return {"outbox": get_outbox().metrics()}
+
+
 def download_latest() -> int:
     metadata = load_sync_metadata()
     since = metadata.get("last_received_timestamp") or metadata.get("last_sync_time")
-    turns = firestore_sync.pull_new_conversation_turns(since_timestamp=since)
+    device_id = get_device_id()
     merged = 0
-    newest = since
-    for turn in turns:
-        if turn.get("device_id") == get_device_id():
-            continue
-        if merge_turn(turn):
-            merged += 1
-        timestamp = turn.get("timestamp") or turn.get("time")
-        if timestamp and (not newest or str(timestamp) > str(newest)):
-            newest = str(timestamp)
-    metadata = load_sync_metadata()
-    metadata["device_id"] = get_device_id()
-    metadata["last_sync_time"] = _now()
-    if newest:
-        metadata["last_received_timestamp"] = newest
-    save_sync_metadata(metadata)
+    # One merge (journal write + metadata update) per page, so the cursor
+    # survives an interrupted catch-up.
+    for page in firestore_sync.iter_new_conversation_turns(since_timestamp=since):
+        newest = max((str(turn.get("timestamp") or turn.get("time") or "") for turn in page), default="")
+        merged += merge_turns(
+            [turn for turn in page if turn.get("device_id") != device_id],
+            received_through=newest or since,
+        )
     return merged
 
 
-def _on_remote_turn(turn: dict[str, Any]) -> None:
-    if turn.get("device_id") == get_device_id():
-        return
-    merge_turn(turn)
+def _on_remote_turns(turns: list[dict[str, Any]]) -> None:
+    device_id = get_device_id()
+    merge_turns([turn for turn in turns if turn.get("device_id") != device_id])
 
 
 def _listener_worker() -> None:
     global _LISTENER
     while True:
         if _LISTENER is None:
-            _LISTENER = firestore_sync.start_realtime_listener(_on_remote_turn, get_device_id())
+            _LISTENER = firestore_sync.start_realtime_listener(_on_remote_turns, get_device_id(), batch=True)
         threading.Event().wait(30)
 
 
@@ -128,27 +160,28 @@ def listen_for_updates() -> Any | None:
     return _LISTENER
 
 
-def _upload_pending_turns() -> int:
+def _on_connectivity_changed(state: dict[str, Any] | None) -> None:
+    if state and state.get("online"):
+        get_outbox().retry_now()
+
+
+def _enqueue_legacy_pending() -> None:
+    # Failed uploads used to be remembered as ids in the sync metadata.
     metadata = load_sync_metadata()
-    pending = set(metadata.get("pending_conversation_ids", []))
+    pending = set(metadata.pop("pending_conversation_ids", None) or [])
     if not pending:
-        return 0
-    uploaded_count = 0
-    turns = read_cache().get("conversation_turns", [])
-    for turn in turns if isinstance(turns, list) else []:
-        if not isinstance(turn, dict):
-            continue
+        return
+    outbox = get_outbox()
+    for turn in get_journal().tail():
         conversation_id = str(turn.get("conversation_id") or turn.get("id") or turn.get("turn_id") or "")
-        if conversation_id not in pending:
-            continue
-        payload = ensure_turn_identity(turn)
-        if firestore_sync.push_conversation_turn(payload):
-            pending.discard(conversation_id)
-            uploaded_count += 1
-    metadata["pending_conversation_ids"] = sorted(pending)
-    metadata["last_sync_time"] = _now()
+        if conversation_id in pending:
+            outbox.enqueue(conversation_id, ensure_turn_identity(turn))
     save_sync_metadata(metadata)
-    return uploaded_count
+
+
+def _upload_pending_turns() -> int:
+    _enqueue_legacy_pending()
+    return get_outbox().drain(force=True)
 
 
 def sync_now() -> int:
@@ -164,7 +197,9 @@ def start_sync() -> bool:
         if _STARTED:
             return True
         get_device_id()
-        _upload_pending_turns()
+        _enqueue_legacy_pending()
+        register_event(CONNECTIVITY_EVENT, _on_connectivity_changed)
+        get_outbox().start()
         download_latest()
         listen_for_updates()
         _STARTED = True
@@ -1,23 +1,17 @@
-from memory.local_cache import read_cache, write_cache
+from memory.local_cache import read_section, update_section
 from datetime import datetime
 
 USER_KEY = "user_profile"
 
 
 def get_user_profile() -> dict:
-    data = read_cache()
-    return data.get(USER_KEY, {})
+    return read_section(USER_KEY)
 
 
 def update_user_profile(**kwargs):
-    data = read_cache()
-    profile = data.get(USER_KEY, {})
-
-    profile.update(kwargs)
+    profile = dict(kwargs)
     profile["updated_at"] = datetime.now().isoformat()
-
-    data[USER_KEY] = profile
-    write_cache(data)
+    update_section(USER_KEY, profile)
 
 
 def get_preference(key: str):
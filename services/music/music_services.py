@@ -44,12 +44,12 @@ MOOD_MAP = {
     "study":         "lofi hip hop study beats",
     "studying":      "lofi beats study music",
     "concentration": "concentration music brain power",
-   
+    "work":          "background music for work deep focus",
     "coding":        "coding music lofi programming beats",
     "productive":    "productive background music",
 
     # Energy / Workout
-   
+    "workout":       "workout music gym motivation",
     "gym":           "gym pump up music energy",
     "energy":        "high energy pump up songs",
     "morning":       "morning motivation music positive",
@@ -147,13 +147,16 @@ def _send_key(key: str) -> bool:
 # =========================
 # PLAY MUSIC
 # =========================
-def play_music_response(query: str = "") -> str:
+def play_music_response(query: str = "", mood: str | None = None) -> str:
     """
     Main play function. Detects mood, artist, or song from query.
     Opens YouTube Music and plays automatically.
 
     Args:
         query (str): Raw user text e.g. "play chill music for sleeping"
+        mood (str | None): Mood already found by the NLU gazetteer ("" for
+            none); None, or a mood MOOD_MAP has no search for, makes this
+            function scan the query itself
 
     Returns:
         str: Response message
@@ -165,11 +168,14 @@ def play_music_response(query: str = "") -> str:
     # 1. Mood detection
     mood_query = None
     detected_mood = None
-    for mood, search in MOOD_MAP.items():
-        if mood in query_lower:
-            mood_query = search
-            detected_mood = mood
-            break
+    if mood in MOOD_MAP:
+        mood_query = MOOD_MAP[mood]
+        detected_mood = mood
+    elif mood != "":
+        # Longest key first: "workout" rather than the "work" inside it.
+        detected_mood = max((key for key in MOOD_MAP if key in query_lower), key=len, default=None)
+        if detected_mood is not None:
+            mood_query = MOOD_MAP[detected_mood]
 
     if mood_query:
         url = _build_search_url(mood_query)
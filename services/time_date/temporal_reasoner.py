@@ -33,6 +33,12 @@ _MONTH_NAMES = (
 _WEEKDAY_LOOKUP = {name.lower(): idx for idx, name in enumerate(_WEEKDAY_NAMES)}
 _WEEKDAY_PATTERN = "|".join(name.lower() for name in _WEEKDAY_NAMES)
 
+# Words the expressions below are built from; the NLU spell-corrects towards them.
+TEMPORAL_WORDS = (
+    "today", "todays", "tomorrow", "tomorrows", "yesterday",
+    "overmorrow", "next", "week", "after", *(name.lower() for name in _WEEKDAY_NAMES),
+)
+
 
 @dataclass(frozen=True)
 class TemporalResolution:
@@ -157,9 +163,9 @@ class TemporalReasoner:
 
         if re.search(r"\b(day\s+after\s+tomorrow|overmorrow)\b", text):
             return "day after tomorrow", "date", is_followup
-        if re.search(r"\b(tomorrow|tommorow|tomarow|tomarrows|tomorrows)\b", text):
+        if re.search(r"\b(tomorrow|tomorrows)\b", text):
             return "tomorrow", "date", is_followup
-        if re.search(r"\b(yesterday|yestarday)\b", text):
+        if re.search(r"\byesterday\b", text):
             return "yesterday", "date", is_followup
         if re.search(r"\b(today|todays)\b", text):
             return "today", "date", is_followup
@@ -177,7 +183,7 @@ class TemporalReasoner:
     def _looks_temporal(self, normalized: str) -> bool:
         return bool(
             re.search(
-                rf"\b(today|todays|tomorrow|tommorow|tomarow|tomarrows|tomorrows|yesterday|yestarday|"
+                rf"\b(today|todays|tomorrow|tomorrows|yesterday|"
                 rf"day\s+after\s+tomorrow|overmorrow|next\s+week|next\s+(?:{_WEEKDAY_PATTERN}))\b",
                 normalized,
             )
@@ -1,17 +1,38 @@
 from __future__ import annotations
 
-import difflib
 import json
 import os
 import platform
+import shlex
+import shutil
 import subprocess
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from threading import Lock, Thread
 from typing import Any
 
+from system.laptop.app_usage import APP_USAGE
+from system.laptop.fuzzy_index import TrigramIndex
+from system.laptop.incremental_walk import DirectoryCache
+
 APP_INDEX_PATH = Path("database/app_names.json")
+# Directory listings of the last filesystem scan, for incremental refreshes.
+APP_WALK_CACHE_PATH = Path("database/app_walk_cache.json")
 CACHE_TTL_HOURS = 24
 
+# "difflib" keeps the historical SequenceMatcher scores and cutoffs (scored over
+# trigram candidates only); "trigram" ranks by trigram overlap alone.
+APP_FUZZY_SCORER = "difflib"
+# (canonicalize_app_name, search_apps) cutoffs per scorer.
+_FUZZY_CUTOFFS = {"difflib": (0.72, 0.62), "trigram": (0.6, 0.45)}
+# Fuzzy candidates this close to the best score are ordered by launch history.
+USAGE_RANK_MARGIN = 0.1
+USAGE_RANK_CANDIDATES = 5
+# Most used apps resolved to their launch target at startup.
+PRERESOLVE_TOP_N = 10
+
 # Optional: predefined paths for common apps
 APP_PATHS = {
     "chrome": r"C:\Program Files\Google\Chrome\Application\chrome.exe",
@@ -28,15 +49,12 @@ APP_PATHS = {
     "powerpoint": r"C:\Program Files\Microsoft Office\root\Office16\POWERPNT.EXE",
 }
 
-# Aliases and common typos → canonical key in APP_PATHS or name for `start`.
+# Aliases → canonical key in APP_PATHS or name for `start`.
 APP_ALIASES = {
     "browser": "chrome",
     "web browser": "chrome",
     "internet browser": "chrome",
     "google chrome": "chrome",
-    "chorme": "chrome",
-    "chrom": "chrome",
-    "chrime": "chrome",
     "microsoft edge": "edge",
     "edge browser": "edge",
     "terminal": "cmd",
@@ -72,13 +90,134 @@ def _tag_for_name(name: str) -> str:
     return "utility"
 
 
-def _known_app_names() -> list[str]:
-    names = set(APP_PATHS.keys()) | set(APP_ALIASES.keys()) | set(APP_ALIASES.values())
-    for item in load_app_index().get("apps", []):
-        name = item.get("name")
-        if isinstance(name, str):
-            names.add(_normalize_key(name))
-    return sorted(names)
+# =========================
+# APP CATALOG
+# One parsed copy of the app index per process, re-read only when the file
+# changes on disk or build_app_index() writes a new one.
+# =========================
+class AppCatalog:
+    def __init__(self, path: Path = APP_INDEX_PATH) -> None:
+        self._path = path
+        self._lock = Lock()
+        self._signature: tuple[int, int] | None = None
+        self._loaded = False
+        self._listeners: list[Callable[[], None]] = []
+        self._set_payload({})
+
+    def _set_payload(self, payload: dict[str, Any]) -> None:
+        apps = payload.get("apps", [])
+        if not isinstance(apps, list):
+            apps = []
+        # Indexes written while $PATH executables were collected still list
+        # them ("reboot", "rm"); those are not apps to open or to recognise.
+        apps = [app for app in apps if isinstance(app, dict) and app.get("source") != "path"]
+        entries = [(_normalize_key(str(app.get("name", ""))), app) for app in apps]
+        names = set(APP_PATHS) | set(APP_ALIASES) | set(APP_ALIASES.values())
+        names.update(name for name, _ in entries if name)
+        tags: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+        for entry in entries:
+            tags.setdefault(str(entry[1].get("tag", "")).lower(), []).append(entry)
+
+        self._payload = payload
+        self._entries: list[tuple[str, dict[str, Any]]] = entries
+        self._known_names = sorted(names)
+        self._known_set = frozenset(names)
+        self._tags = tags
+        # Longest alias first so "google chrome" wins over "chrome".
+        self._aliases = sorted(APP_ALIASES.items(), key=lambda x: -len(x[0]))
+        # Fuzzy indexes are built on first use: None for known names, else a tag.
+        self._fuzzy: dict[str | None, TrigramIndex] = {}
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = self._path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> None:
+        signature = self._stat()
+        if self._loaded and signature == self._signature:
+            return
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                return
+            payload: dict[str, Any] = {}
+            if signature is not None:
+                try:
+                    payload = json.loads(self._path.read_text(encoding="utf-8"))
+                except Exception:
+                    payload = {}
+            changed = self._loaded
+            self._set_payload(payload if isinstance(payload, dict) else {})
+            self._signature = signature
+            self._loaded = True
+        if changed:
+            self._notify()
+
+    def replace(self, payload: dict[str, Any]) -> None:
+        """Adopt a payload that was just written to disk without re-reading it."""
+        with self._lock:
+            self._set_payload(payload)
+            self._signature = self._stat()
+            self._loaded = True
+        self._notify()
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` whenever a different index is adopted."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def _notify(self) -> None:
+        for callback in list(self._listeners):
+            callback()
+
+    def payload(self) -> dict[str, Any]:
+        """The parsed index file; shared, so callers must not mutate it."""
+        self._refresh()
+        return self._payload
+
+    def entries(self, tag: str | None = None) -> list[tuple[str, dict[str, Any]]]:
+        """``(normalized name, app record)`` pairs, optionally for one tag only."""
+        self._refresh()
+        if not tag:
+            return self._entries
+        return self._tags.get(tag.lower(), [])
+
+    def known_names(self) -> list[str]:
+        """Sorted normalized names of every indexed, curated or aliased app."""
+        self._refresh()
+        return self._known_names
+
+    def is_known(self, name: str) -> bool:
+        self._refresh()
+        return name in self._known_set
+
+    def name_index(self) -> TrigramIndex:
+        """Fuzzy index over ``known_names()``."""
+        return self._index(None, self.known_names)
+
+    def entry_index(self, tag: str | None = None) -> TrigramIndex:
+        """Fuzzy index over the indexed app names, optionally for one tag only."""
+        key = f"tag:{tag.lower()}" if tag else "entries"
+        return self._index(key, lambda: [name for name, _ in self.entries(tag)])
+
+    def _index(self, key: str | None, names: Callable[[], list[str]]) -> TrigramIndex:
+        self._refresh()
+        fuzzy = self._fuzzy
+        index = fuzzy.get(key)
+        if index is None:
+            index = fuzzy[key] = TrigramIndex(names())
+        return index
+
+    def aliases(self) -> list[tuple[str, str]]:
+        """``(alias, canonical)`` pairs, longest alias first."""
+        self._refresh()
+        return self._aliases
+
+
+APP_CATALOG = AppCatalog()
+APP_WALK_CACHE = DirectoryCache(APP_WALK_CACHE_PATH)
 
 
 def canonicalize_app_name(name: str) -> str:
@@ -88,12 +227,27 @@ def canonicalize_app_name(name: str) -> str:
         return n
     if n in APP_ALIASES:
         return APP_ALIASES[n]
-    for alias, canonical in sorted(APP_ALIASES.items(), key=lambda x: -len(x[0])):
+    for alias, canonical in APP_CATALOG.aliases():
         if n == alias or n.startswith(alias + " ") or n.endswith(" " + alias):
             return canonical
-    pool = _known_app_names()
-    matches = difflib.get_close_matches(n, pool, n=1, cutoff=0.72)
-    return matches[0] if matches else n
+    if APP_CATALOG.is_known(n):
+        return n
+    matches = APP_CATALOG.name_index().match(
+        n, n=USAGE_RANK_CANDIDATES, cutoff=_FUZZY_CUTOFFS[APP_FUZZY_SCORER][0], scorer=APP_FUZZY_SCORER
+    )
+    if not matches:
+        return n
+    floor = matches[0][0] - USAGE_RANK_MARGIN
+    return max(
+        (match for match in matches if match[0] >= floor),
+        key=lambda match: (APP_USAGE.weight(match[1]), match[0]),
+    )[1]
+
+
+def _by_usage(entries: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+    """App records, most launched first; ties keep index order."""
+    ranked = sorted(entries, key=lambda entry: -APP_USAGE.weight(entry[0]))
+    return [app for _, app in ranked]
 
 
 def _run_powershell_json(command: str) -> list[dict[str, Any]]:
@@ -147,6 +301,11 @@ def _collect_registry_apps() -> list[dict[str, Any]]:
     return results
 
 
+def _is_windows_app_exe(entry: os.DirEntry) -> bool:
+    name = entry.name.lower()
+    return name.endswith(".exe") and name not in {"uninstall.exe", "setup.exe", "update.exe"}
+
+
 def _collect_program_files_apps() -> list[dict[str, Any]]:
     if platform.system() != "Windows":
         return []
@@ -154,25 +313,16 @@ def _collect_program_files_apps() -> list[dict[str, Any]]:
     roots = [r for r in roots if r]
     results: list[dict[str, Any]] = []
     for root in roots:
-        for base, _, files in os.walk(root):
-            depth = Path(base).relative_to(root).parts
-            if len(depth) > 4:
-                continue
-            for file_name in files:
-                if not file_name.lower().endswith(".exe"):
-                    continue
-                if file_name.lower() in {"uninstall.exe", "setup.exe", "update.exe"}:
-                    continue
-                full_path = str(Path(base) / file_name)
-                app_name = Path(file_name).stem
-                results.append(
-                    {
-                        "name": app_name,
-                        "location": full_path,
-                        "source": "program_files",
-                        "tag": _tag_for_name(app_name),
-                    }
-                )
+        for full_path in APP_WALK_CACHE.walk(root, max_depth=4, keep=_is_windows_app_exe):
+            app_name = Path(full_path).stem
+            results.append(
+                {
+                    "name": app_name,
+                    "location": full_path,
+                    "source": "program_files",
+                    "tag": _tag_for_name(app_name),
+                }
+            )
     return results
 
 
@@ -198,6 +348,69 @@ def _collect_uwp_apps() -> list[dict[str, Any]]:
     return results
 
 
+def _desktop_entry_dirs() -> list[str]:
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    bases = [data_home, *data_dirs.split(":"), "/var/lib/flatpak/exports/share"]
+    return list(dict.fromkeys(os.path.join(base, "applications") for base in bases if base))
+
+
+def _is_desktop_file(entry: os.DirEntry) -> bool:
+    return entry.name.endswith(".desktop")
+
+
+def _read_desktop_entry(path: str) -> dict[str, str]:
+    """Unlocalized keys of the ``[Desktop Entry]`` group."""
+    fields: dict[str, str] = {}
+    in_entry = False
+    try:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line and not line.startswith("#"):
+                    key, value = line.split("=", 1)
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return {}
+    return fields
+
+
+def _desktop_exec_argv(command: str) -> list[str]:
+    """argv of an ``Exec=`` line without field codes, the executable resolved on ``$PATH``."""
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        argv = command.split()
+    argv = [arg for arg in argv if not (arg.startswith("%") and len(arg) == 2)]
+    if argv:
+        argv[0] = shutil.which(argv[0]) or argv[0]
+    return argv
+
+
+def _collect_desktop_entry_apps() -> list[dict[str, Any]]:
+    """Applications announced through freedesktop ``.desktop`` files (Linux menus)."""
+    if platform.system() != "Linux":
+        return []
+    results: list[dict[str, Any]] = []
+    for directory in _desktop_entry_dirs():
+        for path in APP_WALK_CACHE.walk(directory, max_depth=2, keep=_is_desktop_file):
+            entry = _read_desktop_entry(path)
+            name = entry.get("Name", "")
+            if entry.get("Type", "Application") != "Application" or not name:
+                continue
+            if entry.get("NoDisplay") == "true" or entry.get("Hidden") == "true":
+                continue
+            # "flatpak run org.gimp.GIMP": the executable is the location, the rest its arguments.
+            argv = _desktop_exec_argv(entry.get("Exec", "")) or [path]
+            app: dict[str, Any] = {"name": name, "location": argv[0], "source": "desktop", "tag": _tag_for_name(name)}
+            if argv[1:]:
+                app["args"] = argv[1:]
+            results.append(app)
+    return results
+
+
 def _dedupe_apps(apps: list[dict[str, Any]]) -> list[dict[str, Any]]:
     deduped: dict[tuple[str, str], dict[str, Any]] = {}
     for app in apps:
@@ -214,22 +427,47 @@ def _dedupe_apps(apps: list[dict[str, Any]]) -> list[dict[str, Any]]:
             "source": app.get("source", "unknown"),
             "tag": app.get("tag", _tag_for_name(name)),
         }
+        if app.get("args"):
+            deduped[key]["args"] = [str(arg) for arg in app["args"]]
     return sorted(deduped.values(), key=lambda item: item["name"])
 
 
+def _run_collectors(collectors: list[Callable[[], list[dict[str, Any]]]]) -> list[dict[str, Any]]:
+    """Run the collectors concurrently; results keep the collectors' order."""
+    apps: list[dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=len(collectors), thread_name_prefix="app-index") as pool:
+        futures = [pool.submit(collector) for collector in collectors]
+        for future in futures:
+            try:
+                apps.extend(future.result())
+            except Exception:
+                # One broken source (PowerShell missing, unreadable folder)
+                # must not cost the apps found by the others.
+                continue
+    return apps
+
+
 def build_app_index(force_refresh: bool = False) -> dict[str, Any]:
     """
-    Build an app index from registry + Program Files + UWP Start menu.
+    Build an app index from registry + Program Files + UWP Start menu on
+    Windows, or .desktop entries on Linux.
     Writes `database/app_names.json` and returns the payload.
     """
-    existing = load_app_index()
+    existing = APP_CATALOG.payload()
     if not force_refresh and existing.get("apps") and not _cache_expired(existing):
         return existing
 
-    apps = []
-    apps.extend(_collect_registry_apps())
-    apps.extend(_collect_program_files_apps())
-    apps.extend(_collect_uwp_apps())
+    # The PowerShell collectors block for seconds each, so they overlap with
+    # each other and with the filesystem walks.
+    apps = _run_collectors(
+        [
+            _collect_registry_apps,
+            _collect_program_files_apps,
+            _collect_uwp_apps,
+            _collect_desktop_entry_apps,
+        ]
+    )
+    APP_WALK_CACHE.save()
 
     # Always keep curated paths as strongest records.
     for name, location in APP_PATHS.items():
@@ -245,16 +483,13 @@ def build_app_index(force_refresh: bool = False) -> dict[str, Any]:
 
     APP_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
     APP_INDEX_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    APP_CATALOG.replace(payload)
     return payload
 
 
 def load_app_index() -> dict[str, Any]:
-    if not APP_INDEX_PATH.exists():
-        return {}
-    try:
-        return json.loads(APP_INDEX_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+    """The current app index, served from ``APP_CATALOG`` (do not mutate)."""
+    return APP_CATALOG.payload()
 
 
 def _cache_expired(payload: dict[str, Any]) -> bool:
@@ -269,27 +504,25 @@ def _cache_expired(payload: dict[str, Any]) -> bool:
 
 
 def search_apps(query: str, *, limit: int = 10, tag: str | None = None) -> list[dict[str, Any]]:
-    payload = build_app_index(force_refresh=False)
-    apps = payload.get("apps", [])
-    if not isinstance(apps, list):
-        return []
+    build_app_index(force_refresh=False)
+    entries = APP_CATALOG.entries(tag)
 
     q = canonicalize_app_name(query)
-    if tag:
-        apps = [a for a in apps if str(a.get("tag", "")).lower() == tag.lower()]
 
-    exact = [a for a in apps if _normalize_key(str(a.get("name", ""))) == q]
+    exact = [a for name, a in entries if name == q]
     if exact:
         return exact[:limit]
 
-    contains = [a for a in apps if q in _normalize_key(str(a.get("name", "")))]
+    contains = [(name, a) for name, a in entries if q in name]
     if contains:
-        return contains[:limit]
+        return _by_usage(contains)[:limit]
 
-    names = [_normalize_key(str(a.get("name", ""))) for a in apps]
-    matched = difflib.get_close_matches(q, names, n=limit, cutoff=0.62)
-    ranked = [a for a in apps if _normalize_key(str(a.get("name", ""))) in matched]
-    return ranked[:limit]
+    matched = set(
+        APP_CATALOG.entry_index(tag).close_matches(
+            q, n=limit, cutoff=_FUZZY_CUTOFFS[APP_FUZZY_SCORER][1], scorer=APP_FUZZY_SCORER
+        )
+    )
+    return _by_usage([(name, a) for name, a in entries if name in matched])[:limit]
 
 
 def resolve_app(query: str) -> dict[str, Any] | None:
@@ -297,6 +530,58 @@ def resolve_app(query: str) -> dict[str, Any] | None:
     return results[0] if results else None
 
 
+# =========================
+# PRE-RESOLUTION
+# Launch targets of the most used apps, resolved and probed once in the
+# background so the usual "open X" skips the index search and path checks.
+# =========================
+_PRERESOLVED: dict[str, dict[str, Any]] = {}
+
+
+def _launch_target(app: dict[str, Any]) -> str | None:
+    """Expanded location of ``app`` if it can be launched directly, else None."""
+    location = os.path.expandvars(str(app.get("location", "")).strip())
+    if not location:
+        return None
+    if "!" in location and platform.system() == "Windows":
+        return location
+    return location if os.path.exists(location) else None
+
+
+def _launch_argv(app: dict[str, Any], location: str) -> list[str]:
+    """``location`` plus the arguments its index record carries (desktop ``Exec=`` lines)."""
+    args = app.get("args")
+    return [location, *(str(arg) for arg in args)] if isinstance(args, list) else [location]
+
+
+def preresolve_top_apps(n: int = PRERESOLVE_TOP_N, *, background: bool = True) -> Thread | None:
+    """Resolve the ``n`` most launched apps; returns the worker thread when ``background``."""
+
+    def work() -> None:
+        for canonical in APP_USAGE.top(n):
+            app = resolve_app(canonical)
+            if app and _launch_target(app):
+                _PRERESOLVED[canonical] = app
+
+    if not background:
+        work()
+        return None
+    worker = Thread(target=work, name="app-preresolve", daemon=True)
+    worker.start()
+    return worker
+
+
+def clear_preresolved() -> None:
+    _PRERESOLVED.clear()
+
+
+APP_CATALOG.add_listener(clear_preresolved)
+
+
+def _record_launch(canonical: str, label: str | None = None) -> None:
+    APP_USAGE.record(canonical, _normalize_key(label) if label else None)
+
+
 def _action_payload(
     *,
     success: bool,
@@ -331,6 +616,7 @@ def open_app(name: str) -> dict[str, Any]:
         uri = APP_SPECIAL_URIS[canonical]
         try:
             subprocess.Popen(f'start "" {uri}', shell=True)
+            _record_launch(canonical)
             return _action_payload(
                 success=True,
                 entity_type="app",
@@ -346,6 +632,26 @@ def open_app(name: str) -> dict[str, Any]:
                 error=str(e),
             )
 
+    preresolved = _PRERESOLVED.get(canonical)
+    if preresolved:
+        location = os.path.expandvars(str(preresolved.get("location", "")).strip())
+        app_name = str(preresolved.get("name") or canonical)
+        try:
+            if "!" in location and platform.system() == "Windows":
+                subprocess.Popen(["explorer.exe", f"shell:AppsFolder\\{location}"])
+            else:
+                subprocess.Popen(_launch_argv(preresolved, location))
+            _record_launch(canonical, app_name)
+            return _action_payload(
+                success=True,
+                entity_type="app",
+                entity_id=location,
+                entity_label=app_name,
+            )
+        except Exception:
+            # Moved or uninstalled since startup: resolve it the slow way.
+            _PRERESOLVED.pop(canonical, None)
+
     resolved = resolve_app(canonical)
 
     if resolved:
@@ -357,6 +663,7 @@ def open_app(name: str) -> dict[str, Any]:
         if location and "!" in location and platform.system() == "Windows":
             try:
                 subprocess.Popen(["explorer.exe", f"shell:AppsFolder\\{location}"])
+                _record_launch(canonical, app_name)
                 return _action_payload(
                     success=True,
                     entity_type="app",
@@ -369,7 +676,8 @@ def open_app(name: str) -> dict[str, Any]:
         # Classic executable path launch
         if location and os.path.exists(location):
             try:
-                subprocess.Popen(location)
+                subprocess.Popen(_launch_argv(resolved, location))
+                _record_launch(canonical, app_name)
                 return _action_payload(
                     success=True,
                     entity_type="app",
@@ -391,6 +699,7 @@ def open_app(name: str) -> dict[str, Any]:
     if path and os.path.exists(path):
         try:
             subprocess.Popen(path)
+            _record_launch(canonical)
             return _action_payload(
                 success=True,
                 entity_type="app",
@@ -409,6 +718,7 @@ def open_app(name: str) -> dict[str, Any]:
     if platform.system() == "Windows":
         try:
             subprocess.Popen(f'start "" {canonical}', shell=True)
+            _record_launch(canonical)
             return _action_payload(
                 success=True,
                 entity_type="app",
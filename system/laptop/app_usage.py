@@ -0,0 +1,103 @@
+"""Launch counts and recency per app, used to rank fuzzy app matches.
+
+The store is one small JSON object, ``{canonical: [count, last_used, label]}``,
+where ``canonical`` is what the request canonicalized to ("code") and ``label``
+the normalized name of the app that was actually launched ("visual studio
+code").  Both names earn the launch's weight, so a later fuzzy lookup prefers
+whichever candidate the user really opens.
+
+Weights decay with a half-life, so an app used daily this month outranks one
+launched a hundred times last year.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+APP_USAGE_PATH = Path("database/app_usage.json")
+HALF_LIFE_DAYS = 14.0
+# Entries beyond this many are dropped, least weighted first, when saving.
+MAX_ENTRIES = 200
+
+
+class AppUsage:
+    def __init__(self, path: Path = APP_USAGE_PATH, *, half_life_days: float = HALF_LIFE_DAYS) -> None:
+        self._path = path
+        self._half_life = half_life_days * 86400.0
+        self._lock = Lock()
+        self._entries: dict[str, list[Any]] | None = None
+        self._weights: dict[str, float] | None = None
+
+    def _load(self) -> dict[str, list[Any]]:
+        if self._entries is None:
+            try:
+                loaded = json.loads(self._path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                loaded = {}
+            if not isinstance(loaded, dict):
+                loaded = {}
+            self._entries = {
+                str(key): [int(value[0]), float(value[1]), str(value[2])]
+                for key, value in loaded.items()
+                if isinstance(value, list) and len(value) == 3
+            }
+        return self._entries
+
+    def _decayed(self, entry: list[Any], now: float) -> float:
+        count, last_used, _ = entry
+        return count * 0.5 ** (max(0.0, now - last_used) / self._half_life)
+
+    def record(self, canonical: str, label: str | None = None, *, now: float | None = None) -> None:
+        """Count one launch of ``label`` (default ``canonical``) requested as ``canonical``."""
+        if not canonical:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = self._load()
+            count = entries.get(canonical, [0, now, ""])[0]
+            entries[canonical] = [count + 1, now, label or canonical]
+            self._weights = None
+            self._save_locked(now)
+
+    def weight(self, name: str) -> float:
+        """Decayed launch count credited to ``name``; 0.0 for never-launched apps."""
+        weights = self._weights
+        if weights is None:
+            with self._lock:
+                now = time.time()
+                weights = {}
+                for canonical, entry in self._load().items():
+                    value = self._decayed(entry, now)
+                    weights[canonical] = weights.get(canonical, 0.0) + value
+                    if entry[2] != canonical:
+                        weights[entry[2]] = weights.get(entry[2], 0.0) + value
+                self._weights = weights
+        return weights.get(name, 0.0)
+
+    def top(self, n: int, *, now: float | None = None) -> list[str]:
+        """The ``n`` most used canonical names, most used first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            ranked = sorted(self._load().items(), key=lambda item: -self._decayed(item[1], now))
+        return [canonical for canonical, _ in ranked[:n]]
+
+    def _save_locked(self, now: float) -> None:
+        entries = self._entries or {}
+        if len(entries) > MAX_ENTRIES:
+            ranked = sorted(entries.items(), key=lambda item: -self._decayed(item[1], now))
+            self._entries = entries = dict(ranked[:MAX_ENTRIES])
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+            tmp.write_text(json.dumps(entries, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError:
+            pass
+
+
+APP_USAGE = AppUsage()
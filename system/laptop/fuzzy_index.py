@@ -0,0 +1,107 @@
+"""Character-trigram index for fuzzy app-name lookup.
+
+``difflib.get_close_matches`` runs a SequenceMatcher against every known name,
+so a lookup costs the size of the whole app catalog.  ``TrigramIndex`` posts
+each name under its padded character trigrams; a query only visits the names
+that share trigrams with it and scores the best-overlapping few.
+
+Two scorers are available:
+
+* ``"difflib"`` (compatibility): candidates are re-scored with the same
+  ``SequenceMatcher`` ratio and cutoff ``get_close_matches`` uses, so results
+  agree with the old full scan whenever its answer is among the candidates.
+* ``"trigram"``: Dice coefficient of the trigram sets, no SequenceMatcher at all.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from difflib import SequenceMatcher
+from heapq import nlargest
+
+# How many best-overlapping names are scored per lookup.
+CANDIDATE_LIMIT = 24
+# A trigram posted for more than 1/COMMON_POSTING_SHARE of the names (and at
+# least COMMON_POSTING_MIN of them) is not counted, unless the query would be
+# left with fewer than MIN_SELECTIVE_GRAMS trigrams.
+COMMON_POSTING_SHARE = 50
+COMMON_POSTING_MIN = 256
+MIN_SELECTIVE_GRAMS = 6
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self, names: Iterable[str]) -> None:
+        self._names: list[str] = list(dict.fromkeys(name for name in names if name))
+        self._grams: list[int] = []
+        self._postings: dict[str, list[int]] = {}
+        for position, name in enumerate(self._names):
+            grams = trigrams(name)
+            self._grams.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _overlap(self, grams: set[str], limit: int) -> list[tuple[int, int]]:
+        """``(position, shared trigram count)`` of the best-overlapping names.
+
+        Trigrams shared by a large part of the catalog say little about which
+        name is meant but dominate the counting cost, so they are skipped as
+        long as the query keeps a few more selective ones.
+        """
+        postings = sorted((found for gram in grams if (found := self._postings.get(gram))), key=len)
+        common = max(COMMON_POSTING_MIN, len(self._names) // COMMON_POSTING_SHARE)
+        keep = max(MIN_SELECTIVE_GRAMS, sum(1 for found in postings if len(found) <= common))
+        shared: Counter[int] = Counter()
+        for found in postings[:keep]:
+            shared.update(found)
+        return shared.most_common(limit)
+
+    def match(
+        self,
+        query: str,
+        *,
+        n: int = 3,
+        cutoff: float = 0.6,
+        scorer: str = "difflib",
+        candidates: int = CANDIDATE_LIMIT,
+    ) -> list[tuple[float, str]]:
+        """Up to ``n`` ``(score, name)`` pairs with ``score >= cutoff``, best first."""
+        if not query or n <= 0:
+            return []
+        grams = trigrams(query)
+        overlap = self._overlap(grams, max(candidates, n))
+        if scorer == "trigram":
+            size = len(grams)
+            scored = (
+                (2 * count / (size + self._grams[position]), self._names[position])
+                for position, count in overlap
+            )
+        elif scorer == "difflib":
+            scored = self._difflib_scores(query, (self._names[position] for position, _ in overlap), cutoff)
+        else:
+            raise ValueError(f"unknown scorer: {scorer!r}")
+        return nlargest(n, (item for item in scored if item[0] >= cutoff))
+
+    @staticmethod
+    def _difflib_scores(query: str, names: Iterable[str], cutoff: float) -> Iterable[tuple[float, str]]:
+        # Same early outs and argument order as difflib.get_close_matches.
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        for name in names:
+            matcher.set_seq1(name)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                ratio = matcher.ratio()
+                if ratio >= cutoff:
+                    yield ratio, name
+
+    def close_matches(self, query: str, n: int = 3, cutoff: float = 0.6, scorer: str = "difflib") -> list[str]:
+        """Drop-in for ``difflib.get_close_matches(query, names, n, cutoff)``."""
+        return [name for _, name in self.match(query, n=n, cutoff=cutoff, scorer=scorer)]
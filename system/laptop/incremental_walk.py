@@ -0,0 +1,99 @@
+"""Directory walks that only re-list directories whose mtime changed.
+
+A directory's mtime moves whenever an entry is added, removed or renamed
+directly inside it.  ``DirectoryCache`` remembers, per directory, that mtime
+together with the matching file names and the sub-directories found last time.
+An unchanged directory then costs one ``stat`` instead of a full listing, and
+an app index refresh re-reads only the install folders that actually changed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+FileFilter = Callable[[os.DirEntry], bool]
+
+
+class DirectoryCache:
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = Lock()
+        self._previous: dict[str, dict[str, Any]] | None = None
+        self._seen: dict[str, dict[str, Any]] = {}
+        self.listed = 0
+        self.reused = 0
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            if self._previous is None:
+                try:
+                    loaded = json.loads(self._path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    loaded = {}
+                self._previous = loaded if isinstance(loaded, dict) else {}
+            return self._previous
+
+    def walk(self, root: str, *, max_depth: int, keep: FileFilter) -> list[str]:
+        """Paths of kept files in ``root`` and up to ``max_depth`` levels below it."""
+        previous = self._load()
+        found: list[str] = []
+        stack = [(root, 0)]
+        while stack:
+            directory, depth = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            cached = previous.get(directory)
+            if cached and cached.get("mtime") == mtime:
+                dirs, files = cached["dirs"], cached["files"]
+                self.reused += 1
+            else:
+                listing = self._list(directory, keep)
+                if listing is None:
+                    continue
+                dirs, files = listing
+                self.listed += 1
+            self._seen[directory] = {"mtime": mtime, "dirs": dirs, "files": files}
+            found.extend(os.path.join(directory, name) for name in files)
+            if depth < max_depth:
+                stack.extend((os.path.join(directory, name), depth + 1) for name in reversed(dirs))
+        return found
+
+    @staticmethod
+    def _list(directory: str, keep: FileFilter) -> tuple[list[str], list[str]] | None:
+        dirs: list[str] = []
+        files: list[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.name)
+                        elif keep(entry):
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        dirs.sort()
+        files.sort()
+        return dirs, files
+
+    def save(self) -> None:
+        """Persist the directories visited since the last save; unvisited ones are dropped."""
+        with self._lock:
+            seen, self._seen = self._seen, {}
+            self._previous = seen
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+            tmp.write_text(json.dumps(seen), encoding="utf-8")
+            os.replace(tmp, self._path)
+        except OSError:
+            pass
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""Offline NLU latency/accuracy benchmark with a per-stage breakdown.
+
+Replays the dialogue scenarios (turn by turn, with their context) and a
+generated paraphrase set through ``detect_intent`` and reports p50/p95/p99
+latency for every pipeline stage, end-to-end throughput and intent accuracy.
+Like the dialogue evaluator it never routes, speaks or calls the LLM.
+Latencies and throughput come from the quickest of ``--repeat`` passes.
+
+    python tests/dialogue/benchmark_nlu.py --write-baseline   # record this machine
+    python tests/dialogue/benchmark_nlu.py                    # report and gate
+
+With a baseline present the exit code is 1 when a stage's p50 or p95 grew by
+more than ``--tolerance`` (and by more than ``--slack-us``, so sub-microsecond
+stages do not flap) or when accuracy dropped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from brain.context import context  # noqa: E402
+from brain.nlu.intent_memo import IntentMemo  # noqa: E402
+from brain.nlu.utterance import Utterance  # noqa: E402
+import brain.intent_engine as intent_engine  # noqa: E402
+
+SCENARIO_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = SCENARIO_DIR / "nlu_benchmark_baseline.json"
+GATED_PERCENTILES = ("p50", "p95")
+
+# Stages in pipeline order; "utterance_parse" and "detect_intent" bracket them.
+STAGES = (
+    "utterance_parse",
+    "deterministic",
+    "active_domain_followup",
+    "followup_resolver",
+    "regex_rules",
+    "classifier",
+    "slot_filler",
+    "detect_intent",
+)
+
+# Single-turn commands with their expected intent, expanded by PREFIXES x SUFFIXES.
+PARAPHRASE_BASE = (
+    ("what time is it", "get_time"),
+    ("what is the date today", "get_date"),
+    ("what day is it tomorrow", "get_date"),
+    ("weather in pune", "get_weather"),
+    ("will it rain in london tomorrow", "get_weather"),
+    ("show me sports news", "get_news"),
+    ("latest technology headlines", "get_news"),
+    ("bitcoin price", "get_crypto_price"),
+    ("how much is eth in usd", "get_crypto_price"),
+    ("open chrome", "open_app"),
+    ("launch visual studio code", "open_app"),
+    ("play some music", "play_music"),
+    ("pause the song", "stop_music"),
+    ("next song", "next_track"),
+    ("play despacito on youtube", "play_youtube"),
+    ("search youtube for lofi", "search_youtube"),
+    ("define serendipity", "lookup_word"),
+    ("set volume to 40", "set_volume"),
+    ("volume up", "volume_up"),
+    ("mute volume", "set_volume"),
+    ("set brightness to 70", "set_brightness"),
+    ("decrease brightness", "brightness_down"),
+    ("take a screenshot", "take_screenshot"),
+    ("remind me in 10 minutes", "schedule_task"),
+    ("show running processes", "process_manager"),
+    ("minimize the window", "minimize"),
+    ("create folder reports", "file_manager"),
+    ("why is the sky blue", "chat"),
+    ("tell me a joke", "chat"),
+    ("who wrote hamlet", "chat"),
+)
+PREFIXES = ("", "jarvis ", "please ", "hey jarvis ")
+SUFFIXES = ("", " please", " now", " for me")
+
+
+@dataclass
+class Case:
+    text: str
+    intent: str | None
+    # Cases of one scenario share dialogue context; None means a fresh context.
+    scenario: str | None = None
+
+
+@dataclass
+class StageSamples:
+    """Per-pass latency samples; summaries keep each percentile's best pass.
+
+    Taking the quickest pass (as ``timeit`` does) filters out passes that were
+    slowed down by the rest of the machine, which makes the gate usable.
+    """
+
+    passes: list[dict[str, list[float]]] = field(default_factory=list)
+
+    def next_pass(self) -> None:
+        self.passes.append({name: [] for name in STAGES})
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.passes[-1][stage].append(seconds)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        result: dict[str, dict[str, float]] = {}
+        for stage in STAGES:
+            runs = [samples[stage] for samples in self.passes if samples[stage]]
+            if not runs:
+                continue
+            result[stage] = {"calls": sum(len(values) for values in runs)}
+            for q in (50, 95, 99):
+                result[stage][f"p{q}"] = min(_percentile(values, q) for values in runs) * 1e6
+        return result
+
+
+def _percentile(values: list[float], q: int) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def load_cases(scenario_dir: Path = SCENARIO_DIR) -> list[Case]:
+    cases: list[Case] = []
+    for path in sorted(scenario_dir.glob("*.json")):
+        scenario = json.loads(path.read_text(encoding="utf-8"))
+        name = scenario.get("name", path.stem)
+        for turn in scenario.get("turns", []):
+            cases.append(Case(turn["user"], turn.get("expect", {}).get("intent"), name))
+    for base, intent in PARAPHRASE_BASE:
+        for prefix in PREFIXES:
+            for suffix in SUFFIXES:
+                cases.append(Case(f"{prefix}{base}{suffix}", intent))
+    return cases
+
+
+def _timed(samples: StageSamples, stage: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.add(stage, time.perf_counter() - start)
+
+    return wrapper
+
+
+@contextmanager
+def _instrumented(samples: StageSamples) -> Iterator[None]:
+    """Wrap each pipeline stage in a timer for the duration of the block."""
+    module_stages = {
+        "_deterministic_intent": "deterministic",
+        "_resolve_active_domain_followup": "active_domain_followup",
+        "_resolve_relative_date_followup": "followup_resolver",
+    }
+    instance_stages = [
+        (intent_engine.FOLLOWUP_RESOLVER, "resolve_temporal_followup", "followup_resolver"),
+        (intent_engine.FOLLOWUP_RESOLVER, "resolve_slots", "followup_resolver"),
+        # What _regex_fallback_intent runs once the follow-ups are done.
+        (intent_engine.INTENT_MATCHER, "match", "regex_rules"),
+        (intent_engine.NLU_CLASSIFIER, "classify", "classifier"),
+        (intent_engine.SLOT_FILLER, "fill", "slot_filler"),
+    ]
+    originals = {name: getattr(intent_engine, name) for name in module_stages}
+    try:
+        for name, stage in module_stages.items():
+            setattr(intent_engine, name, _timed(samples, stage, originals[name]))
+        for obj, name, stage in instance_stages:
+            setattr(obj, name, _timed(samples, stage, getattr(obj, name)))
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(intent_engine, name, original)
+        for obj, name, _ in instance_stages:
+            obj.__dict__.pop(name, None)
+
+
+def _replay(cases: list[Case], samples: StageSamples | None) -> tuple[int, int, float]:
+    """Run every case once; returns (correct, labelled, seconds in detect_intent)."""
+    correct = labelled = 0
+    elapsed = 0.0
+    scenario: str | None = None
+    for case in cases:
+        if case.scenario is None or case.scenario != scenario:
+            context.__init__()
+        scenario = case.scenario
+
+        start = time.perf_counter()
+        utterance = Utterance.parse(case.text)
+        parsed = time.perf_counter()
+        intent_data = intent_engine.detect_intent(utterance)
+        done = time.perf_counter()
+        context.update(intent_data)
+
+        elapsed += done - start
+        if samples is not None:
+            samples.add("utterance_parse", parsed - start)
+            samples.add("detect_intent", done - parsed)
+        if case.intent is not None:
+            labelled += 1
+            correct += intent_data.get("intent") == case.intent
+    return correct, labelled, elapsed
+
+
+def run(cases: list[Case], repeat: int, keep_memo: bool = False) -> dict[str, Any]:
+    memo = intent_engine.INTENT_MEMO
+    if not keep_memo:
+        # Every call goes through the whole pipeline.
+        intent_engine.INTENT_MEMO = IntentMemo(maxsize=0)
+    try:
+        _replay(cases, None)  # warm caches and lazily built indexes
+
+        samples = StageSamples()
+        with _instrumented(samples):
+            for _ in range(repeat):
+                samples.next_pass()
+                correct, labelled, _ = _replay(cases, samples)
+
+        # Throughput is measured without the stage timers in the way.
+        elapsed = min(_replay(cases, None)[2] for _ in range(repeat))
+    finally:
+        intent_engine.INTENT_MEMO = memo
+        context.__init__()
+
+    return {
+        "utterances": len(cases),
+        "repeat": repeat,
+        "memo": keep_memo,
+        "embeddings": intent_engine.NLU_CLASSIFIER.embedder_ready,
+        "accuracy": correct / labelled if labelled else 1.0,
+        "throughput_per_s": len(cases) / elapsed if elapsed else 0.0,
+        "stages_us": samples.summary(),
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float, slack_us: float) -> list[str]:
+    """Regressions of ``current`` against ``baseline``, as readable lines."""
+    regressions: list[str] = []
+    if current["accuracy"] + 1e-9 < baseline.get("accuracy", 0.0):
+        regressions.append(f"accuracy {baseline['accuracy']:.2%} -> {current['accuracy']:.2%}")
+    for stage, before in baseline.get("stages_us", {}).items():
+        after = current["stages_us"].get(stage)
+        if after is None:
+            continue
+        for key in GATED_PERCENTILES:
+            limit = max(before[key] * (1 + tolerance), before[key] + slack_us)
+            if after[key] > limit:
+                regressions.append(f"{stage} {key} {before[key]:.1f} -> {after[key]:.1f} µs")
+    return regressions
+
+
+def _print_report(result: dict[str, Any]) -> None:
+    print(
+        f"NLU benchmark: {result['utterances']} utterances x {result['repeat']} "
+        f"(memo {'on' if result['memo'] else 'off'}, embeddings {'on' if result['embeddings'] else 'off'})"
+    )
+    print(f"\n{'stage':<24} {'calls':>7} {'p50 µs':>9} {'p95 µs':>9} {'p99 µs':>9}")
+    for stage, stats in result["stages_us"].items():
+        print(f"{stage:<24} {stats['calls']:>7} {stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['p99']:>9.1f}")
+    print(f"\nthroughput: {result['throughput_per_s']:.0f} utterances/s")
+    print(f"intent accuracy: {result['accuracy']:.2%}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark NLU latency per stage and intent accuracy offline.")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the corpus")
+    parser.add_argument("--memo", action="store_true", help="Keep the detect_intent memo enabled")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--write-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative growth per stage percentile")
+    parser.add_argument("--slack-us", type=float, default=5.0, help="Growth in µs that is always tolerated")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results JSON")
+    args = parser.parse_args()
+
+    intent_engine.llm_chat = lambda _prompt: '{"intent":"chat","parameters":{}}'
+    result = run(load_cases(), max(1, args.repeat), keep_memo=args.memo)
+
+    if args.json:
+        print(json.dumps(result, indent=2, sort_keys=True))
+    else:
+        _print_report(result)
+
+    if args.write_baseline:
+        args.baseline.write_text(json.dumps(result, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        return 0
+
+    regressions = compare(result, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance, args.slack_us)
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%} of {args.baseline}:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
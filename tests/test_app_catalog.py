@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import system.laptop.app_launcher as app_launcher
+from system.laptop.app_launcher import AppCatalog
+
+
+def _write_index(path: Path, names: list[str], mtime_ns: int) -> None:
+    apps = [{"name": name, "location": f"/opt/{name}", "source": "test", "tag": "media"} for name in names]
+    path.write_text(json.dumps({"generated_at": "2099-01-01T00:00:00+00:00", "apps": apps}), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_catalog_parses_once_and_reloads_on_mtime_change(tmp_path, monkeypatch):
+    index = tmp_path / "app_names.json"
+    _write_index(index, ["Spotify"], 1_000_000_000)
+    catalog = AppCatalog(index)
+    reloads = []
+    catalog.add_listener(lambda: reloads.append(True))
+
+    reads = []
+    real_read = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self) or real_read(self, *a, **k))
+
+    assert catalog.is_known("spotify")
+    assert catalog.entries("MEDIA")[0][0] == "spotify"
+    assert "chrome" in catalog.known_names()  # curated names are always there
+    assert len(reads) == 1
+
+    _write_index(index, ["Spotify", "VLC media player"], 2_000_000_000)
+    assert catalog.is_known("vlc media player")
+    assert len(reads) == 2
+    assert reloads == [True]
+
+
+def test_build_app_index_hands_the_new_payload_to_the_catalog(tmp_path, monkeypatch):
+    index = tmp_path / "app_names.json"
+    catalog = AppCatalog(index)
+    monkeypatch.setattr(app_launcher, "APP_INDEX_PATH", index)
+    monkeypatch.setattr(app_launcher, "APP_CATALOG", catalog)
+    monkeypatch.setattr(
+        app_launcher,
+        "_collect_registry_apps",
+        lambda: [{"name": "Obsidian", "location": "/opt/obsidian", "source": "registry", "tag": "utility"}],
+    )
+    monkeypatch.setattr(app_launcher, "_collect_program_files_apps", lambda: [])
+    monkeypatch.setattr(app_launcher, "_collect_uwp_apps", lambda: [])
+    monkeypatch.setattr(app_launcher, "_collect_desktop_entry_apps", lambda: [])
+    monkeypatch.setattr(app_launcher, "APP_WALK_CACHE", app_launcher.DirectoryCache(tmp_path / "walk.json"))
+
+    assert not catalog.is_known("obsidian")
+    app_launcher.build_app_index(force_refresh=True)
+
+    assert catalog.is_known("obsidian")
+    assert app_launcher.canonicalize_app_name("Obsidian") == "obsidian"
+    assert app_launcher.search_apps("obsidian")[0]["location"] == "/opt/obsidian"
+
+
+def test_path_executables_from_old_indexes_are_not_apps(tmp_path):
+    index = tmp_path / "app_names.json"
+    apps = [
+        {"name": "reboot", "location": "/usr/sbin/reboot", "source": "path", "tag": "utility"},
+        {"name": "Firefox", "location": "/usr/bin/firefox", "source": "desktop", "tag": "browser"},
+    ]
+    index.write_text(json.dumps({"generated_at": "2099-01-01T00:00:00+00:00", "apps": apps}), encoding="utf-8")
+    catalog = AppCatalog(index)
+
+    assert [name for name, _ in catalog.entries()] == ["firefox"]
+    assert not catalog.is_known("reboot")
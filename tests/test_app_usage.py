@@ -0,0 +1,99 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import system.laptop.app_launcher as app_launcher
+from system.laptop.app_launcher import AppCatalog
+from system.laptop.app_usage import AppUsage
+
+DAY = 86400.0
+
+
+def _catalog(tmp_path, monkeypatch, apps):
+    index = tmp_path / "app_names.json"
+    index.write_text(json.dumps({"generated_at": "2099-01-01T00:00:00+00:00", "apps": apps}), encoding="utf-8")
+    catalog = AppCatalog(index)
+    catalog.add_listener(app_launcher.clear_preresolved)
+    monkeypatch.setattr(app_launcher, "APP_INDEX_PATH", index)
+    monkeypatch.setattr(app_launcher, "APP_CATALOG", catalog)
+    usage = AppUsage(tmp_path / "usage.json")
+    monkeypatch.setattr(app_launcher, "APP_USAGE", usage)
+    monkeypatch.setattr(app_launcher, "_PRERESOLVED", {})
+    return usage
+
+
+def _app(name, location):
+    return {"name": name, "location": location, "source": "test", "tag": "utility"}
+
+
+def test_usage_decays_and_persists(tmp_path):
+    path = tmp_path / "usage.json"
+    usage = AppUsage(path, half_life_days=7)
+    now = 1_000 * DAY
+    for _ in range(3):
+        usage.record("code", "visual studio code", now=now - 14 * DAY)
+    usage.record("spotify", now=now)
+
+    reloaded = AppUsage(path, half_life_days=7)
+    # Three launches two half-lives ago weigh less than one launch today.
+    assert reloaded.top(2, now=now) == ["spotify", "code"]
+    assert reloaded.weight("visual studio code") == reloaded.weight("code")
+    assert reloaded.weight("never opened") == 0.0
+    assert json.loads(path.read_text())["code"][0] == 3
+
+
+def test_launch_history_breaks_fuzzy_near_ties(tmp_path, monkeypatch):
+    usage = _catalog(
+        tmp_path,
+        monkeypatch,
+        [_app("Photo Editor", "/opt/photo-editor"), _app("Photo Edits", "/opt/photo-edits")],
+    )
+    assert app_launcher.canonicalize_app_name("photo edit") == "photo edits"
+
+    usage.record("photo editor")
+    assert app_launcher.canonicalize_app_name("photo edit") == "photo editor"
+
+
+def test_search_ranks_partial_matches_by_launches(tmp_path, monkeypatch):
+    usage = _catalog(
+        tmp_path,
+        monkeypatch,
+        [_app("Notes Lite", "/opt/notes-lite"), _app("Notes Pro", "/opt/notes-pro")],
+    )
+    assert [app["name"] for app in app_launcher.search_apps("notes")] == ["Notes Lite", "Notes Pro"]
+
+    usage.record("notes", "notes pro")
+    assert [app["name"] for app in app_launcher.search_apps("notes")] == ["Notes Pro", "Notes Lite"]
+
+
+def test_preresolved_apps_launch_without_index_lookup(tmp_path, monkeypatch):
+    executable = tmp_path / "notes-pro"
+    executable.write_text("")
+    usage = _catalog(tmp_path, monkeypatch, [_app("Notes Pro", str(executable))])
+    usage.record("notes pro")
+    app_launcher.preresolve_top_apps(background=False)
+
+    launched = []
+    monkeypatch.setattr(app_launcher.subprocess, "Popen", lambda target: launched.append(target))
+    monkeypatch.setattr(app_launcher, "resolve_app", lambda query: (_ for _ in ()).throw(AssertionError(query)))
+
+    result = app_launcher.open_app("notes pro")
+
+    assert result["success"] and launched == [[str(executable)]]
+    assert usage.top(1) == ["notes pro"] and json.loads((tmp_path / "usage.json").read_text())["notes pro"][0] == 2
+
+
+def test_catalog_reload_drops_preresolved_apps(tmp_path, monkeypatch):
+    executable = tmp_path / "notes-pro"
+    executable.write_text("")
+    usage = _catalog(tmp_path, monkeypatch, [_app("Notes Pro", str(executable))])
+    usage.record("notes pro")
+    app_launcher.preresolve_top_apps(background=False)
+    assert "notes pro" in app_launcher._PRERESOLVED
+
+    app_launcher.APP_CATALOG.replace({"apps": []})
+    assert app_launcher._PRERESOLVED == {}
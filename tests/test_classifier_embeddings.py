@@ -0,0 +1,178 @@
+import sys
+import threading
+import types
+from math import sqrt
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+np = pytest.importorskip("numpy")
+
+from brain.nlu.classifier import IntentClassifier
+
+
+class FakeEncoder:
+    """Deterministic bag-of-words encoder standing in for SentenceTransformer."""
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                out[row, sum(map(ord, word)) % self.dim] += 1.0
+        return out
+
+
+def _embedding_classifier() -> IntentClassifier:
+    classifier = IntentClassifier(load_on_demand=False)
+    classifier._embedder = FakeEncoder()
+    classifier._build_prototype_matrix()
+    return classifier
+
+
+def _reference_best(classifier: IntentClassifier, text: str) -> str:
+    """The old per-prototype pure-Python cosine loop, over every intent."""
+
+    def cosine(a, b):
+        dot = sum(x * y for x, y in zip(a, b))
+        n1 = sqrt(sum(x * x for x in a))
+        n2 = sqrt(sum(y * y for y in b))
+        return dot / (n1 * n2) if n1 and n2 else 0.0
+
+    emb = list(classifier._embedder.encode([text])[0])
+    best_intent, best_sim = "chat", -1.0
+    for intent, samples in classifier._prototypes.items():
+        sim = max(cosine(emb, list(vec)) for vec in classifier._embedder.encode(samples))
+        if sim > best_sim:
+            best_intent, best_sim = intent, sim
+    return best_intent
+
+
+def test_prototype_matrix_is_normalized_and_grouped_by_intent():
+    classifier = _embedding_classifier()
+    total = sum(len(samples) for samples in classifier._prototypes.values())
+
+    assert classifier._prototype_matrix.shape == (total, 64)
+    assert np.allclose(np.linalg.norm(classifier._prototype_matrix, axis=1), 1.0)
+    assert classifier._prototype_intent_ids.shape == (total,)
+    assert classifier._matrix_intents == list(classifier._prototypes)
+
+
+@pytest.mark.parametrize("text", ["launch spotify", "weather in london", "why is the sky blue"])
+def test_matrix_scoring_matches_reference_loop(text):
+    classifier = _embedding_classifier()
+
+    result = classifier.classify(text, text, candidates=set(classifier._prototypes))
+
+    assert result.source == "embedding_classifier"
+    assert result.intent == _reference_best(classifier, text)
+
+
+def test_classify_batch_encodes_once_and_matches_single_calls():
+    classifier = _embedding_classifier()
+    texts = ["open chrome", "latest technology news", "remind me in 10 minutes", "tell me a story"]
+    singles = [classifier.classify(text, text) for text in texts]
+    classifier._embedder.calls = 0
+
+    batch = classifier.classify_batch(texts)
+
+    assert classifier._embedder.calls == 1
+    assert [r.intent for r in batch] == [r.intent for r in singles]
+    assert [r.confidence for r in batch] == pytest.approx([r.confidence for r in singles])
+
+
+def test_classify_batch_without_embedder_uses_keyword_path():
+    classifier = IntentClassifier(load_on_demand=False)
+    classifier._embedder = None
+
+    results = classifier.classify_batch(["take screenshot", "weather in paris"])
+
+    assert [r.intent for r in results] == ["take_screenshot", "get_weather"]
+
+
+def test_warm_up_loads_embedder_in_background(monkeypatch):
+    release = threading.Event()
+
+    class GatedTransformer(FakeEncoder):
+        def __init__(self, name):
+            release.wait(5)
+            super().__init__()
+            self.name = name
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=GatedTransformer))
+    classifier = IntentClassifier()
+
+    assert not classifier.embedder_ready
+    # The first classify call starts loading and is answered by the keyword path.
+    assert classifier.classify("take screenshot", "take screenshot").source == "keyword_classifier"
+    assert not classifier.embedder_ready
+
+    release.set()
+    assert classifier.wait_until_ready(timeout=5)
+    assert classifier._embedder.name == "all-MiniLM-L6-v2"
+    assert classifier.classify("take screenshot", "take screenshot").source == "embedding_classifier"
+
+
+def test_failed_warm_up_keeps_keyword_path(monkeypatch):
+    def broken(name):
+        raise OSError("model files missing")
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=broken))
+    classifier = IntentClassifier()
+
+    assert classifier.warm_up(background=False) is False
+    assert classifier.embedder_failed
+    assert classifier.classify("weather in paris", "weather in paris").intent == "get_weather"
+
+
+def test_prototype_cache_reuses_rows_and_encodes_only_changed_texts(tmp_path):
+    from brain.nlu.embedding_cache import PrototypeEmbeddingCache
+
+    cache = PrototypeEmbeddingCache(tmp_path)
+    first = IntentClassifier(load_on_demand=False, embedding_cache=cache)
+    first._embedder = FakeEncoder()
+    first._build_prototype_matrix()
+    assert cache.last_encoded == len(set(s for samples in first._prototypes.values() for s in samples))
+    assert cache.matrix_path.exists() and cache.manifest_path.exists()
+
+    # Unchanged prototypes: memory-mapped straight from disk, nothing encoded.
+    second = IntentClassifier(load_on_demand=False, embedding_cache=cache)
+    second._embedder = FakeEncoder()
+    second._build_prototype_matrix()
+    assert cache.last_encoded == 0
+    assert second._embedder.calls == 0
+    assert isinstance(second._prototype_matrix, np.memmap)
+    np.testing.assert_allclose(second._prototype_matrix, first._prototype_matrix)
+
+    # One edited prototype: only that text goes through the encoder.
+    third = IntentClassifier(load_on_demand=False, embedding_cache=cache)
+    third._prototypes["take_screenshot"] = ["grab the screen now"]
+    third._embedder = FakeEncoder()
+    third._build_prototype_matrix()
+    assert cache.last_encoded == 1
+    reference = IntentClassifier(load_on_demand=False)
+    reference._prototypes["take_screenshot"] = ["grab the screen now"]
+    reference._embedder = FakeEncoder()
+    reference._build_prototype_matrix()
+    np.testing.assert_allclose(third._prototype_matrix, reference._prototype_matrix, rtol=1e-6)
+
+
+def test_prototype_cache_ignores_other_models(tmp_path):
+    from brain.nlu.embedding_cache import PrototypeEmbeddingCache
+
+    cache = PrototypeEmbeddingCache(tmp_path)
+    encode = lambda batch: np.ones((len(batch), 4), dtype=np.float32)
+    cache.load("model-a", ["x", "y"], encode)
+
+    assert cache.load("model-a", ["x", "y"], encode).shape == (2, 4)
+    assert cache.last_encoded == 0
+    cache.load("model-b", ["x", "y"], encode)
+    assert cache.last_encoded == 2
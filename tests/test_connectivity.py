@@ -0,0 +1,78 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from brain import connectivity
+from brain.connectivity import CONNECTIVITY_EVENT, ConnectivityMonitor
+
+
+class _Probe:
+    def __init__(self, online):
+        self.online = online
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.online
+
+
+def test_is_online_reads_the_last_probe_without_probing():
+    probe = _Probe(False)
+    monitor = ConnectivityMonitor(probe, publish=lambda *args: None)
+
+    assert monitor.is_online()  # optimistic until the first probe
+    monitor.check()
+    for _ in range(100):
+        assert not monitor.is_online()
+    assert probe.calls == 1
+
+
+def test_only_transitions_are_published():
+    probe = _Probe(True)
+    events = []
+    monitor = ConnectivityMonitor(probe, publish=lambda name, data: events.append((name, data)))
+
+    for online in (True, False, False, True):
+        probe.online = online
+        monitor.check()
+    assert events == [(CONNECTIVITY_EVENT, {"online": False}), (CONNECTIVITY_EVENT, {"online": True})]
+
+
+def test_a_failing_probe_counts_as_offline():
+    def broken():
+        raise OSError("no route")
+
+    monitor = ConnectivityMonitor(broken, publish=lambda *args: None)
+    assert monitor.check() is False and not monitor.is_online()
+
+
+def test_background_thread_probes_and_refresh_wakes_it():
+    probe = _Probe(False)
+    checked = threading.Event()
+    monitor = ConnectivityMonitor(
+        probe, online_interval=60, offline_interval=60, publish=lambda name, data: checked.set()
+    )
+    monitor.start()
+    assert monitor.wait_until_checked(5)
+    assert checked.wait(5) and not monitor.is_online()
+
+    checked.clear()
+    probe.online = True
+    monitor.refresh()
+    assert checked.wait(5) and monitor.is_online()
+    monitor.stop()
+
+
+def test_installed_monitor_backs_the_module_functions():
+    fake = ConnectivityMonitor(_Probe(False), publish=lambda *args: None)
+    fake.check()
+    previous = connectivity.install_monitor(fake)
+    try:
+        assert connectivity.is_online() is False
+        assert connectivity.get_monitor() is fake
+    finally:
+        connectivity.install_monitor(previous)
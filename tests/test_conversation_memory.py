@@ -1,14 +1,19 @@
 import importlib
+import json
+import re
+import subprocess
 import sys
 import types
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 
-def _import_conversation(monkeypatch):
+def _import_conversation(monkeypatch, tmp_path, cache=None):
     firebase_admin = types.ModuleType("firebase_admin")
     firebase_admin.credentials = types.SimpleNamespace(Certificate=lambda path: object())
     firebase_admin.db = types.SimpleNamespace(reference=lambda path: object())
@@ -19,17 +24,26 @@ def _import_conversation(monkeypatch):
     monkeypatch.setitem(sys.modules, "firebase_admin.db", firebase_admin.db)
     sys.modules.pop("memory.firebase_sync", None)
     sys.modules.pop("memory.local_cache", None)
+    sys.modules.pop("memory.sync_manager", None)
     sys.modules.pop("memory.conversation", None)
-    return importlib.import_module("memory.conversation")
-
-
-def test_add_turn_persists_chat_intent_to_conversation_turns(monkeypatch):
-    conversation = _import_conversation(monkeypatch)
-    writes = []
+    conversation = importlib.import_module("memory.conversation")
+
+    local_cache = importlib.import_module("memory.local_cache")
+    monkeypatch.setattr(local_cache, "DB_FILE", str(tmp_path / "memory.db"))
+    monkeypatch.setattr(local_cache, "CACHE_FILE", str(tmp_path / "cache.json"))
+    monkeypatch.setattr(local_cache, "SYNC_FILE", str(tmp_path / "sync.json"))
+    monkeypatch.setattr(local_cache, "JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setattr(local_cache, "_store", None)
+    monkeypatch.setattr(local_cache, "_journal", None)
+    if cache is not None:
+        (tmp_path / "cache.json").write_text(json.dumps(cache), encoding="utf-8")
+    return conversation
+
+
+def test_add_turn_persists_chat_intent_to_conversation_turns(monkeypatch, tmp_path):
+    conversation = _import_conversation(monkeypatch, tmp_path)
     pushed = []
 
-    monkeypatch.setattr(conversation, "read_cache", lambda: {})
-    monkeypatch.setattr(conversation, "write_cache", writes.append)
     monkeypatch.setattr(conversation, "push_conversation_turn", pushed.append)
 
     conversation.add_turn(
@@ -39,8 +53,7 @@ def test_add_turn_persists_chat_intent_to_conversation_turns(monkeypatch):
         assistant_metadata={"intent": "chat", "status": "success"},
     )
 
-    assert len(writes) == 1
-    turns = writes[0][conversation.CONVERSATION_TURNS_KEY]
+    turns = conversation.get_journal().tail()
     assert len(turns) == 1
     assert turns[0]["user_text"] == "What is Python?"
     assert turns[0]["assistant_text"] == "Python is a programming language."
@@ -49,20 +62,43 @@ def test_add_turn_persists_chat_intent_to_conversation_turns(monkeypatch):
     assert pushed == [turns[0]]
 
     # Legacy history remains available for callers that still depend on raw messages.
-    history = writes[0][conversation.KEY]
+    history = conversation.get_history()
     assert [message["role"] for message in history] == ["user", "assistant"]
     assert history[0]["metadata"]["intent"] == "chat"
 
 
-def test_add_turn_skips_action_intent_without_cache_write(monkeypatch):
-    conversation = _import_conversation(monkeypatch)
-    writes = []
+def test_history_is_derived_from_turns_stored_once(monkeypatch, tmp_path):
+    conversation = _import_conversation(monkeypatch, tmp_path)
+    monkeypatch.setattr(conversation, "push_conversation_turn", lambda turn: None)
+    sys.modules.pop("memory.memory_retriver", None)
+    memory_retriver = importlib.import_module("memory.memory_retriver")
+
+    conversation.add_message("user", "standalone")
+    for index in range(3):
+        conversation.add_turn(f"question {index}", f"answer {index}", user_metadata={"intent": "chat"})
+
+    # Only the standalone message is stored as a message; turns are not copied.
+    assert [message["text"] for message in conversation.get_store().history()] == ["standalone"]
+    assert [message["text"] for message in conversation.get_history()] == [
+        "standalone",
+        "question 0",
+        "answer 0",
+        "question 1",
+        "answer 1",
+        "question 2",
+        "answer 2",
+    ]
+    assert [message["text"] for message in memory_retriver.recall_recent(3)] == ["answer 1", "question 2", "answer 2"]
+    assert memory_retriver.recall_last_user_message() == "question 2"
+
+
+def test_add_turn_skips_action_intent_without_cache_write(monkeypatch, tmp_path):
+    conversation = _import_conversation(monkeypatch, tmp_path)
 
-    def fail_read_cache():
+    def fail_get_store():
         raise AssertionError("command turns should not read/write cache")
 
-    monkeypatch.setattr(conversation, "read_cache", fail_read_cache)
-    monkeypatch.setattr(conversation, "write_cache", writes.append)
+    monkeypatch.setattr(conversation, "get_store", fail_get_store)
 
     conversation.add_turn(
         "Open Chrome",
@@ -71,15 +107,12 @@ def test_add_turn_skips_action_intent_without_cache_write(monkeypatch):
         assistant_metadata={"intent": "open_app", "status": "success"},
     )
 
-    assert writes == []
+    assert not (tmp_path / "memory.db").exists()
 
 
-def test_add_turn_allows_explicit_conversation_kind(monkeypatch):
-    conversation = _import_conversation(monkeypatch)
-    writes = []
+def test_add_turn_allows_explicit_conversation_kind(monkeypatch, tmp_path):
+    conversation = _import_conversation(monkeypatch, tmp_path)
 
-    monkeypatch.setattr(conversation, "read_cache", lambda: {})
-    monkeypatch.setattr(conversation, "write_cache", writes.append)
     monkeypatch.setattr(conversation, "push_conversation_turn", lambda turn: None)
 
     conversation.add_turn(
@@ -89,24 +122,19 @@ def test_add_turn_allows_explicit_conversation_kind(monkeypatch):
         assistant_metadata={"status": "success"},
     )
 
-    assert len(writes) == 1
-    assert writes[0][conversation.CONVERSATION_TURNS_KEY][0]["user_text"] == "Tell me something interesting."
+    assert conversation.get_recent_turns()[0]["user_text"] == "Tell me something interesting."
 
 
-def test_add_turn_trims_conversation_turns_to_newest_20(monkeypatch):
-    conversation = _import_conversation(monkeypatch)
-    writes = []
+def test_add_turn_trims_conversation_turns_to_newest_20(monkeypatch, tmp_path):
     existing_turns = [
-        {"user_text": f"u{i}", "assistant_text": f"a{i}", "time": str(i), "metadata": {}}
+        {"user_text": f"u{i}", "assistant_text": f"a{i}", "time": f"2000-01-01T00:00:{i:02d}", "metadata": {}}
         for i in range(20)
     ]
-
-    monkeypatch.setattr(
-        conversation,
-        "read_cache",
-        lambda: {conversation.CONVERSATION_TURNS_KEY: list(existing_turns), conversation.KEY: []},
+    conversation = _import_conversation(
+        monkeypatch,
+        tmp_path,
+        cache={"conversation_turns": existing_turns, "conversation_history": []},
     )
-    monkeypatch.setattr(conversation, "write_cache", writes.append)
     monkeypatch.setattr(conversation, "push_conversation_turn", lambda turn: None)
 
     conversation.add_turn(
@@ -116,40 +144,38 @@ def test_add_turn_trims_conversation_turns_to_newest_20(monkeypatch):
         assistant_metadata={"intent": "chat"},
     )
 
-    turns = writes[0][conversation.CONVERSATION_TURNS_KEY]
+    turns = conversation.get_journal().tail()
     assert len(turns) == 20
     assert turns[0]["user_text"] == "u1"
     assert turns[-1]["user_text"] == "new user"
 
 
-def test_get_recent_turns_reads_conversation_turns_not_legacy_history(monkeypatch):
-    conversation = _import_conversation(monkeypatch)
+def test_get_recent_turns_reads_conversation_turns_not_legacy_history(monkeypatch, tmp_path):
     data = {
-        conversation.CONVERSATION_TURNS_KEY: [
+        "conversation_turns": [
             {"user_text": "first", "assistant_text": "one", "time": "1", "metadata": {}},
             {"user_text": "second", "assistant_text": "two", "time": "2", "metadata": {}},
         ],
-        conversation.KEY: [
+        "conversation_history": [
             {"role": "user", "text": "legacy", "time": "0", "metadata": {"intent": "chat"}},
             {"role": "assistant", "text": "old", "time": "0", "metadata": {"intent": "chat"}},
         ],
     }
-    monkeypatch.setattr(conversation, "read_cache", lambda: data)
+    conversation = _import_conversation(monkeypatch, tmp_path, cache=data)
 
-    assert conversation.get_recent_turns(1) == [data[conversation.CONVERSATION_TURNS_KEY][1]]
+    assert conversation.get_recent_turns(1) == [data["conversation_turns"][1]]
 
 
-def test_get_recent_turns_migrates_legacy_history_without_action_turns(monkeypatch):
-    conversation = _import_conversation(monkeypatch)
+def test_get_recent_turns_migrates_legacy_history_without_action_turns(monkeypatch, tmp_path):
     data = {
-        conversation.KEY: [
+        "conversation_history": [
             {"role": "user", "text": "hello", "time": "1", "metadata": {"intent": "greeting"}},
             {"role": "assistant", "text": "hi", "time": "1", "metadata": {"intent": "greeting"}},
             {"role": "user", "text": "open chrome", "time": "2", "metadata": {"intent": "open_app"}},
             {"role": "assistant", "text": "opening", "time": "2", "metadata": {"intent": "open_app"}},
         ]
     }
-    monkeypatch.setattr(conversation, "read_cache", lambda: data)
+    conversation = _import_conversation(monkeypatch, tmp_path, cache=data)
 
     assert conversation.get_recent_turns() == [
         {
@@ -162,3 +188,114 @@ def test_get_recent_turns_migrates_legacy_history_without_action_turns(monkeypat
             },
         }
     ]
+
+
+def test_journal_compaction_folds_old_turns_into_summary(monkeypatch, tmp_path):
+    conversation = _import_conversation(monkeypatch, tmp_path)
+    monkeypatch.setattr(conversation, "push_conversation_turn", lambda turn: None)
+
+    for index in range(45):
+        conversation.add_turn(f"question {index}", "answer", user_metadata={"intent": "chat"})
+    journal = conversation.get_journal()
+    journal.compact()
+
+    assert [turn["user_text"] for turn in conversation.get_recent_turns(2)] == ["question 43", "question 44"]
+    assert len(conversation.get_history()) <= conversation.COMPACT_AFTER_MESSAGES
+    summary = conversation.get_summary()
+    # The 25 turns that left the tail were folded, possibly over several runs.
+    assert sum(int(n) for n in re.findall(r"Compacted (\d+) older messages", summary)) == 50
+    assert "question 0" in summary and "question 25" not in summary
+    assert len(list((tmp_path / "journal").glob("turns-*.jsonl"))) <= 3
+
+
+_CRASH_AFTER_COMPACTION = """
+import os, sys
+sys.path.insert(0, {root!r})
+import memory.journal as journal
+import memory.local_cache as local_cache
+journal.TurnJournal._start_compactor = lambda self: None
+local_cache.DB_FILE = {db!r}
+local_cache.JOURNAL_DIR = {journal!r}
+local_cache.CACHE_FILE = local_cache.SYNC_FILE = os.devnull
+import memory.conversation as conversation
+conversation.push_conversation_turn = lambda turn: None
+local_cache.get_store()._delay = 60
+for index in range(45):
+    conversation.add_turn(f"question {{index}}", "answer", user_metadata={{"intent": "chat"}})
+local_cache.flush()
+assert local_cache.get_journal().compact()
+os._exit(0)  # killed before the write-back timer would have flushed
+"""
+
+
+def test_turns_folded_by_compaction_survive_a_crash(monkeypatch, tmp_path):
+    script = _CRASH_AFTER_COMPACTION.format(
+        root=str(ROOT), db=str(tmp_path / "memory.db"), journal=str(tmp_path / "journal")
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+
+    conversation = _import_conversation(monkeypatch, tmp_path)
+    in_journal = {
+        json.loads(line)["user_text"]
+        for path in (tmp_path / "journal").glob("turns-*.jsonl")
+        for line in path.read_text().splitlines()
+    }
+    folded_messages = sum(int(n) for n in re.findall(r"Compacted (\d+) older messages", conversation.get_summary()))
+    # Every turn is either still in the journal or counted in the summary.
+    assert folded_messages == 50
+    assert len(in_journal) + folded_messages // 2 == 45
+
+
+def test_sync_merge_turns_batches_journal_and_metadata_writes(monkeypatch, tmp_path):
+    conversation = _import_conversation(monkeypatch, tmp_path)
+    sync_manager = importlib.import_module("memory.sync_manager")
+    local_cache = importlib.import_module("memory.local_cache")
+    monkeypatch.setattr(sync_manager, "_DEVICE_ID", "this-device")
+    saved = []
+    monkeypatch.setattr(
+        sync_manager,
+        "save_sync_metadata",
+        lambda metadata: (saved.append(dict(metadata)), local_cache.save_sync_metadata(metadata)),
+    )
+
+    remote = [
+        {"conversation_id": f"r{index}", "user_text": f"remote {index}", "assistant_text": "ok", "timestamp": f"2000-01-01T00:{index:02d}", "device_id": "other"}
+        for index in range(30)
+    ]
+    assert sync_manager.merge_turns(remote + remote[:5]) == 30
+    assert sync_manager.merge_turns(remote) == 0
+
+    assert len(saved) == 1
+    assert saved[0]["last_received_timestamp"] == "2000-01-01T00:29"
+    assert saved[0]["last_processed_document"] == "r29"
+    recent = conversation.get_journal().tail()
+    assert len(recent) == local_cache.MAX_CONVERSATION_TURNS
+    assert recent[-1]["conversation_id"] == "r29"
+
+
+def test_memory_snapshot_is_shared_until_memory_changes(monkeypatch, tmp_path):
+    conversation = _import_conversation(monkeypatch, tmp_path)
+    monkeypatch.setattr(conversation, "push_conversation_turn", lambda turn: None)
+    conversation.add_turn("open notepad", "done", user_metadata={"intent": "chat", "app": "notepad"})
+
+    snapshot = conversation.get_nlu_context()
+    assert conversation.get_memory_snapshot() is snapshot
+    assert snapshot["recent_turns"][0]["user_text"] == "open notepad"
+    assert snapshot.last_intent == "chat"
+    assert snapshot.frames[0]["app"] == "notepad"
+    with pytest.raises(TypeError):
+        snapshot["recent_turns"][0]["metadata"]["user"]["app"] = "paint"
+    with pytest.raises(AttributeError):
+        snapshot.summary = "changed"
+
+    conversation.set_working_memory(current_task={"status": "nlu"})
+    with_task = conversation.get_memory_snapshot()
+    assert with_task is not snapshot and with_task.version > snapshot.version
+    assert with_task["working_memory"]["current_task"]["status"] == "nlu"
+    assert with_task.turns is snapshot.turns  # turns untouched, so not rebuilt
+
+    conversation.add_turn("what about paint", "sure", user_metadata={"intent": "chat"})
+    assert [turn["user_text"] for turn in conversation.get_memory_snapshot().turns] == [
+        "open notepad",
+        "what about paint",
+    ]
@@ -0,0 +1,85 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import memory.firestore_sync as firestore_sync
+from benchmarks.firestore_fake import FakeFirestore, fake_firestore_module
+
+
+def _install_fake(monkeypatch, **options):
+    client = FakeFirestore(**options)
+    monkeypatch.setattr(firestore_sync, "_is_online", lambda *args, **kwargs: True)
+    monkeypatch.setattr(firestore_sync, "_firestore_client", None)
+    monkeypatch.setattr(firestore_sync, "_firestore_module", None)
+    monkeypatch.setattr(firestore_sync, "_initialized", False)
+    monkeypatch.setenv(firestore_sync.USER_ENV_VAR, "tester")
+    firestore_sync.install_client(client, fake_firestore_module)
+    return client
+
+
+def test_push_uses_write_batches_and_pull_pages_with_a_cursor(monkeypatch):
+    client = _install_fake(monkeypatch)
+    turns = [
+        {"conversation_id": f"t{index:04d}", "user_text": str(index), "timestamp": f"2026-01-01T00:{index // 60:02d}:{index % 60:02d}"}
+        for index in range(1100)
+    ]
+
+    assert firestore_sync.push_conversation_turns(turns) == 1100
+    assert client.round_trips == 3  # 500 + 500 + 100
+
+    pages = list(firestore_sync.iter_new_conversation_turns(since_timestamp=turns[99]["timestamp"], page_size=400))
+    assert [len(page) for page in pages] == [400, 400, 200]
+    pulled = [turn["conversation_id"] for page in pages for turn in page]
+    assert pulled == [turn["conversation_id"] for turn in turns[100:]]
+    assert isinstance(pages[0][0]["synced_at"], str)  # server timestamps arrive as datetimes
+
+
+def _turn(index, device_id="phone"):
+    return {"conversation_id": f"{device_id}-{index}", "user_text": str(index), "device_id": device_id, "timestamp": f"2026-01-01T00:00:{index:02d}"}
+
+
+def test_failed_batch_reports_the_turns_committed_before_it(monkeypatch):
+    client = _install_fake(monkeypatch)
+    turns = [_turn(index % 60, device_id=f"d{index // 60}") for index in range(700)]
+    client.fail_next(1, after=1)  # the second commit
+
+    assert firestore_sync.push_conversation_turns(turns) == 500
+    assert len(firestore_sync.pull_new_conversation_turns(limit=1000)) == 500
+
+
+def test_realtime_listener_batches_remote_turns_and_skips_our_own(monkeypatch):
+    client = _install_fake(monkeypatch)
+    collection = firestore_sync._conversations_collection()
+    collection.document("phone-0").set(_turn(0))
+    received = []
+    arrived = threading.Event()
+
+    def on_turns(turns):
+        received.append([turn["conversation_id"] for turn in turns])
+        if len(received) == 2:
+            arrived.set()
+
+    watch = firestore_sync.start_realtime_listener(on_turns, "laptop", batch=True)
+    batch = client.batch()
+    for turn in (_turn(1), _turn(2, device_id="laptop"), _turn(3)):
+        batch.set(collection.document(turn["conversation_id"]), turn)
+    batch.commit()
+
+    assert arrived.wait(5)
+    watch.unsubscribe()
+    assert received == [["phone-0"], ["phone-1", "phone-3"]]
+
+
+def test_injected_failures_leave_nothing_written(monkeypatch):
+    client = _install_fake(monkeypatch)
+    client.fail_next(2)
+
+    assert firestore_sync.push_conversation_turn(_turn(1)) is False
+    assert firestore_sync.push_conversation_turns([_turn(2)]) == 0
+    assert firestore_sync.push_conversation_turns([_turn(3)]) == 1
+    assert client.failures == 2
+    assert [turn["conversation_id"] for turn in firestore_sync.pull_new_conversation_turns()] == ["phone-3"]
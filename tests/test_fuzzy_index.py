@@ -0,0 +1,45 @@
+import difflib
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from system.laptop.app_launcher import canonicalize_app_name
+from system.laptop.fuzzy_index import TrigramIndex, trigrams
+
+NAMES = [
+    "visual studio code", "visual studio installer", "vlc media player", "whatsapp", "whatsapp web",
+    "notepad", "notepad++", "chrome", "android studio", "spotify", "steam", "obs studio", "wmplayer",
+]
+
+
+def test_trigrams_are_padded():
+    assert trigrams("vlc") == {"  v", " vl", "vlc", "lc "}
+
+
+@pytest.mark.parametrize(
+    "query", ["chrme", "visual studio", "vlc player", "whatsap", "notepad plus", "obs", "steem", "xyzzy"]
+)
+def test_difflib_scorer_matches_get_close_matches(query):
+    index = TrigramIndex(NAMES)
+
+    assert index.close_matches(query, n=3, cutoff=0.62) == difflib.get_close_matches(query, NAMES, n=3, cutoff=0.62)
+
+
+def test_trigram_scorer_ranks_by_overlap():
+    index = TrigramIndex(NAMES)
+    ranked = index.match("whatsap", n=2, cutoff=0.5, scorer="trigram")
+
+    assert [name for _, name in ranked] == ["whatsapp", "whatsapp web"]
+    assert ranked[0][0] > ranked[1][0]
+    with pytest.raises(ValueError):
+        index.match("whatsap", scorer="nope")
+
+
+def test_canonicalize_uses_the_index_for_typos():
+    assert canonicalize_app_name("chrme") == "chrome"
+    assert canonicalize_app_name("qqqqqq") == "qqqqqq"
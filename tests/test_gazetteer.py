@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from brain.intent_engine import _regex_fallback_intent
+from brain.nlu.gazetteer import AhoCorasick, Gazetteer, best, default_gazetteer
+from brain.nlu.slot_filler import SlotFiller
+from brain.nlu.utterance import Utterance
+
+
+def test_automaton_reports_overlapping_matches():
+    automaton = AhoCorasick()
+    for word in ("he", "she", "his", "hers"):
+        automaton.add(word, word)
+
+    found = sorted((start, end, word) for start, end, word in automaton.iter("ushers"))
+
+    assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_gazetteer_respects_word_boundaries():
+    gazetteer = Gazetteer()
+    gazetteer.add_all("coin", ["bitcoin"], prefix=True)
+    gazetteer.add_all("coin", ["eth"])
+    gazetteer.add_all("mood", ["work", "workout"])
+    gazetteer.add("app", "google chrome", "chrome")
+    gazetteer.add("app", "chrome")
+
+    assert [m.value for m in gazetteer.find("two bitcoins and eth")] == ["bitcoin", "eth"]
+    assert gazetteer.find("something about the network") == ()
+    assert best(gazetteer.find("workout then work"), "mood") == "work"
+
+    mentions = gazetteer.find("open google chrome")
+    assert [(m.text, m.value) for m in mentions] == [("google chrome", "chrome"), ("chrome", "chrome")]
+
+
+def test_default_gazetteer_covers_every_entity_list():
+    mentions = default_gazetteer().find("play chill sports news in new york on google chrome with doge")
+    kinds = {(m.kind, m.value) for m in mentions}
+
+    assert {("mood", "chill"), ("news_category", "sports"), ("city", "new york"), ("coin", "doge")} <= kinds
+    assert ("app", "chrome") in kinds
+
+
+def test_mood_rule_no_longer_fires_inside_other_words():
+    assert _regex_fallback_intent("play something for my workout")["mood"] == "workout"
+    hit = _regex_fallback_intent("check the network popularity")
+    assert hit is None or hit["intent"] != "play_by_mood"
+
+
+def test_slot_filler_reads_gazetteer_mentions():
+    filler = SlotFiller()
+
+    assert filler.fill(intent="get_news", utterance=Utterance.parse("any technology headlines")) == {
+        "category": "technology"
+    }
+    assert filler.fill(intent="get_weather", utterance=Utterance.parse("weather for pune please")) == {"city": "pune"}
+    assert filler.fill(intent="open_app", utterance=Utterance.parse("google chrome please")) == {"app": "chrome"}
@@ -0,0 +1,113 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import system.laptop.app_launcher as app_launcher
+from system.laptop.incremental_walk import DirectoryCache
+
+
+def _keep_exe(entry):
+    return entry.name.endswith(".exe")
+
+
+def _touch_dir(path: Path, seconds: int) -> None:
+    os.utime(path, ns=(seconds * 1_000_000_000, seconds * 1_000_000_000))
+
+
+def test_walk_relists_only_changed_directories(tmp_path):
+    apps = tmp_path / "apps"
+    (apps / "Editor" / "bin").mkdir(parents=True)
+    (apps / "Player").mkdir()
+    (apps / "Editor" / "bin" / "editor.exe").write_text("")
+    (apps / "Player" / "player.exe").write_text("")
+    (apps / "Player" / "readme.txt").write_text("")
+    for directory in (apps / "Editor" / "bin", apps / "Editor", apps / "Player", apps):
+        _touch_dir(directory, 1_000)
+
+    cache_file = tmp_path / "walk.json"
+    cold = DirectoryCache(cache_file)
+    found = cold.walk(str(apps), max_depth=4, keep=_keep_exe)
+    cold.save()
+    assert sorted(Path(p).name for p in found) == ["editor.exe", "player.exe"]
+    assert (cold.listed, cold.reused) == (4, 0)
+
+    (apps / "Player" / "visualizer.exe").write_text("")
+    _touch_dir(apps / "Player", 2_000)
+
+    warm = DirectoryCache(cache_file)
+    found = warm.walk(str(apps), max_depth=4, keep=_keep_exe)
+    assert sorted(Path(p).name for p in found) == ["editor.exe", "player.exe", "visualizer.exe"]
+    assert (warm.listed, warm.reused) == (1, 3)
+
+
+def test_walk_respects_max_depth(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "top.exe").write_text("")
+    (tmp_path / "a" / "b" / "deep.exe").write_text("")
+
+    found = DirectoryCache(tmp_path / "walk.json").walk(str(tmp_path), max_depth=1, keep=_keep_exe)
+    assert [Path(p).name for p in found] == ["top.exe"]
+
+
+def test_desktop_entries_become_app_records(tmp_path, monkeypatch):
+    applications = tmp_path / "share" / "applications"
+    applications.mkdir(parents=True)
+    (applications / "firefox.desktop").write_text(
+        "[Desktop Entry]\nType=Application\nName=Firefox\nName[de]=Feuerfuchs\nExec=firefox %u\n"
+        "[Desktop Action new-window]\nName=New Window\nExec=firefox --new-window\n"
+    )
+    (applications / "hidden.desktop").write_text("[Desktop Entry]\nName=Hidden Tool\nExec=tool\nNoDisplay=true\n")
+    (applications / "link.desktop").write_text("[Desktop Entry]\nType=Link\nName=Docs\nURL=https://example.com\n")
+    monkeypatch.setattr(app_launcher.platform, "system", lambda: "Linux")
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "share"))
+    monkeypatch.setenv("XDG_DATA_DIRS", str(tmp_path / "missing"))
+    monkeypatch.setattr(app_launcher, "APP_WALK_CACHE", DirectoryCache(tmp_path / "walk.json"))
+    monkeypatch.setattr(app_launcher.shutil, "which", lambda name: f"/usr/bin/{name}")
+
+    apps = app_launcher._collect_desktop_entry_apps()
+
+    assert apps == [{"name": "Firefox", "location": "/usr/bin/firefox", "source": "desktop", "tag": "browser"}]
+
+
+def test_desktop_exec_keeps_arguments_and_drops_field_codes(monkeypatch):
+    monkeypatch.setattr(app_launcher.shutil, "which", lambda name: None)
+    assert app_launcher._desktop_exec_argv("code --new-window %F") == ["code", "--new-window"]
+    assert app_launcher._desktop_exec_argv("") == []
+
+
+def test_wrapped_desktop_apps_launch_with_their_arguments(tmp_path, monkeypatch):
+    applications = tmp_path / "share" / "applications"
+    applications.mkdir(parents=True)
+    (applications / "gimp.desktop").write_text("[Desktop Entry]\nName=GIMP\nExec=flatpak run org.gimp.GIMP %U\n")
+    flatpak = tmp_path / "flatpak"
+    flatpak.write_text("")
+    monkeypatch.setattr(app_launcher.platform, "system", lambda: "Linux")
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "share"))
+    monkeypatch.setenv("XDG_DATA_DIRS", str(tmp_path / "missing"))
+    monkeypatch.setattr(app_launcher, "APP_WALK_CACHE", DirectoryCache(tmp_path / "walk.json"))
+    monkeypatch.setattr(app_launcher.shutil, "which", lambda name: str(flatpak) if name == "flatpak" else None)
+
+    [app] = app_launcher._dedupe_apps(app_launcher._collect_desktop_entry_apps())
+    assert (app["location"], app["args"]) == (str(flatpak), ["run", "org.gimp.GIMP"])
+
+    launched = []
+    monkeypatch.setattr(app_launcher, "resolve_app", lambda name: app)
+    monkeypatch.setattr(app_launcher, "_record_launch", lambda *args: None)
+    monkeypatch.setattr(app_launcher.subprocess, "Popen", launched.append)
+
+    assert app_launcher.open_app("gimp")["success"]
+    assert launched == [[str(flatpak), "run", "org.gimp.GIMP"]]
+
+
+def test_failing_collector_does_not_drop_the_others():
+    def broken():
+        raise RuntimeError("powershell missing")
+
+    apps = app_launcher._run_collectors(
+        [lambda: [{"name": "a"}], broken, lambda: [{"name": "b"}, {"name": "c"}]]
+    )
+    assert [app["name"] for app in apps] == ["a", "b", "c"]
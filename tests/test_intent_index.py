@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from brain.nlu.classifier import IntentClassifier
+from brain.nlu.intent_index import IntentIndex
+from brain.nlu.slot_filler import SlotFiller
+
+
+def test_index_resolves_tokens_bigrams_fragments_and_always_entries():
+    index = IntentIndex()
+    index.add_keys("get_weather", ["weather"])
+    index.add_keys("search_youtube", ["look up"])
+    index.add_fragments("get_crypto_price", ["bitcoin"])
+    index.add_fragments("create_folder", ["create folder"])
+    index.add_always("chat")
+
+    assert index.lookup("weather in pune") == {"chat", "get_weather"}
+    assert index.lookup("look up cats") == {"chat", "search_youtube"}
+    assert index.lookup("look at cats") == {"chat"}
+    assert index.lookup("two bitcoins please") == {"chat", "get_crypto_price"}
+    assert index.lookup("create folders now") == {"chat", "create_folder"}
+
+
+def test_classifier_only_scores_candidate_intents():
+    classifier = IntentClassifier(load_on_demand=False)
+
+    assert classifier.candidate_intents("turn it louder") >= {"volume_up", "chat"}
+    assert "get_weather" not in classifier.candidate_intents("turn it louder")
+    # Stopword-only overlap no longer drags a random intent into the result.
+    assert classifier.classify("what is it", "what is it").intent == "chat"
+    assert classifier.classify("turn it louder", "turn it louder").intent == "volume_up"
+
+
+def test_classifier_respects_explicit_candidate_set():
+    classifier = IntentClassifier(load_on_demand=False)
+
+    result = classifier.classify("take screenshot", "take screenshot", candidates={"chat"})
+
+    assert result.intent == "chat"
+
+
+def test_slot_filler_dispatches_by_intent():
+    filler = SlotFiller()
+
+    assert filler.fill(intent="set_volume", raw_text="volume max", normalized="volume max") == {"level": 100}
+    assert filler.fill(intent="get_crypto_price", raw_text="eth in usd", normalized="eth in usd") == {
+        "currency": "usd",
+        "symbol": "eth",
+    }
+    assert filler.fill(intent="take_screenshot", raw_text="take screenshot", normalized="take screenshot") == {}
@@ -0,0 +1,156 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.legacy_intent_cascade import legacy_regex_fallback_intent
+from brain.context import context
+from brain.intent_engine import INTENT_MATCHER, _normalize, _regex_fallback_intent
+
+# One or more utterances per rule, plus near-misses that must fall through.
+EXTRA_UTTERANCES = [
+    "exit",
+    "close jarvis",
+    "hello jarvis",
+    "what time is it",
+    "tell me the time now please",
+    "what is the date",
+    "what day is it tomorrow",
+    "tomorrows",
+    "next friday",
+    "what is the weather tomorrow",
+    "when should i sleep",
+    "convert 5pm ist to utc",
+    "change the timezone",
+    "weather in new york please",
+    "temperature",
+    "show me sports news",
+    "top stories",
+    "bitcoin price",
+    "how much is eth in usd",
+    "something about crypto",
+    "dogecoin in eur",
+    "alert me when the price drops",
+    "notify me when it goes below 3000",
+    "remind me in 10 minutes",
+    "set timer for 2 hour",
+    "play despacito on youtube",
+    "youtube watch trailers",
+    "search youtube for lofi",
+    "find cats on yt",
+    "define serendipity",
+    "what does ephemeral mean",
+    "look up gregarious",
+    "meaning of life",
+    "play some music",
+    "pause the song",
+    "continue the music",
+    "next song",
+    "skip",
+    "go back",
+    "play something for sleeping",
+    "i feel happy",
+    "play songs by arijit singh",
+    "play bollywood playlist",
+    "open chrome and maximize",
+    "launch visual studio code",
+    "start spotify",
+    "run notepad",
+    "what is the volume",
+    "how loud is it",
+    "current brightness",
+    "volume up",
+    "turn down the volume",
+    "brighter",
+    "decrease brightness",
+    "set brightness to 40",
+    "brightness max",
+    "set volume to 70 percent",
+    "mute volume",
+    "volume",
+    "create folder reports",
+    "delete notes txt",
+    "rename draft",
+    "copy report",
+    "kill chrome process",
+    "end task",
+    "show running processes",
+    "minimize",
+    "maximize everything",
+    "close window",
+    "restore",
+    "restore window",
+    "focus on the chrome window",
+    "focus",
+    "resize window",
+    "take a screenshot",
+    "take a snap",
+    "run python script py",
+    "if battery low then notify me",
+    "apply rules",
+    "why is the sky blue",
+    "what is python",
+    "set it to 80",
+    "max",
+    "50 percent",
+    "turn it up",
+    "dimmer",
+    "something completely different",
+    "",
+    "   ",
+]
+
+
+def _scenario_utterances() -> list[str]:
+    utterances: list[str] = []
+    for path in sorted((ROOT / "tests" / "dialogue").glob("*.json")):
+        scenario = json.loads(path.read_text(encoding="utf-8"))
+        utterances.extend(turn["user"] for turn in scenario.get("turns", []))
+    return utterances
+
+
+ALL_UTTERANCES = _scenario_utterances() + EXTRA_UTTERANCES
+
+
+@pytest.fixture(autouse=True)
+def _reset_context():
+    context.__init__()
+    yield
+    context.__init__()
+
+
+@pytest.mark.parametrize("domain", [None, "volume", "brightness"])
+def test_compiled_matcher_matches_legacy_cascade(domain):
+    mismatches = []
+    for utterance in ALL_UTTERANCES:
+        context.active_domain = domain
+        expected = legacy_regex_fallback_intent(utterance)
+        actual = _regex_fallback_intent(utterance)
+        if expected != actual:
+            mismatches.append((utterance, expected, actual))
+
+    assert mismatches == []
+
+
+def test_prefilter_skips_rules_without_trigger_words():
+    names = [rule.name for rule in INTENT_MATCHER.candidates(_normalize("volume up"))]
+
+    assert "volume_up" in names
+    assert "get_weather" not in names
+    assert "take_screenshot" not in names
+    # Context-dependent rules and the chat catch-all are never prefiltered away.
+    assert {"set_volume", "set_brightness", "chat"} <= set(names)
+
+
+def test_rule_table_keeps_priority_order():
+    names = [rule.name for rule in INTENT_MATCHER.rules]
+
+    assert names.index("get_date") < names.index("get_weather")
+    assert names.index("search_youtube") < names.index("lookup_word")
+    assert names.index("open_app") < names.index("get_volume")
+    assert names[-1] == "chat"
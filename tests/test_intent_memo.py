@@ -0,0 +1,69 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import brain.intent_engine as intent_engine
+from brain.context import ContextManager
+from brain.nlu.intent_memo import IntentMemo
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    fresh = ContextManager()
+    monkeypatch.setattr(intent_engine, "context", fresh)
+    monkeypatch.setattr(intent_engine, "INTENT_MEMO", IntentMemo(maxsize=8))
+    return fresh
+
+
+def test_repeat_utterance_is_served_from_memo():
+    first = intent_engine.detect_intent("Volume Up")
+    first["level"] = 999  # callers enrich the dict; the memo must not see it
+    second = intent_engine.detect_intent("volume up")
+
+    assert second["intent"] == "volume_up"
+    assert "level" not in second
+    assert second["text"] == "volume up"
+    assert intent_engine.INTENT_MEMO.stats()["hits"] == 1
+    assert intent_engine.INTENT_MEMO.stats()["misses"] == 1
+
+
+def test_dialogue_state_is_part_of_the_key(fresh_state):
+    fresh_state.active_domain = "volume"
+    assert intent_engine.detect_intent("set to 40")["intent"] == "set_volume"
+
+    fresh_state.active_domain = "brightness"
+    assert intent_engine.detect_intent("set to 40")["intent"] == "set_brightness"
+    assert intent_engine.INTENT_MEMO.stats()["hits"] == 0
+
+
+def test_memo_hit_recomputes_temporal_slots(monkeypatch):
+    reasoner = intent_engine.TEMPORAL_REASONER
+    first = intent_engine.detect_intent("what is the date tomorrow")
+    assert first["intent"] == "get_date"
+
+    real_now = reasoner._aware_now
+    monkeypatch.setattr(reasoner, "_aware_now", lambda now, tz: real_now(now, tz) + timedelta(days=3))
+    second = intent_engine.detect_intent("what is the date tomorrow")
+
+    assert intent_engine.INTENT_MEMO.stats()["hits"] == 1
+    expected = datetime.fromisoformat(first["resolved_date"]).date() + timedelta(days=3)
+    assert second["resolved_date"] == expected.isoformat()
+    assert second["date_ref"] == "tomorrow"
+
+
+def test_memo_evicts_least_recently_used():
+    memo = IntentMemo(maxsize=2)
+    memo.put("a", (), {"intent": "a"})
+    memo.put("b", (), {"intent": "b"})
+    assert memo.get("a", ()) == {"intent": "a"}
+    memo.put("c", (), {"intent": "c"})
+
+    assert memo.get("b", ()) is None
+    assert memo.get("a", ()) is not None
+    assert memo.stats() == {"size": 2, "maxsize": 2, "hits": 2, "misses": 1}
@@ -0,0 +1,156 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from memory.journal import TurnJournal
+
+
+def _turn(index, timestamp=None):
+    return {"conversation_id": f"t{index}", "user_text": f"u{index}", "timestamp": timestamp or f"2000-01-01T00:{index:02d}"}
+
+
+def test_append_writes_one_line_per_turn_and_dedupes(tmp_path):
+    journal = TurnJournal(str(tmp_path), tail_size=3, segment_turns=100)
+    for index in range(5):
+        assert journal.append(_turn(index))
+    assert not journal.append(_turn(4))
+
+    lines = (tmp_path / "turns-000001.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["conversation_id"] for line in lines] == ["t0", "t1", "t2", "t3", "t4"]
+    assert [turn["user_text"] for turn in journal.tail()] == ["u2", "u3", "u4"]
+    assert journal.has_turn("t0")
+
+
+def test_tail_orders_late_turns_by_timestamp(tmp_path):
+    journal = TurnJournal(str(tmp_path), tail_size=3, segment_turns=100)
+    for index in (1, 3, 4):
+        journal.append(_turn(index))
+    journal.append(_turn(2))  # a remote turn arriving late
+    journal.append(_turn(0))  # older than the whole tail
+
+    assert [turn["conversation_id"] for turn in journal.tail()] == ["t2", "t3", "t4"]
+
+
+def test_append_many_dedupes_and_merges_the_batch_into_the_tail(tmp_path):
+    journal = TurnJournal(str(tmp_path), tail_size=3, segment_turns=100)
+    journal.append(_turn(1))
+    journal.append(_turn(4))
+
+    batch = [_turn(3), _turn(0), _turn(1), _turn(5), _turn(3)]
+    added = journal.append_many(batch)
+
+    assert [turn["conversation_id"] for turn in added] == ["t3", "t0", "t5"]
+    assert [turn["conversation_id"] for turn in journal.tail()] == ["t3", "t4", "t5"]
+    lines = (tmp_path / "turns-000001.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["conversation_id"] for line in lines] == ["t1", "t4", "t3", "t0", "t5"]
+    assert journal.append_many([_turn(0), _turn(5)]) == []
+
+
+def test_reload_skips_a_torn_last_line(tmp_path):
+    journal = TurnJournal(str(tmp_path), tail_size=5, segment_turns=100)
+    journal.append(_turn(0))
+    journal.append(_turn(1))
+    journal.close()
+    with open(tmp_path / "turns-000001.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"conversation_id": "t2", "user_')
+
+    reopened = TurnJournal(str(tmp_path), tail_size=5, segment_turns=100)
+    assert [turn["conversation_id"] for turn in reopened.tail()] == ["t0", "t1"]
+
+
+def test_compaction_folds_sealed_turns_outside_the_tail(tmp_path):
+    folded = []
+    journal = TurnJournal(str(tmp_path), tail_size=3, segment_turns=4, on_fold=folded.extend)
+    journal._start_compactor = lambda: None  # compact explicitly below
+    for index in range(10):
+        journal.append(_turn(index))
+
+    assert journal.compact() == 7
+    assert [turn["conversation_id"] for turn in folded] == [f"t{i}" for i in range(7)]
+    assert [turn["conversation_id"] for turn in journal.tail()] == ["t7", "t8", "t9"]
+    # Folded turns stay known, so pulling one again does not bring it back.
+    assert journal.has_turn("t0")
+    assert not journal.append(_turn(0))
+
+    reopened = TurnJournal(str(tmp_path), tail_size=3, segment_turns=4)
+    reopened._start_compactor = lambda: None
+    assert [turn["conversation_id"] for turn in reopened.tail()] == ["t7", "t8", "t9"]
+    assert reopened.has_turn("t0")
+    assert sorted(p.name for p in tmp_path.glob("turns-*.jsonl")) == ["turns-000002.jsonl", "turns-000003.jsonl"]
+
+
+
+def _journal(tmp_path, **kwargs):
+    journal = TurnJournal(str(tmp_path), tail_size=3, segment_turns=4, **kwargs)
+    journal._start_compactor = lambda: None  # compact explicitly in the tests
+    return journal
+
+
+def test_compaction_cut_short_after_the_summary_neither_refolds_nor_readds(tmp_path):
+    folded = []
+    journal = _journal(tmp_path, on_fold=folded.extend)
+    for index in range(10):
+        journal.append(_turn(index))
+
+    def crash(number, turns):
+        raise OSError("killed before the segment rewrite")
+
+    journal._write_segment = crash
+    with pytest.raises(OSError):
+        journal.compact()
+    assert len(folded) == 7
+
+    reopened = _journal(tmp_path, on_fold=folded.extend)
+    assert reopened.has_turn("t0")
+    assert not reopened.append_many([_turn(index) for index in range(7)])
+    assert reopened.compact() == 0
+    assert len(folded) == 7
+    lines = (tmp_path / "turns-000002.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["conversation_id"] for line in lines] == ["t7"]
+    assert not (tmp_path / "turns-000001.jsonl").exists()
+
+
+def test_failed_fold_leaves_the_turns_to_fold_next_time(tmp_path):
+    folded = []
+
+    def fail(turns):
+        raise RuntimeError("summary not written")
+
+    journal = _journal(tmp_path, on_fold=fail)
+    for index in range(10):
+        journal.append(_turn(index))
+    with pytest.raises(RuntimeError):
+        journal.compact()
+    assert not (tmp_path / "folded-ids.txt").read_text(encoding="utf-8")
+
+    journal._on_fold = folded.extend
+    assert journal.compact() == 7
+    assert [turn["conversation_id"] for turn in folded] == [f"t{i}" for i in range(7)]
+
+
+def test_folded_ids_keep_only_the_newest(tmp_path):
+    journal = _journal(tmp_path, folded_ids=3)
+    for index in range(10):
+        journal.append(_turn(index))
+    assert journal.compact() == 7
+
+    lines = (tmp_path / "folded-ids.txt").read_text(encoding="utf-8").splitlines()
+    assert [line.split("\t")[1] for line in lines] == ["t4", "t5", "t6"]
+    assert journal.has_turn("t6") and not journal.has_turn("t0")
+    reopened = _journal(tmp_path, folded_ids=3)
+    assert reopened.has_turn("t4") and not reopened.has_turn("t3")
+
+
+def test_replace_rewrites_the_journal(tmp_path):
+    journal = TurnJournal(str(tmp_path), tail_size=5, segment_turns=100)
+    journal.append(_turn(0))
+    journal.replace([_turn(7), _turn(8)])
+
+    assert not journal.has_turn("t0")
+    assert [turn["conversation_id"] for turn in TurnJournal(str(tmp_path), tail_size=5).tail()] == ["t7", "t8"]
@@ -0,0 +1,87 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from memory.sqlite_store import MemoryStore
+
+
+def _legacy_files(tmp_path):
+    cache = {
+        "user_profile": {"name": "Tony"},
+        "working_memory": {},
+        "conversation_history": [{"role": "user", "text": "hi", "time": "1"}],
+        "conversation_turns": [
+            {"user_text": "hi", "assistant_text": "hello", "time": "1", "timestamp": "1", "conversation_id": "a"}
+        ],
+        "conversation_summary": "Compacted 4 older messages.",
+        "last_topic": "weather",
+    }
+    (tmp_path / "cache.json").write_text(json.dumps(cache), encoding="utf-8")
+    (tmp_path / "sync.json").write_text(json.dumps({"device_id": "desk-1"}), encoding="utf-8")
+    return cache
+
+
+def _open(tmp_path):
+    return MemoryStore(
+        str(tmp_path / "memory.db"),
+        legacy_cache=str(tmp_path / "cache.json"),
+        legacy_sync=str(tmp_path / "sync.json"),
+    )
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    cache = _legacy_files(tmp_path)
+    store = _open(tmp_path)
+
+    assert store.snapshot() == {key: value for key, value in cache.items() if key != "working_memory"}
+    assert store.section("sync") == {"device_id": "desk-1"}
+    store.update_section("user_profile", {"name": "Pepper"})
+    store.close()
+
+    # Reopening must not re-import the JSON over newer data.
+    reopened = _open(tmp_path)
+    assert reopened.section("user_profile") == {"name": "Pepper"}
+    with sqlite3.connect(tmp_path / "memory.db") as db:
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sections_update_only_their_own_rows(tmp_path):
+    store = _open(tmp_path)
+    store.update_section("working_memory", {"current_task": {"status": "nlu"}})
+    store.update_section("user_profile", {"name": "Tony"})
+    store.replace_section("working_memory", {})
+
+    assert store.section("working_memory") == {}
+    assert store.section("user_profile") == {"name": "Tony"}
+
+
+def test_turns_are_unique_ordered_and_trimmed(tmp_path):
+    store = _open(tmp_path)
+    for index in (3, 1, 2, 4):
+        turn = {"conversation_id": f"t{index}", "user_text": f"u{index}"}
+        assert store.add_turn(turn, f"2000-01-0{index}", keep=3)
+    assert not store.add_turn({"conversation_id": "t4"}, "2000-01-05", keep=3)
+
+    assert [turn["conversation_id"] for turn in store.turns()] == ["t2", "t3", "t4"]
+    assert [turn["conversation_id"] for turn in store.turns(limit=1)] == ["t4"]
+    assert store.has_turn("t3") and not store.has_turn("t1")
+
+
+def test_failed_transaction_rolls_back(tmp_path):
+    store = _open(tmp_path)
+    try:
+        with store.transaction():
+            store.append_history([{"role": "user", "text": "lost"}])
+            raise RuntimeError
+    except RuntimeError:
+        pass
+
+    assert store.history() == []
+    store.append_history([{"role": "user", "text": str(i)} for i in range(5)])
+    assert [m["text"] for m in store.take_oldest_history(3)] == ["0", "1", "2"]
+    assert [m["text"] for m in store.history()] == ["3", "4"]
@@ -0,0 +1,110 @@
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from memory.local_cache import WriteBackStore
+from memory.sqlite_store import MemoryStore
+
+
+class CountingStore(MemoryStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self.transactions = 0
+
+    def transaction(self):
+        if not self._depth:
+            self.transactions += 1
+        return super().transaction()
+
+
+class FlakyStore(MemoryStore):
+    def __init__(self, path, failures):
+        super().__init__(path)
+        self.failures = failures
+
+    def transaction(self):
+        if self.failures and not self._depth:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().transaction()
+
+
+def test_hot_path_writes_stay_in_memory_until_flush(tmp_path):
+    disk = CountingStore(str(tmp_path / "memory.db"))
+    store = WriteBackStore(disk, delay=60)
+    assert store.history() == []  # opening the database runs its schema setup
+    disk.transactions = 0
+
+    store.update_section("working_memory", {"current_task": {"status": "nlu"}})
+    store.update_section("working_memory", {"current_task": {"status": "routing"}})
+    store.append_history([{"role": "user", "text": "hi"}])
+    store.replace_section("working_memory", {})
+
+    assert disk.transactions == 0
+    assert store.section("working_memory") == {}
+    assert store.history() == [{"role": "user", "text": "hi"}]
+    assert disk.history() == []
+
+    store.flush()
+
+    # One transaction for the whole command; the intermediate states are coalesced away.
+    assert disk.transactions == 1
+    assert disk.section("working_memory") == {}
+    assert disk.history() == [{"role": "user", "text": "hi"}]
+
+
+def test_debounce_timer_flushes_in_the_background(tmp_path):
+    disk = MemoryStore(str(tmp_path / "memory.db"))
+    store = WriteBackStore(disk, delay=0.01)
+    store.update_section("user_profile", {"name": "Tony"})
+
+    deadline = time.monotonic() + 2
+    while disk.section("user_profile") != {"name": "Tony"} and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert disk.section("user_profile") == {"name": "Tony"}
+
+
+def test_close_persists_pending_writes_for_the_next_process(tmp_path):
+    path = str(tmp_path / "memory.db")
+    store = WriteBackStore(MemoryStore(path), delay=60)
+    store.set_summary("Compacted 20 older messages.")
+    store.update_section("sync", {"device_id": "desk-1"})
+    store.close()
+
+    reopened = WriteBackStore(MemoryStore(path))
+    assert reopened.summary() == "Compacted 20 older messages."
+    assert reopened.section("sync") == {"device_id": "desk-1"}
+
+
+def test_reads_are_copies(tmp_path):
+    store = WriteBackStore(MemoryStore(str(tmp_path / "memory.db")), delay=60)
+    store.update_section("user_profile", {"preferences": ["tea"]})
+
+    store.section_value("user_profile", "preferences").append("coffee")
+    assert store.section("user_profile") == {"preferences": ["tea"]}
+
+
+def test_failed_flush_keeps_the_writes_and_retries(tmp_path):
+    disk = FlakyStore(str(tmp_path / "memory.db"), failures=0)
+    store = WriteBackStore(disk, delay=0.01)
+    assert store.summary() == ""
+    disk.failures = 2
+
+    store.append_history([{"role": "user", "text": "hi"}])
+    store.update_section("user_profile", {"name": "Tony"})
+    assert store.flush() is False
+    store.update_section("user_profile", {"city": "Malibu"})
+    store.set_summary("Compacted 2 older messages.")
+
+    # The retry timer fails once more, then writes everything in order.
+    deadline = time.monotonic() + 5
+    while disk.summary() != "Compacted 2 older messages." and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert disk.failures == 0
+    assert disk.history() == [{"role": "user", "text": "hi"}]
+    assert disk.section("user_profile") == {"name": "Tony", "city": "Malibu"}
@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import services.music.music_services as music_services
+from brain.nlu.gazetteer import MOODS
+from brain.nlu.utterance import Utterance
+
+
+def test_gazetteer_moods_play_as_moods(monkeypatch):
+    opened = []
+    monkeypatch.setattr(music_services, "_open_and_play", opened.append)
+
+    for text in ("play workout music", "play some music for work"):
+        mood = Utterance.parse(text).best_entity("mood") or ""
+        assert mood in MOODS
+        reply = music_services.play_music_response(text, mood=mood)
+        assert reply == f"🎵 Playing {mood} music for you, sir."
+    assert opened[0] == music_services._build_search_url(music_services.MOOD_MAP["workout"])
+
+
+def test_unknown_mood_falls_back_to_scanning_the_query(monkeypatch):
+    monkeypatch.setattr(music_services, "_open_and_play", lambda url: None)
+
+    assert music_services.play_music_response("play workout music", mood="cardio") == (
+        "🎵 Playing workout music for you, sir."
+    )
+    assert music_services.play_music_response("play workout music", mood=None) == (
+        "🎵 Playing workout music for you, sir."
+    )
@@ -11,8 +11,9 @@ if str(ROOT) not in sys.path:
 def _install_stub_modules(monkeypatch):
     """Stub optional runtime integrations so router can be imported in tests."""
     stubs = {
-        "LLM.chatbot": {"chat": lambda prompt: "LLM called"},
+        "LLM.chatbot": {"chat": lambda prompt: "LLM called", "stream_chat": lambda prompt: iter(["LLM called"])},
         "services.time_date.time_utils": {
+            "current_time": lambda format="%Y-%m-%d %H:%M:%S": {"success": True, "time": "12:00"},
             "current_time_only": lambda: "12:00",
             "current_date": lambda date_ref="today": "2026-05-15",
             "current_weekday": lambda date_ref="today": "Friday",
@@ -132,3 +133,81 @@ def test_router_rejects_flat_intent_payload(monkeypatch):
         assert "structured command" in str(exc)
     else:
         raise AssertionError("router should reject flat intent payloads")
+
+
+def _must_not_call(name):
+    def fail(prompt):
+        raise AssertionError(f"{name} should not be called")
+
+    return fail
+
+
+def _voice_route(router, intent, slots=None, text="tell me about tea"):
+    return router.route({"type": "command", "intent": intent, "slots": slots or {}, "metadata": {"text": text}})
+
+
+def test_llm_replies_stream_to_speech_in_voice_mode(monkeypatch):
+    router = _import_router(monkeypatch)
+    import body.speak as speak_module
+
+    prompts, streamed, spoken = [], [], []
+
+    def stream_chat(prompt):
+        prompts.append(prompt)
+        yield "Tea is a drink. "
+        yield "It is brewed."
+
+    def speak_stream(deltas, on_first_sentence=None):
+        text = "".join(deltas)
+        streamed.append(text)
+        return text
+
+    monkeypatch.setattr(router, "llm_stream_chat", stream_chat)
+    monkeypatch.setattr(router, "llm_chat", _must_not_call("llm_chat"))
+    monkeypatch.setattr(speak_module, "speak_stream", speak_stream)
+    monkeypatch.setattr(speak_module, "speak", spoken.append)
+
+    cases = [
+        ("chat", {}),
+        ("advice_time", {"topic": "best time for tea"}),
+        ("convert_timezone", {"query": "5pm IST in London"}),
+        ("evaluate_trigger", {"query": "if it rains then remind me"}),
+        ("apply_rules", {"query": "apply my rules"}),
+        ("no_such_intent", {}),
+        ("unknown", {}),
+    ]
+    for intent, slots in cases:
+        assert _voice_route(router, intent, slots) == "Tea is a drink. It is brewed."
+    assert prompts == [
+        "tell me about tea",
+        "best time for tea",
+        "5pm IST in London",
+        "if it rains then remind me",
+        "apply my rules",
+        "tell me about tea",
+        "tell me about tea",
+    ]
+    assert len(streamed) == len(cases)
+    assert spoken == []  # already spoken while streaming
+
+
+def test_empty_stream_falls_back_to_a_spoken_reply(monkeypatch):
+    router = _import_router(monkeypatch)
+    import body.speak as speak_module
+
+    spoken = []
+    monkeypatch.setattr(router, "llm_stream_chat", lambda prompt: iter(()))
+    monkeypatch.setattr(speak_module, "speak_stream", lambda deltas, on_first_sentence=None: "".join(deltas))
+    monkeypatch.setattr(speak_module, "speak", spoken.append)
+
+    reply = _voice_route(router, "chat")
+
+    assert reply and spoken == [reply]
+
+
+def test_llm_replies_are_not_streamed_when_returned_as_text(monkeypatch):
+    router = _import_router(monkeypatch)
+    monkeypatch.setattr(router, "llm_stream_chat", _must_not_call("llm_stream_chat"))
+
+    command = {"type": "command", "intent": "advice_time", "slots": {"topic": "tea"}, "metadata": {}}
+    assert router.route(command, return_response=True) == "LLM called"
@@ -0,0 +1,84 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import body.speak as speak_module
+from body.sentences import SentenceChunker, iter_sentences
+
+
+def test_sentences_are_emitted_as_soon_as_they_end():
+    chunker = SentenceChunker()
+
+    assert chunker.feed("Sure, Mr. Stark") == []
+    assert chunker.feed(". It is 3.5 degrees") == ["Sure, Mr. Stark."]
+    assert chunker.feed(" outside! Anything") == ["It is 3.5 degrees outside!"]
+    assert chunker.feed(" else?") == []  # could still be followed by a quote or more text
+    assert chunker.flush() == ["Anything else?"]
+
+
+
+def test_single_letters_and_no_end_sentences_unless_the_next_word_says_otherwise():
+    assert list(iter_sentences(["The answer is no. Try again later."])) == ["The answer is no.", "Try again later."]
+    assert list(iter_sentences(["Plan B. It works."])) == ["Plan B.", "It works."]
+    assert list(iter_sentences(["See No. 5 in the U.S. list. J. R. R. Tolkien wrote it."])) == [
+        "See No. 5 in the U.S. list.",
+        "J. R. R. Tolkien wrote it.",
+    ]
+
+    chunker = SentenceChunker()
+    assert chunker.feed("Plan B. ") == []  # "B." may still be an initial
+    assert chunker.feed("It") == ["Plan B."]
+
+
+def test_line_breaks_end_sentences_and_long_runs_are_cut():
+    assert list(iter_sentences(["Steps:\n- open it\n", "- close it"])) == ["Steps:", "- open it", "- close it"]
+    assert list(iter_sentences(["one two three, four five six seven"], max_chars=20)) == [
+        "one two three,",
+        "four five six seven",
+    ]
+
+
+class _Backend:
+    def __init__(self):
+        self.spoken = []
+        self.first = threading.Event()
+        self.release = threading.Event()
+
+    def speak(self, text):
+        self.spoken.append(text)
+        self.first.set()
+        self.release.wait(5)  # blocks like the offline backend
+
+
+def test_first_sentence_is_spoken_while_the_reply_is_still_generating(monkeypatch):
+    backend = _Backend()
+    monkeypatch.setattr(speak_module, "_get_backend", lambda: ("fake", backend))
+    generated_after_first = []
+
+    def reply():
+        yield "Hello there. "
+        assert backend.first.wait(5)
+        generated_after_first.append(True)
+        backend.release.set()
+        yield "The rest "
+        yield "follows."
+
+    text = speak_module.speak_stream(reply())
+
+    assert text == "Hello there. The rest follows."
+    assert generated_after_first == [True]
+    assert backend.spoken == ["Hello there.", "The rest follows."]
+
+
+def test_streamed_reply_is_printed_once_in_full(monkeypatch, capsys):
+    spoken = []
+    monkeypatch.setattr(speak_module, "_get_backend", lambda: ("fake", type("B", (), {"speak": spoken.append})))
+
+    speak_module.speak_stream(iter(["First part. ", "Second ", "part."]))
+
+    assert spoken == ["First part.", "Second part."]
+    assert capsys.readouterr().out.splitlines() == ["Jarvis: First part. Second part."]
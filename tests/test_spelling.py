@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import brain.intent_engine as intent_engine
+from brain.context import ContextManager
+from brain.nlu.intent_memo import IntentMemo
+from brain.nlu.spelling import SymSpell, default_speller, edit_distance
+from brain.nlu.utterance import Utterance
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(intent_engine, "context", ContextManager())
+    monkeypatch.setattr(intent_engine, "INTENT_MEMO", IntentMemo(maxsize=8))
+
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("chorme", "chrome", 2) == 1
+    assert edit_distance("tomarow", "tomorrow", 2) == 2
+    assert edit_distance("abcdef", "uvwxyz", 2) == 3
+
+
+def test_symspell_picks_the_closest_frequent_word():
+    speller = SymSpell()
+    speller.add_words(["weather", "whether", "chrome", "time", "sports", "window"])
+
+    assert speller.lookup("wheather") is None  # one edit from both, equally common
+    assert speller.lookup("chrom") == "chrome"
+    assert speller.lookup("chrome") is None
+    assert speller.lookup("tim") is None  # too short to correct
+    # Inflections and first-letter changes are different words, not typos.
+    assert speller.lookup("timer") is None
+    assert speller.lookup("windows") is None
+    assert speller.lookup("reports") is None
+    assert speller.correct("Open Chrom, then Sports!") == "Open chrome, then Sports!"
+
+
+def test_nlu_vocabulary_replaces_the_typo_lists():
+    speller = default_speller()
+
+    for typo in ("tommorow", "tomarow"):
+        assert speller.lookup(typo) == "tomorrow"
+    assert speller.lookup("tomarrows") == "tomorrows"
+    for typo in ("chorme", "chrom", "chrime"):
+        assert speller.lookup(typo) == "chrome"
+    assert speller.lookup("whether") is None
+
+
+def test_utterance_keeps_what_was_typed_next_to_the_correction():
+    u = Utterance.parse("Date tommorow?")
+
+    assert u.raw == "Date tommorow?"
+    assert u.corrected == "Date tomorrow?"
+    assert u.normalized == "date tomorrow "
+
+
+def test_misspelled_commands_resolve_like_the_correct_ones():
+    typo = intent_engine.detect_intent("what is the date tommorow")
+    clean = intent_engine.detect_intent("what is the date tomorrow")
+
+    assert typo["intent"] == clean["intent"] == "get_date"
+    assert typo["date_ref"] == "tomorrow"
+    assert typo["text"] == "what is the date tommorow"
+
+    app = intent_engine.detect_intent(Utterance.parse("open chorme"))
+    assert app["intent"] == "open_app"
+    assert app["app"] == "chrome"
+
+
+def test_english_words_are_not_typos():
+    speller = SymSpell()
+    speller.add_words(["running", "meaning", "coding"])
+    speller.add_dictionary(["rain", "meet", "come", "run"])
+
+    assert speller.lookup("meanig") == "meaning"
+    for word in ("raining", "meeting", "coming", "runner"):
+        assert speller.lookup(word) is None
+    for word in ("raining", "movie", "lunch", "cooking", "progress", "reading", "storm", "brother"):
+        assert default_speller().lookup(word) is None
+
+
+def test_corrections_pick_the_intent_but_not_the_slot_text():
+    u = Utterance.parse("serch youtube for voluem mixing")
+    assert u.normalized == "search youtube for volume mixing"
+    assert u.uncorrected == "serch youtube for voluem mixing"
+
+    result = intent_engine.detect_intent(u)
+    assert result["intent"] == "search_youtube"
+    assert result["query"] == "voluem mixing"
+
+    word = intent_engine.detect_intent("what is the meaning of meeting")
+    assert (word["intent"], word["word"]) == ("lookup_word", "meeting")
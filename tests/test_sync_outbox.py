@@ -0,0 +1,139 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from memory.local_cache import WriteBackStore
+from memory.outbox import SyncOutbox
+from memory.sqlite_store import MemoryStore
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _store(tmp_path):
+    return WriteBackStore(MemoryStore(str(tmp_path / "memory.db")))
+
+
+def test_drain_uploads_in_batches_and_backs_off_after_a_failure(tmp_path):
+    store = _store(tmp_path)
+    clock = _Clock()
+    results = [0, 2, 1]
+    sent = []
+
+    def upload(payloads):
+        sent.append([payload["id"] for payload in payloads])
+        return results.pop(0)
+
+    outbox = SyncOutbox(lambda: store, upload, base_delay=2.0, batch_size=2, clock=clock)
+    for key in "abc":
+        store.outbox_put(key, {"id": key}, 0.0)
+
+    assert outbox.drain() == 0  # the first batch fails; the pass stops there
+    assert outbox.drain() == 0  # "a" and "b" back off, and "c" waits behind them
+    assert sent == [["a", "b"]]
+    clock.now += 2.0
+    assert outbox.drain() == 3
+    assert sent == [["a", "b"], ["a", "b"], ["c"]]
+
+    metrics = outbox.metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["uploaded"] == 3 and metrics["failed_attempts"] == 1
+    assert metrics["upload_ms_p50"] is not None
+
+
+def test_partial_upload_keeps_the_rest_queued(tmp_path):
+    store = _store(tmp_path)
+    outbox = SyncOutbox(lambda: store, lambda payloads: 1, clock=_Clock())
+    store.outbox_put("a", {}, 0.0)
+    store.outbox_put("b", {}, 0.0)
+
+    assert outbox.drain() == 1
+    assert [key for key, _, _ in store.outbox_items()] == ["b"]
+
+
+def test_items_queued_after_a_failure_wait_for_the_failed_ones(tmp_path):
+    store = _store(tmp_path)
+    clock = _Clock()
+    failures = [True]
+    sent = []
+
+    def upload(payloads):
+        sent.append([payload["id"] for payload in payloads])
+        return 0 if failures and failures.pop() else len(payloads)
+
+    outbox = SyncOutbox(lambda: store, upload, base_delay=2.0, batch_size=10, clock=clock)
+    store.outbox_put("a", {"id": "a"}, 0.0)
+    assert outbox.drain() == 0
+    for key in "bc":
+        store.outbox_put(key, {"id": key}, 0.0)
+
+    assert outbox.drain() == 0
+    assert sent == [["a"]]
+    clock.now += 2.0
+    assert outbox.drain() == 3
+    assert sent == [["a"], ["a", "b", "c"]]
+
+
+def test_backoff_doubles_per_failure(tmp_path):
+    store = _store(tmp_path)
+    clock = _Clock()
+    outbox = SyncOutbox(lambda: store, lambda payloads: 0, base_delay=2.0, max_delay=5.0, clock=clock)
+    store.outbox_put("a", {}, 0.0)
+
+    waits = []
+    for _ in range(3):
+        outbox.drain(force=True)
+        waits.append(outbox._seconds_to_next_retry())
+    assert waits == [2.0, 4.0, 5.0]
+
+
+def test_retry_now_ends_the_backoff(tmp_path):
+    store = _store(tmp_path)
+    results = [0, 1]
+    outbox = SyncOutbox(lambda: store, lambda payloads: results.pop(0), base_delay=60.0, clock=_Clock())
+    store.outbox_put("a", {}, 0.0)
+
+    assert outbox.drain() == 0
+    assert outbox.drain() == 0  # backing off: no upload attempted
+    outbox.retry_now()  # wakes the uploader thread, which retries at once
+    for _ in range(100):
+        if store.outbox_count() == 0:
+            break
+        threading.Event().wait(0.01)
+    outbox.stop()
+    assert store.outbox_count() == 0 and results == []
+
+
+def test_enqueue_returns_before_the_upload_finishes(tmp_path):
+    store = _store(tmp_path)
+    release = threading.Event()
+    done = threading.Event()
+
+    def slow_upload(payloads):
+        release.wait(5)
+        done.set()
+        return len(payloads)
+
+    outbox = SyncOutbox(lambda: store, slow_upload)
+    outbox.enqueue("turn-1", {"user_text": "hi"})
+    assert outbox.depth() == 1  # queued durably, upload still blocked
+
+    release.set()
+    assert done.wait(5)
+    outbox.stop()
+    for _ in range(100):
+        if outbox.depth() == 0:
+            break
+        threading.Event().wait(0.01)
+    assert store.outbox_count() == 0
+    assert MemoryStore(str(tmp_path / "memory.db")).outbox_count() == 0
+
@@ -0,0 +1,66 @@
+import dataclasses
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from brain.context import ContextManager
+from brain.dialogue_manager import DialogueManager
+from brain.nlu.slot_filler import SlotFiller
+from brain.nlu.utterance import Utterance
+
+
+def test_parse_extracts_shared_fields_once():
+    u = Utterance.parse("  Alert me when ETH & bitcoin go below 3,000 in New York  ")
+
+    assert u.raw == "Alert me when ETH & bitcoin go below 3,000 in New York"
+    assert u.normalized == "alert me when eth bitcoin go below 3 000 in new york"
+    assert u.tokens[:3] == ("alert", "me", "when")
+    assert "bitcoin" in u.token_set
+    assert u.numbers == ("3", "000")
+    assert u.coins == ("bitcoin", "eth")
+    assert u.cities == ("new york",)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        u.raw = "changed"
+
+
+def test_app_candidates_prefer_the_latest_verb():
+    assert Utterance.parse("start spotify and then open the vs code").app_candidates == ("vs code", "spotify")
+    assert Utterance.parse("something else").app_candidates == ()
+    assert Utterance.parse("ethics").coins == ()
+
+
+def test_slot_filler_reads_utterance_fields():
+    filler = SlotFiller()
+
+    assert filler.fill(intent="set_volume", utterance=Utterance.parse("volume 1234")) == {"level": 100}
+    assert filler.fill(intent="set_volume", utterance=Utterance.parse("volume 045")) == {"level": 45}
+    assert filler.fill(intent="get_weather", utterance=Utterance.parse("weather for san jose today")) == {
+        "city": "san jose"
+    }
+    assert filler.fill(intent="check_price_alert", utterance=Utterance.parse("tell me when btc is below 20")) == {
+        "direction": "below",
+        "target_price": 20,
+        "symbol": "btc",
+        "currency": "inr",
+    }
+
+
+def test_dialogue_result_carries_the_utterance_only_for_fresh_commands():
+    ctx = ContextManager()
+    manager = DialogueManager()
+    u = Utterance.parse("take screenshot")
+
+    result = manager.handle({"intent": "take_screenshot", "text": u.raw, "confidence": 0.9}, ctx, u)
+    assert result.action == "execute"
+    assert result.utterance is u
+
+    manager.handle({"intent": "kill_pid", "text": "kill pid 42", "pid": 42, "confidence": 0.9}, ctx)
+    confirmed = manager.handle({"intent": "chat", "text": "yes", "confidence": 0.4}, ctx, Utterance.parse("yes"))
+    assert confirmed.action == "execute"
+    assert confirmed.command["intent"] == "kill_pid"
+    assert confirmed.utterance is None
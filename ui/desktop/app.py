@@ -53,6 +53,10 @@ def run() -> int:
 
     _preload_voice_stack()
 
+    from system.laptop.app_launcher import preresolve_top_apps
+
+    preresolve_top_apps()
+
     from ui.desktop.main_window import MainWindow
 
     app = QApplication(sys.argv)